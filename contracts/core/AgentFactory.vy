@@ -13,14 +13,23 @@ interface MainWallet:
     def clawBackTrialFunds() -> bool: nonpayable
     def canBeAmbassador() -> bool: view
     def apiVersion() -> String[28]: view
+    def initialize(_walletConfig: address, _wethAddr: address, _trialFundsAsset: address, _trialFundsInitialAmount: uint256) -> bool: nonpayable
 
 interface AddyRegistry:
+    def getAddy(_addyId: uint256) -> address: view
     def setIsUserWalletOrAgent(_addr: address, _isThing: bool, _setUserWalletMap: bool) -> bool: nonpayable
     def isUserWallet(_addr: address) -> bool: view
     def isAgent(_addr: address) -> bool: view
 
 interface WalletConfig:
     def setWallet(_wallet: address) -> bool: nonpayable
+    def initialize(_owner: address, _initialAgent: address, _ambassador: address) -> bool: nonpayable
+
+interface Agent:
+    def initialize(_owner: address) -> bool: nonpayable
+
+interface PriceSheets:
+    def shouldAccrueTxFees() -> bool: view
 
 flag AddressTypes:
     USER_WALLET_TEMPLATE
@@ -42,6 +51,11 @@ struct TrialFundsData:
     asset: address
     amount: uint256
 
+struct NewUserWallet:
+    owner: address
+    ambassador: address
+    shouldUseTrialFunds: bool
+
 struct TrialFundsOpp:
     legoId: uint256
     vaultToken: address
@@ -120,6 +134,12 @@ event AmbassadorYieldBonusPaid:
 event AmbassadorBonusRatioSet:
     ratio: uint256
 
+event AccruedFeesSwept:
+    recipient: indexed(address)
+    asset: indexed(address)
+    caller: indexed(address)
+    amount: uint256
+
 event AgentFactoryFundsRecovered:
     asset: indexed(address)
     recipient: indexed(address)
@@ -147,6 +167,10 @@ ambassadorBonusRatio: public(uint256)
 # trial funds
 trialFundsData: public(TrialFundsData)
 
+# deferred fee settlement (enabled in price sheets)
+accruedFees: public(HashMap[address, HashMap[address, uint256]]) # recipient -> asset -> amount
+totalAccruedFees: public(HashMap[address, uint256]) # asset -> amount
+
 # limits / controls
 numUserWalletsAllowed: public(uint256)
 numAgentsAllowed: public(uint256)
@@ -160,9 +184,15 @@ isActivated: public(bool)
 ADDY_REGISTRY: public(immutable(address))
 WETH_ADDR: public(immutable(address))
 
+# registry ids
+PRICE_SHEETS_ID: constant(uint256) = 3
+
 HUNDRED_PERCENT: constant(uint256) = 100_00 # 100.00%
 MAX_RECOVERIES: constant(uint256) = 100
 MAX_LEGOS: constant(uint256) = 20
+MAX_SWEEP_ASSETS: constant(uint256) = 25
+MAX_WALLETS_PER_BATCH: constant(uint256) = 100
+BLUEPRINT_PREAMBLE: constant(bytes2) = 0xfe71 # erc-5202
 
 MIN_OWNER_CHANGE_DELAY: public(immutable(uint256))
 MAX_OWNER_CHANGE_DELAY: public(immutable(uint256))
@@ -262,6 +292,75 @@ def createUserWallet(
     if self.numUserWallets >= self.numUserWalletsAllowed:
         return empty(address)
 
+    # initial trial funds asset + amount
+    userTrialFundsData: TrialFundsData = empty(TrialFundsData)
+    if _shouldUseTrialFunds:
+        trialFundsData: TrialFundsData = self.trialFundsData
+        if trialFundsData.asset != empty(address) and trialFundsData.amount != 0 and self._getAvailableBalance(trialFundsData.asset) >= trialFundsData.amount:
+            userTrialFundsData = trialFundsData
+
+    # create wallet contracts
+    defaultAgent: address = self.addressInfo[AddressTypes.DEFAULT_AGENT].addr
+    mainWalletAddr: address = self._createUserWallet(_owner, _ambassador, userTrialFundsData, userWalletTemplate, walletConfigTemplate, defaultAgent)
+    self.numUserWallets += 1
+    return mainWalletAddr
+
+
+@external
+def createUserWallets(_newWallets: DynArray[NewUserWallet, MAX_WALLETS_PER_BATCH]) -> DynArray[address, MAX_WALLETS_PER_BATCH]:
+    """
+    @notice Create many User Wallets in one transaction
+    @dev Shared state (templates, limits, trial funds) is read once. Trial funds are handed out in order while available.
+    @param _newWallets The list of (owner, ambassador, shouldUseTrialFunds) for each wallet
+    @return The addresses of the newly created wallets, or empty list if setup is invalid
+    """
+    assert self.isActivated # dev: not activated
+
+    # get templates
+    userWalletTemplate: address = self.addressInfo[AddressTypes.USER_WALLET_TEMPLATE].addr
+    walletConfigTemplate: address = self.addressInfo[AddressTypes.USER_WALLET_CONFIG_TEMPLATE].addr
+    assert empty(address) not in [userWalletTemplate, walletConfigTemplate] # dev: invalid setup
+
+    # check safety / limits (whole batch must fit)
+    numNewWallets: uint256 = len(_newWallets)
+    if self.shouldEnforceWhitelist and not self.whitelist[msg.sender]:
+        return []
+    numUserWallets: uint256 = self.numUserWallets
+    if numUserWallets + numNewWallets > self.numUserWalletsAllowed:
+        return []
+
+    # trial funds available for this batch
+    trialFundsData: TrialFundsData = self.trialFundsData
+    numTrialFundsAvailable: uint256 = 0
+    if trialFundsData.asset != empty(address) and trialFundsData.amount != 0:
+        numTrialFundsAvailable = self._getAvailableBalance(trialFundsData.asset) // trialFundsData.amount
+
+    # create wallet contracts
+    defaultAgent: address = self.addressInfo[AddressTypes.DEFAULT_AGENT].addr
+    newWalletAddrs: DynArray[address, MAX_WALLETS_PER_BATCH] = []
+    for w: NewUserWallet in _newWallets:
+        assert w.owner != empty(address) # dev: invalid owner
+
+        userTrialFundsData: TrialFundsData = empty(TrialFundsData)
+        if w.shouldUseTrialFunds and numTrialFundsAvailable != 0:
+            userTrialFundsData = trialFundsData
+            numTrialFundsAvailable -= 1
+
+        newWalletAddrs.append(self._createUserWallet(w.owner, w.ambassador, userTrialFundsData, userWalletTemplate, walletConfigTemplate, defaultAgent))
+
+    self.numUserWallets = numUserWallets + numNewWallets
+    return newWalletAddrs
+
+
+@internal
+def _createUserWallet(
+    _owner: address,
+    _ambassador: address,
+    _trialFundsData: TrialFundsData,
+    _userWalletTemplate: address,
+    _walletConfigTemplate: address,
+    _defaultAgent: address,
+) -> address:
     # validate ambassador
     ambassador: address = empty(address)
     if _ambassador != empty(address):
@@ -270,29 +369,42 @@ def createUserWallet(
         if version != "0.0.1" and version != "0.0.2" and staticcall MainWallet(_ambassador).canBeAmbassador():
             ambassador = _ambassador
 
-    # initial trial funds asset + amount
-    userTrialFundsData: TrialFundsData = empty(TrialFundsData)
-    if _shouldUseTrialFunds:
-        trialFundsData: TrialFundsData = self.trialFundsData
-        if trialFundsData.asset != empty(address) and trialFundsData.amount != 0 and staticcall IERC20(trialFundsData.asset).balanceOf(self) >= trialFundsData.amount:
-            userTrialFundsData = trialFundsData
-
     # create wallet contracts
-    defaultAgent: address = self.addressInfo[AddressTypes.DEFAULT_AGENT].addr
-    walletConfigAddr: address = create_from_blueprint(walletConfigTemplate, _owner, defaultAgent, ambassador, ADDY_REGISTRY, MIN_OWNER_CHANGE_DELAY, MAX_OWNER_CHANGE_DELAY)
-    mainWalletAddr: address = create_from_blueprint(userWalletTemplate, walletConfigAddr, ADDY_REGISTRY, WETH_ADDR, userTrialFundsData.asset, userTrialFundsData.amount)
+    walletConfigAddr: address = self._deployWalletConfig(_walletConfigTemplate, _owner, _defaultAgent, ambassador)
+    mainWalletAddr: address = self._deployUserWallet(_userWalletTemplate, walletConfigAddr, _trialFundsData)
     assert extcall WalletConfig(walletConfigAddr).setWallet(mainWalletAddr) # dev: could not set wallet
 
     # transfer after initialization
-    if userTrialFundsData.asset != empty(address) and userTrialFundsData.amount != 0:
-        assert extcall IERC20(userTrialFundsData.asset).transfer(mainWalletAddr, userTrialFundsData.amount, default_return_value=True) # dev: gift transfer failed
+    if _trialFundsData.asset != empty(address) and _trialFundsData.amount != 0:
+        assert extcall IERC20(_trialFundsData.asset).transfer(mainWalletAddr, _trialFundsData.amount, default_return_value=True) # dev: gift transfer failed
 
     # update data
     assert extcall AddyRegistry(ADDY_REGISTRY).setIsUserWalletOrAgent(mainWalletAddr, True, True) # dev: could not set is user wallet
     self.isUserWalletLocal[mainWalletAddr] = True
-    self.numUserWallets += 1
 
-    log UserWalletCreated(mainAddr=mainWalletAddr, configAddr=walletConfigAddr, owner=_owner, agent=defaultAgent, ambassador=ambassador, creator=msg.sender)
+    log UserWalletCreated(mainAddr=mainWalletAddr, configAddr=walletConfigAddr, owner=_owner, agent=_defaultAgent, ambassador=ambassador, creator=msg.sender)
+    return mainWalletAddr
+
+
+@internal
+def _deployWalletConfig(_template: address, _owner: address, _defaultAgent: address, _ambassador: address) -> address:
+    if self._isBlueprint(_template):
+        return create_from_blueprint(_template, _owner, _defaultAgent, _ambassador, ADDY_REGISTRY, MIN_OWNER_CHANGE_DELAY, MAX_OWNER_CHANGE_DELAY)
+
+    # minimal proxy to shared implementation
+    walletConfigAddr: address = create_minimal_proxy_to(_template)
+    assert extcall WalletConfig(walletConfigAddr).initialize(_owner, _defaultAgent, _ambassador) # dev: could not init config
+    return walletConfigAddr
+
+
+@internal
+def _deployUserWallet(_template: address, _walletConfig: address, _trialFundsData: TrialFundsData) -> address:
+    if self._isBlueprint(_template):
+        return create_from_blueprint(_template, _walletConfig, ADDY_REGISTRY, WETH_ADDR, _trialFundsData.asset, _trialFundsData.amount)
+
+    # minimal proxy to shared implementation
+    mainWalletAddr: address = create_minimal_proxy_to(_template)
+    assert extcall MainWallet(mainWalletAddr).initialize(_walletConfig, WETH_ADDR, _trialFundsData.asset, _trialFundsData.amount) # dev: could not init wallet
     return mainWalletAddr
 
 
@@ -340,7 +452,12 @@ def createAgent(_owner: address = msg.sender) -> address:
         return empty(address)
 
     # create agent contract
-    agentAddr: address = create_from_blueprint(agentTemplate, _owner, ADDY_REGISTRY, MIN_OWNER_CHANGE_DELAY, MAX_OWNER_CHANGE_DELAY)
+    agentAddr: address = empty(address)
+    if self._isBlueprint(agentTemplate):
+        agentAddr = create_from_blueprint(agentTemplate, _owner, ADDY_REGISTRY, MIN_OWNER_CHANGE_DELAY, MAX_OWNER_CHANGE_DELAY)
+    else:
+        agentAddr = create_minimal_proxy_to(agentTemplate)
+        assert extcall Agent(agentAddr).initialize(_owner) # dev: could not init agent
 
     # update data
     assert extcall AddyRegistry(ADDY_REGISTRY).setIsUserWalletOrAgent(agentAddr, True, False) # dev: could not set is agent
@@ -494,6 +611,13 @@ def hasPendingAgentTemplateUpdate() -> bool:
 # shared utilities
 
 
+@view
+@internal
+def _isBlueprint(_template: address) -> bool:
+    # blueprints are deployed with `create_from_blueprint`, anything else is an implementation for minimal proxies
+    return convert(slice(_template.code, 0, 2), bytes2) == BLUEPRINT_PREAMBLE
+
+
 @view
 @internal
 def _hasPendingAddressUpdate(_addressType: AddressTypes) -> bool:
@@ -794,12 +918,16 @@ def payAmbassadorYieldBonus(_ambassador: address, _asset: address, _amount: uint
     if ambassadorBonusRatio == 0:
         return False
 
-    # calculate bonus amount, transfer to ambassador
-    bonusAmount: uint256 = min(_amount * ambassadorBonusRatio // HUNDRED_PERCENT, staticcall IERC20(_asset).balanceOf(self))
+    # calculate bonus amount (accrued fees are not available for bonuses)
+    bonusAmount: uint256 = min(_amount * ambassadorBonusRatio // HUNDRED_PERCENT, self._getAvailableBalance(_asset))
     if bonusAmount == 0:
         return False
 
-    assert extcall IERC20(_asset).transfer(_ambassador, bonusAmount, default_return_value=True) # dev: bonus transfer failed
+    # credit ledger, or transfer to ambassador
+    if staticcall PriceSheets(staticcall AddyRegistry(ADDY_REGISTRY).getAddy(PRICE_SHEETS_ID)).shouldAccrueTxFees():
+        self._accrueFees(_ambassador, _asset, bonusAmount)
+    else:
+        assert extcall IERC20(_asset).transfer(_ambassador, bonusAmount, default_return_value=True) # dev: bonus transfer failed
     log AmbassadorYieldBonusPaid(user=wallet, ambassador=_ambassador, asset=_asset, amount=bonusAmount, ratio=ambassadorBonusRatio)
     return True
 
@@ -818,6 +946,83 @@ def setAmbassadorBonusRatio(_bonusRatio: uint256) -> bool:
     return True
 
 
+###########################
+# Deferred Fee Settlement #
+###########################
+
+
+@external
+def accrueTransactionFees(
+    _asset: address,
+    _protocolRecipient: address,
+    _protocolAmount: uint256,
+    _ambassadorRecipient: address,
+    _ambassadorAmount: uint256,
+) -> bool:
+    """
+    @notice Record transaction fees that a wallet has already transferred to this factory
+    @dev Only callable by a wallet, credits the ledger for later sweeping by each recipient
+    @param _asset The address of the fee asset
+    @param _protocolRecipient The address of the protocol recipient
+    @param _protocolAmount The amount owed to the protocol recipient
+    @param _ambassadorRecipient The address of the ambassador recipient
+    @param _ambassadorAmount The amount owed to the ambassador recipient
+    @return True if the fees were successfully recorded, False otherwise
+    """
+    assert self._isUserWallet(msg.sender) # dev: not a user wallet
+    assert _asset != empty(address) # dev: invalid asset
+
+    if _protocolRecipient != empty(address) and _protocolAmount != 0:
+        self._accrueFees(_protocolRecipient, _asset, _protocolAmount)
+    if _ambassadorRecipient != empty(address) and _ambassadorAmount != 0:
+        self._accrueFees(_ambassadorRecipient, _asset, _ambassadorAmount)
+
+    assert staticcall IERC20(_asset).balanceOf(self) >= self.totalAccruedFees[_asset] # dev: fees not received
+    return True
+
+
+@internal
+def _accrueFees(_recipient: address, _asset: address, _amount: uint256):
+    self.accruedFees[_recipient][_asset] += _amount
+    self.totalAccruedFees[_asset] += _amount
+
+
+@external
+def sweepAccruedFees(_recipient: address, _assets: DynArray[address, MAX_SWEEP_ASSETS]) -> uint256:
+    """
+    @notice Sweep a recipient's accrued fees for a list of assets
+    @dev Callable by anyone, funds always go to the ledger recipient (user wallets included, they cannot call this)
+    @param _recipient The ledger recipient to pay out
+    @param _assets The list of assets to sweep
+    @return The number of assets swept
+    """
+    assert _recipient != empty(address) # dev: invalid recipient
+
+    numSwept: uint256 = 0
+    for asset: address in _assets:
+        amount: uint256 = self.accruedFees[_recipient][asset]
+        if amount == 0:
+            continue
+
+        self.accruedFees[_recipient][asset] = 0
+        self.totalAccruedFees[asset] -= amount
+        assert extcall IERC20(asset).transfer(_recipient, amount, default_return_value=True) # dev: sweep transfer failed
+        log AccruedFeesSwept(recipient=_recipient, asset=asset, caller=msg.sender, amount=amount)
+        numSwept += 1
+
+    return numSwept
+
+
+@view
+@internal
+def _getAvailableBalance(_asset: address) -> uint256:
+    balance: uint256 = staticcall IERC20(_asset).balanceOf(self)
+    accrued: uint256 = self.totalAccruedFees[_asset]
+    if balance <= accrued:
+        return 0
+    return balance - accrued
+
+
 #################
 # Default Agent #
 #################
@@ -878,14 +1083,14 @@ def hasPendingDefaultAgentUpdate() -> bool:
 def recoverFundsFromAgentFactory(_asset: address, _recipient: address) -> bool:
     """
     @notice Recover funds from the factory
-    @dev Only callable by the governor, transfers funds to the recipient
+    @dev Only callable by the governor, transfers funds to the recipient (accrued fees stay in the ledger)
     @param _asset The address of the asset to recover
     @param _recipient The address to send the funds to
     @return True if the funds were successfully recovered, False otherwise
     """
     assert gov._canGovern(msg.sender) # dev: no perms
 
-    balance: uint256 = staticcall IERC20(_asset).balanceOf(self)
+    balance: uint256 = self._getAvailableBalance(_asset)
     if empty(address) in [_recipient, _asset] or balance == 0:
         return False
 
@@ -112,6 +112,9 @@ event PriceChangeDelaySet:
 event AmbassadorRatioSet:
     ratio: uint256
 
+event ShouldAccrueTxFeesSet:
+    shouldAccrue: bool
+
 event PriceSheetsActivated:
     isActivated: bool
 
@@ -131,6 +134,9 @@ priceChangeDelay: public(uint256) # number of blocks that must pass before price
 # ambassador settings
 ambassadorRatio: public(uint256) # ratio of ambassador proceeds
 
+# fee settlement
+shouldAccrueTxFees: public(bool) # wallets send fees to the agent factory ledger instead of paying recipients
+
 # config
 ADDY_REGISTRY: public(immutable(address))
 isActivated: public(bool)
@@ -144,6 +150,7 @@ MIN_PAY_PERIOD: public(immutable(uint256))
 MAX_PAY_PERIOD: public(immutable(uint256))
 MIN_PRICE_CHANGE_BUFFER: public(immutable(uint256))
 
+MAX_PREPAID_PERIODS: constant(uint256) = 24
 HUNDRED_PERCENT: constant(uint256) = 100_00 # 100.00%
 MAX_TX_FEE: constant(uint256) = 20_00 # 20.00%
 
@@ -243,6 +250,43 @@ def _updatePaidThroughBlock(_paidThroughBlock: uint256, _subData: SubscriptionIn
     return data
 
 
+@view
+@external
+def getPrepaidSubData(_agent: address, _paidThroughBlock: uint256, _numPeriods: uint256, _oracleRegistry: address) -> SubPaymentInfo:
+    """
+    @notice Get payment data to prepay multiple subscription periods at the current price
+    @dev Periods are added on top of the current paid through block (or current block if lapsed)
+    @param _agent The address of the agent (empty address for protocol subscription)
+    @param _paidThroughBlock The current paid through block
+    @param _numPeriods The number of pay periods to prepay
+    @param _oracleRegistry The address of the oracle registry
+    @return SubPaymentInfo struct containing payment amount and new paid through block
+    """
+    data: SubPaymentInfo = empty(SubPaymentInfo)
+    if _numPeriods == 0 or _numPeriods > MAX_PREPAID_PERIODS:
+        return data
+
+    subData: SubscriptionInfo = self.protocolSubPriceData
+    data.recipient = self.protocolRecipient
+    if _agent != empty(address):
+        subData = self.agentSubPriceData[_agent]
+        data.recipient = _agent
+
+    if subData.usdValue == 0:
+        return empty(SubPaymentInfo)
+
+    # price is locked in for all periods
+    data.usdValue = subData.usdValue * _numPeriods
+    data.amount = staticcall OracleRegistry(_oracleRegistry).getAssetAmount(subData.asset, data.usdValue)
+    if data.amount == 0:
+        return empty(SubPaymentInfo)
+
+    data.asset = subData.asset
+    data.paidThroughBlock = max(_paidThroughBlock, block.number) + (subData.payPeriod * _numPeriods)
+    data.didChange = True
+    return data
+
+
 ######################
 # Agent Subscription #
 ######################
@@ -493,6 +537,22 @@ def getTransactionFeeDataWithAmbassadorRatio(_user: address, _action: ActionType
     return self._getTxFeeForAction(_action, self.protocolTxPriceData), self.protocolRecipient, self.ambassadorRatio
 
 
+@view
+@external
+def getTransactionFeeSettlementData(_user: address, _action: ActionType) -> (uint256, address, uint256, bool):
+    """
+    @notice Get transaction fee data for the protocol, along with how wallets settle it
+    @dev Same as `getTransactionFeeDataWithAmbassadorRatio`, plus the settlement mode, so wallets need no extra call
+    @param _user The address of the user
+    @param _action The type of action being performed
+    @return feeAmount The fee amount for the action
+    @return recipient The recipient address for the fee
+    @return ambassadorRatio The ratio of ambassador proceeds
+    @return shouldAccrue True if fees are recorded in the agent factory ledger
+    """
+    return self._getTxFeeForAction(_action, self.protocolTxPriceData), self.protocolRecipient, self.ambassadorRatio, self.shouldAccrueTxFees
+
+
 @view
 @external
 def getTransactionFeeData(_user: address, _action: ActionType) -> (uint256, address):
@@ -651,6 +711,24 @@ def setAmbassadorRatio(_ratio: uint256) -> bool:
     return True
 
 
+##################
+# Fee Settlement #
+##################
+
+
+@external
+def setShouldAccrueTxFees(_shouldAccrue: bool) -> bool:
+    """
+    @notice Enable or disable deferred settlement of transaction fees and ambassador payouts
+    @dev Only callable by governor
+    @param _shouldAccrue True to record fees in the agent factory ledger, False to transfer them directly
+    """
+    assert gov._canGovern(msg.sender) # dev: no perms
+    self.shouldAccrueTxFees = _shouldAccrue
+    log ShouldAccrueTxFeesSet(shouldAccrue=_shouldAccrue)
+    return True
+
+
 ############
 # Activate #
 ############
@@ -33,16 +33,35 @@ struct VaultTokenInfo:
 event LegoHelperSet:
     helperAddr: indexed(address)
 
+event DirectLegoSet:
+    legoId: indexed(uint256)
+    isDirect: bool
+
 event RipeHqSet:
     ripeHq: indexed(address)
+    priceDesk: indexed(address)
+
+event RipePriceDeskUpdated:
+    priceDesk: indexed(address)
+
+event RipeSnapshotIntervalSet:
+    numBlocks: uint256
 
 # lego types
 pendingLegoType: public(HashMap[address, LegoType]) # addr -> pending lego type
 legoIdToType: public(HashMap[uint256, LegoType]) # legoId -> lego type
 
+# wallets deposit / redeem with the vault directly (see `LegoDirect`)
+isDirectLego: public(HashMap[uint256, bool]) # legoId -> is direct
+
 legoHelper: public(address)
 ripeHq: public(address)
 
+# ripe price snapshots
+ripePriceDesk: public(address) # cached from ripe hq
+ripeSnapshotInterval: public(uint256) # min blocks between snapshots of an asset (0 -> once per block)
+lastRipeSnapshotBlock: public(HashMap[address, uint256]) # asset -> block
+
 MAX_VAULTS: constant(uint256) = 15
 MAX_VAULTS_FOR_USER: constant(uint256) = 30
 RIPE_PRICE_DESK_ID: constant(uint256) = 7
@@ -179,6 +198,7 @@ def confirmLegoUpdate(_legoId: uint256) -> bool:
     if didUpdate:
         legoAddr: address = registry.addyInfo[_legoId].addr
         assert extcall LegoCommon(legoAddr).setLegoId(_legoId) # dev: set id failed
+        self._setDirectLego(_legoId, False) # new lego needs to be vetted again
     return didUpdate
 
 
@@ -226,7 +246,10 @@ def confirmLegoDisable(_legoId: uint256) -> bool:
     @return True if the disable was successfully confirmed, False if confirmation fails
     """
     assert gov._canGovern(msg.sender) # dev: no perms
-    return registry._confirmAddyDisable(_legoId)
+    didDisable: bool = registry._confirmAddyDisable(_legoId)
+    if didDisable:
+        self._setDirectLego(_legoId, False)
+    return didDisable
 
 
 @external
@@ -241,6 +264,35 @@ def cancelPendingLegoDisable(_legoId: uint256) -> bool:
     return registry._cancelPendingAddyDisable(_legoId)
 
 
+###############
+# Direct Mode #
+###############
+
+
+@external
+def setDirectLego(_legoId: uint256, _isDirect: bool) -> bool:
+    """
+    @notice Let wallets deposit into / redeem from a yield lego's vaults directly, with the lego only doing accounting
+    @dev Only callable by governor. Lego must implement `LegoDirect` and only support erc4626 vaults
+    @param _legoId The ID of the yield lego
+    @param _isDirect Whether direct mode is on
+    @return True if direct mode was set successfully
+    """
+    assert gov._canGovern(msg.sender) # dev: no perms
+    assert registry._isValidAddyId(_legoId) # dev: invalid lego
+    assert self.legoIdToType[_legoId] == LegoType.YIELD_OPP # dev: not yield lego
+    self._setDirectLego(_legoId, _isDirect)
+    return True
+
+
+@internal
+def _setDirectLego(_legoId: uint256, _isDirect: bool):
+    if self.isDirectLego[_legoId] == _isDirect:
+        return
+    self.isDirectLego[_legoId] = _isDirect
+    log DirectLegoSet(legoId=_legoId, isDirect=_isDirect)
+
+
 #####################
 # Lego Change Delay #
 #####################
@@ -311,6 +363,13 @@ def getLegoAddr(_legoId: uint256) -> address:
     return registry._getAddy(_legoId)
 
 
+@view
+@external
+def getLegoAddrAndIsDirect(_legoId: uint256) -> (address, bool):
+    # single lookup for wallets, direct mode decides how they deposit / withdraw
+    return registry._getAddy(_legoId), self.isDirectLego[_legoId]
+
+
 @view
 @external
 def getLegoInfo(_legoId: uint256) -> registry.AddyInfo:
@@ -557,20 +616,60 @@ def setRipeHq(_ripeHq: address) -> bool:
     if not self._isValidRipeHq(_ripeHq):
         return False
     self.ripeHq = _ripeHq
-    log RipeHqSet(ripeHq=_ripeHq)
+
+    priceDesk: address = staticcall RipeRegistry(_ripeHq).getAddr(RIPE_PRICE_DESK_ID)
+    self.ripePriceDesk = priceDesk
+    log RipeHqSet(ripeHq=_ripeHq, priceDesk=priceDesk)
     return True
 
 
 @external
-def addRipeSnapshot(_asset: address):
-    assert registry._isValidAddyAddr(msg.sender) # dev: no perms
+def updateRipePriceDesk() -> bool:
+    """
+    @notice Re-read the price desk from ripe hq, if ripe moved it
+    @dev Only callable by governor
+    @return True if the cached price desk changed, False otherwise
+    """
+    assert gov._canGovern(msg.sender) # dev: no perms
 
     ripeHq: address = self.ripeHq
     if ripeHq == empty(address):
-        return
+        return False
 
     priceDesk: address = staticcall RipeRegistry(ripeHq).getAddr(RIPE_PRICE_DESK_ID)
+    if priceDesk == self.ripePriceDesk:
+        return False
+    self.ripePriceDesk = priceDesk
+    log RipePriceDeskUpdated(priceDesk=priceDesk)
+    return True
+
+
+@external
+def setRipeSnapshotInterval(_numBlocks: uint256) -> bool:
+    """
+    @notice Set the min number of blocks between price snapshots of the same asset
+    @dev Only callable by governor, 0 still coalesces snapshots within a block
+    @param _numBlocks The number of blocks
+    @return True if interval was set successfully
+    """
+    assert gov._canGovern(msg.sender) # dev: no perms
+    self.ripeSnapshotInterval = _numBlocks
+    log RipeSnapshotIntervalSet(numBlocks=_numBlocks)
+    return True
+
+
+@external
+def addRipeSnapshot(_asset: address):
+    # no ripe -> only this sload
+    priceDesk: address = self.ripePriceDesk
     if priceDesk == empty(address):
         return
 
-    extcall RipePriceDesk(priceDesk).addPriceSnapshot(_asset)
\ No newline at end of file
+    assert registry._isValidAddyAddr(msg.sender) # dev: no perms
+
+    # at most one snapshot per asset per interval
+    if block.number < self.lastRipeSnapshotBlock[_asset] + max(self.ripeSnapshotInterval, 1):
+        return
+    self.lastRipeSnapshotBlock[_asset] = block.number
+
+    extcall RipePriceDesk(priceDesk).addPriceSnapshot(_asset)
@@ -14,21 +14,46 @@ import contracts.modules.Registry as registry
 from ethereum.ercs import IERC20Detailed
 import interfaces.OraclePartnerInterface as OraclePartner
 
+interface AddyRegistry:
+    def getAddy(_addyId: uint256) -> address: view
+
+interface AgentFactory:
+    def isUserWallet(_addr: address) -> bool: view
+
+interface LegoRegistry:
+    def isValidLegoAddr(_addr: address) -> bool: view
+
 event PriorityOraclePartnerIdsModified:
     numIds: uint256
 
 event StaleTimeSet:
     staleTime: uint256
 
+event AssetDecimalsCached:
+    asset: indexed(address)
+    decimals: uint256
+
 # custom config
 priorityOraclePartnerIds: public(DynArray[uint256, MAX_PRIORITY_PARTNERS])
 staleTime: public(uint256)
 
+# asset metadata (filled lazily, never changes once set)
+assetDecimals: public(HashMap[address, uint256]) # asset -> decimals
+
+# transient
+priceMemo: transient(HashMap[uint256, HashMap[address, uint256]]) # epoch -> asset -> price (for rest of tx)
+priceMemoEpoch: transient(uint256) # bumped when a partner pushes new prices
+
 ETH: public(immutable(address))
 MIN_STALE_TIME: public(immutable(uint256))
 MAX_STALE_TIME: public(immutable(uint256))
 
 MAX_PRIORITY_PARTNERS: constant(uint256) = 10
+MAX_ASSETS: constant(uint256) = 50
+
+# registry ids
+AGENT_FACTORY_ID: constant(uint256) = 1
+LEGO_REGISTRY_ID: constant(uint256) = 2
 
 
 @deploy
@@ -76,7 +101,11 @@ def getPrice(_asset: address, _shouldRaise: bool = False) -> uint256:
 @view
 @internal
 def _getPrice(_asset: address, _shouldRaise: bool = False) -> uint256:
-    price: uint256 = 0
+    # already priced earlier in this tx
+    price: uint256 = self.priceMemo[self.priceMemoEpoch][_asset]
+    if price != 0:
+        return price
+
     hasFeedConfig: bool = False
     alreadyLooked: DynArray[uint256, MAX_PRIORITY_PARTNERS] = []
     staleTime: uint256 = self.staleTime
@@ -141,8 +170,52 @@ def getUsdValue(_asset: address, _amount: uint256, _shouldRaise: bool = False) -
     price: uint256 = self._getPrice(_asset, _shouldRaise)
     if price == 0:
         return 0
-    decimals: uint256 = convert(staticcall IERC20Detailed(_asset).decimals(), uint256)
-    return price * _amount // (10 ** decimals)
+    return price * _amount // (10 ** self._getDecimals(_asset))
+
+
+@external
+def getUsdValueAndMemoize(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256:
+    """
+    @notice Calculate the USD value of a given amount of an asset, memoizing the price for the rest of the tx
+    @dev Same result as `getUsdValue`. Only user wallets and registered legos write the memo, later price lookups
+         for this asset in the same tx then only read transient storage (until a partner pushes new prices).
+    @param _asset The address of the asset
+    @param _amount The amount of the asset
+    @param _shouldRaise If True, raises an error when price feed exists but returns no price
+    @return The USD value with 18 decimals
+    """
+    if _amount == 0 or _asset == empty(address):
+        return 0
+    price: uint256 = self._getPrice(_asset, _shouldRaise)
+    if price == 0:
+        return 0
+    if self._canMemoize(msg.sender):
+        self.priceMemo[self.priceMemoEpoch][_asset] = price
+    return price * _amount // (10 ** self._cacheDecimals(_asset))
+
+
+@view
+@internal
+def _canMemoize(_caller: address) -> bool:
+    addyRegistry: address = gov._addyRegistry
+    agentFactory: address = staticcall AddyRegistry(addyRegistry).getAddy(AGENT_FACTORY_ID)
+    if agentFactory != empty(address) and staticcall AgentFactory(agentFactory).isUserWallet(_caller):
+        return True
+    legoRegistry: address = staticcall AddyRegistry(addyRegistry).getAddy(LEGO_REGISTRY_ID)
+    return legoRegistry != empty(address) and staticcall LegoRegistry(legoRegistry).isValidLegoAddr(_caller)
+
+
+@external
+def clearPriceMemo() -> bool:
+    """
+    @notice Drop every memoized price for the rest of the tx
+    @dev Only registered oracle partners can clear it, right after they push new prices
+    @return True if the memo was cleared, False if caller is not an oracle partner
+    """
+    if not registry._isValidAddyAddr(msg.sender):
+        return False
+    self.priceMemoEpoch += 1
+    return True
 
 
 @view
@@ -161,8 +234,7 @@ def getAssetAmount(_asset: address, _usdValue: uint256, _shouldRaise: bool = Fal
     price: uint256 = self._getPrice(_asset, _shouldRaise)
     if price == 0:
         return 0
-    decimals: uint256 = convert(staticcall IERC20Detailed(_asset).decimals(), uint256)
-    return _usdValue * (10 ** decimals) // price
+    return _usdValue * (10 ** self._getDecimals(_asset)) // price
 
 
 @view
@@ -217,6 +289,74 @@ def getEthAmount(_usdValue: uint256, _shouldRaise: bool = False) -> uint256:
     return _usdValue * (10 ** 18) // price
 
 
+##################
+# Asset Decimals #
+##################
+
+
+@view
+@external
+def getDecimals(_asset: address) -> uint256:
+    """
+    @notice Get the decimals of an asset
+    @dev Reads the cached value if there is one, otherwise asks the token
+    @param _asset The address of the asset
+    @return The number of decimals
+    """
+    return self._getDecimals(_asset)
+
+
+@view
+@external
+def getDecimalsForAssets(_assets: DynArray[address, MAX_ASSETS]) -> DynArray[uint256, MAX_ASSETS]:
+    """
+    @notice Get the decimals of many assets in one call
+    @param _assets The addresses of the assets
+    @return Decimals for each asset, in the same order
+    """
+    decimals: DynArray[uint256, MAX_ASSETS] = []
+    for asset: address in _assets:
+        decimals.append(self._getDecimals(asset))
+    return decimals
+
+
+@view
+@internal
+def _getDecimals(_asset: address) -> uint256:
+    decimals: uint256 = self.assetDecimals[_asset]
+    if decimals == 0:
+        decimals = convert(staticcall IERC20Detailed(_asset).decimals(), uint256)
+    return decimals
+
+
+@external
+def cacheAssetDecimals(_assets: DynArray[address, MAX_ASSETS]) -> bool:
+    """
+    @notice Store decimals for assets so later usd value / amount lookups skip the token call
+    @dev Anyone can call, value comes from the token itself and is only stored once
+    @param _assets The addresses of the assets
+    @return True if it went through
+    """
+    for asset: address in _assets:
+        if asset != empty(address):
+            self._cacheDecimals(asset)
+    return True
+
+
+@internal
+def _cacheDecimals(_asset: address) -> uint256:
+    decimals: uint256 = self.assetDecimals[_asset]
+    if decimals != 0:
+        return decimals
+
+    # zero decimal tokens are not cached, same result either way
+    decimals = convert(staticcall IERC20Detailed(_asset).decimals(), uint256)
+    if decimals != 0:
+        self.assetDecimals[_asset] = decimals
+        log AssetDecimalsCached(asset=_asset, decimals=decimals)
+    return decimals
+
+
 ###########################
 # Register Oracle Partner #
 ###########################
@@ -13,6 +13,15 @@ from ethereum.ercs import IERC20
 interface UserWalletCustom:
     def swapTokens(_swapInstructions: DynArray[SwapInstruction, MAX_SWAP_INSTRUCTIONS]) -> (uint256, uint256, uint256): nonpayable
 
+interface AddyRegistry:
+    def getAddy(_addyId: uint256) -> address: view
+
+interface OracleRegistry:
+    def isValidOraclePartnerAddr(_addr: address) -> bool: view
+
+interface PythFeeds:
+    def updatePythPrices(_payloads: DynArray[Bytes[2048], MAX_PRICE_UPDATES], _refundRecipient: address) -> uint256: payable
+
 flag ActionType:
     DEPOSIT
     WITHDRAWAL
@@ -91,6 +100,9 @@ REPAY_TYPE_HASH: constant(bytes32) = keccak256('Repay(address userWallet,uint256
 BATCH_ACTIONS_TYPE_HASH: constant(bytes32) =  keccak256('BatchActions(address userWallet,ActionInstruction[] instructions,uint256 expiration)')
 ACTION_INSTRUCTION_TYPE_HASH: constant(bytes32) = keccak256('ActionInstruction(bool usePrevAmountOut,uint256 action,uint256 legoId,address asset,address vault,uint256 amount,uint256 altLegoId,address altAsset,address altVault,uint256 altAmount,uint256 minAmountOut,address pool,bytes32 proof,address nftAddr,uint256 nftTokenId,int24 tickLower,int24 tickUpper,uint256 minAmountA,uint256 minAmountB,uint256 minLpAmount,uint256 liqToRemove,address recipient,bool isWethToEthConversion,SwapInstruction[] swapInstructions)')
 
+AGENT_FACTORY_ID: constant(uint256) = 1
+ORACLE_REGISTRY_ID: constant(uint256) = 4
+MAX_PRICE_UPDATES: constant(uint256) = 15
 MAX_INSTRUCTIONS: constant(uint256) = 20
 MAX_SWAP_INSTRUCTIONS: constant(uint256) = 5
 MAX_TOKEN_PATH: constant(uint256) = 5
@@ -116,6 +128,22 @@ def __init__(
     own.__init__(_owner, _addyRegistry, _minOwnerChangeDelay, _maxOwnerChangeDelay)
 
 
+@external
+def initialize(_owner: address) -> bool:
+    """
+    @notice Initializes a minimal proxy (clone) of this agent contract
+    @dev Can only be called once by the agent factory, in place of the constructor. Registry and delays come from the implementation.
+    @param _owner The address that will own the agent
+    @return bool True if the agent was successfully initialized
+    """
+    assert own.owner == empty(address) # dev: already initialized
+    assert _owner != empty(address) # dev: invalid owner
+    assert msg.sender == staticcall AddyRegistry(own._ADDY_REGISTRY).getAddy(AGENT_FACTORY_ID) # dev: no perms
+    own.owner = _owner
+    own.ownershipChangeDelay = own.MIN_OWNER_CHANGE_DELAY
+    return True
+
+
 @pure
 @external
 def apiVersion() -> String[28]:
@@ -490,6 +518,44 @@ def performBatchActions(
     _userWallet: address,
     _instructions: DynArray[ActionInstruction, MAX_INSTRUCTIONS],
     _sig: Signature = empty(Signature),
+) -> bool:
+    return self._performBatchActions(_userWallet, _instructions, _sig)
+
+
+@payable
+@nonreentrant
+@external
+def performBatchActionsWithPriceUpdates(
+    _userWallet: address,
+    _instructions: DynArray[ActionInstruction, MAX_INSTRUCTIONS],
+    _pythFeeds: address,
+    _pythPayloads: DynArray[Bytes[2048], MAX_PRICE_UPDATES],
+    _sig: Signature = empty(Signature),
+) -> bool:
+    """
+    @notice Update Pyth prices and perform batch actions in the same transaction
+    @dev Update fees are paid from msg.value, any unused amount is refunded to the caller
+    @param _userWallet The user wallet to perform the actions on
+    @param _instructions The batch action instructions
+    @param _pythFeeds The Pyth oracle partner (must be registered in the oracle registry)
+    @param _pythPayloads The Pyth price update payloads
+    @param _sig The owner signature, if not called by the owner
+    @return True if the actions were successfully performed
+    """
+    if len(_pythPayloads) != 0:
+        oracleRegistry: address = staticcall AddyRegistry(own._ADDY_REGISTRY).getAddy(ORACLE_REGISTRY_ID)
+        assert staticcall OracleRegistry(oracleRegistry).isValidOraclePartnerAddr(_pythFeeds) # dev: invalid pyth feeds
+        extcall PythFeeds(_pythFeeds).updatePythPrices(_pythPayloads, msg.sender, value=msg.value)
+    else:
+        assert msg.value == 0 # dev: no price updates
+    return self._performBatchActions(_userWallet, _instructions, _sig)
+
+
+@internal
+def _performBatchActions(
+    _userWallet: address,
+    _instructions: DynArray[ActionInstruction, MAX_INSTRUCTIONS],
+    _sig: Signature,
 ) -> bool:
     owner: address = own.owner
     if msg.sender != owner:
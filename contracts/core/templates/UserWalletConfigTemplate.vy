@@ -18,6 +18,7 @@ interface UserWallet:
     def trialFundsAsset() -> address: view
     def walletConfig() -> address: view
     def canBeAmbassador() -> bool: view
+    def paySubscription(_sub: SubPaymentInfo, _isAgent: bool) -> bool: nonpayable
 
 interface WalletConfig:
     def vaultTokenAmounts(_vaultToken: address) -> uint256: view
@@ -29,12 +30,13 @@ interface WalletConfig:
 
 interface LegoRegistry:
     def getLegoFromVaultToken(_vaultToken: address) -> (uint256, address): view
-    def getUnderlyingForUser(_user: address, _asset: address) -> uint256: view
     def isVaultToken(_vaultToken: address) -> bool: view
+    def getLegoAddr(_legoId: uint256) -> address: view
     def isValidLegoId(_legoId: uint256) -> bool: view
 
 interface PriceSheets:
     def getCombinedSubData(_user: address, _agent: address, _agentPaidThru: uint256, _protocolPaidThru: uint256, _oracleRegistry: address) -> (SubPaymentInfo, SubPaymentInfo): view
+    def getPrepaidSubData(_agent: address, _paidThroughBlock: uint256, _numPeriods: uint256, _oracleRegistry: address) -> SubPaymentInfo: view
     def getAgentSubPriceData(_agent: address) -> SubscriptionInfo: view
     def protocolSubPriceData() -> SubscriptionInfo: view
 
@@ -194,6 +196,14 @@ event FundsRecovered:
     recipient: indexed(address)
     balance: uint256
 
+event SubscriptionPrepaid:
+    agent: indexed(address)
+    asset: indexed(address)
+    amount: uint256
+    usdValue: uint256
+    numPeriods: uint256
+    paidThroughBlock: uint256
+
 event UserWalletStartMigration:
     newWallet: indexed(address)
     numAssetsToMigrate: uint256
@@ -214,6 +224,11 @@ protocolSub: public(ProtocolSub) # subscription info
 reserveAssets: public(HashMap[address, uint256]) # asset -> reserve amount
 agentSettings: public(HashMap[address, AgentInfo]) # agent -> agent info
 
+# agent permissions (mirrors agentSettings for O(1) lookups)
+agentActionFlags: public(HashMap[address, ActionType]) # agent -> allowed actions (empty = all)
+isAgentAssetAllowed: public(HashMap[address, HashMap[address, bool]]) # agent -> asset -> is allowed
+isAgentLegoIdAllowed: public(HashMap[address, HashMap[uint256, bool]]) # agent -> lego id -> is allowed
+
 # transfer whitelist
 isRecipientAllowed: public(HashMap[address, bool]) # recipient -> is allowed
 pendingWhitelist: public(HashMap[address, PendingWhitelist]) # addr -> pending whitelist
@@ -233,6 +248,10 @@ isVaultToken: public(HashMap[address, bool]) # asset -> is vault token
 vaultTokenAmounts: public(HashMap[address, uint256]) # vault token -> vault token amount
 depositedAmounts: public(HashMap[address, uint256]) # vault token -> underlying asset amount
 
+# trial funds (vault tokens the trial funds asset was deposited into)
+trialFundsVaultTokens: public(DynArray[address, MAX_TRIAL_FUNDS_VAULT_TOKENS])
+trialFundsLegoId: public(HashMap[address, uint256]) # vault token -> lego id
+
 # registry ids
 AGENT_FACTORY_ID: constant(uint256) = 1
 LEGO_REGISTRY_ID: constant(uint256) = 2
@@ -243,6 +262,7 @@ MAX_MIGRATION_ASSETS: constant(uint256) = 40
 MAX_MIGRATION_WHITELIST: constant(uint256) = 20
 MAX_ASSETS: constant(uint256) = 25
 MAX_LEGOS: constant(uint256) = 20
+MAX_TRIAL_FUNDS_VAULT_TOKENS: constant(uint256) = 20
 API_VERSION: constant(String[28]) = "0.0.3"
 
 ADDY_REGISTRY: public(immutable(address))
@@ -274,6 +294,32 @@ def __init__(
     own.__init__(_owner, _addyRegistry, _minOwnerChangeDelay, _maxOwnerChangeDelay)
 
     ADDY_REGISTRY = _addyRegistry
+    self._initializeConfig(_initialAgent, _ambassador, _addyRegistry)
+
+
+@external
+def initialize(_owner: address, _initialAgent: address, _ambassador: address) -> bool:
+    """
+    @notice Initializes a minimal proxy (clone) of this config contract
+    @dev Can only be called once by the agent factory, in place of the constructor. Registry and delays come from the implementation.
+    @param _owner Address of the contract owner who will have administrative privileges
+    @param _initialAgent Address of the initial agent to be set up (can be empty)
+    @param _ambassador Address of the ambassador who invited the user (can be empty)
+    @return bool True if the config was successfully initialized
+    """
+    assert own.owner == empty(address) # dev: already initialized
+    assert _owner != empty(address) # dev: invalid owner
+    assert _initialAgent != _owner # dev: agent cannot be owner
+    assert msg.sender == staticcall AddyRegistry(ADDY_REGISTRY).getAddy(AGENT_FACTORY_ID) # dev: no perms
+
+    own.owner = _owner
+    own.ownershipChangeDelay = own.MIN_OWNER_CHANGE_DELAY
+    self._initializeConfig(_initialAgent, _ambassador, ADDY_REGISTRY)
+    return True
+
+
+@internal
+def _initializeConfig(_initialAgent: address, _ambassador: address, _addyRegistry: address):
     priceSheets: address = staticcall AddyRegistry(_addyRegistry).getAddy(PRICE_SHEETS_ID)
 
     # initial agent setup
@@ -354,81 +400,51 @@ def canAgentAccess(
     _assets: DynArray[address, MAX_ASSETS],
     _legoIds: DynArray[uint256, MAX_LEGOS],
 ) -> bool:
-    return self._canAgentAccess(self.agentSettings[_agent], _action, _assets, _legoIds)
+    return self._canAgentAccess(_agent, _action, _assets, _legoIds)
 
 
 @view
 @internal
 def _canAgentAccess(
-    _agentInfo: AgentInfo,
+    _agent: address,
     _action: ActionType,
     _assets: DynArray[address, MAX_ASSETS],
     _legoIds: DynArray[uint256, MAX_LEGOS],
 ) -> bool:
     """
     @notice Checks if an agent has permission to perform a specific action with given assets and lego IDs
-    @dev Validates agent's active status, allowed actions, allowed assets, and allowed lego IDs
-    @param _agentInfo The agent's information including permissions and allowed actions
+    @dev Only reads the storage slots for the action, assets and lego IDs being checked
+    @param _agent The address of the agent
     @param _action The type of action being attempted
     @param _assets Array of asset addresses involved in the action
     @param _legoIds Array of lego IDs involved in the action
     @return True if the agent has permission to perform the action, False otherwise
     """
-    if not _agentInfo.isActive:
+    if not self.agentSettings[_agent].isActive:
         return False
 
     # check allowed actions
-    if not self._canAgentPerformAction(_action, _agentInfo.allowedActions):
+    allowedActions: ActionType = self.agentActionFlags[_agent]
+    if allowedActions != empty(ActionType) and _action != empty(ActionType) and _action not in allowedActions:
         return False
 
     # check allowed assets
-    if len(_agentInfo.allowedAssets) != 0:
+    if len(self.agentSettings[_agent].allowedAssets) != 0:
         for i: uint256 in range(len(_assets), bound=MAX_ASSETS):
             asset: address = _assets[i]
-            if asset != empty(address) and asset not in _agentInfo.allowedAssets:
+            if asset != empty(address) and not self.isAgentAssetAllowed[_agent][asset]:
                 return False
 
     # check allowed lego ids
-    if len(_agentInfo.allowedLegoIds) != 0:
+    if len(self.agentSettings[_agent].allowedLegoIds) != 0:
         for i: uint256 in range(len(_legoIds), bound=MAX_LEGOS):
             legoId: uint256 = _legoIds[i]
-            if legoId != 0 and legoId not in _agentInfo.allowedLegoIds:
+            if legoId != 0 and not self.isAgentLegoIdAllowed[_agent][legoId]:
                 return False
 
     return True
 
 
-@view
-@internal
-def _canAgentPerformAction(_action: ActionType, _allowedActions: AllowedActions) -> bool:
-    if not _allowedActions.isSet or _action == empty(ActionType):
-        return True
-    if _action == ActionType.DEPOSIT:
-        return _allowedActions.canDeposit
-    elif _action == ActionType.WITHDRAWAL:
-        return _allowedActions.canWithdraw
-    elif _action == ActionType.REBALANCE:
-        return _allowedActions.canRebalance
-    elif _action == ActionType.TRANSFER:
-        return _allowedActions.canTransfer
-    elif _action == ActionType.SWAP:
-        return _allowedActions.canSwap
-    elif _action == ActionType.CONVERSION:
-        return _allowedActions.canConvert
-    elif _action == ActionType.ADD_LIQ:
-        return _allowedActions.canAddLiq
-    elif _action == ActionType.REMOVE_LIQ:
-        return _allowedActions.canRemoveLiq
-    elif _action == ActionType.CLAIM_REWARDS:
-        return _allowedActions.canClaimRewards
-    elif _action == ActionType.BORROW:
-        return _allowedActions.canBorrow
-    elif _action == ActionType.REPAY:
-        return _allowedActions.canRepay
-    else:
-        return True # no action specified
-
-
 ##########################
 # Subscription + Tx Fees #
 ##########################
@@ -488,17 +504,17 @@ def handleSubscriptionsAndPermissions(
     assert msg.sender == self.wallet # dev: no perms
 
     # check if agent can perform action with assets and legos
-    userAgentData: AgentInfo = empty(AgentInfo)
+    agentPaidThroughBlock: uint256 = 0
     if _agent != empty(address):
-        userAgentData = self.agentSettings[_agent]
-        assert self._canAgentAccess(userAgentData, _action, _assets, _legoIds) # dev: agent not allowed
+        assert self._canAgentAccess(_agent, _action, _assets, _legoIds) # dev: agent not allowed
+        agentPaidThroughBlock = self.agentSettings[_agent].paidThroughBlock
 
     userProtocolData: ProtocolSub = self.protocolSub
 
     # get latest sub data for agent and protocol
     protocolSub: SubPaymentInfo = empty(SubPaymentInfo)
     agentSub: SubPaymentInfo = empty(SubPaymentInfo)
-    protocolSub, agentSub = staticcall PriceSheets(_cd.priceSheets).getCombinedSubData(_cd.wallet, _agent, userAgentData.paidThroughBlock, userProtocolData.paidThroughBlock, _cd.oracleRegistry)
+    protocolSub, agentSub = staticcall PriceSheets(_cd.priceSheets).getCombinedSubData(_cd.wallet, _agent, agentPaidThroughBlock, userProtocolData.paidThroughBlock, _cd.oracleRegistry)
 
     # check if sufficient funds
     canPayProtocol: bool = False
@@ -512,13 +528,52 @@ def handleSubscriptionsAndPermissions(
         userProtocolData.paidThroughBlock = protocolSub.paidThroughBlock
         self.protocolSub = userProtocolData
     if agentSub.didChange:
-        userAgentData.paidThroughBlock = agentSub.paidThroughBlock
-        self.agentSettings[_agent] = userAgentData
+        self.agentSettings[_agent].paidThroughBlock = agentSub.paidThroughBlock
 
     # actual payments will happen from wallet
     return protocolSub, agentSub
 
 
+@nonreentrant
+@external
+def prepaySubscription(_agent: address, _numPeriods: uint256) -> bool:
+    """
+    @notice Prepays multiple subscription periods at the current price
+    @dev Can only be called by the owner. Subscription checks skip price sheets until the credit runs out
+    @param _agent The address of the agent (empty address for protocol subscription)
+    @param _numPeriods The number of pay periods to prepay
+    @return bool True if the subscription was successfully prepaid
+    """
+    cd: CoreData = self._getCoreData()
+    assert msg.sender == cd.owner # dev: no perms
+
+    paidThroughBlock: uint256 = self.protocolSub.paidThroughBlock
+    if _agent != empty(address):
+        assert self.agentSettings[_agent].isActive # dev: agent not active
+        paidThroughBlock = self.agentSettings[_agent].paidThroughBlock
+
+    sub: SubPaymentInfo = staticcall PriceSheets(cd.priceSheets).getPrepaidSubData(_agent, paidThroughBlock, _numPeriods, cd.oracleRegistry)
+    assert sub.amount != 0 # dev: nothing to prepay
+
+    # check if sufficient funds
+    canPay: bool = False
+    na: bool = False
+    canPay, na = self._checkIfSufficientFunds(sub.asset, sub.amount, empty(address), 0, cd)
+    assert canPay # dev: insufficient balance for subscription payment
+
+    # save data
+    if _agent != empty(address):
+        self.agentSettings[_agent].paidThroughBlock = sub.paidThroughBlock
+    else:
+        self.protocolSub.paidThroughBlock = sub.paidThroughBlock
+
+    # payment happens from wallet
+    assert extcall UserWallet(cd.wallet).paySubscription(sub, _agent != empty(address)) # dev: subscription payment failed
+
+    log SubscriptionPrepaid(agent=_agent, asset=sub.asset, amount=sub.amount, usdValue=sub.usdValue, numPeriods=_numPeriods, paidThroughBlock=sub.paidThroughBlock)
+    return True
+
+
 ####################
 # Random Utilities #
 ####################
@@ -554,7 +609,7 @@ def _checkIfSufficientFunds(_protocolAsset: address, _protocolAmount: uint256, _
     trialFundsDeployed: uint256 = 0
     if (_protocolAsset != empty(address) and _protocolAsset == _cd.trialFundsAsset) or (_agentAsset != empty(address) and _agentAsset == _cd.trialFundsAsset):
         trialFundsCurrentBal = staticcall IERC20(_cd.trialFundsAsset).balanceOf(_cd.wallet)
-        trialFundsDeployed = staticcall LegoRegistry(_cd.legoRegistry).getUnderlyingForUser(_cd.wallet, _cd.trialFundsAsset)
+        trialFundsDeployed = self._getTrialFundsDeployed(_cd.wallet, _cd.legoRegistry)
 
     # check if can make protocol payment
     if _protocolAmount != 0:
@@ -597,7 +652,7 @@ def getAvailableTxAmount(
 
     # check if asset is trial funds asset
     if _shouldCheckTrialFunds and _asset == cd.trialFundsAsset:
-        trialFundsDeployed: uint256 = staticcall LegoRegistry(cd.legoRegistry).getUnderlyingForUser(cd.wallet, _asset)
+        trialFundsDeployed: uint256 = self._getTrialFundsDeployed(cd.wallet, cd.legoRegistry)
         availableAmount = self._getAvailBalAfterTrialFunds(_asset, cd.wallet, cd.trialFundsAsset, cd.trialFundsInitialAmount, availableAmount, trialFundsDeployed)
 
     # check if any reserve is set
@@ -653,6 +708,7 @@ def updateYieldTrackingOnDeposit(
     _vaultTokenAmountReceived: uint256,
     _assetAmountDeposited: uint256,
     _legoRegistry: address,
+    _trialFundsLegoId: uint256 = 0,
 ):
     assert msg.sender == self.wallet # dev: no perms
 
@@ -660,6 +716,14 @@ def updateYieldTrackingOnDeposit(
         self._updateYieldTrackingOnExit(_asset, _legoRegistry)
     self._updateYieldTrackingOnDeposit(_vaultToken, _vaultTokenAmountReceived, _assetAmountDeposited, _legoRegistry)
 
+    # trial funds asset deposited, keep track of where it went
+    if _trialFundsLegoId != 0 and self.isVaultToken[_vaultToken] and self.trialFundsLegoId[_vaultToken] == 0:
+        if len(self.trialFundsVaultTokens) == MAX_TRIAL_FUNDS_VAULT_TOKENS:
+            self._pruneTrialFundsVaultTokens()
+        assert len(self.trialFundsVaultTokens) < MAX_TRIAL_FUNDS_VAULT_TOKENS # dev: too many trial funds vaults
+        self.trialFundsVaultTokens.append(_vaultToken)
+        self.trialFundsLegoId[_vaultToken] = _trialFundsLegoId
+
 
 @internal
 def _updateYieldTrackingOnDeposit(
@@ -731,6 +795,7 @@ def _updateYieldTrackingOnWithdrawal(
     if vaultTokenToReduce >= trackedVaultTokenBalance:
         self.vaultTokenAmounts[_vaultToken] = 0
         shouldZeroOut = True
+        self._removeTrialFundsVaultToken(_vaultToken)
     else:
         self.vaultTokenAmounts[_vaultToken] -= vaultTokenToReduce
 
@@ -823,6 +888,7 @@ def _updateYieldTrackingOnExit(_vaultToken: address, _legoRegistry: address):
     if vaultTokenToReduce >= trackedVaultTokenBalance:
         self.vaultTokenAmounts[_vaultToken] = 0
         self.depositedAmounts[_vaultToken] = 0
+        self._removeTrialFundsVaultToken(_vaultToken)
 
     else:
         self.vaultTokenAmounts[_vaultToken] -= vaultTokenToReduce
@@ -834,6 +900,73 @@ def _updateYieldTrackingOnExit(_vaultToken: address, _legoRegistry: address):
             self.depositedAmounts[_vaultToken] -= assetAmountToReduce
 
 
+# trial funds
+
+
+@view
+@external
+def isTrialFundsVaultToken(_vaultToken: address) -> bool:
+    return self.trialFundsLegoId[_vaultToken] != 0
+
+
+@view
+@external
+def getTrialFundsDeployed(_legoRegistry: address) -> uint256:
+    """
+    @notice Returns the underlying value of the vault tokens trial funds were deposited into
+    @dev Only looks at tracked vault tokens, cost does not depend on number of legos / vaults in registry
+    @param _legoRegistry The address of the lego registry
+    @return uint256 The underlying amount
+    """
+    return self._getTrialFundsDeployed(self.wallet, _legoRegistry)
+
+
+@view
+@internal
+def _getTrialFundsDeployed(_wallet: address, _legoRegistry: address) -> uint256:
+    totalDeployed: uint256 = 0
+    for vaultToken: address in self.trialFundsVaultTokens:
+        vaultTokenBal: uint256 = staticcall IERC20(vaultToken).balanceOf(_wallet)
+        if vaultTokenBal == 0:
+            continue
+        legoAddr: address = staticcall LegoRegistry(_legoRegistry).getLegoAddr(self.trialFundsLegoId[vaultToken])
+        if legoAddr != empty(address):
+            totalDeployed += staticcall LegoYield(legoAddr).getUnderlyingAmount(vaultToken, vaultTokenBal)
+    return totalDeployed
+
+
+# vault tokens leave the list once the wallet fully exited them, so the slots get reused
+
+
+@internal
+def _removeTrialFundsVaultToken(_vaultToken: address):
+    if self.trialFundsLegoId[_vaultToken] == 0:
+        return
+    self.trialFundsLegoId[_vaultToken] = 0
+
+    numVaultTokens: uint256 = len(self.trialFundsVaultTokens)
+    for i: uint256 in range(numVaultTokens, bound=MAX_TRIAL_FUNDS_VAULT_TOKENS):
+        if self.trialFundsVaultTokens[i] != _vaultToken:
+            continue
+        lastIndex: uint256 = numVaultTokens - 1
+        if i != lastIndex:
+            self.trialFundsVaultTokens[i] = self.trialFundsVaultTokens[lastIndex]
+        self.trialFundsVaultTokens.pop()
+        return
+
+
+@internal
+def _pruneTrialFundsVaultTokens():
+    # fallback for vault tokens that left without an exit hook (e.g. redeemed by someone else)
+    vaultTokens: DynArray[address, MAX_TRIAL_FUNDS_VAULT_TOKENS] = []
+    for vaultToken: address in self.trialFundsVaultTokens:
+        if staticcall IERC20(vaultToken).balanceOf(self.wallet) != 0:
+            vaultTokens.append(vaultToken)
+        else:
+            self.trialFundsLegoId[vaultToken] = 0
+    self.trialFundsVaultTokens = vaultTokens
+
+
 ####################
 # Wallet Migration #
 ####################
@@ -951,9 +1084,20 @@ def addOrModifyAgent(
     # allowed actions
     agentInfo.allowedActions = _allowedActions
     agentInfo.allowedActions.isSet = self._hasAllowedActionsSet(_allowedActions)
+    self.agentActionFlags[_agent] = self._getActionFlags(agentInfo.allowedActions)
+
+    # clear previous asset / lego id lookups
+    for asset: address in agentInfo.allowedAssets:
+        self.isAgentAssetAllowed[_agent][asset] = False
+    for legoId: uint256 in agentInfo.allowedLegoIds:
+        self.isAgentLegoIdAllowed[_agent][legoId] = False
 
     # sanitize other input data
     agentInfo.allowedAssets, agentInfo.allowedLegoIds = self._sanitizeAgentInputData(_allowedAssets, _allowedLegoIds)
+    for asset: address in agentInfo.allowedAssets:
+        self.isAgentAssetAllowed[_agent][asset] = True
+    for legoId: uint256 in agentInfo.allowedLegoIds:
+        self.isAgentLegoIdAllowed[_agent][legoId] = True
 
     # get subscription info
     priceSheets: address = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(PRICE_SHEETS_ID)
@@ -1051,16 +1195,15 @@ def addLegoIdForAgent(_agent: address, _legoId: uint256) -> bool:
     """
     assert msg.sender == own.owner # dev: no perms
 
-    agentInfo: AgentInfo = self.agentSettings[_agent]
-    assert agentInfo.isActive # dev: agent not active
+    assert self.agentSettings[_agent].isActive # dev: agent not active
 
     legoRegistry: address = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(LEGO_REGISTRY_ID)
     assert staticcall LegoRegistry(legoRegistry).isValidLegoId(_legoId)
-    assert _legoId not in agentInfo.allowedLegoIds # dev: lego id already saved
+    assert not self.isAgentLegoIdAllowed[_agent][_legoId] # dev: lego id already saved
 
     # save data
-    agentInfo.allowedLegoIds.append(_legoId)
-    self.agentSettings[_agent] = agentInfo
+    self.agentSettings[_agent].allowedLegoIds.append(_legoId)
+    self.isAgentLegoIdAllowed[_agent][_legoId] = True
 
     # log event
     log LegoIdAddedToAgent(agent=_agent, legoId=_legoId)
@@ -1082,15 +1225,14 @@ def addAssetForAgent(_agent: address, _asset: address) -> bool:
     """
     assert msg.sender == own.owner # dev: no perms
 
-    agentInfo: AgentInfo = self.agentSettings[_agent]
-    assert agentInfo.isActive # dev: agent not active
+    assert self.agentSettings[_agent].isActive # dev: agent not active
 
     assert _asset != empty(address) # dev: invalid asset
-    assert _asset not in agentInfo.allowedAssets # dev: asset already saved
+    assert not self.isAgentAssetAllowed[_agent][_asset] # dev: asset already saved
 
     # save data
-    agentInfo.allowedAssets.append(_asset)
-    self.agentSettings[_agent] = agentInfo
+    self.agentSettings[_agent].allowedAssets.append(_asset)
+    self.isAgentAssetAllowed[_agent][_asset] = True
 
     # log event
     log AssetAddedToAgent(agent=_agent, asset=_asset)
@@ -1118,6 +1260,7 @@ def modifyAllowedActions(_agent: address, _allowedActions: AllowedActions = empt
     agentInfo.allowedActions = _allowedActions
     agentInfo.allowedActions.isSet = self._hasAllowedActionsSet(_allowedActions)
     self.agentSettings[_agent] = agentInfo
+    self.agentActionFlags[_agent] = self._getActionFlags(agentInfo.allowedActions)
 
     log AllowedActionsModified(agent=_agent, canDeposit=_allowedActions.canDeposit, canWithdraw=_allowedActions.canWithdraw, canRebalance=_allowedActions.canRebalance, canTransfer=_allowedActions.canTransfer, canSwap=_allowedActions.canSwap, canConvert=_allowedActions.canConvert, canAddLiq=_allowedActions.canAddLiq, canRemoveLiq=_allowedActions.canRemoveLiq, canClaimRewards=_allowedActions.canClaimRewards, canBorrow=_allowedActions.canBorrow, canRepay=_allowedActions.canRepay)
     return True
@@ -1129,6 +1272,37 @@ def _hasAllowedActionsSet(_actions: AllowedActions) -> bool:
     return _actions.canDeposit or _actions.canWithdraw or _actions.canRebalance or _actions.canTransfer or _actions.canSwap or _actions.canConvert
 
 
+@view
+@internal
+def _getActionFlags(_actions: AllowedActions) -> ActionType:
+    flags: ActionType = empty(ActionType)
+    if not _actions.isSet:
+        return flags # no restrictions
+    if _actions.canDeposit:
+        flags |= ActionType.DEPOSIT
+    if _actions.canWithdraw:
+        flags |= ActionType.WITHDRAWAL
+    if _actions.canRebalance:
+        flags |= ActionType.REBALANCE
+    if _actions.canTransfer:
+        flags |= ActionType.TRANSFER
+    if _actions.canSwap:
+        flags |= ActionType.SWAP
+    if _actions.canConvert:
+        flags |= ActionType.CONVERSION
+    if _actions.canAddLiq:
+        flags |= ActionType.ADD_LIQ
+    if _actions.canRemoveLiq:
+        flags |= ActionType.REMOVE_LIQ
+    if _actions.canClaimRewards:
+        flags |= ActionType.CLAIM_REWARDS
+    if _actions.canBorrow:
+        flags |= ActionType.BORROW
+    if _actions.canRepay:
+        flags |= ActionType.REPAY
+    return flags
+
+
 ######################
 # Transfer Whitelist #
 ######################
@@ -9,22 +9,26 @@ from interfaces import LegoDex
 from interfaces import LegoYield
 from interfaces import LegoCommon
 from interfaces import LegoCredit
+from interfaces import LegoDirect
 from interfaces import UserWalletInterface
 
 from ethereum.ercs import IERC20
 from ethereum.ercs import IERC721
+from ethereum.ercs import IERC4626
 
 interface WalletConfig:
     def finishMigrationIn(_whitelistToMigrate: DynArray[address, MAX_MIGRATION_WHITELIST], _assetsMigrated: DynArray[address, MAX_MIGRATION_ASSETS], _vaultTokensMigrated: DynArray[address, MAX_MIGRATION_ASSETS]) -> bool: nonpayable
     def handleSubscriptionsAndPermissions(_agent: address, _action: ActionType, _assets: DynArray[address, MAX_ASSETS], _legoIds: DynArray[uint256, MAX_LEGOS], _cd: CoreData) -> (SubPaymentInfo, SubPaymentInfo): nonpayable
     def updateYieldTrackingOnWithdrawal(_vaultToken: address, _vaultTokenAmountBurned: uint256, _asset: address, _assetAmountReceived: uint256, _legoRegistry: address) -> uint256: nonpayable
-    def updateYieldTrackingOnDeposit(_asset: address, _vaultToken: address, _vaultTokenAmountReceived: uint256, _assetAmountDeposited: uint256, _legoRegistry: address): nonpayable
+    def updateYieldTrackingOnDeposit(_asset: address, _vaultToken: address, _vaultTokenAmountReceived: uint256, _assetAmountDeposited: uint256, _legoRegistry: address, _trialFundsLegoId: uint256): nonpayable
     def getAvailableTxAmount(_asset: address, _wantedAmount: uint256, _shouldCheckTrialFunds: bool, _cd: CoreData = empty(CoreData)) -> uint256: view
     def updateYieldTrackingOnSwap(_tokenIn: address, _tokenOut: address, _tokenOutAmount: uint256, _legoRegistry: address): nonpayable
     def updateYieldTrackingOnEntry(_asset: address, _amount: uint256, _legoRegistry: address): nonpayable
     def updateYieldTrackingOnExit(_asset: address, _legoRegistry: address): nonpayable
     def canTransferToRecipient(_recipient: address) -> bool: view
     def isVaultToken(_asset: address) -> bool: view
+    def isTrialFundsVaultToken(_vaultToken: address) -> bool: view
+    def getTrialFundsDeployed(_legoRegistry: address) -> uint256: view
     def canWalletBeAmbassador() -> bool: view
     def getProceedsAddr() -> address: view
     def myAmbassador() -> address: view
@@ -32,13 +36,13 @@ interface WalletConfig:
 
 interface LegoRegistry:
     def getVaultTokensForUser(_user: address, _asset: address) -> DynArray[VaultTokenInfo, MAX_VAULTS_FOR_USER]: view
-    def getUnderlyingForUser(_user: address, _asset: address) -> uint256: view
-    def getUnderlyingAsset(_vaultToken: address) -> address: view
     def getLegoAddr(_legoId: uint256) -> address: view
     def isBorrowLego(_legoId: uint256) -> bool: view
+    def getLegoAddrAndIsDirect(_legoId: uint256) -> (address, bool): view
 
 interface AgentFactory:
     def payAmbassadorYieldBonus(_ambassador: address, _asset: address, _amount: uint256) -> bool: nonpayable
+    def accrueTransactionFees(_asset: address, _protocolRecipient: address, _protocolAmount: uint256, _ambassadorRecipient: address, _ambassadorAmount: uint256) -> bool: nonpayable
     def agentBlacklist(_agentAddr: address) -> bool: view
     def isUserWallet(_wallet: address) -> bool: view
 
@@ -51,7 +55,7 @@ interface WethContract:
     def deposit(): payable
 
 interface PriceSheets:
-    def getTransactionFeeDataWithAmbassadorRatio(_user: address, _action: ActionType) -> (uint256, address, uint256): view
+    def getTransactionFeeSettlementData(_user: address, _action: ActionType) -> (uint256, address, uint256, bool): view
 
 interface AddyRegistry:
     def getAddy(_addyId: uint256) -> address: view
@@ -299,12 +303,40 @@ def __init__(
     @param _trialFundsInitialAmount Initial amount of trial funds to be held (can be 0)
     """
     assert empty(address) not in [_walletConfig, _addyRegistry, _wethAddr] # dev: invalid addrs
+    ADDY_REGISTRY = _addyRegistry
+    self._initializeWallet(_walletConfig, _wethAddr, _trialFundsAsset, _trialFundsInitialAmount)
+
+
+@external
+def initialize(
+    _walletConfig: address,
+    _wethAddr: address,
+    _trialFundsAsset: address,
+    _trialFundsInitialAmount: uint256,
+) -> bool:
+    """
+    @notice Initializes a minimal proxy (clone) of this wallet contract
+    @dev Can only be called once by the agent factory, in place of the constructor. Registry comes from the implementation.
+    @param _walletConfig Address of the wallet configuration contract that manages permissions and settings
+    @param _wethAddr Address of the WETH contract for ETH wrapping/unwrapping functionality
+    @param _trialFundsAsset Address of the asset used for trial funds (can be empty)
+    @param _trialFundsInitialAmount Initial amount of trial funds to be held (can be 0)
+    @return bool True if the wallet was successfully initialized
+    """
+    assert self.walletConfig == empty(address) # dev: already initialized
+    assert empty(address) not in [_walletConfig, _wethAddr] # dev: invalid addrs
+    assert msg.sender == staticcall AddyRegistry(ADDY_REGISTRY).getAddy(AGENT_FACTORY_ID) # dev: no perms
+    self._initializeWallet(_walletConfig, _wethAddr, _trialFundsAsset, _trialFundsInitialAmount)
+    return True
+
+
+@internal
+def _initializeWallet(_walletConfig: address, _wethAddr: address, _trialFundsAsset: address, _trialFundsInitialAmount: uint256):
     self.walletConfig = _walletConfig
     self.wethAddr = _wethAddr
-    ADDY_REGISTRY = _addyRegistry
 
     # trial funds info
-    if _trialFundsAsset != empty(address) and _trialFundsInitialAmount != 0:   
+    if _trialFundsAsset != empty(address) and _trialFundsInitialAmount != 0:
         self.trialFundsAsset = _trialFundsAsset
         self.trialFundsInitialAmount = _trialFundsInitialAmount
 
@@ -383,25 +415,42 @@ def _depositTokens(
     _isSignerAgent: bool,
     _cd: CoreData,
 ) -> (uint256, address, uint256, uint256):
-    legoAddr: address = staticcall LegoRegistry(_cd.legoRegistry).getLegoAddr(_legoId)
+    legoAddr: address = empty(address)
+    isDirect: bool = False
+    legoAddr, isDirect = staticcall LegoRegistry(_cd.legoRegistry).getLegoAddrAndIsDirect(_legoId)
     assert legoAddr != empty(address) # dev: invalid lego
 
     # finalize amount
     shouldCheckTrialFunds: bool = staticcall LegoRegistry(_cd.legoRegistry).isBorrowLego(_legoId)
     amount: uint256 = staticcall WalletConfig(_cd.walletConfig).getAvailableTxAmount(_asset, _amount, shouldCheckTrialFunds, _cd)
-    assert extcall IERC20(_asset).approve(legoAddr, amount, default_return_value=True) # dev: approval failed
 
-    # deposit into lego partner
     assetAmountDeposited: uint256 = 0
     vaultToken: address = empty(address)
     vaultTokenAmountReceived: uint256 = 0
     refundAssetAmount: uint256 = 0
     usdValue: uint256 = 0
-    assetAmountDeposited, vaultToken, vaultTokenAmountReceived, refundAssetAmount, usdValue = extcall LegoYield(legoAddr).depositTokens(_asset, amount, _vault, self)
-    assert extcall IERC20(_asset).approve(legoAddr, 0, default_return_value=True) # dev: approval failed
+    if isDirect:
+
+        # deposit straight into erc4626 vault (pulls exact amount, approval used up), lego validates + accounts
+        assert staticcall LegoDirect(legoAddr).isDirectVault(_asset, _vault) # dev: invalid vault
+        assert extcall IERC20(_asset).approve(_vault, amount, default_return_value=True) # dev: approval failed
+        vaultTokenAmountReceived = extcall IERC4626(_vault).deposit(amount, self)
+        assetAmountDeposited = amount
+        vaultToken = _vault
+        usdValue = extcall LegoDirect(legoAddr).onDirectDeposit(_asset, _vault, amount, vaultTokenAmountReceived)
+
+    else:
+
+        # deposit into lego partner
+        assert extcall IERC20(_asset).approve(legoAddr, amount, default_return_value=True) # dev: approval failed
+        assetAmountDeposited, vaultToken, vaultTokenAmountReceived, refundAssetAmount, usdValue = extcall LegoYield(legoAddr).depositTokens(_asset, amount, _vault, self)
+        assert extcall IERC20(_asset).approve(legoAddr, 0, default_return_value=True) # dev: approval failed
 
-    # update yield tracking
-    extcall WalletConfig(_cd.walletConfig).updateYieldTrackingOnDeposit(_asset, vaultToken, vaultTokenAmountReceived, assetAmountDeposited, _cd.legoRegistry)
+    # update yield tracking (trial funds asset deposits are tracked for the trial funds checks)
+    trialFundsLegoId: uint256 = 0
+    if _asset == _cd.trialFundsAsset:
+        trialFundsLegoId = _legoId
+    extcall WalletConfig(_cd.walletConfig).updateYieldTrackingOnDeposit(_asset, vaultToken, vaultTokenAmountReceived, assetAmountDeposited, _cd.legoRegistry, trialFundsLegoId)
 
     log UserWalletDeposit(signer=_signer, asset=_asset, vaultToken=vaultToken, assetAmountDeposited=assetAmountDeposited, vaultTokenAmountReceived=vaultTokenAmountReceived, refundAssetAmount=refundAssetAmount, usdValue=usdValue, legoId=_legoId, legoAddr=legoAddr, isSignerAgent=_isSignerAgent)
     return assetAmountDeposited, vaultToken, vaultTokenAmountReceived, usdValue
@@ -449,29 +498,43 @@ def _withdrawTokens(
     _shouldHandleFees: bool,
     _cd: CoreData,
 ) -> (uint256, uint256, uint256):
-    legoAddr: address = staticcall LegoRegistry(_cd.legoRegistry).getLegoAddr(_legoId)
+    legoAddr: address = empty(address)
+    isDirectLego: bool = False
+    legoAddr, isDirectLego = staticcall LegoRegistry(_cd.legoRegistry).getLegoAddrAndIsDirect(_legoId)
     assert legoAddr != empty(address) # dev: invalid lego
 
     # finalize amount, this will look at vault token balance (not always 1:1 with underlying asset)
     withdrawAmount: uint256 = _withdrawAmount
+    isDirect: bool = False
     if _hasVaultToken and _vaultAddr != empty(address):
         withdrawAmount = staticcall WalletConfig(_cd.walletConfig).getAvailableTxAmount(_vaultAddr, _withdrawAmount, False, _cd)
+        isDirect = isDirectLego
 
         # some vault tokens require max value approval (comp v3)
-        assert extcall IERC20(_vaultAddr).approve(legoAddr, max_value(uint256), default_return_value=True) # dev: approval failed
+        if not isDirect:
+            assert extcall IERC20(_vaultAddr).approve(legoAddr, max_value(uint256), default_return_value=True) # dev: approval failed
 
     assert withdrawAmount != 0 # dev: nothing to withdraw
 
-    # withdraw from lego partner
     assetAmountReceived: uint256 = 0
     vaultTokenAmountBurned: uint256 = 0
     refundVaultTokenAmount: uint256 = 0
     usdValue: uint256 = 0
-    assetAmountReceived, vaultTokenAmountBurned, refundVaultTokenAmount, usdValue = extcall LegoYield(legoAddr).withdrawTokens(_asset, withdrawAmount, _vaultAddr, self)
+    if isDirect:
 
-    # zero out approvals
-    if _hasVaultToken and _vaultAddr != empty(address):
-        assert extcall IERC20(_vaultAddr).approve(legoAddr, 0, default_return_value=True) # dev: approval failed
+        # redeem straight from erc4626 vault (wallet is owner, no approval), lego validates + accounts
+        assetAmountReceived = extcall IERC4626(_vaultAddr).redeem(withdrawAmount, self, self)
+        vaultTokenAmountBurned = withdrawAmount
+        usdValue = extcall LegoDirect(legoAddr).onDirectWithdrawal(_asset, _vaultAddr, assetAmountReceived, withdrawAmount)
+
+    else:
+
+        # withdraw from lego partner
+        assetAmountReceived, vaultTokenAmountBurned, refundVaultTokenAmount, usdValue = extcall LegoYield(legoAddr).withdrawTokens(_asset, withdrawAmount, _vaultAddr, self)
+
+        # zero out approvals
+        if _hasVaultToken and _vaultAddr != empty(address):
+            assert extcall IERC20(_vaultAddr).approve(legoAddr, 0, default_return_value=True) # dev: approval failed
 
     # handle yield profit
     assetProfitAmount: uint256 = extcall WalletConfig(_cd.walletConfig).updateYieldTrackingOnWithdrawal(_vaultAddr, vaultTokenAmountBurned, _asset, assetAmountReceived, _cd.legoRegistry)
@@ -564,7 +627,7 @@ def swapTokens(_swapInstructions: DynArray[SwapInstruction, MAX_SWAP_INSTRUCTION
     isSignerAgent: bool = self._checkPermsAndHandleSubs(msg.sender, ActionType.SWAP, [tokenIn, tokenOut], legoIds, cd)
 
     # check if swap token is trial funds asset
-    isTrialFundsVaultToken: bool = self._isTrialFundsVaultToken(tokenIn, cd.trialFundsAsset, cd.legoRegistry)
+    isTrialFundsVaultToken: bool = self._isTrialFundsVaultToken(tokenIn, cd)
 
     # perform swap instructions
     amountIn: uint256 = initialAmountIn
@@ -583,7 +646,7 @@ def swapTokens(_swapInstructions: DynArray[SwapInstruction, MAX_SWAP_INSTRUCTION
         lastTokenOut, lastTokenOutAmount, lastUsdValue = self._performSwapInstruction(i.legoId, amountIn, i.minAmountOut, i.tokenPath, i.poolPath, msg.sender, isSignerAgent, cd.legoRegistry, cd.oracleRegistry)
 
     # make sure they still have enough trial funds
-    self._checkTrialFundsPostTx(isTrialFundsVaultToken, cd.trialFundsAsset, cd.trialFundsInitialAmount, cd.legoRegistry)
+    self._checkTrialFundsPostTx(isTrialFundsVaultToken, cd)
 
      # yield tracking
     extcall WalletConfig(cd.walletConfig).updateYieldTrackingOnSwap(tokenIn, lastTokenOut, lastTokenOutAmount, cd.legoRegistry)
@@ -747,7 +810,7 @@ def repayDebt(
     paymentAmount: uint256 = staticcall WalletConfig(cd.walletConfig).getAvailableTxAmount(_paymentAsset, _paymentAmount, True, cd)
 
     # check if payment asset is trial funds asset
-    isTrialFundsVaultToken: bool = self._isTrialFundsVaultToken(_paymentAsset, cd.trialFundsAsset, cd.legoRegistry)
+    isTrialFundsVaultToken: bool = self._isTrialFundsVaultToken(_paymentAsset, cd)
 
     # repay debt via lego partner
     paymentAsset: address = empty(address)
@@ -758,7 +821,7 @@ def repayDebt(
     assert extcall IERC20(_paymentAsset).approve(legoAddr, 0, default_return_value=True) # dev: approval failed
 
     # make sure they still have enough trial funds
-    self._checkTrialFundsPostTx(isTrialFundsVaultToken, cd.trialFundsAsset, cd.trialFundsInitialAmount, cd.legoRegistry)
+    self._checkTrialFundsPostTx(isTrialFundsVaultToken, cd)
 
     # yield tracking -- paying back debt with vault token
     extcall WalletConfig(cd.walletConfig).updateYieldTrackingOnExit(_paymentAsset, cd.legoRegistry)
@@ -879,7 +942,7 @@ def addLiquidity(
     if _amountA != 0:
         amountA = staticcall WalletConfig(cd.walletConfig).getAvailableTxAmount(_tokenA, _amountA, True, cd)
         assert extcall IERC20(_tokenA).approve(legoAddr, amountA, default_return_value=True) # dev: approval failed
-        isTrialFundsVaultTokenA = self._isTrialFundsVaultToken(_tokenA, cd.trialFundsAsset, cd.legoRegistry)
+        isTrialFundsVaultTokenA = self._isTrialFundsVaultToken(_tokenA, cd)
 
     # token b
     amountB: uint256 = 0
@@ -887,7 +950,7 @@ def addLiquidity(
     if _amountB != 0:
         amountB = staticcall WalletConfig(cd.walletConfig).getAvailableTxAmount(_tokenB, _amountB, True, cd)
         assert extcall IERC20(_tokenB).approve(legoAddr, amountB, default_return_value=True) # dev: approval failed
-        isTrialFundsVaultTokenB = self._isTrialFundsVaultToken(_tokenB, cd.trialFundsAsset, cd.legoRegistry)
+        isTrialFundsVaultTokenB = self._isTrialFundsVaultToken(_tokenB, cd)
 
     # transfer nft to lego (if applicable)
     hasNftLiqPosition: bool = _nftAddr != empty(address) and _nftTokenId != 0
@@ -909,13 +972,13 @@ def addLiquidity(
         assert staticcall IERC721(_nftAddr).ownerOf(_nftTokenId) == self # dev: nft not returned
 
     # token a
-    self._checkTrialFundsPostTx(isTrialFundsVaultTokenA, cd.trialFundsAsset, cd.trialFundsInitialAmount, cd.legoRegistry)
+    self._checkTrialFundsPostTx(isTrialFundsVaultTokenA, cd)
     if amountA != 0:
         assert extcall IERC20(_tokenA).approve(legoAddr, 0, default_return_value=True) # dev: approval failed
         extcall WalletConfig(cd.walletConfig).updateYieldTrackingOnExit(_tokenA, cd.legoRegistry)
 
     # token b
-    self._checkTrialFundsPostTx(isTrialFundsVaultTokenB, cd.trialFundsAsset, cd.trialFundsInitialAmount, cd.legoRegistry)
+    self._checkTrialFundsPostTx(isTrialFundsVaultTokenB, cd)
     if amountB != 0:
         assert extcall IERC20(_tokenB).approve(legoAddr, 0, default_return_value=True) # dev: approval failed
         extcall WalletConfig(cd.walletConfig).updateYieldTrackingOnExit(_tokenB, cd.legoRegistry)
@@ -1056,14 +1119,14 @@ def _transferFunds(
     else:
 
         # check if vault token of trial funds asset
-        isTrialFundsVaultToken: bool = self._isTrialFundsVaultToken(_asset, _cd.trialFundsAsset, _cd.legoRegistry)
+        isTrialFundsVaultToken: bool = self._isTrialFundsVaultToken(_asset, _cd)
         transferAmount = staticcall WalletConfig(_cd.walletConfig).getAvailableTxAmount(_asset, _amount, True, _cd)
 
         assert extcall IERC20(_asset).transfer(_recipient, transferAmount, default_return_value=True) # dev: transfer failed
         usdValue = staticcall OracleRegistry(_cd.oracleRegistry).getUsdValue(_asset, transferAmount)
 
         # make sure they still have enough trial funds
-        self._checkTrialFundsPostTx(isTrialFundsVaultToken, _cd.trialFundsAsset, _cd.trialFundsInitialAmount, _cd.legoRegistry)
+        self._checkTrialFundsPostTx(isTrialFundsVaultToken, _cd)
 
         # yield tracking -- transferring out vault token
         extcall WalletConfig(_cd.walletConfig).updateYieldTrackingOnExit(_asset, _cd.legoRegistry)
@@ -1212,17 +1275,28 @@ def _checkPermsAndHandleSubs(
 
     # handle protocol subscription payment
     if protocolSub.amount != 0:
-        assert extcall IERC20(protocolSub.asset).transfer(protocolSub.recipient, protocolSub.amount, default_return_value=True) # dev: protocol subscription payment failed
-        log UserWalletSubscriptionPaid(recipient=protocolSub.recipient, asset=protocolSub.asset, amount=protocolSub.amount, usdValue=protocolSub.usdValue, paidThroughBlock=protocolSub.paidThroughBlock, isAgent=False)
+        self._paySubscription(protocolSub, False)
 
     # handle agent subscription payment
     if agentSub.amount != 0:
-        assert extcall IERC20(agentSub.asset).transfer(agentSub.recipient, agentSub.amount, default_return_value=True) # dev: agent subscription payment failed
-        log UserWalletSubscriptionPaid(recipient=agent, asset=agentSub.asset, amount=agentSub.amount, usdValue=agentSub.usdValue, paidThroughBlock=agentSub.paidThroughBlock, isAgent=True)
+        self._paySubscription(agentSub, True)
 
     return agent != empty(address)
 
 
+@external
+def paySubscription(_sub: SubPaymentInfo, _isAgent: bool) -> bool:
+    assert msg.sender == self.walletConfig # dev: only wallet config can call this
+    self._paySubscription(_sub, _isAgent)
+    return True
+
+
+@internal
+def _paySubscription(_sub: SubPaymentInfo, _isAgent: bool):
+    assert extcall IERC20(_sub.asset).transfer(_sub.recipient, _sub.amount, default_return_value=True) # dev: subscription payment failed
+    log UserWalletSubscriptionPaid(recipient=_sub.recipient, asset=_sub.asset, amount=_sub.amount, usdValue=_sub.usdValue, paidThroughBlock=_sub.paidThroughBlock, isAgent=_isAgent)
+
+
 @internal
 def _handleTransactionFees(
     _action: ActionType,
@@ -1244,7 +1318,8 @@ def _handleTransactionFees(
     fee: uint256 = 0
     protocolRecipient: address = empty(address)
     ambassadorRatio: uint256 = 0
-    fee, protocolRecipient, ambassadorRatio = staticcall PriceSheets(_priceSheets).getTransactionFeeDataWithAmbassadorRatio(self, _action)
+    shouldAccrue: bool = False
+    fee, protocolRecipient, ambassadorRatio, shouldAccrue = staticcall PriceSheets(_priceSheets).getTransactionFeeSettlementData(self, _action)
     if fee == 0 or protocolRecipient == empty(address):
         return 0
 
@@ -1256,6 +1331,18 @@ def _handleTransactionFees(
     protocolAmount: uint256 = feeTotalAmount
     ambassadorAmount: uint256 = 0
 
+    # deferred settlement, single transfer to agent factory ledger
+    if shouldAccrue:
+        if ambassadorRatio != 0:
+            ambassadorRecipient = self._getAmbassadorProceedsAddr(ambassadorRecipient)
+            if ambassadorRecipient != empty(address):
+                ambassadorAmount = feeTotalAmount * min(ambassadorRatio, HUNDRED_PERCENT) // HUNDRED_PERCENT
+                protocolAmount -= ambassadorAmount
+        assert extcall IERC20(_asset).transfer(_agentFactory, feeTotalAmount, default_return_value=True) # dev: tx fee accrual failed
+        assert extcall AgentFactory(_agentFactory).accrueTransactionFees(_asset, protocolRecipient, protocolAmount, ambassadorRecipient, ambassadorAmount) # dev: could not accrue fees
+        log UserWalletTransactionFeePaid(asset=_asset, protocolRecipient=protocolRecipient, protocolAmount=protocolAmount, ambassadorRecipient=ambassadorRecipient, ambassadorAmount=ambassadorAmount, fee=fee, action=_action)
+        return feeTotalAmount
+
     # pay ambassador proceeds
     if ambassadorRatio != 0:
         ambassadorRecipient = self._getAmbassadorProceedsAddr(ambassadorRecipient)
@@ -1370,19 +1457,20 @@ def _checkLegoAccessForAction(_legoAddr: address):
 
 @view
 @internal
-def _isTrialFundsVaultToken(_asset: address, _trialFundsAsset: address, _legoRegistry: address) -> bool:
-    if _trialFundsAsset == empty(address) or _asset == _trialFundsAsset:
+def _isTrialFundsVaultToken(_asset: address, _cd: CoreData) -> bool:
+    # nothing to guard once trial funds are clawed back / exhausted
+    if _cd.trialFundsAsset == empty(address) or _cd.trialFundsInitialAmount == 0 or _asset == _cd.trialFundsAsset:
         return False
-    return _trialFundsAsset == staticcall LegoRegistry(_legoRegistry).getUnderlyingAsset(_asset)
+    return staticcall WalletConfig(_cd.walletConfig).isTrialFundsVaultToken(_asset)
 
 
 @view
 @internal
-def _checkTrialFundsPostTx(_isTrialFundsVaultToken: bool, _trialFundsAsset: address, _trialFundsInitialAmount: uint256, _legoRegistry: address):
+def _checkTrialFundsPostTx(_isTrialFundsVaultToken: bool, _cd: CoreData):
     if not _isTrialFundsVaultToken:
         return
-    postUnderlying: uint256 = staticcall LegoRegistry(_legoRegistry).getUnderlyingForUser(self, _trialFundsAsset)
-    assert postUnderlying >= _trialFundsInitialAmount # dev: cannot transfer trial funds vault token
+    postUnderlying: uint256 = staticcall WalletConfig(_cd.walletConfig).getTrialFundsDeployed(_cd.legoRegistry)
+    assert postUnderlying >= _cd.trialFundsInitialAmount # dev: cannot transfer trial funds vault token
 
 
 @external
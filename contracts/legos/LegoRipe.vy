@@ -27,7 +27,7 @@ interface RipeRegistry:
     def greenToken() -> address: view
 
 interface OracleRegistry:
-    def getUsdValue(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: view
+    def getUsdValueAndMemoize(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: nonpayable
 
 interface RipeMissionControl:
     def doesUndyLegoHaveAccess(_wallet: address, _legoAddr: address) -> bool: view
@@ -106,13 +106,12 @@ def getAccessForLego(_user: address) -> (address, String[64], uint256):
         return teller, LEGO_ACCESS_ABI, 1
 
 
-@view
 @internal
-def _getUsdValue(_asset: address, _amount: uint256, _oracleRegistry: address) -> uint256:
+def _getUsdValueAndMemoize(_asset: address, _amount: uint256, _oracleRegistry: address) -> uint256:
     oracleRegistry: address = _oracleRegistry
     if _oracleRegistry == empty(address):
         oracleRegistry = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
-    return staticcall OracleRegistry(oracleRegistry).getUsdValue(_asset, _amount)
+    return extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_asset, _amount)
 
 
 ###########
@@ -152,7 +151,7 @@ def depositTokens(
         refundAssetAmount = currentLegoBalance - preLegoBalance
         assert extcall IERC20(_asset).transfer(msg.sender, refundAssetAmount, default_return_value=True) # dev: transfer failed
 
-    usdValue: uint256 = self._getUsdValue(_asset, depositAmount, _oracleRegistry)
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, depositAmount, _oracleRegistry)
     log UnderscoreDeposit(sender=msg.sender, asset=_asset, assetAmountDeposited=depositAmount, usdValue=usdValue, recipient=_recipient)
     return depositAmount, empty(address), 0, refundAssetAmount, usdValue
 
@@ -177,7 +176,7 @@ def withdrawTokens(
     assetAmountReceived: uint256 = extcall RipeTeller(teller).withdraw(_asset, _amount, _recipient, _vaultAddr, 0)
     assert assetAmountReceived != 0 # dev: no asset amount received
 
-    usdValue: uint256 = self._getUsdValue(_asset, assetAmountReceived, _oracleRegistry)
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, assetAmountReceived, _oracleRegistry)
     log UnderscoreWithdrawal(sender=msg.sender, asset=_asset, assetAmountReceived=assetAmountReceived, usdValue=usdValue, recipient=_recipient)
     return assetAmountReceived, 0, 0, usdValue
 
@@ -29,7 +29,7 @@ interface AeroClassicPool:
     def stable() -> bool: view
 
 interface OracleRegistry:
-    def getUsdValue(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: view
+    def getUsdValueAndMemoize(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: nonpayable
     def getPrice(_asset: address, _shouldRaise: bool = False) -> uint256: view
 
 interface AeroFactory:
@@ -621,7 +621,6 @@ def getPriceUnsafe(_pool: address, _targetToken: address, _oracleRegistry: addre
 # internal utils
 
 
-@view
 @internal
 def _getUsdValue(
     _tokenA: address,
@@ -634,8 +633,8 @@ def _getUsdValue(
     oracleRegistry: address = _oracleRegistry
     if _oracleRegistry == empty(address):
         oracleRegistry = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
-    usdValueA: uint256 = staticcall OracleRegistry(oracleRegistry).getUsdValue(_tokenA, _amountA)
-    usdValueB: uint256 = staticcall OracleRegistry(oracleRegistry).getUsdValue(_tokenB, _amountB)
+    usdValueA: uint256 = extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_tokenA, _amountA)
+    usdValueB: uint256 = extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_tokenB, _amountB)
     if _isSwap:
         return max(usdValueA, usdValueB)
     else:
@@ -44,7 +44,7 @@ interface IUniswapV3Callback:
     def uniswapV3SwapCallback(_amount0Delta: int256, _amount1Delta: int256, _data: Bytes[256]): nonpayable
 
 interface OracleRegistry:
-    def getUsdValue(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: view
+    def getUsdValueAndMemoize(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: nonpayable
     def getPrice(_asset: address, _shouldRaise: bool = False) -> uint256: view
 
 interface AeroSlipStreamFactory:
@@ -963,7 +963,6 @@ def _getDeepestLiqPool(_tokenA: address, _tokenB: address) -> (address, int24):
     return bestPoolAddr, bestTickSpacing
 
 
-@view
 @internal
 def _getUsdValue(
     _tokenA: address,
@@ -976,8 +975,8 @@ def _getUsdValue(
     oracleRegistry: address = _oracleRegistry
     if _oracleRegistry == empty(address):
         oracleRegistry = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
-    usdValueA: uint256 = staticcall OracleRegistry(oracleRegistry).getUsdValue(_tokenA, _amountA)
-    usdValueB: uint256 = staticcall OracleRegistry(oracleRegistry).getUsdValue(_tokenB, _amountB)
+    usdValueA: uint256 = extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_tokenA, _amountA)
+    usdValueB: uint256 = extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_tokenB, _amountB)
     if _isSwap:
         return max(usdValueA, usdValueB)
     else:
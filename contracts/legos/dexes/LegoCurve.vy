@@ -97,7 +97,7 @@ interface CryptoLegacyPool:
     def exchange(_i: uint256, _j: uint256, _dx: uint256, _min_dy: uint256, _use_eth: bool = False) -> uint256: payable
 
 interface OracleRegistry:
-    def getUsdValue(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: view
+    def getUsdValueAndMemoize(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: nonpayable
 
 interface CurveAddressProvider:
     def get_address(_id: uint256) -> address: view
@@ -1166,7 +1166,6 @@ def getPriceUnsafe(_pool: address, _targetToken: address, _oracleRegistry: addre
 # internal utils
 
 
-@view
 @internal
 def _getUsdValue(
     _tokenA: address,
@@ -1181,10 +1180,10 @@ def _getUsdValue(
         oracleRegistry = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
     usdValueA: uint256 = 0
     if _tokenA != empty(address) and _amountA != 0:
-        usdValueA = staticcall OracleRegistry(oracleRegistry).getUsdValue(_tokenA, _amountA)
+        usdValueA = extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_tokenA, _amountA)
     usdValueB: uint256 = 0
     if _tokenB != empty(address) and _amountB != 0:
-        usdValueB = staticcall OracleRegistry(oracleRegistry).getUsdValue(_tokenB, _amountB)
+        usdValueB = extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_tokenB, _amountB)
     if _isSwap:
         return max(usdValueA, usdValueB)
     else:
@@ -25,7 +25,7 @@ interface UniV2Router:
     def removeLiquidity(_tokenA: address, _tokenB: address, _lpAmount: uint256, _amountAMin: uint256, _amountBMin: uint256, _recipient: address, _deadline: uint256) -> (uint256, uint256): nonpayable
 
 interface OracleRegistry:
-    def getUsdValue(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: view
+    def getUsdValueAndMemoize(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: nonpayable
     def getPrice(_asset: address, _shouldRaise: bool = False) -> uint256: view
 
 interface UniV2Factory:
@@ -617,7 +617,6 @@ def getPriceUnsafe(_pool: address, _targetToken: address, _oracleRegistry: addre
 # internal utils
 
 
-@view
 @internal
 def _getUsdValue(
     _tokenA: address,
@@ -630,8 +629,8 @@ def _getUsdValue(
     oracleRegistry: address = _oracleRegistry
     if _oracleRegistry == empty(address):
         oracleRegistry = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
-    usdValueA: uint256 = staticcall OracleRegistry(oracleRegistry).getUsdValue(_tokenA, _amountA)
-    usdValueB: uint256 = staticcall OracleRegistry(oracleRegistry).getUsdValue(_tokenB, _amountB)
+    usdValueA: uint256 = extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_tokenA, _amountA)
+    usdValueB: uint256 = extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_tokenB, _amountB)
     if _isSwap:
         return max(usdValueA, usdValueB)
     else:
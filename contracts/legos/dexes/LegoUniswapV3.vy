@@ -42,7 +42,7 @@ interface UniV3Quoter:
     def quoteExactInput(_path: Bytes[1024], _amountIn: uint256) -> uint256: nonpayable
   
 interface OracleRegistry:
-    def getUsdValue(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: view
+    def getUsdValueAndMemoize(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: nonpayable
     def getPrice(_asset: address, _shouldRaise: bool = False) -> uint256: view
 
 interface IUniswapV3Callback:
@@ -973,7 +973,6 @@ def _getDeepestLiqPool(_tokenA: address, _tokenB: address) -> (address, uint24):
     return bestPoolAddr, bestFeeTier
 
 
-@view
 @internal
 def _getUsdValue(
     _tokenA: address,
@@ -986,8 +985,8 @@ def _getUsdValue(
     oracleRegistry: address = _oracleRegistry
     if _oracleRegistry == empty(address):
         oracleRegistry = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
-    usdValueA: uint256 = staticcall OracleRegistry(oracleRegistry).getUsdValue(_tokenA, _amountA)
-    usdValueB: uint256 = staticcall OracleRegistry(oracleRegistry).getUsdValue(_tokenB, _amountB)
+    usdValueA: uint256 = extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_tokenA, _amountA)
+    usdValueB: uint256 = extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_tokenB, _amountB)
     if _isSwap:
         return max(usdValueA, usdValueB)
     else:
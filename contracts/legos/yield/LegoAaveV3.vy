@@ -35,6 +35,7 @@ interface AaveV3AddressProvider:
 
 interface OracleRegistry:
     def getUsdValue(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: view
+    def getUsdValueAndMemoize(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: nonpayable
 
 interface AddyRegistry:
     def getAddy(_addyId: uint256) -> address: view
@@ -237,6 +238,14 @@ def _getUsdValue(_asset: address, _amount: uint256, _oracleRegistry: address) ->
     return staticcall OracleRegistry(oracleRegistry).getUsdValue(_asset, _amount)
 
 
+@internal
+def _getUsdValueAndMemoize(_asset: address, _amount: uint256, _oracleRegistry: address) -> uint256:
+    oracleRegistry: address = _oracleRegistry
+    if _oracleRegistry == empty(address):
+        oracleRegistry = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
+    return extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_asset, _amount)
+
+
 # other
 
 
@@ -300,7 +309,7 @@ def depositTokens(
         assert extcall IERC20(_asset).transfer(msg.sender, refundAssetAmount, default_return_value=True) # dev: transfer failed
         depositAmount -= refundAssetAmount
 
-    usdValue: uint256 = self._getUsdValue(_asset, depositAmount, _oracleRegistry)
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, depositAmount, _oracleRegistry)
     log AaveV3Deposit(sender=msg.sender, asset=_asset, vaultToken=vaultToken, assetAmountDeposited=depositAmount, usdValue=usdValue, vaultTokenAmountReceived=vaultTokenAmountReceived, recipient=_recipient)
     return depositAmount, vaultToken, vaultTokenAmountReceived, refundAssetAmount, usdValue
 
@@ -356,7 +365,7 @@ def withdrawTokens(
         assert extcall IERC20(vaultToken).transfer(msg.sender, refundVaultTokenAmount, default_return_value=True) # dev: transfer failed
         vaultTokenAmount -= refundVaultTokenAmount
 
-    usdValue: uint256 = self._getUsdValue(_asset, assetAmountReceived, _oracleRegistry)
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, assetAmountReceived, _oracleRegistry)
     log AaveV3Withdrawal(sender=msg.sender, asset=_asset, vaultToken=vaultToken, assetAmountReceived=assetAmountReceived, usdValue=usdValue, vaultTokenAmountBurned=vaultTokenAmount, recipient=_recipient)
     return assetAmountReceived, vaultTokenAmount, refundVaultTokenAmount, usdValue
 
@@ -5,6 +5,7 @@
 
 implements: LegoYield
 implements: LegoCommon
+implements: LegoDirect
 initializes: yld
 initializes: gov
 
@@ -16,6 +17,7 @@ import contracts.modules.LocalGov as gov
 from ethereum.ercs import IERC20
 from interfaces import LegoYield
 from interfaces import LegoCommon
+from interfaces import LegoDirect
 
 interface Erc4626Interface:
     def redeem(_vaultTokenAmount: uint256, _recipient: address, _owner: address) -> uint256: nonpayable
@@ -27,12 +29,17 @@ interface Erc4626Interface:
 
 interface OracleRegistry:
     def getUsdValue(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: view
+    def getUsdValueAndMemoize(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: nonpayable
 
 interface FluidLendingResolver:
     def getAllFTokens() -> DynArray[address, MAX_FTOKENS]: view
 
 interface LegoRegistry:
     def addRipeSnapshot(_asset: address): nonpayable
+    def isDirectLego(_legoId: uint256) -> bool: view
+
+interface AgentFactory:
+    def isUserWallet(_addr: address) -> bool: view
 
 interface AddyRegistry:
     def getAddy(_addyId: uint256) -> address: view
@@ -218,6 +225,14 @@ def _getUsdValue(_asset: address, _amount: uint256, _oracleRegistry: address) ->
     return staticcall OracleRegistry(oracleRegistry).getUsdValue(_asset, _amount)
 
 
+@internal
+def _getUsdValueAndMemoize(_asset: address, _amount: uint256, _oracleRegistry: address) -> uint256:
+    oracleRegistry: address = _oracleRegistry
+    if _oracleRegistry == empty(address):
+        oracleRegistry = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
+    return extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_asset, _amount)
+
+
 # other
 
 
@@ -275,7 +290,7 @@ def depositTokens(
     # add price snapshot
     self._addPriceSnapshot(_asset)
 
-    usdValue: uint256 = self._getUsdValue(_asset, depositAmount, _oracleRegistry)
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, depositAmount, _oracleRegistry)
     log FluidDeposit(sender=msg.sender, asset=_asset, vaultToken=_vault, assetAmountDeposited=depositAmount, usdValue=usdValue, vaultTokenAmountReceived=vaultTokenAmountReceived, recipient=_recipient)
     return depositAmount, _vault, vaultTokenAmountReceived, refundAssetAmount, usdValue
 
@@ -320,11 +335,75 @@ def withdrawTokens(
     # add price snapshot
     self._addPriceSnapshot(_asset)
 
-    usdValue: uint256 = self._getUsdValue(_asset, assetAmountReceived, _oracleRegistry)
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, assetAmountReceived, _oracleRegistry)
     log FluidWithdrawal(sender=msg.sender, asset=_asset, vaultToken=_vaultToken, assetAmountReceived=assetAmountReceived, usdValue=usdValue, vaultTokenAmountBurned=vaultTokenAmount, recipient=_recipient)
     return assetAmountReceived, vaultTokenAmount, refundVaultTokenAmount, usdValue
 
 
+###############
+# Direct Mode #
+###############
+
+
+@view
+@external
+def isDirectVault(_asset: address, _vault: address) -> bool:
+    return yld.indexOfAssetOpportunity[_asset][_vault] != 0
+
+
+@view
+@internal
+def _isValidDirectCaller(_caller: address) -> bool:
+    # only user wallets, and only while this lego is registered for direct mode
+    agentFactory: address = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(1)
+    if not staticcall AgentFactory(agentFactory).isUserWallet(_caller):
+        return False
+    legoRegistry: address = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(2)
+    return staticcall LegoRegistry(legoRegistry).isDirectLego(self.legoId)
+
+
+@external
+def onDirectDeposit(
+    _asset: address,
+    _vault: address,
+    _assetAmount: uint256,
+    _vaultTokenAmount: uint256,
+    _oracleRegistry: address = empty(address),
+) -> uint256:
+    assert self.isActivated # dev: not activated
+    assert self._isValidDirectCaller(msg.sender) # dev: no perms
+    assert yld.indexOfAssetOpportunity[_asset][_vault] != 0 # dev: asset + vault not supported
+    assert _vaultTokenAmount != 0 # dev: no vault tokens received
+
+    # add price snapshot
+    self._addPriceSnapshot(_asset)
+
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, _assetAmount, _oracleRegistry)
+    log FluidDeposit(sender=msg.sender, asset=_asset, vaultToken=_vault, assetAmountDeposited=_assetAmount, usdValue=usdValue, vaultTokenAmountReceived=_vaultTokenAmount, recipient=msg.sender)
+    return usdValue
+
+
+@external
+def onDirectWithdrawal(
+    _asset: address,
+    _vaultToken: address,
+    _assetAmount: uint256,
+    _vaultTokenAmount: uint256,
+    _oracleRegistry: address = empty(address),
+) -> uint256:
+    assert self.isActivated # dev: not activated
+    assert self._isValidDirectCaller(msg.sender) # dev: no perms
+    assert yld.indexOfAssetOpportunity[_asset][_vaultToken] != 0 # dev: asset + vault not supported
+    assert _assetAmount != 0 # dev: no asset amount received
+
+    # add price snapshot
+    self._addPriceSnapshot(_asset)
+
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, _assetAmount, _oracleRegistry)
+    log FluidWithdrawal(sender=msg.sender, asset=_asset, vaultToken=_vaultToken, assetAmountReceived=_assetAmount, usdValue=usdValue, vaultTokenAmountBurned=_vaultTokenAmount, recipient=msg.sender)
+    return usdValue
+
+
 #################
 # Claim Rewards #
 #################
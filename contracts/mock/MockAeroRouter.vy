@@ -0,0 +1,179 @@
+# SPDX-License-Identifier: MIT
+# Underscore Protocol License: https://github.com/underscore-finance/underscore/blob/main/licenses/MIT_LICENSE
+# Underscore Protocol (C) 2025 Hightop Financial, Inc.
+# @version 0.4.1
+
+# NOTE: local stand-in for the aerodrome router, only the liquidity methods `LegoAeroClassic` uses
+
+from ethereum.ercs import IERC20
+
+interface AmmFactory:
+    def getPool(_tokenA: address, _tokenB: address, _isStable: bool) -> address: view
+
+interface AmmPool:
+    def getReserves() -> (uint256, uint256, uint256): view
+    def mint(_recipient: address) -> uint256: nonpayable
+    def burn(_recipient: address) -> (uint256, uint256): nonpayable
+    def token0() -> address: view
+
+FACTORY: public(immutable(address))
+
+MINIMUM_LIQUIDITY: constant(uint256) = 10 ** 3
+
+
+@deploy
+def __init__(_factory: address):
+    assert _factory != empty(address) # dev: invalid factory
+    FACTORY = _factory
+
+
+#############
+# Liquidity #
+#############
+
+
+@external
+def addLiquidity(
+    _tokenA: address,
+    _tokenB: address,
+    _isStable: bool,
+    _amountADesired: uint256,
+    _amountBDesired: uint256,
+    _amountAMin: uint256,
+    _amountBMin: uint256,
+    _recipient: address,
+    _deadline: uint256,
+) -> (uint256, uint256, uint256):
+    assert _deadline >= block.timestamp # dev: expired
+    pool: address = staticcall AmmFactory(FACTORY).getPool(_tokenA, _tokenB, _isStable)
+    assert pool != empty(address) # dev: no pool
+
+    amountA: uint256 = 0
+    amountB: uint256 = 0
+    amountA, amountB = self._getOptimalAmounts(pool, _tokenA, _amountADesired, _amountBDesired)
+    assert amountA >= _amountAMin # dev: insufficient a amount
+    assert amountB >= _amountBMin # dev: insufficient b amount
+
+    assert extcall IERC20(_tokenA).transferFrom(msg.sender, pool, amountA, default_return_value=True) # dev: transfer failed
+    assert extcall IERC20(_tokenB).transferFrom(msg.sender, pool, amountB, default_return_value=True) # dev: transfer failed
+    liquidity: uint256 = extcall AmmPool(pool).mint(_recipient)
+    return amountA, amountB, liquidity
+
+
+@external
+def removeLiquidity(
+    _tokenA: address,
+    _tokenB: address,
+    _isStable: bool,
+    _liquidity: uint256,
+    _amountAMin: uint256,
+    _amountBMin: uint256,
+    _recipient: address,
+    _deadline: uint256,
+) -> (uint256, uint256):
+    assert _deadline >= block.timestamp # dev: expired
+    pool: address = staticcall AmmFactory(FACTORY).getPool(_tokenA, _tokenB, _isStable)
+    assert pool != empty(address) # dev: no pool
+
+    assert extcall IERC20(pool).transferFrom(msg.sender, pool, _liquidity, default_return_value=True) # dev: transfer failed
+    amount0: uint256 = 0
+    amount1: uint256 = 0
+    amount0, amount1 = extcall AmmPool(pool).burn(_recipient)
+
+    amountA: uint256 = amount0
+    amountB: uint256 = amount1
+    if _tokenA != staticcall AmmPool(pool).token0():
+        amountA = amount1
+        amountB = amount0
+    assert amountA >= _amountAMin # dev: insufficient a amount
+    assert amountB >= _amountBMin # dev: insufficient b amount
+    return amountA, amountB
+
+
+##########
+# Quotes #
+##########
+
+
+@view
+@external
+def quoteAddLiquidity(
+    _tokenA: address,
+    _tokenB: address,
+    _isStable: bool,
+    _factory: address,
+    _amountADesired: uint256,
+    _amountBDesired: uint256,
+) -> (uint256, uint256, uint256):
+    pool: address = staticcall AmmFactory(_factory).getPool(_tokenA, _tokenB, _isStable)
+    if pool == empty(address):
+        return 0, 0, 0
+
+    amountA: uint256 = 0
+    amountB: uint256 = 0
+    amountA, amountB = self._getOptimalAmounts(pool, _tokenA, _amountADesired, _amountBDesired)
+
+    reserveA: uint256 = 0
+    reserveB: uint256 = 0
+    reserveA, reserveB = self._getReserves(pool, _tokenA)
+
+    liquidity: uint256 = 0
+    totalSupply: uint256 = staticcall IERC20(pool).totalSupply()
+    if totalSupply == 0:
+        liquidity = isqrt(amountA * amountB) - MINIMUM_LIQUIDITY
+    else:
+        liquidity = min(amountA * totalSupply // reserveA, amountB * totalSupply // reserveB)
+    return amountA, amountB, liquidity
+
+
+@view
+@external
+def quoteRemoveLiquidity(
+    _tokenA: address,
+    _tokenB: address,
+    _isStable: bool,
+    _factory: address,
+    _liquidity: uint256,
+) -> (uint256, uint256):
+    pool: address = staticcall AmmFactory(_factory).getPool(_tokenA, _tokenB, _isStable)
+    if pool == empty(address):
+        return 0, 0
+
+    totalSupply: uint256 = staticcall IERC20(pool).totalSupply()
+    if totalSupply == 0:
+        return 0, 0
+
+    reserveA: uint256 = 0
+    reserveB: uint256 = 0
+    reserveA, reserveB = self._getReserves(pool, _tokenA)
+    return _liquidity * reserveA // totalSupply, _liquidity * reserveB // totalSupply
+
+
+# internal
+
+
+@view
+@internal
+def _getReserves(_pool: address, _tokenA: address) -> (uint256, uint256):
+    reserve0: uint256 = 0
+    reserve1: uint256 = 0
+    na: uint256 = 0
+    reserve0, reserve1, na = staticcall AmmPool(_pool).getReserves()
+    if _tokenA == staticcall AmmPool(_pool).token0():
+        return reserve0, reserve1
+    return reserve1, reserve0
+
+
+@view
+@internal
+def _getOptimalAmounts(_pool: address, _tokenA: address, _amountADesired: uint256, _amountBDesired: uint256) -> (uint256, uint256):
+    reserveA: uint256 = 0
+    reserveB: uint256 = 0
+    reserveA, reserveB = self._getReserves(_pool, _tokenA)
+    if reserveA == 0 and reserveB == 0:
+        return _amountADesired, _amountBDesired
+
+    amountBOptimal: uint256 = _amountADesired * reserveB // reserveA
+    if amountBOptimal <= _amountBDesired:
+        return _amountADesired, amountBOptimal
+    return _amountBDesired * reserveA // reserveB, _amountBDesired
@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: MIT
+# Underscore Protocol License: https://github.com/underscore-finance/underscore/blob/main/licenses/MIT_LICENSE
+# Underscore Protocol (C) 2025 Hightop Financial, Inc.
+# @version 0.4.1
+
+# NOTE: local stand-in for the uniswap v2 / aerodrome classic factory.
+# Pools are deployed separately (`MockAmmPool.vy`) and registered here.
+
+interface AmmPool:
+    def token0() -> address: view
+    def token1() -> address: view
+    def stable() -> bool: view
+    def fee() -> uint256: view
+
+event PoolRegistered:
+    token0: indexed(address)
+    token1: indexed(address)
+    stable: bool
+    pool: address
+
+getPool: public(HashMap[address, HashMap[address, HashMap[bool, address]]])
+isPool: public(HashMap[address, bool])
+allPools: public(DynArray[address, MAX_POOLS])
+
+MAX_POOLS: constant(uint256) = 50
+
+
+@deploy
+def __init__():
+    pass
+
+
+# uniswap v2
+
+
+@view
+@external
+def getPair(_tokenA: address, _tokenB: address) -> address:
+    return self.getPool[_tokenA][_tokenB][False]
+
+
+@view
+@external
+def allPairsLength() -> uint256:
+    return len(self.allPools)
+
+
+# aerodrome
+
+
+@view
+@external
+def getFee(_pool: address, _isStable: bool) -> uint256:
+    return staticcall AmmPool(_pool).fee()
+
+
+# registration
+
+
+@external
+def registerPool(_pool: address) -> bool:
+    token0: address = staticcall AmmPool(_pool).token0()
+    token1: address = staticcall AmmPool(_pool).token1()
+    isStable: bool = staticcall AmmPool(_pool).stable()
+    assert self.getPool[token0][token1][isStable] == empty(address) # dev: pool exists
+
+    self.getPool[token0][token1][isStable] = _pool
+    self.getPool[token1][token0][isStable] = _pool
+    self.isPool[_pool] = True
+    self.allPools.append(_pool)
+    log PoolRegistered(token0=token0, token1=token1, stable=isStable, pool=_pool)
+    return True
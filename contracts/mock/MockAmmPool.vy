@@ -0,0 +1,350 @@
+# SPDX-License-Identifier: MIT
+# Underscore Protocol License: https://github.com/underscore-finance/underscore/blob/main/licenses/MIT_LICENSE
+# Underscore Protocol (C) 2025 Hightop Financial, Inc.
+# @version 0.4.1
+
+# NOTE: local stand-in for a uniswap v2 pair / aerodrome classic pool (the pool is its own lp token).
+# Volatile pools use x * y = k, stable pools use the solidly x^3 * y + y^3 * x = k curve.
+# No flash swaps (`_data` is ignored), no twap observations, no protocol fee.
+
+from ethereum.ercs import IERC20
+from ethereum.ercs import IERC20Detailed
+
+implements: IERC20
+
+event Transfer:
+    sender: indexed(address)
+    receiver: indexed(address)
+    value: uint256
+
+event Approval:
+    owner: indexed(address)
+    spender: indexed(address)
+    value: uint256
+
+event Mint:
+    sender: indexed(address)
+    amount0: uint256
+    amount1: uint256
+
+event Burn:
+    sender: indexed(address)
+    amount0: uint256
+    amount1: uint256
+    recipient: indexed(address)
+
+event Swap:
+    sender: indexed(address)
+    amount0In: uint256
+    amount1In: uint256
+    amount0Out: uint256
+    amount1Out: uint256
+    recipient: indexed(address)
+
+event Sync:
+    reserve0: uint256
+    reserve1: uint256
+
+# lp token
+balanceOf: public(HashMap[address, uint256])
+allowance: public(HashMap[address, HashMap[address, uint256]])
+totalSupply: public(uint256)
+
+# pool
+token0: public(immutable(address))
+token1: public(immutable(address))
+stable: public(immutable(bool))
+fee: public(immutable(uint256)) # 100_00 denominator
+DECIMALS0: immutable(uint256)
+DECIMALS1: immutable(uint256)
+
+reserve0: uint256
+reserve1: uint256
+blockTimestampLast: uint256
+
+MINIMUM_LIQUIDITY: constant(uint256) = 10 ** 3
+FEE_DENOMINATOR: constant(uint256) = 100_00
+EIGHTEEN_DECIMALS: constant(uint256) = 10 ** 18
+
+
+@deploy
+def __init__(_tokenA: address, _tokenB: address, _isStable: bool, _fee: uint256):
+    assert empty(address) not in [_tokenA, _tokenB] # dev: invalid tokens
+    assert _tokenA != _tokenB # dev: invalid tokens
+    assert _fee < FEE_DENOMINATOR # dev: invalid fee
+
+    # sorted, same as the real factories
+    tokenA: address = _tokenA
+    tokenB: address = _tokenB
+    if convert(_tokenB, uint256) < convert(_tokenA, uint256):
+        tokenA = _tokenB
+        tokenB = _tokenA
+
+    token0 = tokenA
+    token1 = tokenB
+    stable = _isStable
+    fee = _fee
+    DECIMALS0 = 10 ** convert(staticcall IERC20Detailed(tokenA).decimals(), uint256)
+    DECIMALS1 = 10 ** convert(staticcall IERC20Detailed(tokenB).decimals(), uint256)
+
+
+############
+# Lp Token #
+############
+
+
+@view
+@external
+def name() -> String[32]:
+    return "Mock Amm Lp"
+
+
+@view
+@external
+def symbol() -> String[8]:
+    return "MOCK-LP"
+
+
+@view
+@external
+def decimals() -> uint8:
+    return 18
+
+
+@external
+def transfer(_recipient: address, _amount: uint256) -> bool:
+    self.balanceOf[msg.sender] -= _amount
+    self.balanceOf[_recipient] += _amount
+    log Transfer(sender=msg.sender, receiver=_recipient, value=_amount)
+    return True
+
+
+@external
+def transferFrom(_sender: address, _recipient: address, _amount: uint256) -> bool:
+    self.allowance[_sender][msg.sender] -= _amount
+    self.balanceOf[_sender] -= _amount
+    self.balanceOf[_recipient] += _amount
+    log Transfer(sender=_sender, receiver=_recipient, value=_amount)
+    return True
+
+
+@external
+def approve(_spender: address, _amount: uint256) -> bool:
+    self.allowance[msg.sender][_spender] = _amount
+    log Approval(owner=msg.sender, spender=_spender, value=_amount)
+    return True
+
+
+@internal
+def _mint(_recipient: address, _amount: uint256):
+    self.totalSupply += _amount
+    self.balanceOf[_recipient] += _amount
+    log Transfer(sender=empty(address), receiver=_recipient, value=_amount)
+
+
+@internal
+def _burn(_owner: address, _amount: uint256):
+    self.totalSupply -= _amount
+    self.balanceOf[_owner] -= _amount
+    log Transfer(sender=_owner, receiver=empty(address), value=_amount)
+
+
+########
+# Pool #
+########
+
+
+@view
+@external
+def tokens() -> (address, address):
+    return token0, token1
+
+
+@view
+@external
+def getReserves() -> (uint256, uint256, uint256):
+    return self.reserve0, self.reserve1, self.blockTimestampLast
+
+
+@view
+@external
+def getAmountOut(_amountIn: uint256, _tokenIn: address) -> uint256:
+    if _tokenIn not in [token0, token1]:
+        return 0
+    amountIn: uint256 = _amountIn - (_amountIn * fee // FEE_DENOMINATOR)
+    return self._getAmountOut(amountIn, _tokenIn, self.reserve0, self.reserve1)
+
+
+@external
+def swap(_amount0Out: uint256, _amount1Out: uint256, _recipient: address, _data: Bytes[256]):
+    assert _amount0Out != 0 or _amount1Out != 0 # dev: insufficient output amount
+    reserve0: uint256 = self.reserve0
+    reserve1: uint256 = self.reserve1
+    assert _amount0Out < reserve0 and _amount1Out < reserve1 # dev: insufficient liquidity
+    assert _recipient not in [token0, token1] # dev: invalid recipient
+
+    # optimistic transfers, input must already be in the pool
+    if _amount0Out != 0:
+        assert extcall IERC20(token0).transfer(_recipient, _amount0Out, default_return_value=True) # dev: transfer failed
+    if _amount1Out != 0:
+        assert extcall IERC20(token1).transfer(_recipient, _amount1Out, default_return_value=True) # dev: transfer failed
+
+    balance0: uint256 = staticcall IERC20(token0).balanceOf(self)
+    balance1: uint256 = staticcall IERC20(token1).balanceOf(self)
+
+    amount0In: uint256 = 0
+    if balance0 > reserve0 - _amount0Out:
+        amount0In = balance0 - (reserve0 - _amount0Out)
+    amount1In: uint256 = 0
+    if balance1 > reserve1 - _amount1Out:
+        amount1In = balance1 - (reserve1 - _amount1Out)
+    assert amount0In != 0 or amount1In != 0 # dev: insufficient input amount
+
+    # invariant check, fees stay in the pool
+    balance0Adjusted: uint256 = balance0 - (amount0In * fee // FEE_DENOMINATOR)
+    balance1Adjusted: uint256 = balance1 - (amount1In * fee // FEE_DENOMINATOR)
+    assert self._k(balance0Adjusted, balance1Adjusted) >= self._k(reserve0, reserve1) # dev: k
+
+    self._update(balance0, balance1)
+    log Swap(sender=msg.sender, amount0In=amount0In, amount1In=amount1In, amount0Out=_amount0Out, amount1Out=_amount1Out, recipient=_recipient)
+
+
+@external
+def mint(_recipient: address) -> uint256:
+    reserve0: uint256 = self.reserve0
+    reserve1: uint256 = self.reserve1
+    balance0: uint256 = staticcall IERC20(token0).balanceOf(self)
+    balance1: uint256 = staticcall IERC20(token1).balanceOf(self)
+    amount0: uint256 = balance0 - reserve0
+    amount1: uint256 = balance1 - reserve1
+
+    liquidity: uint256 = 0
+    totalSupply: uint256 = self.totalSupply
+    if totalSupply == 0:
+        liquidity = isqrt(amount0 * amount1) - MINIMUM_LIQUIDITY
+        self._mint(empty(address), MINIMUM_LIQUIDITY) # permanently locked
+    else:
+        liquidity = min(amount0 * totalSupply // reserve0, amount1 * totalSupply // reserve1)
+    assert liquidity != 0 # dev: insufficient liquidity minted
+
+    self._mint(_recipient, liquidity)
+    self._update(balance0, balance1)
+    log Mint(sender=msg.sender, amount0=amount0, amount1=amount1)
+    return liquidity
+
+
+@external
+def burn(_recipient: address) -> (uint256, uint256):
+    balance0: uint256 = staticcall IERC20(token0).balanceOf(self)
+    balance1: uint256 = staticcall IERC20(token1).balanceOf(self)
+    liquidity: uint256 = self.balanceOf[self]
+
+    totalSupply: uint256 = self.totalSupply
+    amount0: uint256 = liquidity * balance0 // totalSupply
+    amount1: uint256 = liquidity * balance1 // totalSupply
+    assert amount0 != 0 and amount1 != 0 # dev: insufficient liquidity burned
+
+    self._burn(self, liquidity)
+    assert extcall IERC20(token0).transfer(_recipient, amount0, default_return_value=True) # dev: transfer failed
+    assert extcall IERC20(token1).transfer(_recipient, amount1, default_return_value=True) # dev: transfer failed
+
+    self._update(balance0 - amount0, balance1 - amount1)
+    log Burn(sender=msg.sender, amount0=amount0, amount1=amount1, recipient=_recipient)
+    return amount0, amount1
+
+
+@external
+def sync():
+    self._update(staticcall IERC20(token0).balanceOf(self), staticcall IERC20(token1).balanceOf(self))
+
+
+# internal
+
+
+@internal
+def _update(_balance0: uint256, _balance1: uint256):
+    self.reserve0 = _balance0
+    self.reserve1 = _balance1
+    self.blockTimestampLast = block.timestamp
+    log Sync(reserve0=_balance0, reserve1=_balance1)
+
+
+@view
+@internal
+def _getAmountOut(_amountIn: uint256, _tokenIn: address, _reserve0: uint256, _reserve1: uint256) -> uint256:
+    if _amountIn == 0 or _reserve0 == 0 or _reserve1 == 0:
+        return 0
+
+    if not stable:
+        reserveIn: uint256 = _reserve0
+        reserveOut: uint256 = _reserve1
+        if _tokenIn == token1:
+            reserveIn = _reserve1
+            reserveOut = _reserve0
+        return _amountIn * reserveOut // (reserveIn + _amountIn)
+
+    # stable, everything normalized to 18 decimals
+    xy: uint256 = self._k(_reserve0, _reserve1)
+    reserve0: uint256 = _reserve0 * EIGHTEEN_DECIMALS // DECIMALS0
+    reserve1: uint256 = _reserve1 * EIGHTEEN_DECIMALS // DECIMALS1
+    if _tokenIn == token0:
+        amountIn: uint256 = _amountIn * EIGHTEEN_DECIMALS // DECIMALS0
+        y: uint256 = reserve1 - self._getY(amountIn + reserve0, xy, reserve1)
+        return y * DECIMALS1 // EIGHTEEN_DECIMALS
+    else:
+        amountIn: uint256 = _amountIn * EIGHTEEN_DECIMALS // DECIMALS1
+        y: uint256 = reserve0 - self._getY(amountIn + reserve1, xy, reserve0)
+        return y * DECIMALS0 // EIGHTEEN_DECIMALS
+
+
+@view
+@internal
+def _k(_x: uint256, _y: uint256) -> uint256:
+    if not stable:
+        return _x * _y
+
+    x: uint256 = _x * EIGHTEEN_DECIMALS // DECIMALS0
+    y: uint256 = _y * EIGHTEEN_DECIMALS // DECIMALS1
+    a: uint256 = x * y // EIGHTEEN_DECIMALS
+    b: uint256 = x * x // EIGHTEEN_DECIMALS + y * y // EIGHTEEN_DECIMALS
+    return a * b // EIGHTEEN_DECIMALS
+
+
+@pure
+@internal
+def _f(_x0: uint256, _y: uint256) -> uint256:
+    a: uint256 = _x0 * (_y * _y // EIGHTEEN_DECIMALS * _y // EIGHTEEN_DECIMALS) // EIGHTEEN_DECIMALS
+    b: uint256 = (_x0 * _x0 // EIGHTEEN_DECIMALS * _x0 // EIGHTEEN_DECIMALS) * _y // EIGHTEEN_DECIMALS
+    return a + b
+
+
+@pure
+@internal
+def _d(_x0: uint256, _y: uint256) -> uint256:
+    return 3 * _x0 * (_y * _y // EIGHTEEN_DECIMALS) // EIGHTEEN_DECIMALS + (_x0 * _x0 // EIGHTEEN_DECIMALS * _x0 // EIGHTEEN_DECIMALS)
+
+
+@pure
+@internal
+def _getY(_x0: uint256, _xy: uint256, _y: uint256) -> uint256:
+    # newton's method on x0 * y^3 + x0^3 * y = xy
+    y: uint256 = _y
+    for i: uint256 in range(255):
+        k: uint256 = self._f(_x0, y)
+        if k < _xy:
+            dy: uint256 = (_xy - k) * EIGHTEEN_DECIMALS // self._d(_x0, y)
+            if dy == 0:
+                if k == _xy:
+                    return y
+                if self._f(_x0, y + 1) > _xy:
+                    return y + 1
+                dy = 1
+            y = y + dy
+        else:
+            dy: uint256 = (k - _xy) * EIGHTEEN_DECIMALS // self._d(_x0, y)
+            if dy == 0:
+                if k == _xy or self._f(_x0, y - 1) < _xy:
+                    return y
+                dy = 1
+            y = y - dy
+    raise "!y"
@@ -0,0 +1,337 @@
+# SPDX-License-Identifier: MIT
+# Underscore Protocol License: https://github.com/underscore-finance/underscore/blob/main/licenses/MIT_LICENSE
+# Underscore Protocol (C) 2025 Hightop Financial, Inc.
+# @version 0.4.1
+
+# NOTE: shared module for the local uni v3 / slipstream nft position managers.
+# `mint()` and `positions()` differ between the two (fee vs tick spacing), those live in
+# `MockUniV3NftManager.vy` and `MockSlipstreamNftManager.vy`. Ticks are stored but every
+# position is full range (see `MockClPool.vy`).
+
+from ethereum.ercs import IERC20
+
+interface ClPool:
+    def getLiquidityForAmounts(_amount0: uint256, _amount1: uint256) -> uint128: view
+    def mint(_recipient: address, _amount: uint128, _data: Bytes[256]) -> (uint256, uint256): nonpayable
+    def burn(_amount: uint128) -> (uint256, uint256): nonpayable
+    def token0() -> address: view
+    def token1() -> address: view
+
+interface ERC721Receiver:
+    def onERC721Received(_operator: address, _owner: address, _tokenId: uint256, _data: Bytes[1024]) -> bytes4: view
+
+struct Position:
+    pool: address
+    token0: address
+    token1: address
+    poolParam: uint24 # fee (uni v3) or tick spacing (slipstream)
+    tickLower: int24
+    tickUpper: int24
+    liquidity: uint128
+    tokensOwed0: uint128
+    tokensOwed1: uint128
+
+struct IncreaseLiquidityParams:
+    tokenId: uint256
+    amount0Desired: uint256
+    amount1Desired: uint256
+    amount0Min: uint256
+    amount1Min: uint256
+    deadline: uint256
+
+struct DecreaseLiquidityParams:
+    tokenId: uint256
+    liquidity: uint128
+    amount0Min: uint256
+    amount1Min: uint256
+    deadline: uint256
+
+struct CollectParams:
+    tokenId: uint256
+    recipient: address
+    amount0Max: uint128
+    amount1Max: uint128
+
+event Transfer:
+    sender: indexed(address)
+    receiver: indexed(address)
+    tokenId: indexed(uint256)
+
+event Approval:
+    owner: indexed(address)
+    approved: indexed(address)
+    tokenId: indexed(uint256)
+
+event ApprovalForAll:
+    owner: indexed(address)
+    operator: indexed(address)
+    approved: bool
+
+event IncreaseLiquidity:
+    tokenId: indexed(uint256)
+    liquidity: uint128
+    amount0: uint256
+    amount1: uint256
+
+event DecreaseLiquidity:
+    tokenId: indexed(uint256)
+    liquidity: uint128
+    amount0: uint256
+    amount1: uint256
+
+event Collect:
+    tokenId: indexed(uint256)
+    recipient: address
+    amount0: uint256
+    amount1: uint256
+
+# erc721
+ownerOf: public(HashMap[uint256, address])
+balanceOf: public(HashMap[address, uint256])
+getApproved: public(HashMap[uint256, address])
+isApprovedForAll: public(HashMap[address, HashMap[address, bool]])
+
+# positions
+positionData: HashMap[uint256, Position]
+nextTokenId: uint256
+
+# transient (mint callback)
+callbackPool: transient(address)
+callbackPayer: transient(address)
+
+ERC165_INTERFACE_ID: constant(bytes4) = 0x01ffc9a7
+ERC721_INTERFACE_ID: constant(bytes4) = 0x80ac58cd
+
+
+@deploy
+def __init__():
+    self.nextTokenId = 1
+
+
+@view
+@external
+def name() -> String[32]:
+    return "Mock Positions NFT"
+
+
+@view
+@external
+def symbol() -> String[8]:
+    return "MOCK-POS"
+
+
+@view
+@external
+def supportsInterface(_interfaceId: bytes4) -> bool:
+    return _interfaceId in [ERC165_INTERFACE_ID, ERC721_INTERFACE_ID]
+
+
+##########
+# Erc721 #
+##########
+
+
+@external
+def approve(_approved: address, _tokenId: uint256):
+    owner: address = self.ownerOf[_tokenId]
+    assert owner != empty(address) # dev: invalid token
+    assert msg.sender == owner or self.isApprovedForAll[owner][msg.sender] # dev: no perms
+    self.getApproved[_tokenId] = _approved
+    log Approval(owner=owner, approved=_approved, tokenId=_tokenId)
+
+
+@external
+def setApprovalForAll(_operator: address, _approved: bool):
+    self.isApprovedForAll[msg.sender][_operator] = _approved
+    log ApprovalForAll(owner=msg.sender, operator=_operator, approved=_approved)
+
+
+@external
+def transferFrom(_from: address, _to: address, _tokenId: uint256):
+    self._transferFrom(_from, _to, _tokenId)
+
+
+@external
+def safeTransferFrom(_from: address, _to: address, _tokenId: uint256, _data: Bytes[1024] = b""):
+    self._transferFrom(_from, _to, _tokenId)
+    if _to.is_contract:
+        response: bytes4 = staticcall ERC721Receiver(_to).onERC721Received(msg.sender, _from, _tokenId, _data)
+        assert response == method_id("onERC721Received(address,address,uint256,bytes)", output_type=bytes4) # dev: invalid receiver
+
+
+@internal
+def _transferFrom(_from: address, _to: address, _tokenId: uint256):
+    assert self._isAuthorized(msg.sender, _tokenId) # dev: no perms
+    assert self.ownerOf[_tokenId] == _from # dev: invalid owner
+    assert _to != empty(address) # dev: invalid recipient
+
+    self.getApproved[_tokenId] = empty(address)
+    self.balanceOf[_from] -= 1
+    self.balanceOf[_to] += 1
+    self.ownerOf[_tokenId] = _to
+    log Transfer(sender=_from, receiver=_to, tokenId=_tokenId)
+
+
+@view
+@internal
+def _isAuthorized(_spender: address, _tokenId: uint256) -> bool:
+    owner: address = self.ownerOf[_tokenId]
+    return _spender == owner or self.getApproved[_tokenId] == _spender or self.isApprovedForAll[owner][_spender]
+
+
+#############
+# Positions #
+#############
+
+
+@external
+def increaseLiquidity(_params: IncreaseLiquidityParams) -> (uint128, uint256, uint256):
+    assert _params.deadline >= block.timestamp # dev: expired
+    position: Position = self.positionData[_params.tokenId]
+    assert position.pool != empty(address) # dev: invalid token
+
+    liquidity: uint128 = 0
+    amount0: uint256 = 0
+    amount1: uint256 = 0
+    liquidity, amount0, amount1 = self._addLiquidity(position.pool, _params.amount0Desired, _params.amount1Desired, _params.amount0Min, _params.amount1Min)
+
+    position.liquidity += liquidity
+    self.positionData[_params.tokenId] = position
+    log IncreaseLiquidity(tokenId=_params.tokenId, liquidity=liquidity, amount0=amount0, amount1=amount1)
+    return liquidity, amount0, amount1
+
+
+@external
+def decreaseLiquidity(_params: DecreaseLiquidityParams) -> (uint256, uint256):
+    assert _params.deadline >= block.timestamp # dev: expired
+    assert self._isAuthorized(msg.sender, _params.tokenId) # dev: no perms
+    position: Position = self.positionData[_params.tokenId]
+    assert _params.liquidity != 0 and _params.liquidity <= position.liquidity # dev: invalid liquidity
+
+    # tokens are held here until collected
+    amount0: uint256 = 0
+    amount1: uint256 = 0
+    amount0, amount1 = extcall ClPool(position.pool).burn(_params.liquidity)
+    assert amount0 >= _params.amount0Min and amount1 >= _params.amount1Min # dev: price slippage check
+
+    position.liquidity -= _params.liquidity
+    position.tokensOwed0 += convert(amount0, uint128)
+    position.tokensOwed1 += convert(amount1, uint128)
+    self.positionData[_params.tokenId] = position
+    log DecreaseLiquidity(tokenId=_params.tokenId, liquidity=_params.liquidity, amount0=amount0, amount1=amount1)
+    return amount0, amount1
+
+
+@external
+def collect(_params: CollectParams) -> (uint256, uint256):
+    assert self._isAuthorized(msg.sender, _params.tokenId) # dev: no perms
+    position: Position = self.positionData[_params.tokenId]
+
+    amount0: uint128 = min(position.tokensOwed0, _params.amount0Max)
+    amount1: uint128 = min(position.tokensOwed1, _params.amount1Max)
+    position.tokensOwed0 -= amount0
+    position.tokensOwed1 -= amount1
+    self.positionData[_params.tokenId] = position
+
+    if amount0 != 0:
+        assert extcall IERC20(position.token0).transfer(_params.recipient, convert(amount0, uint256), default_return_value=True) # dev: transfer failed
+    if amount1 != 0:
+        assert extcall IERC20(position.token1).transfer(_params.recipient, convert(amount1, uint256), default_return_value=True) # dev: transfer failed
+
+    log Collect(tokenId=_params.tokenId, recipient=_params.recipient, amount0=convert(amount0, uint256), amount1=convert(amount1, uint256))
+    return convert(amount0, uint256), convert(amount1, uint256)
+
+
+@external
+def burn(_tokenId: uint256):
+    assert self._isAuthorized(msg.sender, _tokenId) # dev: no perms
+    position: Position = self.positionData[_tokenId]
+    assert position.liquidity == 0 and position.tokensOwed0 == 0 and position.tokensOwed1 == 0 # dev: not cleared
+
+    owner: address = self.ownerOf[_tokenId]
+    self.positionData[_tokenId] = empty(Position)
+    self.getApproved[_tokenId] = empty(address)
+    self.ownerOf[_tokenId] = empty(address)
+    self.balanceOf[owner] -= 1
+    log Transfer(sender=owner, receiver=empty(address), tokenId=_tokenId)
+
+
+@external
+def uniswapV3MintCallback(_amount0Owed: uint256, _amount1Owed: uint256, _data: Bytes[256]):
+    pool: address = self.callbackPool
+    assert msg.sender == pool # dev: no perms
+
+    payer: address = self.callbackPayer
+    if _amount0Owed != 0:
+        assert extcall IERC20(staticcall ClPool(pool).token0()).transferFrom(payer, pool, _amount0Owed, default_return_value=True) # dev: transfer failed
+    if _amount1Owed != 0:
+        assert extcall IERC20(staticcall ClPool(pool).token1()).transferFrom(payer, pool, _amount1Owed, default_return_value=True) # dev: transfer failed
+
+
+# internal
+
+
+@internal
+def _mintPosition(
+    _pool: address,
+    _poolParam: uint24,
+    _tickLower: int24,
+    _tickUpper: int24,
+    _amount0Desired: uint256,
+    _amount1Desired: uint256,
+    _amount0Min: uint256,
+    _amount1Min: uint256,
+    _recipient: address,
+    _deadline: uint256,
+) -> (uint256, uint128, uint256, uint256):
+    assert _deadline >= block.timestamp # dev: expired
+    assert _pool != empty(address) # dev: invalid pool
+    assert _tickLower < _tickUpper # dev: invalid ticks
+    assert _recipient != empty(address) # dev: invalid recipient
+
+    liquidity: uint128 = 0
+    amount0: uint256 = 0
+    amount1: uint256 = 0
+    liquidity, amount0, amount1 = self._addLiquidity(_pool, _amount0Desired, _amount1Desired, _amount0Min, _amount1Min)
+
+    tokenId: uint256 = self.nextTokenId
+    self.nextTokenId = tokenId + 1
+    self.positionData[tokenId] = Position(
+        pool=_pool,
+        token0=staticcall ClPool(_pool).token0(),
+        token1=staticcall ClPool(_pool).token1(),
+        poolParam=_poolParam,
+        tickLower=_tickLower,
+        tickUpper=_tickUpper,
+        liquidity=liquidity,
+        tokensOwed0=0,
+        tokensOwed1=0,
+    )
+    self.ownerOf[tokenId] = _recipient
+    self.balanceOf[_recipient] += 1
+    log Transfer(sender=empty(address), receiver=_recipient, tokenId=tokenId)
+    log IncreaseLiquidity(tokenId=tokenId, liquidity=liquidity, amount0=amount0, amount1=amount1)
+    return tokenId, liquidity, amount0, amount1
+
+
+@internal
+def _addLiquidity(
+    _pool: address,
+    _amount0Desired: uint256,
+    _amount1Desired: uint256,
+    _amount0Min: uint256,
+    _amount1Min: uint256,
+) -> (uint128, uint256, uint256):
+    liquidity: uint128 = staticcall ClPool(_pool).getLiquidityForAmounts(_amount0Desired, _amount1Desired)
+    assert liquidity != 0 # dev: no liquidity
+
+    self.callbackPool = _pool
+    self.callbackPayer = msg.sender
+    amount0: uint256 = 0
+    amount1: uint256 = 0
+    amount0, amount1 = extcall ClPool(_pool).mint(self, liquidity, b"")
+    self.callbackPool = empty(address)
+    self.callbackPayer = empty(address)
+
+    assert amount0 >= _amount0Min and amount1 >= _amount1Min # dev: price slippage check
+    return liquidity, amount0, amount1
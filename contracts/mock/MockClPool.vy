@@ -0,0 +1,277 @@
+# SPDX-License-Identifier: MIT
+# Underscore Protocol License: https://github.com/underscore-finance/underscore/blob/main/licenses/MIT_LICENSE
+# Underscore Protocol (C) 2025 Hightop Financial, Inc.
+# @version 0.4.1
+
+# NOTE: local stand-in for a uniswap v3 / aerodrome slipstream pool.
+# All liquidity is full range, so the pool behaves like a constant product pool
+# over its reserves (swap fees compound into the reserves). No ticks, oracle or flash swaps.
+# `slot0()` returns the 7 uni v3 fields, slipstream legos decode the first 6 of them.
+
+from ethereum.ercs import IERC20
+
+interface SwapCallback:
+    def uniswapV3SwapCallback(_amount0Delta: int256, _amount1Delta: int256, _data: Bytes[256]): nonpayable
+
+interface MintCallback:
+    def uniswapV3MintCallback(_amount0Owed: uint256, _amount1Owed: uint256, _data: Bytes[256]): nonpayable
+
+event Swap:
+    sender: indexed(address)
+    recipient: indexed(address)
+    amount0: int256
+    amount1: int256
+    sqrtPriceX96: uint160
+    liquidity: uint128
+
+event Mint:
+    owner: indexed(address)
+    amount: uint128
+    amount0: uint256
+    amount1: uint256
+
+event Burn:
+    owner: indexed(address)
+    amount: uint128
+    amount0: uint256
+    amount1: uint256
+
+token0: public(immutable(address))
+token1: public(immutable(address))
+fee: public(immutable(uint24)) # 1_000_000 denominator
+tickSpacing: public(immutable(int24))
+
+liquidity: public(uint128)
+reserve0: public(uint256)
+reserve1: public(uint256)
+sqrtPriceX96: public(uint160)
+positionLiquidity: public(HashMap[address, uint128])
+
+FEE_DENOMINATOR: constant(uint256) = 1_000_000
+Q96: constant(uint256) = 2 ** 96
+
+
+@deploy
+def __init__(_tokenA: address, _tokenB: address, _fee: uint24, _tickSpacing: int24, _sqrtPriceX96: uint160):
+    assert empty(address) not in [_tokenA, _tokenB] # dev: invalid tokens
+    assert _tokenA != _tokenB # dev: invalid tokens
+    assert convert(_fee, uint256) < FEE_DENOMINATOR # dev: invalid fee
+    assert _sqrtPriceX96 != 0 # dev: invalid price
+
+    # sorted, same as the real factories. `_sqrtPriceX96` is token1 per token0
+    tokenA: address = _tokenA
+    tokenB: address = _tokenB
+    if convert(_tokenB, uint256) < convert(_tokenA, uint256):
+        tokenA = _tokenB
+        tokenB = _tokenA
+
+    token0 = tokenA
+    token1 = tokenB
+
+    fee = _fee
+    tickSpacing = _tickSpacing
+    self.sqrtPriceX96 = _sqrtPriceX96
+
+
+@view
+@external
+def slot0() -> (uint160, int24, uint16, uint16, uint16, uint8, bool):
+    return self.sqrtPriceX96, 0, 0, 1, 1, 0, True
+
+
+########
+# Swap #
+########
+
+
+@external
+def swap(_recipient: address, _zeroForOne: bool, _amountSpecified: int256, _sqrtPriceLimitX96: uint160, _data: Bytes[256]) -> (int256, int256):
+    assert _amountSpecified != 0 # dev: invalid amount
+
+    reserveIn: uint256 = self.reserve1
+    reserveOut: uint256 = self.reserve0
+    tokenIn: address = token1
+    tokenOut: address = token0
+    if _zeroForOne:
+        reserveIn = self.reserve0
+        reserveOut = self.reserve1
+        tokenIn = token0
+        tokenOut = token1
+
+    # positive amount is exact input, negative is exact output
+    amountIn: uint256 = 0
+    amountOut: uint256 = 0
+    if _amountSpecified > 0:
+        amountIn = convert(_amountSpecified, uint256)
+        amountOut = self._getAmountOut(amountIn, reserveIn, reserveOut)
+    else:
+        amountOut = convert(-_amountSpecified, uint256)
+        amountIn = self._getAmountIn(amountOut, reserveIn, reserveOut)
+    assert amountOut != 0 and amountOut < reserveOut # dev: insufficient liquidity
+
+    # optimistic transfer, then collect input via callback
+    assert extcall IERC20(tokenOut).transfer(_recipient, amountOut, default_return_value=True) # dev: transfer failed
+
+    amount0: int256 = 0
+    amount1: int256 = 0
+    if _zeroForOne:
+        amount0 = convert(amountIn, int256)
+        amount1 = -convert(amountOut, int256)
+    else:
+        amount0 = -convert(amountOut, int256)
+        amount1 = convert(amountIn, int256)
+
+    preBalanceIn: uint256 = staticcall IERC20(tokenIn).balanceOf(self)
+    extcall SwapCallback(msg.sender).uniswapV3SwapCallback(amount0, amount1, _data)
+    assert staticcall IERC20(tokenIn).balanceOf(self) >= preBalanceIn + amountIn # dev: insufficient input
+
+    self._update()
+    log Swap(sender=msg.sender, recipient=_recipient, amount0=amount0, amount1=amount1, sqrtPriceX96=self.sqrtPriceX96, liquidity=self.liquidity)
+    return amount0, amount1
+
+
+##########
+# Quotes #
+##########
+
+
+@view
+@external
+def quoteExactInput(_zeroForOne: bool, _amountIn: uint256) -> uint256:
+    if _zeroForOne:
+        return self._getAmountOut(_amountIn, self.reserve0, self.reserve1)
+    return self._getAmountOut(_amountIn, self.reserve1, self.reserve0)
+
+
+@view
+@external
+def quoteExactOutput(_zeroForOne: bool, _amountOut: uint256) -> uint256:
+    if _zeroForOne:
+        return self._getAmountIn(_amountOut, self.reserve0, self.reserve1)
+    return self._getAmountIn(_amountOut, self.reserve1, self.reserve0)
+
+
+#############
+# Liquidity #
+#############
+
+
+@view
+@external
+def getLiquidityForAmounts(_amount0: uint256, _amount1: uint256) -> uint128:
+    return convert(self._getLiquidityForAmounts(_amount0, _amount1), uint128)
+
+
+@view
+@external
+def getAmountsForLiquidity(_liquidity: uint128) -> (uint256, uint256):
+    return self._getAmountsForLiquidity(convert(_liquidity, uint256), False)
+
+
+@external
+def mint(_recipient: address, _amount: uint128, _data: Bytes[256]) -> (uint256, uint256):
+    assert _amount != 0 # dev: invalid amount
+
+    amount0: uint256 = 0
+    amount1: uint256 = 0
+    amount0, amount1 = self._getAmountsForLiquidity(convert(_amount, uint256), True)
+
+    preBalance0: uint256 = staticcall IERC20(token0).balanceOf(self)
+    preBalance1: uint256 = staticcall IERC20(token1).balanceOf(self)
+    extcall MintCallback(msg.sender).uniswapV3MintCallback(amount0, amount1, _data)
+    assert staticcall IERC20(token0).balanceOf(self) >= preBalance0 + amount0 # dev: insufficient token0
+    assert staticcall IERC20(token1).balanceOf(self) >= preBalance1 + amount1 # dev: insufficient token1
+
+    self.positionLiquidity[_recipient] += _amount
+    self.liquidity += _amount
+    self._update()
+    log Mint(owner=_recipient, amount=_amount, amount0=amount0, amount1=amount1)
+    return amount0, amount1
+
+
+# NOTE: unlike uni v3, withdrawn tokens go straight to the position owner (no `collect()` on the pool)
+@external
+def burn(_amount: uint128) -> (uint256, uint256):
+    assert _amount != 0 # dev: invalid amount
+    assert self.positionLiquidity[msg.sender] >= _amount # dev: insufficient liquidity
+
+    amount0: uint256 = 0
+    amount1: uint256 = 0
+    amount0, amount1 = self._getAmountsForLiquidity(convert(_amount, uint256), False)
+
+    self.positionLiquidity[msg.sender] -= _amount
+    self.liquidity -= _amount
+    assert extcall IERC20(token0).transfer(msg.sender, amount0, default_return_value=True) # dev: transfer failed
+    assert extcall IERC20(token1).transfer(msg.sender, amount1, default_return_value=True) # dev: transfer failed
+
+    self._update()
+    log Burn(owner=msg.sender, amount=_amount, amount0=amount0, amount1=amount1)
+    return amount0, amount1
+
+
+############
+# Internal #
+############
+
+
+@internal
+def _update():
+    reserve0: uint256 = staticcall IERC20(token0).balanceOf(self)
+    reserve1: uint256 = staticcall IERC20(token1).balanceOf(self)
+    self.reserve0 = reserve0
+    self.reserve1 = reserve1
+
+    # price only moves once there is liquidity, otherwise keep the initial price
+    if reserve0 != 0 and reserve1 != 0:
+        self.sqrtPriceX96 = convert(isqrt(reserve1 * 2 ** 128 // reserve0) * 2 ** 32, uint160)
+
+
+@view
+@internal
+def _getAmountOut(_amountIn: uint256, _reserveIn: uint256, _reserveOut: uint256) -> uint256:
+    if _amountIn == 0 or _reserveIn == 0 or _reserveOut == 0:
+        return 0
+    amountInWithFee: uint256 = _amountIn * (FEE_DENOMINATOR - convert(fee, uint256))
+    return amountInWithFee * _reserveOut // (_reserveIn * FEE_DENOMINATOR + amountInWithFee)
+
+
+@view
+@internal
+def _getAmountIn(_amountOut: uint256, _reserveIn: uint256, _reserveOut: uint256) -> uint256:
+    if _amountOut == 0 or _amountOut >= _reserveOut:
+        return max_value(uint256)
+    numerator: uint256 = _reserveIn * _amountOut * FEE_DENOMINATOR
+    denominator: uint256 = (_reserveOut - _amountOut) * (FEE_DENOMINATOR - convert(fee, uint256))
+    return numerator // denominator + 1
+
+
+@view
+@internal
+def _getLiquidityForAmounts(_amount0: uint256, _amount1: uint256) -> uint256:
+    totalLiquidity: uint256 = convert(self.liquidity, uint256)
+
+    # first deposit, full range liquidity at current price: x = L / sqrtP, y = L * sqrtP
+    if totalLiquidity == 0:
+        sqrtPriceX96: uint256 = convert(self.sqrtPriceX96, uint256)
+        return min(_amount0 * sqrtPriceX96 // Q96, _amount1 * Q96 // sqrtPriceX96)
+
+    return min(_amount0 * totalLiquidity // self.reserve0, _amount1 * totalLiquidity // self.reserve1)
+
+
+@view
+@internal
+def _getAmountsForLiquidity(_liquidity: uint256, _roundUp: bool) -> (uint256, uint256):
+    totalLiquidity: uint256 = convert(self.liquidity, uint256)
+    if totalLiquidity == 0:
+        sqrtPriceX96: uint256 = convert(self.sqrtPriceX96, uint256)
+        return self._mulDiv(_liquidity, Q96, sqrtPriceX96, _roundUp), self._mulDiv(_liquidity, sqrtPriceX96, Q96, _roundUp)
+    return self._mulDiv(_liquidity, self.reserve0, totalLiquidity, _roundUp), self._mulDiv(_liquidity, self.reserve1, totalLiquidity, _roundUp)
+
+
+@pure
+@internal
+def _mulDiv(_a: uint256, _b: uint256, _denominator: uint256, _roundUp: bool) -> uint256:
+    result: uint256 = _a * _b // _denominator
+    if _roundUp and _a * _b % _denominator != 0:
+        result += 1
+    return result
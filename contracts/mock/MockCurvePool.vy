@@ -0,0 +1,429 @@
+# SPDX-License-Identifier: MIT
+# Underscore Protocol License: https://github.com/underscore-finance/underscore/blob/main/licenses/MIT_LICENSE
+# Underscore Protocol (C) 2025 Hightop Financial, Inc.
+# @version 0.4.1
+
+# NOTE: local stand-in for a 2-coin curve stableswap-ng pool (plain tokens only).
+# Same invariant math as stableswap-ng, charging the base fee only (no dynamic fee, no admin fee,
+# no oracles, no `exchange_received`). The pool is its own lp token, like stableswap-ng.
+
+from ethereum.ercs import IERC20
+from ethereum.ercs import IERC20Detailed
+
+event Transfer:
+    sender: indexed(address)
+    receiver: indexed(address)
+    value: uint256
+
+event Approval:
+    owner: indexed(address)
+    spender: indexed(address)
+    value: uint256
+
+event TokenExchange:
+    buyer: indexed(address)
+    sold_id: int128
+    tokens_sold: uint256
+    bought_id: int128
+    tokens_bought: uint256
+
+event AddLiquidity:
+    provider: indexed(address)
+    token_amounts: DynArray[uint256, N_COINS]
+    invariant: uint256
+    token_supply: uint256
+
+event RemoveLiquidity:
+    provider: indexed(address)
+    token_amounts: DynArray[uint256, N_COINS]
+    token_supply: uint256
+
+event RemoveLiquidityOne:
+    provider: indexed(address)
+    token_id: int128
+    token_amount: uint256
+    coin_amount: uint256
+    token_supply: uint256
+
+# lp token
+balanceOf: public(HashMap[address, uint256])
+allowance: public(HashMap[address, HashMap[address, uint256]])
+totalSupply: public(uint256)
+
+# pool
+coins: public(address[N_COINS])
+balances: public(uint256[N_COINS])
+fee: public(immutable(uint256)) # 10 ** 10 denominator
+RATES: immutable(uint256[N_COINS])
+AMP: immutable(uint256) # A * A_PRECISION
+
+N_COINS: public(constant(uint256)) = 2
+A_PRECISION: constant(uint256) = 100
+FEE_DENOMINATOR: constant(uint256) = 10 ** 10
+PRECISION: constant(uint256) = 10 ** 18
+MAX_ITERATIONS: constant(uint256) = 255
+
+
+@deploy
+def __init__(_coinA: address, _coinB: address, _A: uint256, _fee: uint256):
+    assert empty(address) not in [_coinA, _coinB] # dev: invalid coins
+    assert _coinA != _coinB # dev: invalid coins
+    assert _A != 0 # dev: invalid A
+    assert _fee < FEE_DENOMINATOR // 2 # dev: invalid fee
+
+    self.coins = [_coinA, _coinB]
+    fee = _fee
+    AMP = _A * A_PRECISION
+
+    # rates normalize every coin to 18 decimals
+    decimalsA: uint256 = convert(staticcall IERC20Detailed(_coinA).decimals(), uint256)
+    decimalsB: uint256 = convert(staticcall IERC20Detailed(_coinB).decimals(), uint256)
+    RATES = [10 ** (36 - decimalsA), 10 ** (36 - decimalsB)]
+
+
+############
+# Lp Token #
+############
+
+
+@view
+@external
+def name() -> String[32]:
+    return "Mock Curve LP"
+
+
+@view
+@external
+def symbol() -> String[8]:
+    return "MOCK-CRV"
+
+
+@view
+@external
+def decimals() -> uint8:
+    return 18
+
+
+@external
+def transfer(_recipient: address, _amount: uint256) -> bool:
+    self.balanceOf[msg.sender] -= _amount
+    self.balanceOf[_recipient] += _amount
+    log Transfer(sender=msg.sender, receiver=_recipient, value=_amount)
+    return True
+
+
+@external
+def transferFrom(_sender: address, _recipient: address, _amount: uint256) -> bool:
+    self.allowance[_sender][msg.sender] -= _amount
+    self.balanceOf[_sender] -= _amount
+    self.balanceOf[_recipient] += _amount
+    log Transfer(sender=_sender, receiver=_recipient, value=_amount)
+    return True
+
+
+@external
+def approve(_spender: address, _amount: uint256) -> bool:
+    self.allowance[msg.sender][_spender] = _amount
+    log Approval(owner=msg.sender, spender=_spender, value=_amount)
+    return True
+
+
+@internal
+def _mint(_recipient: address, _amount: uint256):
+    self.totalSupply += _amount
+    self.balanceOf[_recipient] += _amount
+    log Transfer(sender=empty(address), receiver=_recipient, value=_amount)
+
+
+@internal
+def _burn(_owner: address, _amount: uint256):
+    self.totalSupply -= _amount
+    self.balanceOf[_owner] -= _amount
+    log Transfer(sender=_owner, receiver=empty(address), value=_amount)
+
+
+########
+# Swap #
+########
+
+
+@external
+def exchange(_i: int128, _j: int128, _dx: uint256, _min_dy: uint256, _receiver: address = msg.sender) -> uint256:
+    i: uint256 = convert(_i, uint256)
+    j: uint256 = convert(_j, uint256)
+    assert i != j and j < N_COINS # dev: invalid coins
+
+    dy: uint256 = self._getDy(i, j, _dx)
+    assert dy >= _min_dy # dev: exchange resulted in fewer coins than expected
+
+    assert extcall IERC20(self.coins[i]).transferFrom(msg.sender, self, _dx, default_return_value=True) # dev: transfer failed
+    assert extcall IERC20(self.coins[j]).transfer(_receiver, dy, default_return_value=True) # dev: transfer failed
+
+    # swap fee stays in the pool
+    self.balances[i] += _dx
+    self.balances[j] -= dy
+    log TokenExchange(buyer=msg.sender, sold_id=_i, tokens_sold=_dx, bought_id=_j, tokens_bought=dy)
+    return dy
+
+
+@view
+@external
+def get_dy(_i: int128, _j: int128, _dx: uint256) -> uint256:
+    return self._getDy(convert(_i, uint256), convert(_j, uint256), _dx)
+
+
+#############
+# Liquidity #
+#############
+
+
+@external
+def add_liquidity(_amounts: DynArray[uint256, N_COINS], _min_mint_amount: uint256, _receiver: address = msg.sender) -> uint256:
+    assert len(_amounts) == N_COINS # dev: invalid amounts
+
+    oldBalances: uint256[N_COINS] = self.balances
+    newBalances: uint256[N_COINS] = oldBalances
+    for i: uint256 in range(N_COINS):
+        if _amounts[i] != 0:
+            assert extcall IERC20(self.coins[i]).transferFrom(msg.sender, self, _amounts[i], default_return_value=True) # dev: transfer failed
+            newBalances[i] += _amounts[i]
+
+    mintAmount: uint256 = 0
+    invariant: uint256 = 0
+    mintAmount, invariant = self._calcTokenAmount(oldBalances, newBalances)
+    assert mintAmount != 0 # dev: nothing minted
+    assert mintAmount >= _min_mint_amount # dev: slippage screwed you
+
+    self.balances = newBalances
+    self._mint(_receiver, mintAmount)
+    log AddLiquidity(provider=msg.sender, token_amounts=_amounts, invariant=invariant, token_supply=self.totalSupply)
+    return mintAmount
+
+
+@external
+def remove_liquidity(_burn_amount: uint256, _min_amounts: DynArray[uint256, N_COINS], _receiver: address = msg.sender, _claim_admin_fees: bool = True) -> DynArray[uint256, N_COINS]:
+    assert len(_min_amounts) == N_COINS # dev: invalid amounts
+    totalSupply: uint256 = self.totalSupply
+    assert _burn_amount != 0 and _burn_amount <= totalSupply # dev: invalid burn amount
+
+    amounts: DynArray[uint256, N_COINS] = []
+    for i: uint256 in range(N_COINS):
+        amount: uint256 = self.balances[i] * _burn_amount // totalSupply
+        assert amount >= _min_amounts[i] # dev: withdrawal resulted in fewer coins than expected
+        self.balances[i] -= amount
+        amounts.append(amount)
+        assert extcall IERC20(self.coins[i]).transfer(_receiver, amount, default_return_value=True) # dev: transfer failed
+
+    self._burn(msg.sender, _burn_amount)
+    log RemoveLiquidity(provider=msg.sender, token_amounts=amounts, token_supply=self.totalSupply)
+    return amounts
+
+
+@external
+def remove_liquidity_one_coin(_burn_amount: uint256, _i: int128, _min_received: uint256, _receiver: address = msg.sender) -> uint256:
+    i: uint256 = convert(_i, uint256)
+    dy: uint256 = self._calcWithdrawOneCoin(_burn_amount, i)
+    assert dy >= _min_received # dev: not enough coins removed
+
+    self.balances[i] -= dy
+    self._burn(msg.sender, _burn_amount)
+    assert extcall IERC20(self.coins[i]).transfer(_receiver, dy, default_return_value=True) # dev: transfer failed
+    log RemoveLiquidityOne(provider=msg.sender, token_id=_i, token_amount=_burn_amount, coin_amount=dy, token_supply=self.totalSupply)
+    return dy
+
+
+@view
+@external
+def calc_token_amount(_amounts: DynArray[uint256, N_COINS], _is_deposit: bool) -> uint256:
+    assert len(_amounts) == N_COINS # dev: invalid amounts
+
+    oldBalances: uint256[N_COINS] = self.balances
+    newBalances: uint256[N_COINS] = oldBalances
+    for i: uint256 in range(N_COINS):
+        if _is_deposit:
+            newBalances[i] += _amounts[i]
+        else:
+            newBalances[i] -= _amounts[i]
+
+    if _is_deposit:
+        mintAmount: uint256 = 0
+        na: uint256 = 0
+        mintAmount, na = self._calcTokenAmount(oldBalances, newBalances)
+        return mintAmount
+
+    # withdrawal, lp tokens needed (fees charged on imbalance)
+    d0: uint256 = self._getDMem(oldBalances)
+    d2: uint256 = self._getDMem(self._chargeImbalanceFees(oldBalances, newBalances, d0))
+    return (d0 - d2) * self.totalSupply // d0
+
+
+@view
+@external
+def calc_withdraw_one_coin(_burn_amount: uint256, _i: int128) -> uint256:
+    return self._calcWithdrawOneCoin(_burn_amount, convert(_i, uint256))
+
+
+#########
+# Views #
+#########
+
+
+@view
+@external
+def A() -> uint256:
+    return AMP // A_PRECISION
+
+
+@view
+@external
+def A_precise() -> uint256:
+    return AMP
+
+
+@view
+@external
+def get_virtual_price() -> uint256:
+    totalSupply: uint256 = self.totalSupply
+    if totalSupply == 0:
+        return 0
+    return self._getDMem(self.balances) * PRECISION // totalSupply
+
+
+@view
+@external
+def stored_rates() -> DynArray[uint256, N_COINS]:
+    return [RATES[0], RATES[1]]
+
+
+############
+# Internal #
+############
+
+
+@view
+@internal
+def _getDy(_i: uint256, _j: uint256, _dx: uint256) -> uint256:
+    xp: uint256[N_COINS] = self._xpMem(self.balances)
+    x: uint256 = xp[_i] + _dx * RATES[_i] // PRECISION
+    y: uint256 = self._getY(x, self._getD(xp))
+    dy: uint256 = xp[_j] - y - 1
+    dyFee: uint256 = dy * fee // FEE_DENOMINATOR
+    return (dy - dyFee) * PRECISION // RATES[_j]
+
+
+@view
+@internal
+def _calcTokenAmount(_oldBalances: uint256[N_COINS], _newBalances: uint256[N_COINS]) -> (uint256, uint256):
+    d1: uint256 = self._getDMem(_newBalances)
+    totalSupply: uint256 = self.totalSupply
+    if totalSupply == 0:
+        return d1, d1
+
+    d0: uint256 = self._getDMem(_oldBalances)
+    assert d1 > d0 # dev: invalid invariant
+    d2: uint256 = self._getDMem(self._chargeImbalanceFees(_oldBalances, _newBalances, d0))
+    return totalSupply * (d2 - d0) // d0, d1
+
+
+@view
+@internal
+def _chargeImbalanceFees(_oldBalances: uint256[N_COINS], _newBalances: uint256[N_COINS], _d0: uint256) -> uint256[N_COINS]:
+    d1: uint256 = self._getDMem(_newBalances)
+    baseFee: uint256 = fee * N_COINS // (4 * (N_COINS - 1))
+
+    balances: uint256[N_COINS] = _newBalances
+    for i: uint256 in range(N_COINS):
+        idealBalance: uint256 = d1 * _oldBalances[i] // _d0
+        difference: uint256 = 0
+        if idealBalance > _newBalances[i]:
+            difference = idealBalance - _newBalances[i]
+        else:
+            difference = _newBalances[i] - idealBalance
+        balances[i] -= baseFee * difference // FEE_DENOMINATOR
+    return balances
+
+
+@view
+@internal
+def _calcWithdrawOneCoin(_burnAmount: uint256, _i: uint256) -> uint256:
+    xp: uint256[N_COINS] = self._xpMem(self.balances)
+    d0: uint256 = self._getD(xp)
+    d1: uint256 = d0 - _burnAmount * d0 // self.totalSupply
+    newY: uint256 = self._getY(xp[1 - _i], d1)
+
+    baseFee: uint256 = fee * N_COINS // (4 * (N_COINS - 1))
+    xpReduced: uint256[N_COINS] = xp
+    for j: uint256 in range(N_COINS):
+        dxExpected: uint256 = 0
+        if j == _i:
+            dxExpected = xp[j] * d1 // d0 - newY
+        else:
+            dxExpected = xp[j] - xp[j] * d1 // d0
+        xpReduced[j] -= baseFee * dxExpected // FEE_DENOMINATOR
+
+    dy: uint256 = xpReduced[_i] - self._getY(xpReduced[1 - _i], d1)
+    return (dy - 1) * PRECISION // RATES[_i]
+
+
+@view
+@internal
+def _xpMem(_balances: uint256[N_COINS]) -> uint256[N_COINS]:
+    return [RATES[0] * _balances[0] // PRECISION, RATES[1] * _balances[1] // PRECISION]
+
+
+@view
+@internal
+def _getDMem(_balances: uint256[N_COINS]) -> uint256:
+    return self._getD(self._xpMem(_balances))
+
+
+@view
+@internal
+def _getD(_xp: uint256[N_COINS]) -> uint256:
+    s: uint256 = _xp[0] + _xp[1]
+    if s == 0:
+        return 0
+
+    d: uint256 = s
+    ann: uint256 = AMP * N_COINS
+    for _: uint256 in range(MAX_ITERATIONS):
+        dP: uint256 = d
+        for x: uint256 in _xp:
+            dP = dP * d // x
+        dP //= N_COINS ** N_COINS
+        dPrev: uint256 = d
+        d = (ann * s // A_PRECISION + dP * N_COINS) * d // ((ann - A_PRECISION) * d // A_PRECISION + (N_COINS + 1) * dP)
+        if d > dPrev:
+            if d - dPrev <= 1:
+                return d
+        elif dPrev - d <= 1:
+            return d
+
+    raise "D did not converge"
+
+
+@view
+@internal
+def _getY(_x: uint256, _d: uint256) -> uint256:
+    # 2 coins, so `_x` is the only other balance
+    ann: uint256 = AMP * N_COINS
+    c: uint256 = _d * _d // (_x * N_COINS)
+    c = c * _d * A_PRECISION // (ann * N_COINS)
+    b: uint256 = _x + _d * A_PRECISION // ann
+    return self._solveY(b, c, _d)
+
+
+@pure
+@internal
+def _solveY(_b: uint256, _c: uint256, _d: uint256) -> uint256:
+    y: uint256 = _d
+    for _: uint256 in range(MAX_ITERATIONS):
+        yPrev: uint256 = y
+        y = (y * y + _c) // (2 * y + _b - _d)
+        if y > yPrev:
+            if y - yPrev <= 1:
+                return y
+        elif yPrev - y <= 1:
+            return y
+
+    raise "y did not converge"
@@ -0,0 +1,215 @@
+# SPDX-License-Identifier: MIT
+# Underscore Protocol License: https://github.com/underscore-finance/underscore/blob/main/licenses/MIT_LICENSE
+# Underscore Protocol (C) 2025 Hightop Financial, Inc.
+# @version 0.4.1
+
+# NOTE: local stand-in for the curve address provider, meta registry, stableswap-ng factory
+# and rate provider, all in one. Only 2-coin `MockCurvePool.vy` pools get registered here.
+
+from ethereum.ercs import IERC20Detailed
+
+interface CurvePool:
+    def get_dy(_i: int128, _j: int128, _dx: uint256) -> uint256: view
+    def balances(_i: uint256) -> uint256: view
+    def coins(_i: uint256) -> address: view
+
+struct Quote:
+    source_token_index: uint256
+    dest_token_index: uint256
+    is_underlying: bool
+    amount_out: uint256
+    pool: address
+    source_token_pool_balance: uint256
+    dest_token_pool_balance: uint256
+    pool_type: uint8
+
+event PoolRegistered:
+    pool: indexed(address)
+    coin0: indexed(address)
+    coin1: indexed(address)
+
+pools: public(DynArray[address, MAX_POOLS])
+is_registered: public(HashMap[address, bool])
+poolsForCoins: HashMap[address, HashMap[address, DynArray[address, MAX_POOLS]]]
+
+# curve address provider ids
+META_REGISTRY_ID: constant(uint256) = 7
+STABLESWAP_NG_FACTORY_ID: constant(uint256) = 12
+RATE_PROVIDER_ID: constant(uint256) = 18
+
+N_COINS: constant(uint256) = 2
+MAX_POOLS: constant(uint256) = 50
+MAX_QUOTES: constant(uint256) = 100
+STABLESWAP_POOL_TYPE: constant(uint8) = 1
+
+
+@deploy
+def __init__():
+    pass
+
+
+@view
+@external
+def get_address(_id: uint256) -> address:
+    if _id in [META_REGISTRY_ID, STABLESWAP_NG_FACTORY_ID, RATE_PROVIDER_ID]:
+        return self
+    return empty(address)
+
+
+@external
+def registerPool(_pool: address) -> bool:
+    assert not self.is_registered[_pool] # dev: pool exists
+    coin0: address = staticcall CurvePool(_pool).coins(0)
+    coin1: address = staticcall CurvePool(_pool).coins(1)
+
+    self.is_registered[_pool] = True
+    self.pools.append(_pool)
+    self.poolsForCoins[coin0][coin1].append(_pool)
+    self.poolsForCoins[coin1][coin0].append(_pool)
+    log PoolRegistered(pool=_pool, coin0=coin0, coin1=coin1)
+    return True
+
+
+#################
+# Meta Registry #
+#################
+
+
+@view
+@external
+def find_pools_for_coins(_from: address, _to: address) -> DynArray[address, MAX_POOLS]:
+    return self.poolsForCoins[_from][_to]
+
+
+@view
+@external
+def get_coin_indices(_pool: address, _from: address, _to: address) -> (int128, int128, bool):
+    if _from == staticcall CurvePool(_pool).coins(0):
+        return 0, 1, False
+    return 1, 0, False
+
+
+@view
+@external
+def get_registry_handlers_from_pool(_pool: address) -> address[10]:
+    handlers: address[10] = empty(address[10])
+    if self.is_registered[_pool]:
+        handlers[0] = self
+    return handlers
+
+
+@view
+@external
+def get_base_registry(_addr: address) -> address:
+    # every pool here is a stableswap-ng pool
+    return self
+
+
+@view
+@external
+def get_pool_from_lp_token(_lpToken: address) -> address:
+    if self.is_registered[_lpToken]:
+        return _lpToken
+    return empty(address)
+
+
+@view
+@external
+def get_lp_token(_pool: address) -> address:
+    if self.is_registered[_pool]:
+        return _pool
+    return empty(address)
+
+
+@view
+@external
+def get_coins(_pool: address) -> address[8]:
+    coins: address[8] = empty(address[8])
+    if not self.is_registered[_pool]:
+        return coins
+    for i: uint256 in range(N_COINS):
+        coins[i] = staticcall CurvePool(_pool).coins(i)
+    return coins
+
+
+@view
+@external
+def get_balances(_pool: address) -> uint256[8]:
+    balances: uint256[8] = empty(uint256[8])
+    if not self.is_registered[_pool]:
+        return balances
+    for i: uint256 in range(N_COINS):
+        balances[i] = staticcall CurvePool(_pool).balances(i)
+    return balances
+
+
+@view
+@external
+def get_n_coins(_pool: address) -> uint256:
+    if self.is_registered[_pool]:
+        return N_COINS
+    return 0
+
+
+@view
+@external
+def is_meta(_pool: address) -> bool:
+    return False
+
+
+#################
+# Rate Provider #
+#################
+
+
+@view
+@external
+def get_quotes(_tokenIn: address, _tokenOut: address, _amountIn: uint256) -> DynArray[Quote, MAX_QUOTES]:
+    return self._getQuotes(_tokenIn, _tokenOut, _amountIn)
+
+
+@view
+@external
+def get_aggregated_rate(_tokenIn: address, _tokenOut: address) -> uint256:
+    amountIn: uint256 = 10 ** convert(staticcall IERC20Detailed(_tokenIn).decimals(), uint256)
+    quotes: DynArray[Quote, MAX_QUOTES] = self._getQuotes(_tokenIn, _tokenOut, amountIn)
+
+    # weighted by the source token balance of each pool
+    weightedSum: uint256 = 0
+    totalWeight: uint256 = 0
+    for quote: Quote in quotes:
+        weightedSum += quote.amount_out * quote.source_token_pool_balance
+        totalWeight += quote.source_token_pool_balance
+
+    if totalWeight == 0:
+        return 0
+    return weightedSum // totalWeight
+
+
+@view
+@internal
+def _getQuotes(_tokenIn: address, _tokenOut: address, _amountIn: uint256) -> DynArray[Quote, MAX_QUOTES]:
+    quotes: DynArray[Quote, MAX_QUOTES] = []
+    for pool: address in self.poolsForCoins[_tokenIn][_tokenOut]:
+        i: uint256 = 0
+        j: uint256 = 1
+        if _tokenIn != staticcall CurvePool(pool).coins(0):
+            i = 1
+            j = 0
+
+        balanceIn: uint256 = staticcall CurvePool(pool).balances(i)
+        balanceOut: uint256 = staticcall CurvePool(pool).balances(j)
+        if balanceIn == 0 or balanceOut == 0:
+            continue
+
+        quotes.append(Quote(
+            source_token_index=i,
+            dest_token_index=j,
+            is_underlying=False,
+            amount_out=staticcall CurvePool(pool).get_dy(convert(i, int128), convert(j, int128), _amountIn),
+            pool=pool,
+            source_token_pool_balance=balanceIn,
+            dest_token_pool_balance=balanceOut,
+            pool_type=STABLESWAP_POOL_TYPE,
+        ))
+    return quotes
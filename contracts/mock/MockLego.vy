@@ -6,6 +6,7 @@
 implements: LegoDex
 implements: LegoYield
 implements: LegoCommon
+implements: LegoDirect
 initializes: yld
 initializes: gov
 
@@ -18,6 +19,7 @@ from ethereum.ercs import IERC20
 from interfaces import LegoDex
 from interfaces import LegoYield
 from interfaces import LegoCommon
+from interfaces import LegoDirect
 
 interface Erc4626Interface:
     def redeem(_vaultTokenAmount: uint256, _recipient: address, _owner: address) -> uint256: nonpayable
@@ -29,6 +31,13 @@ interface Erc4626Interface:
 
 interface OracleRegistry:
     def getUsdValue(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: view
+    def getUsdValueAndMemoize(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: nonpayable
+
+interface LegoRegistry:
+    def isDirectLego(_legoId: uint256) -> bool: view
+
+interface AgentFactory:
+    def isUserWallet(_addr: address) -> bool: view
 
 interface AddyRegistry:
     def getAddy(_addyId: uint256) -> address: view
@@ -201,6 +210,14 @@ def _getUsdValue(_asset: address, _amount: uint256, _oracleRegistry: address) ->
     return staticcall OracleRegistry(oracleRegistry).getUsdValue(_asset, _amount)
 
 
+@internal
+def _getUsdValueAndMemoize(_asset: address, _amount: uint256, _oracleRegistry: address) -> uint256:
+    oracleRegistry: address = _oracleRegistry
+    if _oracleRegistry == empty(address):
+        oracleRegistry = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
+    return extcall OracleRegistry(oracleRegistry).getUsdValueAndMemoize(_asset, _amount)
+
+
 # other
 
 
@@ -255,7 +272,7 @@ def depositTokens(
         assert extcall IERC20(_asset).transfer(msg.sender, refundAssetAmount, default_return_value=True) # dev: transfer failed
         depositAmount -= refundAssetAmount
 
-    usdValue: uint256 = self._getUsdValue(_asset, depositAmount, _oracleRegistry)
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, depositAmount, _oracleRegistry)
     log MockLegoDeposit(sender=msg.sender, asset=_asset, vaultToken=_vault, assetAmountDeposited=depositAmount, usdValue=usdValue, vaultTokenAmountReceived=vaultTokenAmountReceived, recipient=_recipient)
     return depositAmount, _vault, vaultTokenAmountReceived, refundAssetAmount, usdValue
 
@@ -305,11 +322,69 @@ def withdrawTokens(
         assert extcall IERC20(_vaultToken).transfer(msg.sender, refundVaultTokenAmount, default_return_value=True) # dev: transfer failed
         vaultTokenAmount -= refundVaultTokenAmount
 
-    usdValue: uint256 = self._getUsdValue(_asset, assetAmountReceived, _oracleRegistry)
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, assetAmountReceived, _oracleRegistry)
     log MockLegoWithdrawal(sender=msg.sender, asset=_asset, vaultToken=_vaultToken, assetAmountReceived=assetAmountReceived, usdValue=usdValue, vaultTokenAmountBurned=vaultTokenAmount, recipient=_recipient)
     return assetAmountReceived, vaultTokenAmount, refundVaultTokenAmount, usdValue
 
 
+###############
+# Direct Mode #
+###############
+
+
+@view
+@external
+def isDirectVault(_asset: address, _vault: address) -> bool:
+    return yld.indexOfAssetOpportunity[_asset][_vault] != 0
+
+
+@view
+@internal
+def _isValidDirectCaller(_caller: address) -> bool:
+    # only user wallets, and only while this lego is registered for direct mode
+    agentFactory: address = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(1)
+    if not staticcall AgentFactory(agentFactory).isUserWallet(_caller):
+        return False
+    legoRegistry: address = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(2)
+    return staticcall LegoRegistry(legoRegistry).isDirectLego(self.legoId)
+
+
+@external
+def onDirectDeposit(
+    _asset: address,
+    _vault: address,
+    _assetAmount: uint256,
+    _vaultTokenAmount: uint256,
+    _oracleRegistry: address = empty(address),
+) -> uint256:
+    assert self.isActivated # dev: not activated
+    assert self._isValidDirectCaller(msg.sender) # dev: no perms
+    assert yld.indexOfAssetOpportunity[_asset][_vault] != 0 # dev: asset + vault not supported
+    assert _vaultTokenAmount != 0 # dev: no vault tokens received
+
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, _assetAmount, _oracleRegistry)
+    log MockLegoDeposit(sender=msg.sender, asset=_asset, vaultToken=_vault, assetAmountDeposited=_assetAmount, usdValue=usdValue, vaultTokenAmountReceived=_vaultTokenAmount, recipient=msg.sender)
+    return usdValue
+
+
+@external
+def onDirectWithdrawal(
+    _asset: address,
+    _vaultToken: address,
+    _assetAmount: uint256,
+    _vaultTokenAmount: uint256,
+    _oracleRegistry: address = empty(address),
+) -> uint256:
+    assert self.isActivated # dev: not activated
+    assert self._isValidDirectCaller(msg.sender) # dev: no perms
+    assert yld.indexOfAssetOpportunity[_asset][_vaultToken] != 0 # dev: asset + vault not supported
+    assert _assetAmount != 0 # dev: no asset amount received
+
+    usdValue: uint256 = self._getUsdValueAndMemoize(_asset, _assetAmount, _oracleRegistry)
+    log MockLegoWithdrawal(sender=msg.sender, asset=_asset, vaultToken=_vaultToken, assetAmountReceived=_assetAmount, usdValue=usdValue, vaultTokenAmountBurned=_vaultTokenAmount, recipient=msg.sender)
+    return usdValue
+
+
 ########
 # Swap #
 ########
@@ -345,7 +420,7 @@ def swapTokens(
     assert staticcall IERC20(tokenOut).balanceOf(self) >= tokenInAmount # dev: need equivalent amount of `tokenOut`
     assert extcall IERC20(tokenOut).transfer(_recipient, tokenInAmount, default_return_value=True) # dev: transfer failed
 
-    usdValue: uint256 = self._getUsdValue(tokenIn, tokenInAmount, _oracleRegistry)
+    usdValue: uint256 = self._getUsdValueAndMemoize(tokenIn, tokenInAmount, _oracleRegistry)
     return tokenInAmount, tokenInAmount, 0, usdValue
 
 
@@ -0,0 +1,38 @@
+# SPDX-License-Identifier: MIT
+# Underscore Protocol License: https://github.com/underscore-finance/underscore/blob/main/licenses/MIT_LICENSE
+# Underscore Protocol (C) 2025 Hightop Financial, Inc.
+# @version 0.4.1
+
+# NOTE: local stand-in for Multicall3 (0xcA11bde05977b3631167028862bE2a173976CA11), `aggregate3` only.
+# Same selector + abi as the real one, with bounded calls / calldata / return data.
+
+struct Call3:
+    target: address
+    allowFailure: bool
+    callData: Bytes[MAX_CALLDATA]
+
+struct Result:
+    success: bool
+    returnData: Bytes[MAX_RETURN_DATA]
+
+MAX_CALLS: constant(uint256) = 128
+MAX_CALLDATA: constant(uint256) = 256
+MAX_RETURN_DATA: constant(uint256) = 1024
+
+
+@deploy
+def __init__():
+    pass
+
+
+@view
+@external
+def aggregate3(_calls: DynArray[Call3, MAX_CALLS]) -> DynArray[Result, MAX_CALLS]:
+    results: DynArray[Result, MAX_CALLS] = []
+    for c: Call3 in _calls:
+        success: bool = False
+        returnData: Bytes[MAX_RETURN_DATA] = b""
+        success, returnData = raw_call(c.target, c.callData, max_outsize=MAX_RETURN_DATA, is_static_call=True, revert_on_failure=False)
+        assert success or c.allowFailure # dev: call failed
+        results.append(Result(success=success, returnData=returnData))
+    return results
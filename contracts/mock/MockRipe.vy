@@ -0,0 +1,41 @@
+# SPDX-License-Identifier: MIT
+# Underscore Protocol License: https://github.com/underscore-finance/underscore/blob/main/licenses/MIT_LICENSE
+# Underscore Protocol (C) 2025 Hightop Financial, Inc.
+# @version 0.4.1
+
+# ripe hq + price desk in one
+
+event PriceSnapshotAdded:
+    asset: indexed(address)
+
+addys: public(HashMap[uint256, address])
+numSnapshots: public(HashMap[address, uint256])
+
+
+@deploy
+def __init__():
+    pass
+
+
+# ripe hq
+
+
+@view
+@external
+def getAddr(_regId: uint256) -> address:
+    return self.addys[_regId]
+
+
+@external
+def setAddr(_regId: uint256, _addr: address):
+    self.addys[_regId] = _addr
+
+
+# price desk
+
+
+@external
+def addPriceSnapshot(_asset: address) -> bool:
+    self.numSnapshots[_asset] += 1
+    log PriceSnapshotAdded(asset=_asset)
+    return True
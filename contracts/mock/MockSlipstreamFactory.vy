@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: MIT
+# Underscore Protocol License: https://github.com/underscore-finance/underscore/blob/main/licenses/MIT_LICENSE
+# Underscore Protocol (C) 2025 Hightop Financial, Inc.
+# @version 0.4.1
+
+# NOTE: local stand-in for the aerodrome slipstream factory, also serves as the quoter.
+# Pools are deployed separately (`MockClPool.vy`) and registered here.
+
+interface ClPool:
+    def quoteExactInput(_zeroForOne: bool, _amountIn: uint256) -> uint256: view
+    def quoteExactOutput(_zeroForOne: bool, _amountOut: uint256) -> uint256: view
+    def sqrtPriceX96() -> uint160: view
+    def token0() -> address: view
+    def token1() -> address: view
+    def tickSpacing() -> int24: view
+
+struct QuoteExactInputSingleParams:
+    tokenIn: address
+    tokenOut: address
+    amountIn: uint256
+    tickSpacing: int24
+    sqrtPriceLimitX96: uint160
+
+struct QuoteExactOutputSingleParams:
+    tokenIn: address
+    tokenOut: address
+    amount: uint256
+    tickSpacing: int24
+    sqrtPriceLimitX96: uint160
+
+event PoolRegistered:
+    token0: indexed(address)
+    token1: indexed(address)
+    tickSpacing: int24
+    pool: address
+
+getPool: public(HashMap[address, HashMap[address, HashMap[int24, address]]])
+
+
+@deploy
+def __init__():
+    pass
+
+
+@external
+def registerPool(_pool: address) -> bool:
+    token0: address = staticcall ClPool(_pool).token0()
+    token1: address = staticcall ClPool(_pool).token1()
+    tickSpacing: int24 = staticcall ClPool(_pool).tickSpacing()
+    assert self.getPool[token0][token1][tickSpacing] == empty(address) # dev: pool exists
+
+    self.getPool[token0][token1][tickSpacing] = _pool
+    self.getPool[token1][token0][tickSpacing] = _pool
+    log PoolRegistered(token0=token0, token1=token1, tickSpacing=tickSpacing, pool=_pool)
+    return True
+
+
+##########
+# Quoter #
+##########
+
+
+@view
+@external
+def quoteExactInputSingle(_params: QuoteExactInputSingleParams) -> (uint256, uint160, uint32, uint256):
+    pool: address = self.getPool[_params.tokenIn][_params.tokenOut][_params.tickSpacing]
+    assert pool != empty(address) # dev: no pool
+    zeroForOne: bool = _params.tokenIn == staticcall ClPool(pool).token0()
+    amountOut: uint256 = staticcall ClPool(pool).quoteExactInput(zeroForOne, _params.amountIn)
+    return amountOut, staticcall ClPool(pool).sqrtPriceX96(), 0, 0
+
+
+@view
+@external
+def quoteExactOutputSingle(_params: QuoteExactOutputSingleParams) -> (uint256, uint160, uint32, uint256):
+    pool: address = self.getPool[_params.tokenIn][_params.tokenOut][_params.tickSpacing]
+    assert pool != empty(address) # dev: no pool
+    zeroForOne: bool = _params.tokenIn == staticcall ClPool(pool).token0()
+    amountIn: uint256 = staticcall ClPool(pool).quoteExactOutput(zeroForOne, _params.amount)
+    return amountIn, staticcall ClPool(pool).sqrtPriceX96(), 0, 0
@@ -0,0 +1,91 @@
+# SPDX-License-Identifier: MIT
+# Underscore Protocol License: https://github.com/underscore-finance/underscore/blob/main/licenses/MIT_LICENSE
+# Underscore Protocol (C) 2025 Hightop Financial, Inc.
+# @version 0.4.1
+
+# NOTE: local stand-in for the aerodrome slipstream nft position manager
+
+initializes: clNft
+exports: clNft.__interface__
+
+import contracts.mock.MockClNftManager as clNft
+
+interface SlipstreamFactory:
+    def getPool(_tokenA: address, _tokenB: address, _tickSpacing: int24) -> address: view
+
+struct MintParams:
+    token0: address
+    token1: address
+    tickSpacing: int24
+    tickLower: int24
+    tickUpper: int24
+    amount0Desired: uint256
+    amount1Desired: uint256
+    amount0Min: uint256
+    amount1Min: uint256
+    recipient: address
+    deadline: uint256
+    sqrtPriceX96: uint160
+
+struct PositionData:
+    nonce: uint96
+    operator: address
+    token0: address
+    token1: address
+    tickSpacing: uint24
+    tickLower: int24
+    tickUpper: int24
+    liquidity: uint128
+    feeGrowthInside0LastX128: uint256
+    feeGrowthInside1LastX128: uint256
+    tokensOwed0: uint128
+    tokensOwed1: uint128
+
+FACTORY: public(immutable(address))
+
+
+@deploy
+def __init__(_factory: address):
+    assert _factory != empty(address) # dev: invalid factory
+    FACTORY = _factory
+    clNft.__init__()
+
+
+@external
+def mint(_params: MintParams) -> (uint256, uint128, uint256, uint256):
+    # pools are created via the factory, not on mint
+    assert _params.sqrtPriceX96 == 0 # dev: pool creation not supported
+    pool: address = staticcall SlipstreamFactory(FACTORY).getPool(_params.token0, _params.token1, _params.tickSpacing)
+    return clNft._mintPosition(
+        pool,
+        convert(_params.tickSpacing, uint24),
+        _params.tickLower,
+        _params.tickUpper,
+        _params.amount0Desired,
+        _params.amount1Desired,
+        _params.amount0Min,
+        _params.amount1Min,
+        _params.recipient,
+        _params.deadline,
+    )
+
+
+@view
+@external
+def positions(_tokenId: uint256) -> PositionData:
+    position: clNft.Position = clNft.positionData[_tokenId]
+    assert position.pool != empty(address) # dev: invalid token
+    return PositionData(
+        nonce=0,
+        operator=clNft.getApproved[_tokenId],
+        token0=position.token0,
+        token1=position.token1,
+        tickSpacing=position.poolParam,
+        tickLower=position.tickLower,
+        tickUpper=position.tickUpper,
+        liquidity=position.liquidity,
+        feeGrowthInside0LastX128=0,
+        feeGrowthInside1LastX128=0,
+        tokensOwed0=position.tokensOwed0,
+        tokensOwed1=position.tokensOwed1,
+    )
@@ -16,6 +16,9 @@ import interfaces.OraclePartnerInterface as OraclePartner
 interface AddyRegistry:
     def getAddy(_addyId: uint256) -> address: view
 
+interface OracleRegistry:
+    def clearPriceMemo() -> bool: nonpayable
+
 struct CustomOracleData:
     price: uint256
     publishTime: uint256
@@ -97,6 +100,7 @@ def setPrice(_asset: address, _price: uint256):
     )
     oad._addAsset(_asset)
     log CustomPriceSet(asset=_asset, price=_price)
+    self._clearPriceMemo()
 
 
 # disable price feed
@@ -110,9 +114,18 @@ def disablePriceFeed(_asset: address) -> bool:
     self.priceData[_asset] = empty(CustomOracleData)
     oad._removeAsset(_asset)
     log CustomPriceDisabled(asset=_asset)
+    self._clearPriceMemo()
     return True
 
 
+@internal
+def _clearPriceMemo():
+    # prices memoized earlier in this tx are stale now
+    oracleRegistry: address = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
+    if oracleRegistry != empty(address):
+        extcall OracleRegistry(oracleRegistry).clearPriceMemo()
+
+
 ##########
 # Config #
 ##########
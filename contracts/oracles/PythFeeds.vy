@@ -22,6 +22,9 @@ interface PythNetwork:
 interface AddyRegistry:
     def getAddy(_addyId: uint256) -> address: view
 
+interface OracleRegistry:
+    def clearPriceMemo() -> bool: nonpayable
+
 struct PythPrice:
     price: int64
     confidence: uint64
@@ -151,14 +154,42 @@ def _hasPriceFeed(_asset: address) -> bool:
 ################
 
 
+@payable
 @external
-def updatePythPrices(_payloads: DynArray[Bytes[2048], MAX_PRICE_UPDATES]):
+def updatePythPrices(_payloads: DynArray[Bytes[2048], MAX_PRICE_UPDATES], _refundRecipient: address = msg.sender) -> uint256:
+    """
+    @notice Push Pyth price updates
+    @dev Fees are paid from msg.value first, then this contract's balance. Unused msg.value is refunded.
+    @param _payloads The Pyth price update payloads
+    @param _refundRecipient The address to refund unused msg.value to (defaults to msg.sender)
+    @return The total update fee paid
+    """
+    totalFee: uint256 = 0
     for i: uint256 in range(len(_payloads), bound=MAX_PRICE_UPDATES):
         p: Bytes[2048] = _payloads[i]
         feeAmount: uint256 = staticcall PythNetwork(PYTH).getUpdateFee(p)
         assert self.balance >= feeAmount # dev: insufficient balance
         extcall PythNetwork(PYTH).updatePriceFeeds(p, value=feeAmount)
         log PythPriceUpdated(payload=p, feeAmount=feeAmount, caller=msg.sender)
+        totalFee += feeAmount
+
+    if len(_payloads) != 0:
+        self._clearPriceMemo()
+
+    # refund unused eth sent by caller
+    if msg.value > totalFee:
+        assert _refundRecipient != empty(address) # dev: invalid refund recipient
+        # smart accounts (safes etc) need more than the 2300 gas `send` forwards
+        raw_call(_refundRecipient, b"", value=msg.value - totalFee, revert_on_failure=True)
+    return totalFee
+
+
+@internal
+def _clearPriceMemo():
+    # prices memoized earlier in this tx are stale now
+    oracleRegistry: address = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
+    if oracleRegistry != empty(address):
+        extcall OracleRegistry(oracleRegistry).clearPriceMemo()
 
 
 #####################
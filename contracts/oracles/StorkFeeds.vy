@@ -21,6 +21,9 @@ interface StorkNetwork:
 interface AddyRegistry:
     def getAddy(_addyId: uint256) -> address: view
 
+interface OracleRegistry:
+    def clearPriceMemo() -> bool: nonpayable
+
 struct TemporalNumericValue:
     timestampNs: uint64
     quantizedValue: uint256
@@ -136,6 +139,17 @@ def updateStorkPrices(_payloads: DynArray[Bytes[2048], MAX_PRICE_UPDATES]):
         extcall StorkNetwork(STORK).updateTemporalNumericValuesV1(p, value=feeAmount)
         log StorkPriceUpdated(payload=p, feeAmount=feeAmount, caller=msg.sender)
 
+    if len(_payloads) != 0:
+        self._clearPriceMemo()
+
+
+@internal
+def _clearPriceMemo():
+    # prices memoized earlier in this tx are stale now
+    oracleRegistry: address = staticcall AddyRegistry(ADDY_REGISTRY).getAddy(4)
+    if oracleRegistry != empty(address):
+        extcall OracleRegistry(oracleRegistry).clearPriceMemo()
+
 
 #####################
 # Config Price Feed #
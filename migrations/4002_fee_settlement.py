@@ -0,0 +1,53 @@
+from scripts.utils import log
+from scripts.utils.migration import Migration
+
+
+PRICE_SHEETS_ID = 3
+AGENT_FACTORY_ID = 1
+
+
+def migrate(migration: Migration):
+    log.h1("Deploying Price Sheets, wallet templates and Agent Factory for fee settlement")
+
+    blueprint = migration.blueprint()
+    addy_registry = migration.get_address("AddyRegistry")
+    agent_factory = migration.get_contract("AgentFactory")
+    default_agent = agent_factory.getDefaultAgentAddr()
+
+    # new wallets read fee data via `getTransactionFeeSettlementData`, price sheets goes first
+    price_sheets = migration.deploy(
+        'PriceSheets',
+        blueprint.PARAMS["PRICES_MIN_TRIAL_PERIOD"],
+        blueprint.PARAMS["PRICES_MAX_TRIAL_PERIOD"],
+        blueprint.PARAMS["PRICES_MIN_PAY_PERIOD"],
+        blueprint.PARAMS["PRICES_MAX_PAY_PERIOD"],
+        blueprint.PARAMS["PRICES_MIN_PRICE_CHANGE_BUFFER"],
+        addy_registry
+    )
+
+    #  template contracts
+    wallet_funds = migration.deploy_bp("UserWalletTemplate")
+    wallet_config = migration.deploy_bp("UserWalletConfigTemplate")
+    agent_template = migration.deploy_bp("AgentTemplate")
+
+    #  factory contract
+    agent_factory = migration.deploy(
+        "AgentFactory",
+        addy_registry,
+        blueprint.CORE_TOKENS["WETH"],
+        wallet_funds,
+        wallet_config,
+        agent_template,
+        default_agent,
+        blueprint.PARAMS["USER_MIN_OWNER_CHANGE_DELAY"],
+        blueprint.PARAMS["USER_MAX_OWNER_CHANGE_DELAY"]
+    )
+
+    # addy registry is governed by the gov wallet since `3000_wrap_up`, it switches over in this order
+    # (the new price sheets still serves `getTransactionFeeDataWithAmbassadorRatio` to existing wallets)
+    log.h2("Governance steps, in order")
+    log.h3("1. PriceSheets: copy tx price sheet, subscription prices, protocol recipient and ambassador ratio from the current one")
+    log.h3(f"2. AddyRegistry.updateAddyAddr({PRICE_SHEETS_ID}, {price_sheets.address}), then confirmAddyUpdate({PRICE_SHEETS_ID}) once the delay passed")
+    log.h3("3. AgentFactory: set trial funds data, wallet / agent limits and ambassador bonus ratio, then fund trial funds")
+    log.h3(f"4. AddyRegistry.updateAddyAddr({AGENT_FACTORY_ID}, {agent_factory.address}), then confirmAddyUpdate({AGENT_FACTORY_ID}), only after step 2 is confirmed")
+    log.warning("Wallets created from these templates revert on fee-bearing actions until step 2 is confirmed")
@@ -0,0 +1,56 @@
+import click
+import os
+import time
+
+from scripts.utils import log, json_file
+from scripts.utils.deploy_args import BluePrint
+from scripts.utils.deployment_audit import DeploymentAuditor, get_lego_types, load_chainlink_feeds, log_report
+from scripts.utils.migration_helpers import load_vyper_files
+from scripts.utils.portfolio_valuation import MULTICALL3, Multicaller, RpcEthCaller
+
+MIGRATION_HISTORY_DIR = "./migration_history"
+
+
+@click.command()
+@click.option("--rpc", required=True, help="RPC url of the chain the environment is deployed on.")
+@click.option("--environment", default="prod-v3", help="Environment whose current manifest is audited. Defaults to `prod-v3`.")
+@click.option("--blueprint", default="base", help="Blueprint the environment was deployed with. Defaults to `base`.")
+@click.option("--block", default=None, type=int, help="Block to audit at. Defaults to the chain head.")
+@click.option("--chunk-size", default=100, type=int, help="Calls per multicall `eth_call`. Defaults to 100.")
+@click.option("--multicall", default=MULTICALL3, help="Multicall3 address. Defaults to the canonical deployment.")
+@click.option("--skip-code", is_flag=True, help="Only check wiring, don't compile the manifest sources to compare deployed code.")
+@click.option("--out", default=None, help="Json file to write every check to.")
+def cli(rpc, environment, blueprint, block, chunk_size, multicall, skip_code, out):
+    """Check registries, templates, feeds and deployed code against the current manifest, report drift"""
+    manifest_path = f"{MIGRATION_HISTORY_DIR}/{environment}/current-manifest.json"
+    if not os.path.exists(manifest_path):
+        log.error(f"No manifest found at {manifest_path}")
+        return
+    manifest = json_file.load(manifest_path)
+
+    files = load_vyper_files()
+    caller = RpcEthCaller(rpc, block)
+    multicaller = Multicaller(caller, multicall, chunk_size)
+    auditor = DeploymentAuditor(
+        multicaller,
+        manifest,
+        get_lego_types(files, manifest["contracts"].keys()),
+        load_chainlink_feeds(BluePrint(blueprint)),
+    )
+    log.h1(f"Auditing {environment} at block {caller.block_number}")
+
+    started = time.perf_counter()
+    checks = auditor.audit(check_code=not skip_code)
+    log_report(checks)
+    log.h3(f"{multicaller.num_calls} calls in {multicaller.num_eth_calls} eth_calls, {time.perf_counter() - started:.2f}s")
+
+    if out is not None:
+        json_file.save(out, {"environment": environment, "block": caller.block_number, "checks": checks})
+        log.h3(f"Checks written to {out}")
+
+    if len(auditor.drift) != 0:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    cli()
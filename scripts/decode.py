@@ -0,0 +1,38 @@
+import click
+
+from scripts.utils import log
+from scripts.utils.abi_index import DEFAULT_INDEX_PATH, build_abi_index, get_manifest_paths, load_abi_index
+
+
+@click.command()
+@click.option("--calldata", default=None, help="Hex calldata to decode.")
+@click.option("--topic", "topics", multiple=True, help="Log topic(s), topic0 first.")
+@click.option("--data", default="0x", help="Hex log data, with `--topic`.")
+@click.option("--abi-index", "index_path", default=DEFAULT_INDEX_PATH, help=f"Index file. Defaults to `{DEFAULT_INDEX_PATH}`.")
+@click.option("--rebuild", is_flag=True, help="Rebuild the index even if no manifest changed.")
+def cli(calldata, topics, data, index_path, rebuild):
+    """Decode calldata or a log with the selector / topic index built from every manifest"""
+    paths = get_manifest_paths()
+    index = build_abi_index(paths, index_path) if rebuild else load_abi_index(paths, index_path)
+    log.h3(f"Abi index {index_path} over {len(paths)} manifests")
+
+    if calldata is not None:
+        decoded = index.decode_call(calldata)
+        if decoded is None:
+            log.error(f"Unknown selector {calldata[:10]}")
+        else:
+            name, args, contracts = decoded
+            log.info(f"{name}({args}) on {', '.join(contracts)}")
+
+    if len(topics) != 0:
+        decoded = index.decode_log({"topics": list(topics), "data": data})
+        if decoded is None:
+            log.error(f"Unknown event {topics[0]}")
+        else:
+            log.info(f"{decoded[0]}({decoded[1]})")
+
+    index.close()
+
+
+if __name__ == "__main__":
+    cli()
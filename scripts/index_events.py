@@ -0,0 +1,50 @@
+import click
+import os
+
+from scripts.utils import log, json_file
+from scripts.utils.abi_index import DEFAULT_INDEX_PATH, load_abi_index
+from scripts.utils.event_indexer import EventDecoder, EventIndexer, IndexerStore, RpcLogSource
+
+MIGRATION_HISTORY_DIR = "./migration_history"
+
+
+@click.command()
+@click.option("--rpc", required=True, help="RPC url of the chain to index.")
+@click.option("--environment", default="prod-v3", help="Environment whose current manifest provides the abis and factory. Defaults to `prod-v3`.")
+@click.option("--db", "db_path", default=None, help="Sqlite file to index into. Defaults to `./indexer/<environment>.db`.")
+@click.option("--factory", "factories", multiple=True, help="Agent factory address(es) to discover wallets from. Defaults to the manifest `AgentFactory`.")
+@click.option("--start-block", default=0, type=int, help="First block to index (only used on an empty db).")
+@click.option("--to-block", default=None, type=int, help="Last block to index. Defaults to the chain head.")
+@click.option("--confirmations", default=5, type=int, help="Blocks behind head to stay, to avoid most reorgs. Defaults to 5.")
+@click.option("--max-range", default=10_000, type=int, help="Max blocks per `eth_getLogs` request. Defaults to 10,000.")
+@click.option("--abi-index", "index_path", default=DEFAULT_INDEX_PATH, help=f"Prebuilt selector / topic index, rebuilt when manifests change. Defaults to `{DEFAULT_INDEX_PATH}`.")
+def cli(rpc, environment, db_path, factories, start_block, to_block, confirmations, max_range, index_path):
+    """Index wallet, wallet config and agent factory events into a local sqlite db"""
+    manifest_path = f"{MIGRATION_HISTORY_DIR}/{environment}/current-manifest.json"
+    if not os.path.exists(manifest_path):
+        log.error(f"No manifest found at {manifest_path}")
+        return
+
+    decoder = EventDecoder.from_abi_index(load_abi_index(index_path=index_path))
+    if len(factories) == 0:
+        factories = [json_file.load(manifest_path)["contracts"]["AgentFactory"]["address"]]
+
+    if db_path is None:
+        db_path = f"./indexer/{environment}.db"
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+    log.h1(f"Indexing {environment} events into {db_path}")
+    store = IndexerStore(db_path)
+    indexer = EventIndexer(RpcLogSource(rpc), store, decoder, factories, start_block=start_block, max_range=max_range)
+
+    rolled_back = indexer.check_reorg()
+    if rolled_back is not None:
+        log.h2(f"Reorg detected, rolled back to block {rolled_back}")
+
+    num_events = indexer.sync(to_block, confirmations)
+    log.h3(f"{num_events} new events, {len(store.get_wallets())} wallets, indexed to block {store.get_cursor()}")
+    store.close()
+
+
+if __name__ == "__main__":
+    cli()
@@ -2,12 +2,17 @@ import boa.deployments
 import click
 import boa
 
+from scripts.utils import json_file
 from scripts.utils import log
+from scripts.utils import tracing
+from scripts.utils import migration_plan
 from scripts.utils.migration_helpers import get_account, load_vyper_files
+from scripts.utils.precompile import precompile as precompile_files
 from scripts.utils.migration_runner import MigrationRunner
 from scripts.utils.deploy_args import DeployArgs
 
 from boa.environment import Env
+from boa.rpc import EthereumRPC
 import os
 
 MIGRATION_SCRIPTS_DIR = "./migrations"
@@ -60,6 +65,11 @@ CLICK_PROMPTS = {
         "default": "DEPLOYER",
         "help": "Account name for deployment. Defaults to `DEPLOYER`"
     },
+    "reuse_from": {
+        "prompt": "Reuse unchanged contracts from environment (empty for none)",
+        "default": "",
+        "help": "Environment whose contracts are reused when their bytecode and constructor args are unchanged, e.g. `prod-v2`. Calls on reused contracts are skipped, the run fails if such a call wires in a redeployed contract.",
+    },
     "is_retry": {
         "prompt": "Ignore current logs (always run transactions)?",
         "help": "Ignore previous log files",
@@ -119,6 +129,10 @@ def param_prompt(ctx, param, value):
 @click.command()
 @click.option("--silent", is_flag=True, default=False, help="Run command without prompts.")
 @click.option("--fork", is_flag=True, default=False, help="Declare that the migration is running on a fork.")
+@click.option("--precompile", is_flag=True, default=False, help="Compile every contract in a process pool first (filling the compile cache and `build/artifacts`).")
+@click.option("--dry-run", is_flag=True, default=False, help="Simulate the migrations (on a fork of `--rpc` / the chain, or locally) and print the plan, nothing is written to the history.")
+@click.option("--base-fee-gwei", type=float, default=None, help="Base fee for the dry run cost estimate. Defaults to the latest block's base fee of the forked chain.")
+@click.option("--plan-file", default=None, help="Also save the dry run plan as json to this file.")
 @click.option(
     "--rpc",
     default=CLICK_PROMPTS["rpc"]["default"],
@@ -168,6 +182,12 @@ def param_prompt(ctx, param, value):
     help=CLICK_PROMPTS["account"]["help"],
     callback=param_prompt,
 )
+@click.option(
+    "--reuse-from",
+    default=CLICK_PROMPTS["reuse_from"]["default"],
+    help=CLICK_PROMPTS["reuse_from"]["help"],
+    callback=param_prompt,
+)
 @click.option(
     "--is-retry",
     is_flag=True,
@@ -178,6 +198,10 @@ def param_prompt(ctx, param, value):
 def cli(
     silent,
     fork,
+    precompile,
+    dry_run,
+    base_fee_gwei,
+    plan_file,
     is_retry,
     rpc,
     single,
@@ -187,6 +211,7 @@ def cli(
     chain,
     blueprint,
     account,
+    reuse_from,
 ):
     """
     Deploys the protocol by running migration scripts.
@@ -219,7 +244,11 @@ def cli(
 
     sender = get_account(account)
 
-    deploy_args = DeployArgs(sender, chain, ignore_logs=not is_retry, blueprint=blueprint)
+    reuse_manifest = None
+    if reuse_from:
+        reuse_manifest = json_file.load(f"{MIGRATION_HISTORY_DIR}/{reuse_from}/current-manifest.json")
+
+    deploy_args = DeployArgs(sender, chain, ignore_logs=not is_retry, blueprint=blueprint, reuse_manifest=reuse_manifest)
 
     log.h1("Contract Migration")
     log.info(f"Connected to rpc `{final_rpc}`.")
@@ -229,6 +258,8 @@ def cli(
     log.info(f"Running migrations starting with timestamp {start_timestamp}.")
     log.info(f"Chain: {chain}.")
     log.info(f"Fork: {fork}.")
+    if reuse_from:
+        log.info(f"Reusing unchanged contracts from `{reuse_from}` ({len(reuse_manifest['contracts'])} contracts).")
     log.info("")
     vyper_files = load_vyper_files()
     log.info(f"Loaded {len(vyper_files)} Vyper files.")
@@ -239,8 +270,35 @@ def cli(
         f"{MIGRATION_HISTORY_DIR}/{environment}",
         vyper_files
     )
+    if precompile:
+        precompile_files(vyper_files)
+        # cache hits now, still off the main thread
+        migrations.deployers.warm()
 
     boa.deployments.set_deployments_db(boa.deployments.DeploymentsDB(":memory:"))
+    if dry_run:
+        if final_rpc == 'boa':
+            env = boa.set_env(Env())
+            base_fee = 0
+        else:
+            env = boa.fork(final_rpc, allow_dirty=True)
+            base_fee = int(EthereumRPC(final_rpc).fetch("eth_getBlockByNumber", ["latest", False])["baseFeePerGas"], 16)
+        if base_fee_gwei is not None:
+            base_fee = int(base_fee_gwei * 10**9)
+
+        with env:
+            boa.env.set_balance(sender.address, 10*10**18)
+            plan = migrations.dry_run(deploy_args, start_timestamp, end_timestamp, not single, base_fee)
+        migrations.deployers.close()
+
+        migration_plan.log_plan(plan)
+        if plan_file:
+            json_file.save(os.path.abspath(plan_file), plan)
+            log.info(f"Plan saved to {plan_file}")
+        if plan["error"] is not None:
+            raise SystemExit(1)
+        return
+
     if final_rpc == 'boa':
         with boa.set_env(Env()) as env:
             total_gas = migrations.run(
@@ -258,10 +316,13 @@ def cli(
     else:
         with boa.set_network_env(final_rpc) as env:
             env.add_account(sender)
+            tracing.count_rpc_calls(env)
             total_gas = migrations.run(
                 deploy_args, start_timestamp, end_timestamp, not single)
 
+    migrations.deployers.close()
     log.info(f'Total gas used: {total_gas}')
+    tracing.get_tracer().log_summary()
 
     log.info("Done.")
     log.info("")
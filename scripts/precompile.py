@@ -0,0 +1,21 @@
+import click
+
+from scripts.utils import log
+from scripts.utils.migration_helpers import load_vyper_files
+from scripts.utils.precompile import ARTIFACTS_DIR, precompile
+
+
+@click.command()
+@click.option("--workers", default=None, type=int, help="Compiler processes. Defaults to the number of cores.")
+@click.option("--out", default=ARTIFACTS_DIR, help=f"Artifacts directory. Defaults to `{ARTIFACTS_DIR}`.")
+def cli(workers, out):
+    """Compile every contract in parallel, write abi / bytecode / layout / standard json artifacts"""
+    files = load_vyper_files()
+    log.h1(f"Precompiling {len(files)} contracts")
+    index = precompile(files, out, workers)
+    for name, error in index["errors"].items():
+        log.info(f"\t{name}: {error[:120]}")
+
+
+if __name__ == "__main__":
+    cli()
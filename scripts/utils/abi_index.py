@@ -0,0 +1,262 @@
+import glob
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+from eth_abi import decode
+from eth_utils import keccak
+
+from boa.rpc import to_hex
+
+from scripts.utils.abi_utils import abi_type, get_indexing, get_signature, to_json_value
+from scripts.utils.event_indexer import decode_event
+
+
+MIGRATION_HISTORY_DIR = "./migration_history"
+DEPLOYMENTS_MANIFEST = "./deployments/manifest.json"
+DEFAULT_INDEX_PATH = "./indexer/abi-index.bin"
+
+MAGIC = b"ABIX"
+VERSION = 1
+
+# magic, version, meta length, selector slots, topic slots
+HEADER = struct.Struct("<4sIIII")
+# key, payload offset, payload length (0 = empty slot)
+SELECTOR_SLOT = struct.Struct("<4sII")
+TOPIC_SLOT = struct.Struct("<32sII")
+
+
+def get_manifest_paths(history_dir=MIGRATION_HISTORY_DIR, deployments_manifest=DEPLOYMENTS_MANIFEST):
+    """
+    Every manifest of every environment (each holds the abis of its time), plus the deployments manifest.
+    """
+    paths = sorted(glob.glob(os.path.join(history_dir, "*", "*-manifest.json")))
+    if os.path.exists(deployments_manifest):
+        paths.append(deployments_manifest)
+    return paths
+
+
+def get_fingerprint(paths):
+    # cheap change detection, no need to read the manifests
+    fingerprint = []
+    for path in paths:
+        stat = os.stat(path)
+        fingerprint.append([os.path.normpath(path), stat.st_size, stat.st_mtime_ns])
+    return fingerprint
+
+
+def _iter_abis(manifest):
+    # migration manifests keep contracts under `contracts`, the deployments manifest at the top level
+    contracts = manifest.get("contracts", manifest)
+    for name, contract in contracts.items():
+        if isinstance(contract, dict) and isinstance(contract.get("abi"), list):
+            yield name, contract["abi"]
+
+
+def _add_entry(entries, key, variant_key, item, contract):
+    # one entry per variant of a key, the latest abi item wins and contracts accumulate
+    variants = entries.setdefault(key, {})
+    entry = variants.get(variant_key)
+    if entry is None:
+        entry = variants[variant_key] = {"contracts": []}
+    entry.update({
+        "name": item["name"],
+        "signature": get_signature(item),
+        "inputs": [abi_type(i) for i in item["inputs"]],
+        "abi": item,
+    })
+    if contract not in entry["contracts"]:
+        entry["contracts"].append(contract)
+
+
+def _get_num_slots(num_keys):
+    # power of two, at most half full so probes stay short
+    num_slots = 1
+    while num_slots < num_keys * 2:
+        num_slots *= 2
+    return num_slots
+
+
+def _slot_of(key, num_slots):
+    # selectors and topics are hashes already
+    return int.from_bytes(key[:4], "big") & (num_slots - 1)
+
+
+def _build_table(entries, slot_struct, payload):
+    num_slots = _get_num_slots(len(entries))
+    slots = [None] * num_slots
+    for key, variants in entries.items():
+        data = json.dumps(list(variants.values()), separators=(",", ":")).encode()
+        i = _slot_of(key, num_slots)
+        while slots[i] is not None:
+            i = (i + 1) % num_slots
+        slots[i] = (key, len(payload), len(data))
+        payload += data
+
+    table = bytearray()
+    for slot in slots:
+        table += slot_struct.pack(*slot) if slot is not None else slot_struct.pack(b"", 0, 0)
+    return num_slots, bytes(table)
+
+
+def build_abi_index(paths, index_path=DEFAULT_INDEX_PATH):
+    """
+    Reads every manifest once and writes the selector / topic0 hash tables to `index_path`.
+    """
+    functions, events = {}, {}
+    for path in paths:
+        with open(path) as f:
+            manifest = json.load(f)
+        for name, abi in _iter_abis(manifest):
+            for item in abi:
+                if item.get("type") == "function":
+                    _add_entry(functions, keccak(text=get_signature(item))[:4], get_signature(item), item, name)
+                elif item.get("type") == "event" and not item.get("anonymous", False):
+                    _add_entry(events, keccak(text=get_signature(item)), get_indexing(item), item, name)
+
+    payload = bytearray()
+    num_selector_slots, selector_table = _build_table(functions, SELECTOR_SLOT, payload)
+    num_topic_slots, topic_table = _build_table(events, TOPIC_SLOT, payload)
+    meta = json.dumps({"sources": get_fingerprint(paths)}).encode()
+
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(meta), num_selector_slots, num_topic_slots))
+        f.write(meta)
+        f.write(selector_table)
+        f.write(topic_table)
+        f.write(payload)
+    # readers never see a half written index
+    os.replace(tmp_path, index_path)
+    return AbiIndex(index_path)
+
+
+def load_abi_index(paths=None, index_path=DEFAULT_INDEX_PATH):
+    """
+    The index at `index_path`, rebuilt first if it is missing or any manifest changed since it was built.
+    """
+    paths = get_manifest_paths() if paths is None else paths
+    if os.path.exists(index_path):
+        index = AbiIndex(index_path)
+        if index.meta["sources"] == get_fingerprint(paths):
+            return index
+        index.close()
+    return build_abi_index(paths, index_path)
+
+
+class AbiIndex:
+    """
+    Memory mapped selector -> functions and topic0 -> events tables, looked up without loading
+    any manifest. Entries are `{"name", "signature", "inputs", "contracts", "abi"}`; a key has more
+    than one entry on selector clashes, or events sharing a signature but not their indexing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, meta_len, self._num_selector_slots, self._num_topic_slots = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not an abi index (version {VERSION})")
+
+        self.meta = json.loads(self._mm[HEADER.size:HEADER.size + meta_len])
+        self._selector_start = HEADER.size + meta_len
+        self._topic_start = self._selector_start + self._num_selector_slots * SELECTOR_SLOT.size
+        self._payload_start = self._topic_start + self._num_topic_slots * TOPIC_SLOT.size
+        self._cache = {}
+
+    def close(self):
+        self._mm.close()
+
+    def get_functions(self, selector):
+        return self._lookup(_to_bytes(selector), self._selector_start, self._num_selector_slots, SELECTOR_SLOT)
+
+    def get_events(self, topic):
+        return self._lookup(_to_bytes(topic), self._topic_start, self._num_topic_slots, TOPIC_SLOT)
+
+    @property
+    def events(self):
+        # topic0 (hex) -> abi event items, what `EventDecoder` expects
+        return _EventTable(self)
+
+    def decode_call(self, data):
+        """
+        Returns (function name, args, contracts) for calldata, or None if no known function decodes it.
+        """
+        data = _to_bytes(data)
+        for entry in self.get_functions(data[:4]):
+            try:
+                values = decode(entry["inputs"], data[4:])
+            except Exception:
+                continue
+            args = {param["name"]: to_json_value(value) for param, value in zip(entry["abi"]["inputs"], values)}
+            return entry["name"], args, entry["contracts"]
+        return None
+
+    def decode_log(self, log):
+        """
+        Returns (event name, args) for a raw log, or None for unknown events.
+        """
+        if len(log["topics"]) == 0:
+            return None
+        for entry in self.get_events(log["topics"][0]):
+            decoded = decode_event(entry["abi"], log)
+            if decoded is not None:
+                return decoded
+        return None
+
+    def _lookup(self, key, table_start, num_slots, slot_struct):
+        cache_key = (table_start, key)
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+
+        entries = []
+        i = _slot_of(key, num_slots)
+        for _ in range(num_slots):
+            slot_key, offset, length = slot_struct.unpack_from(self._mm, table_start + i * slot_struct.size)
+            if length == 0:
+                break
+            if slot_key == key:
+                start = self._payload_start + offset
+                entries = json.loads(self._mm[start:start + length])
+                break
+            i = (i + 1) % num_slots
+
+        self._cache[cache_key] = entries
+        return entries
+
+    def _iter_keys(self, table_start, num_slots, slot_struct):
+        for i in range(num_slots):
+            slot_key, _, length = slot_struct.unpack_from(self._mm, table_start + i * slot_struct.size)
+            if length != 0:
+                yield slot_key
+
+
+class _EventTable(Mapping):
+    # every indexing variant of a topic, like an `EventDecoder` built from the abis in the same order
+
+    def __init__(self, index):
+        self._index = index
+
+    def __getitem__(self, topic):
+        entries = self._index.get_events(topic)
+        if len(entries) == 0:
+            raise KeyError(topic)
+        return [e["abi"] for e in entries]
+
+    def __iter__(self):
+        for key in self._index._iter_keys(self._index._topic_start, self._index._num_topic_slots, TOPIC_SLOT):
+            yield to_hex(key)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def _to_bytes(value):
+    if isinstance(value, str):
+        return bytes.fromhex(value.removeprefix("0x"))
+    return bytes(value)
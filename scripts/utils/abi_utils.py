@@ -0,0 +1,38 @@
+from eth_utils import to_checksum_address
+
+from boa.rpc import to_hex
+
+
+def to_address(addr):
+    # checksummed address, accepts boa contracts too
+    return to_checksum_address(str(getattr(addr, "address", addr)))
+
+
+def abi_type(param):
+    # canonical type string, expanding tuples (structs)
+    param_type = param["type"]
+    if not param_type.startswith("tuple"):
+        return param_type
+    inner = ",".join(abi_type(c) for c in param["components"])
+    return f"({inner}){param_type[len('tuple'):]}"
+
+
+def get_signature(item):
+    # "Transfer(address,address,uint256)", what selectors and topic0 are hashed from
+    return f"{item['name']}({','.join(abi_type(i) for i in item['inputs'])})"
+
+
+def get_indexing(event):
+    # events sharing a signature (and topic0) can still differ in which inputs are indexed
+    return "".join("1" if i["indexed"] else "0" for i in event["inputs"])
+
+
+def to_json_value(value):
+    # decoded abi value -> json friendly (hex bytes, checksummed addresses, lists for tuples)
+    if isinstance(value, bytes):
+        return to_hex(value)
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(v) for v in value]
+    if isinstance(value, str) and value.startswith("0x") and len(value) == 42:
+        return to_checksum_address(value)
+    return value
@@ -0,0 +1,241 @@
+from eth_abi import encode
+from eth_keys import keys
+from eth_utils import keccak
+
+from scripts.utils.abi_utils import to_address
+
+
+# must match `AgentTemplate.vy`
+AGENT_NAME = "UnderscoreAgent"
+API_VERSION = "0.0.2"
+
+MAX_INSTRUCTIONS = 20
+MAX_SWAP_INSTRUCTIONS = 5
+MAX_TOKEN_PATH = 5
+
+# `Bytes[...]` bounds the contract concatenates instruction encodings into
+MAX_ENCODED_SWAP_INSTRUCTIONS = 2720
+MAX_ENCODED_INSTRUCTIONS = 15360
+
+DOMAIN_TYPE = "EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"
+
+# single actions, all fields are static so these are plain eip-712 structs
+ACTION_TYPES = {
+    "Deposit": "Deposit(address userWallet,uint256 legoId,address asset,address vault,uint256 amount,uint256 expiration)",
+    "Withdrawal": "Withdrawal(address userWallet,uint256 legoId,address asset,address vaultAddr,uint256 withdrawAmount,bool hasVaultToken,uint256 expiration)",
+    "Rebalance": "Rebalance(address userWallet,uint256 fromLegoId,address fromAsset,address fromVaultAddr,uint256 toLegoId,address toVaultAddr,uint256 fromVaultAmount,bool hasFromVaultToken,uint256 expiration)",
+    "AddLiquidity": "AddLiquidity(address userWallet,uint256 legoId,address nftAddr,uint256 nftTokenId,address pool,address tokenA,address tokenB,uint256 amountA,uint256 amountB,int24 tickLower,int24 tickUpper,uint256 minAmountA,uint256 minAmountB,uint256 minLpAmount,uint256 expiration)",
+    "RemoveLiquidity": "RemoveLiquidity(address userWallet,uint256 legoId,address nftAddr,uint256 nftTokenId,address pool,address tokenA,address tokenB,uint256 liqToRemove,uint256 minAmountA,uint256 minAmountB,uint256 expiration)",
+    "Transfer": "Transfer(address userWallet,address recipient,uint256 amount,address asset,uint256 expiration)",
+    "EthToWeth": "EthToWeth(address userWallet,uint256 amount,uint256 depositLegoId,address depositVault,uint256 expiration)",
+    "WethToEth": "WethToEth(address userWallet,uint256 amount,address recipient,uint256 withdrawLegoId,address withdrawVaultAddr,bool hasWithdrawVaultToken,uint256 expiration)",
+    "ClaimRewards": "ClaimRewards(address userWallet,uint256 legoId,address market,address rewardToken,uint256 rewardAmount,bytes32 proof,uint256 expiration)",
+    "Borrow": "Borrow(address userWallet,uint256 legoId,address borrowAsset,uint256 amount,uint256 expiration)",
+    "Repay": "Repay(address userWallet,uint256 legoId,address paymentAsset,uint256 paymentAmount,uint256 expiration)",
+}
+
+SWAP_ACTION_TYPE = "Swap(address userWallet,SwapInstruction[] swapInstructions,uint256 expiration)"
+SWAP_INSTRUCTION_TYPE = "SwapInstruction(uint256 legoId,uint256 amountIn,uint256 minAmountOut,address[] tokenPath,address[] poolPath)"
+BATCH_ACTIONS_TYPE = "BatchActions(address userWallet,ActionInstruction[] instructions,uint256 expiration)"
+ACTION_INSTRUCTION_TYPE = "ActionInstruction(bool usePrevAmountOut,uint256 action,uint256 legoId,address asset,address vault,uint256 amount,uint256 altLegoId,address altAsset,address altVault,uint256 altAmount,uint256 minAmountOut,address pool,bytes32 proof,address nftAddr,uint256 nftTokenId,int24 tickLower,int24 tickUpper,uint256 minAmountA,uint256 minAmountB,uint256 minLpAmount,uint256 liqToRemove,address recipient,bool isWethToEthConversion,SwapInstruction[] swapInstructions)"
+
+# NOTE: the contract does not hash nested structs the eip-712 way. Each instruction is abi encoded
+# (no hash), the encodings are concatenated and passed along as one `bytes` value. The action
+# instruction encoding also carries `hasVaultToken`, which is not in its type string.
+SWAP_INSTRUCTION_ABI = ["bytes32", "uint256", "uint256", "uint256", "address[]", "address[]"]
+ACTION_INSTRUCTION_ABI = [
+    "bytes32",  # type hash
+    "bool", "uint256", "uint256", "address", "address", "uint256", "uint256", "address", "address", "uint256",
+    "uint256", "address", "bytes32", "address", "uint256", "int24", "int24", "uint256", "uint256", "uint256",
+    "uint256", "address", "bool",
+    "bytes",  # encoded swap instructions
+    "bool",  # hasVaultToken
+]
+
+
+def _get_fields(type_str):
+    # "Deposit(address userWallet,uint256 legoId)" -> [("address", "userWallet"), ("uint256", "legoId")]
+    return [tuple(f.split(" ")) for f in type_str[type_str.index("(") + 1:-1].split(",")]
+
+
+def _to_bytes32(value):
+    if isinstance(value, str):
+        value = bytes.fromhex(value.removeprefix("0x"))
+    if len(value) > 32:
+        raise ValueError(f"not a bytes32: {value.hex()}")
+    return bytes(value).ljust(32, b"\x00")
+
+
+def _normalize(abi_type, value):
+    if abi_type == "address":
+        return to_address(value)
+    if abi_type == "bytes32":
+        return _to_bytes32(value)
+    return value
+
+
+ACTION_TYPE_HASHES = {name: keccak(text=type_str) for name, type_str in ACTION_TYPES.items()}
+ACTION_FIELDS = {name: _get_fields(type_str) for name, type_str in ACTION_TYPES.items()}
+SWAP_ACTION_TYPE_HASH = keccak(text=SWAP_ACTION_TYPE)
+SWAP_INSTRUCTION_TYPE_HASH = keccak(text=SWAP_INSTRUCTION_TYPE)
+BATCH_ACTIONS_TYPE_HASH = keccak(text=BATCH_ACTIONS_TYPE)
+ACTION_INSTRUCTION_TYPE_HASH = keccak(text=ACTION_INSTRUCTION_TYPE)
+
+
+############
+# Encoding #
+############
+
+
+def get_domain_separator(agent, chain_id, api_version=API_VERSION):
+    return keccak(
+        keccak(text=DOMAIN_TYPE)
+        + keccak(text=AGENT_NAME)
+        + keccak(text=api_version)
+        + encode(["uint256", "address"], [chain_id, to_address(agent)])
+    )
+
+
+def encode_action(action, **fields):
+    """
+    Struct encoding of a single action, e.g. `encode_action("Deposit", userWallet=..., legoId=..., ...)`.
+    Field names are the ones in the contract's type strings (see `ACTION_TYPES`).
+    """
+    if action not in ACTION_FIELDS:
+        raise ValueError(f"unknown action: {action}")
+
+    types, values = ["bytes32"], [ACTION_TYPE_HASHES[action]]
+    expected = ACTION_FIELDS[action]
+    if set(fields) != {name for _, name in expected}:
+        raise ValueError(f"{action} takes {[name for _, name in expected]}, got {list(fields)}")
+    for abi_type, name in expected:
+        types.append(abi_type)
+        values.append(_normalize(abi_type, fields[name]))
+    return encode(types, values)
+
+
+def encode_swap_instructions(swap_instructions):
+    """
+    `swap_instructions` are `(legoId, amountIn, minAmountOut, tokenPath, poolPath)` tuples, same as the contract args.
+    """
+    if len(swap_instructions) > MAX_SWAP_INSTRUCTIONS:
+        raise ValueError(f"max {MAX_SWAP_INSTRUCTIONS} swap instructions")
+
+    encoded = b""
+    for lego_id, amount_in, min_amount_out, token_path, pool_path in swap_instructions:
+        if len(token_path) > MAX_TOKEN_PATH or len(pool_path) > MAX_TOKEN_PATH - 1:
+            raise ValueError("swap path too long")
+        encoded += encode(SWAP_INSTRUCTION_ABI, [
+            SWAP_INSTRUCTION_TYPE_HASH,
+            lego_id,
+            amount_in,
+            min_amount_out,
+            [to_address(a) for a in token_path],
+            [to_address(a) for a in pool_path],
+        ])
+    if len(encoded) > MAX_ENCODED_SWAP_INSTRUCTIONS:
+        raise ValueError(f"swap instructions encode to {len(encoded)} bytes, max {MAX_ENCODED_SWAP_INSTRUCTIONS}")
+    return encoded
+
+
+def encode_swap_action(user_wallet, swap_instructions, expiration):
+    return encode(
+        ["bytes32", "address", "bytes", "uint256"],
+        [SWAP_ACTION_TYPE_HASH, to_address(user_wallet), encode_swap_instructions(swap_instructions), expiration],
+    )
+
+
+def encode_batch_actions(user_wallet, instructions, expiration):
+    """
+    `instructions` are the 25-field `ActionInstruction` tuples, same as the contract args.
+    Raises if the encoding won't fit the contract's buffer, which can happen below `MAX_INSTRUCTIONS`
+    (each instruction is 864 bytes + 544 per swap instruction, the buffer is 15,360).
+    """
+    if len(instructions) > MAX_INSTRUCTIONS:
+        raise ValueError(f"max {MAX_INSTRUCTIONS} instructions")
+
+    encoded = b""
+    for instruction in instructions:
+        instruction = list(instruction)
+        swap_instructions = instruction[23]
+        values = [_normalize(abi_type, v) for abi_type, v in zip(ACTION_INSTRUCTION_ABI[1:24], instruction[:23])]
+        encoded += encode(ACTION_INSTRUCTION_ABI, [
+            ACTION_INSTRUCTION_TYPE_HASH,
+            *values,
+            encode_swap_instructions(swap_instructions),
+            instruction[24],
+        ])
+    if len(encoded) > MAX_ENCODED_INSTRUCTIONS:
+        raise ValueError(f"instructions encode to {len(encoded)} bytes, max {MAX_ENCODED_INSTRUCTIONS}")
+
+    return encode(
+        ["bytes32", "address", "bytes", "uint256"],
+        [BATCH_ACTIONS_TYPE_HASH, to_address(user_wallet), encoded, expiration],
+    )
+
+
+###########
+# Signing #
+###########
+
+
+class AgentSigner:
+    """
+    Builds the same digests as `AgentTemplate` and signs them locally, no rpc needed.
+    Signatures are `(signature, signer, expiration)`, ready to pass as the contract's `Signature` struct.
+    """
+
+    def __init__(self, private_key, agent, chain_id, api_version=API_VERSION):
+        if isinstance(private_key, str):
+            private_key = bytes.fromhex(private_key.removeprefix("0x"))
+        self.key = keys.PrivateKey(bytes(private_key))
+        self.address = self.key.public_key.to_checksum_address()
+        self.agent = to_address(agent)
+        self.chain_id = chain_id
+        self.domain_separator = get_domain_separator(self.agent, chain_id, api_version)
+
+    def get_digest(self, encoded):
+        return keccak(b"\x19\x01" + self.domain_separator + keccak(encoded))
+
+    def get_action_digest(self, action, **fields):
+        return self.get_digest(encode_action(action, **fields))
+
+    def get_swap_digest(self, user_wallet, swap_instructions, expiration):
+        # same as `AgentTemplate.getSwapActionHash`
+        return self.get_digest(encode_swap_action(user_wallet, swap_instructions, expiration))
+
+    def get_batch_digest(self, user_wallet, instructions, expiration):
+        # same as `AgentTemplate.getBatchActionHash`
+        return self.get_digest(encode_batch_actions(user_wallet, instructions, expiration))
+
+    def sign_digest(self, digest):
+        # packed as r, s, v (v is 27 / 28), what the contract's ecrecover expects
+        sig = self.key.sign_msg_hash(digest)
+        return sig.r.to_bytes(32, "big") + sig.s.to_bytes(32, "big") + bytes([sig.v + 27])
+
+    def _sign(self, digest, expiration):
+        return (self.sign_digest(digest), self.address, expiration)
+
+    def sign_action(self, action, **fields):
+        return self._sign(self.get_action_digest(action, **fields), fields["expiration"])
+
+    def sign_swap(self, user_wallet, swap_instructions, expiration):
+        return self._sign(self.get_swap_digest(user_wallet, swap_instructions, expiration), expiration)
+
+    def sign_batch(self, user_wallet, instructions, expiration):
+        return self._sign(self.get_batch_digest(user_wallet, instructions, expiration), expiration)
+
+    def sign_many(self, requests):
+        """
+        Sign a list of `(kind, args)`: `("swap", (wallet, swap_instructions, expiration))`,
+        `("batch", (wallet, instructions, expiration))` or `("Deposit", {field: value})` etc.
+        """
+        signatures = []
+        for kind, args in requests:
+            if kind == "swap":
+                signatures.append(self.sign_swap(*args))
+            elif kind == "batch":
+                signatures.append(self.sign_batch(*args))
+            else:
+                signatures.append(self.sign_action(kind, **args))
+        return signatures
@@ -11,11 +11,13 @@ class BluePrint:
 
 
 class DeployArgs:
-    def __init__(self, sender, chain, ignore_logs, blueprint):
+    def __init__(self, sender, chain, ignore_logs, blueprint, reuse_manifest=None):
         self.sender = sender
         self.chain = chain
         self.ignore_logs = ignore_logs
         self.blueprint = BluePrint(blueprint)
+        # manifest of another environment, unchanged contracts from it are reused instead of deployed
+        self.reuse_manifest = reuse_manifest
 
 
 class LegoType:
@@ -0,0 +1,71 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import boa
+from vyper.compiler.output import build_abi_output
+
+from scripts.utils import tracing
+
+
+class DeployerRegistry:
+    """
+    Compiled deployers (`boa.load_partial`) by contract name, each compiled at most once per run.
+    Shared by every migration of a run, also serves ABIs to the manifest writer.
+
+    `warm` compiles in the background, so compiling overlaps with waiting on the network.
+    The vyper compiler keeps global state, so compiles never run at the same time.
+    """
+
+    def __init__(self, files):
+        self._files = files
+        self._deployers = {}
+        self._abis = {}
+        self._compile_lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def files(self):
+        return self._files
+
+    def __contains__(self, name):
+        return name in self._deployers
+
+    def get(self, name):
+        deployer = self._deployers.get(name)
+        if deployer is not None:
+            return deployer
+        with tracing.span(name, "compile", file=self._files[name]):
+            return self._compile(name)
+
+    def get_abi(self, name):
+        if name not in self._abis:
+            self._abis[name] = build_abi_output(self.get(name).compiler_data)
+        return self._abis[name]
+
+    def warm(self, names=None):
+        """
+        Compiles `names` (all files by default) in a background worker, returns right away.
+        Failures are left for `get` to raise when the contract is actually needed.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="deployer-registry")
+        return [self._executor.submit(self._try_compile, name) for name in (names or self._files.keys())]
+
+    def close(self):
+        # drop whatever wasn't compiled yet, doesn't wait for the rest of the queue
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _compile(self, name):
+        with self._compile_lock:
+            if name not in self._deployers:
+                self._deployers[name] = boa.load_partial(self._files[name])
+            return self._deployers[name]
+
+    def _try_compile(self, name):
+        try:
+            self._compile(name)
+            return True
+        except Exception:
+            return False
@@ -0,0 +1,240 @@
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+from boa.util.eip5202 import DEFAULT_BLUEPRINT_PREAMBLE
+from eth_utils import keccak
+from vyper.cli.vyper_json import compile_json
+
+from scripts.utils import log
+from scripts.utils.abi_utils import to_address
+from scripts.utils.deploy_args import LegoType
+from scripts.utils.portfolio_valuation import ZERO_ADDRESS
+
+
+# AddyRegistry ids, in the order `0001_core` registers them
+ADDY_REGISTRY_IDS = {1: "AgentFactory", 2: "LegoRegistry", 3: "PriceSheets", 4: "OracleRegistry"}
+
+# AgentFactory getter -> manifest contract
+AGENT_FACTORY_TEMPLATES = {
+    "getUserWalletTemplateAddr()": "UserWalletTemplate",
+    "getUserWalletConfigTemplateAddr()": "UserWalletConfigTemplate",
+    "getAgentTemplateAddr()": "AgentTemplate",
+}
+
+# deployed with `deploy_bp`, their code is the initcode
+BLUEPRINTS = ["UserWalletTemplate", "UserWalletConfigTemplate", "AgentTemplate"]
+
+ORACLE_PARTNERS = ["ChainlinkFeeds", "PythFeeds", "StorkFeeds"]
+
+# lego type by contract folder
+LEGO_TYPE_DIRS = {"contracts/legos/yield/": LegoType.YIELD_OPP, "contracts/legos/dexes/": LegoType.DEX}
+
+CHAINLINK_MIGRATION = "./migrations/1001_oracle_chainlink.py"
+
+
+def get_lego_types(files, names):
+    """
+    Manifest legos (by contract folder) -> expected `legoIdToType`.
+    """
+    lego_types = {}
+    for name in names:
+        path = files.get(name, "").replace("\\", "/")
+        for folder, lego_type in LEGO_TYPE_DIRS.items():
+            if path.startswith(folder):
+                lego_types[name] = lego_type
+    return lego_types
+
+
+def load_chainlink_feeds(blueprint, path=CHAINLINK_MIGRATION):
+    """
+    Asset -> chainlink feed, as set by the chainlink migration (its `ChainlinkFeeds` symbols over the blueprint core tokens).
+    """
+    spec = importlib.util.spec_from_file_location("chainlink_migration", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    feeds = {}
+    for symbol, feed in vars(module.ChainlinkFeeds).items():
+        if not symbol.startswith("_") and symbol in blueprint.CORE_TOKENS:
+            feeds[to_address(blueprint.CORE_TOKENS[symbol])] = to_address(feed)
+    return feeds
+
+
+def compile_manifest_code(solc_json):
+    """
+    (initcode, runtime code) of a manifest contract, compiled from the sources in its `solc_json`
+    (what was actually deployed), not from the working tree.
+    """
+    output = compile_json(solc_json)
+    for contracts in output["contracts"].values():
+        for data in contracts.values():
+            bytecode, bytecode_runtime = data["evm"]["bytecode"]["object"], data["evm"]["deployedBytecode"]["object"]
+            return bytes.fromhex(bytecode.removeprefix("0x")), bytes.fromhex(bytecode_runtime.removeprefix("0x"))
+
+
+def _same(a, b):
+    if isinstance(a, str) and isinstance(b, str):
+        return a.lower() == b.lower()
+    return a == b
+
+
+class DeploymentAuditor:
+    """
+    Compares on-chain wiring and code against a manifest. Expected state comes from the manifest
+    (code is compiled from its `solc_json`) and blueprint; actual state is read in two rounds of
+    multicalls (registries, then the legos they point to) plus one batch of `eth_getCode`, all
+    pinned to one block.
+
+    A check is `{"check", "expected", "actual", "ok"}`.
+    """
+
+    def __init__(self, multicaller, manifest, lego_types=None, chainlink_feeds=None):
+        self.multicaller = multicaller
+        self.contracts = {name: c["address"] for name, c in manifest["contracts"].items() if c.get("address")}
+        self.solc_jsons = {name: c["solc_json"] for name, c in manifest["contracts"].items() if c.get("address") and c.get("solc_json")}
+        self.lego_types = lego_types or {}
+        self.chainlink_feeds = chainlink_feeds or {}
+        self.checks = []
+
+    @property
+    def drift(self):
+        return [c for c in self.checks if not c["ok"]]
+
+    def audit(self, check_code=True):
+        self.checks = []
+
+        # compiles while waiting on the node, one worker as the vyper compiler keeps global state
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="deployment-audit") as executor:
+            compiled = executor.submit(self._compile_all) if check_code else None
+            self._audit_registries()
+            if check_code:
+                self._audit_code(compiled.result())
+        return self.checks
+
+    def _compile_all(self):
+        return {name: compile_manifest_code(solc_json) for name, solc_json in self.solc_jsons.items()}
+
+    def _add(self, check, expected, actual, ok=None):
+        self.checks.append({
+            "check": check,
+            "expected": expected,
+            "actual": actual,
+            "ok": _same(expected, actual) if ok is None else ok,
+        })
+
+    def _get(self, name):
+        return self.contracts.get(name)
+
+    ##########
+    # Wiring #
+    ##########
+
+    def _audit_registries(self):
+        addy_registry = self._get("AddyRegistry")
+        lego_registry = self._get("LegoRegistry")
+        oracle_registry = self._get("OracleRegistry")
+        agent_factory = self._get("AgentFactory")
+        chainlink = self._get("ChainlinkFeeds")
+        legos = [name for name in self.lego_types if self._get(name)]
+        partners = [name for name in ORACLE_PARTNERS if self._get(name)]
+        assets = list(self.chainlink_feeds.keys()) if chainlink else []
+
+        # round 1: everything keyed by the manifest
+        keys, calls = [], []
+
+        def add(key, call):
+            keys.append(key)
+            calls.append(call)
+
+        if addy_registry:
+            for addy_id in ADDY_REGISTRY_IDS:
+                add(("addy", addy_id), (addy_registry, "getAddy(uint256)", [addy_id], ["address"]))
+        if agent_factory:
+            for getter in AGENT_FACTORY_TEMPLATES:
+                add(("template", getter), (agent_factory, getter, [], ["address"]))
+        if lego_registry:
+            add(("last_lego_id",), (lego_registry, "getLastLegoId()", [], ["uint256"]))
+            for name in legos:
+                add(("lego_id", name), (lego_registry, "getLegoId(address)", [self._get(name)], ["uint256"]))
+        if oracle_registry:
+            add(("priority",), (oracle_registry, "getPriorityOraclePartnerIds()", [], ["uint256[]"]))
+            for name in partners:
+                add(("partner_id", name), (oracle_registry, "getOraclePartnerId(address)", [self._get(name)], ["uint256"]))
+        for asset in assets:
+            add(("feed", asset), (chainlink, "feedConfig(address)", [asset], ["address", "uint256", "bool", "bool"]))
+
+        results = dict(zip(keys, self.multicaller.call_many(calls)))
+
+        for addy_id, name in ADDY_REGISTRY_IDS.items():
+            if ("addy", addy_id) in results:
+                self._add(f"AddyRegistry.getAddy({addy_id})", self._get(name), results[("addy", addy_id)])
+
+        for getter, name in AGENT_FACTORY_TEMPLATES.items():
+            if ("template", getter) in results:
+                self._add(f"AgentFactory.{getter}", self._get(name), results[("template", getter)])
+
+        for asset in assets:
+            config = results[("feed", asset)]
+            self._add(f"ChainlinkFeeds.feedConfig({asset})", self.chainlink_feeds[asset], config[0] if config else None)
+
+        if oracle_registry:
+            partner_ids = {name: results[("partner_id", name)] for name in partners}
+            for name, partner_id in partner_ids.items():
+                self._add(f"OracleRegistry.getOraclePartnerId({name})", "registered", partner_id, bool(partner_id))
+            priority = list(results[("priority",)] or [])
+            known = set(i for i in partner_ids.values() if i)
+            self._add("OracleRegistry.getPriorityOraclePartnerIds()", sorted(known), priority, all(i in known for i in priority))
+
+        if lego_registry:
+            self._audit_legos(lego_registry, legos, results)
+
+    def _audit_legos(self, lego_registry, legos, results):
+        # round 2: every registered lego id, so unknown registrations show up too
+        lego_ids = list(range(1, (results[("last_lego_id",)] or 0) + 1))
+        values = self.multicaller.call_many(
+            [(lego_registry, "getLegoAddr(uint256)", [i], ["address"]) for i in lego_ids]
+            + [(lego_registry, "legoIdToType(uint256)", [i], ["uint256"]) for i in lego_ids]
+        )
+        addrs = dict(zip(lego_ids, values[:len(lego_ids)]))
+        types = dict(zip(lego_ids, values[len(lego_ids):]))
+
+        expected = {}
+        for name in legos:
+            lego_id = results[("lego_id", name)]
+            expected[lego_id] = name
+            self._add(f"LegoRegistry.getLegoId({name})", self._get(name), addrs.get(lego_id), bool(lego_id) and _same(self._get(name), addrs.get(lego_id)))
+            if lego_id:
+                self._add(f"LegoRegistry.legoIdToType({lego_id}) {name}", self.lego_types[name], types.get(lego_id))
+
+        for lego_id in lego_ids:
+            if lego_id not in expected and addrs[lego_id] not in [None, ZERO_ADDRESS]:
+                self._add(f"LegoRegistry.getLegoAddr({lego_id})", "not registered", addrs[lego_id], False)
+
+    ########
+    # Code #
+    ########
+
+    def _audit_code(self, compiled):
+        all_names = list(self.contracts.keys())
+        codes = dict(zip(all_names, self.multicaller.caller.get_code_many([self.contracts[n] for n in all_names])))
+
+        for name in all_names:
+            code = codes[name]
+            if name not in compiled:
+                self._add(f"code {name}", "deployed", f"{len(code)} bytes", len(code) != 0)
+                continue
+
+            # blueprints hold the initcode, other contracts the runtime code + immutables
+            bytecode, bytecode_runtime = compiled[name]
+            if name in BLUEPRINTS:
+                expected_code, actual_code = DEFAULT_BLUEPRINT_PREAMBLE + bytecode, code
+            else:
+                expected_code, actual_code = bytecode_runtime, code[:len(bytecode_runtime)]
+            self._add(f"code {name}", "0x" + keccak(expected_code).hex(), "0x" + keccak(actual_code).hex())
+
+
+def log_report(checks):
+    drift = [c for c in checks if not c["ok"]]
+    log.h2(f"{len(checks)} checks, {len(drift)} drifted")
+    for c in drift:
+        log.info(f"\t{c['check']}: expected {c['expected']}, got {c['actual']}")
@@ -0,0 +1,438 @@
+import json
+import sqlite3
+
+from eth_abi import decode
+from eth_utils import keccak, to_checksum_address
+
+from boa.rpc import EthereumRPC, RPCError, to_hex, to_int
+
+from scripts.utils.abi_utils import abi_type, get_indexing, get_signature, to_address, to_json_value
+
+
+WALLET_CREATED_EVENT = "UserWalletCreated"
+
+# provider errors that mean "ask for fewer blocks", not "give up"
+RANGE_ERROR_HINTS = ["range", "too many", "limit", "exceed", "timeout", "10000 results", "response size"]
+
+
+class RangeTooLarge(Exception):
+    """
+    The log source refused (or timed out on) a block range, retry with a smaller one.
+    """
+
+
+###############
+# Log Sources #
+###############
+
+
+def _normalize_log(address, topics, data, block_number, block_hash, log_index, tx_hash):
+    return {
+        "address": to_checksum_address(address),
+        "topics": [to_hex(t) for t in topics],
+        "data": to_hex(data),
+        "blockNumber": block_number,
+        "blockHash": block_hash,
+        "logIndex": log_index,
+        "txHash": tx_hash,
+    }
+
+
+class RpcLogSource:
+    """
+    Logs and block hashes straight from a node (`eth_getLogs`).
+    """
+
+    def __init__(self, rpc):
+        self.rpc = EthereumRPC(rpc) if isinstance(rpc, str) else rpc
+
+    def get_latest_block(self):
+        return to_int(self.rpc.fetch("eth_blockNumber", []))
+
+    def get_block_hash(self, block_number):
+        block = self.rpc.fetch("eth_getBlockByNumber", [to_hex(block_number), False])
+        return None if block is None else block["hash"]
+
+    def get_logs(self, addresses, from_block, to_block):
+        params = {"address": list(addresses), "fromBlock": to_hex(from_block), "toBlock": to_hex(to_block)}
+        try:
+            logs = self.rpc.fetch("eth_getLogs", [params])
+        except RPCError as e:
+            if any(hint in str(e).lower() for hint in RANGE_ERROR_HINTS):
+                raise RangeTooLarge(str(e)) from e
+            raise
+
+        return [
+            _normalize_log(
+                log["address"],
+                log["topics"],
+                log["data"],
+                to_int(log["blockNumber"]),
+                log["blockHash"],
+                to_int(log["logIndex"]),
+                log["transactionHash"],
+            )
+            for log in logs
+            if not log.get("removed", False)
+        ]
+
+
+class BoaLogSource:
+    """
+    Captures logs of every call made in a local boa env, so the indexer can run against it.
+    Blocks are `env.evm.patch.block_number` (advanced with `time_travel`), hashes are synthetic.
+    """
+
+    def __init__(self, env):
+        self.env = env
+        self.logs = []
+        self._num_txs = 0
+        self._block_salts = {}
+
+        evm = env.evm
+        self._orig_execute_code = evm.execute_code
+        self._orig_deploy_code = evm.deploy_code
+        evm.execute_code = self._capture(evm.execute_code)
+        evm.deploy_code = self._capture(evm.deploy_code)
+
+    def close(self):
+        self.env.evm.execute_code = self._orig_execute_code
+        self.env.evm.deploy_code = self._orig_deploy_code
+
+    def _capture(self, fn):
+        def wrapped(*args, **kwargs):
+            computation = fn(*args, **kwargs)
+            if not computation.is_error:
+                self._record(computation)
+            return computation
+        return wrapped
+
+    def _record(self, computation):
+        entries = sorted(computation.get_raw_log_entries())
+        if len(entries) == 0:
+            return
+
+        block_number = self.env.evm.patch.block_number
+        self._num_txs += 1
+        tx_hash = to_hex(keccak(text=f"tx:{self._num_txs}"))
+        log_index = sum(1 for log in self.logs if log["blockNumber"] == block_number)
+        for _, address, topics, data in entries:
+            self.logs.append(_normalize_log(
+                address,
+                [t.to_bytes(32, "big") for t in topics],
+                data,
+                block_number,
+                self.get_block_hash(block_number),
+                log_index,
+                tx_hash,
+            ))
+            log_index += 1
+
+    def reorg(self, from_block):
+        """
+        Simulate a reorg: drop logs from `from_block` on and give those blocks new hashes.
+        """
+        self.logs = [log for log in self.logs if log["blockNumber"] < from_block]
+        for block_number in range(from_block, self.get_latest_block() + 1):
+            self._block_salts[block_number] = self._block_salts.get(block_number, 0) + 1
+
+    def get_latest_block(self):
+        return self.env.evm.patch.block_number
+
+    def get_block_hash(self, block_number):
+        salt = self._block_salts.get(block_number, 0)
+        return to_hex(keccak(text=f"block:{block_number}:{salt}"))
+
+    def get_logs(self, addresses, from_block, to_block):
+        addresses = {to_address(a) for a in addresses}
+        return [
+            log for log in self.logs
+            if from_block <= log["blockNumber"] <= to_block and log["address"] in addresses
+        ]
+
+
+###########
+# Decoder #
+###########
+
+
+class EventDecoder:
+    """
+    Decodes raw logs by topic0, using every event found in the given abis.
+    A topic maps to one abi item per indexing variant, tried in order.
+    """
+
+    def __init__(self, abis):
+        variants = {}
+        for abi in abis:
+            for item in abi:
+                if item.get("type") != "event" or item.get("anonymous", False):
+                    continue
+                variants.setdefault(to_hex(keccak(text=get_signature(item))), {})[get_indexing(item)] = item
+        self.events = {topic: list(v.values()) for topic, v in variants.items()}
+
+    @classmethod
+    def from_manifest(cls, manifest):
+        # `manifest` is a migration manifest (or its path), see `migration_history/`
+        if isinstance(manifest, str):
+            with open(manifest) as f:
+                manifest = json.load(f)
+        return cls([c["abi"] for c in manifest["contracts"].values() if "abi" in c])
+
+    @classmethod
+    def from_abi_index(cls, index):
+        # events looked up in a prebuilt `AbiIndex`, nothing parsed up front
+        decoder = cls([])
+        decoder.events = index.events
+        return decoder
+
+    def get_topic(self, event_name):
+        return next((t for t, e in self.events.items() if e[0]["name"] == event_name), None)
+
+    def decode(self, log):
+        """
+        Returns (event name, args), or None for events not in the abis.
+        """
+        if len(log["topics"]) == 0:
+            return None
+        for event in self.events.get(log["topics"][0], []):
+            decoded = decode_event(event, log)
+            if decoded is not None:
+                return decoded
+        return None
+
+
+def decode_event(event, log):
+    """
+    Decodes a raw log with one abi event item. Returns (event name, args), or None if the indexing doesn't match.
+    """
+    indexed = [i for i in event["inputs"] if i["indexed"]]
+    data_inputs = [i for i in event["inputs"] if not i["indexed"]]
+    if len(indexed) != len(log["topics"]) - 1:
+        # same signature, different indexing -- not ours
+        return None
+
+    args = {}
+    for param, topic in zip(indexed, log["topics"][1:]):
+        param_type = abi_type(param)
+        topic_bytes = bytes.fromhex(topic.removeprefix("0x"))
+        if param_type in ["string", "bytes"] or param_type.endswith("]") or param_type.startswith("("):
+            # dynamic indexed values are only stored as their hash
+            args[param["name"]] = topic
+        else:
+            args[param["name"]] = to_json_value(decode([param_type], topic_bytes)[0])
+
+    values = decode([abi_type(i) for i in data_inputs], bytes.fromhex(log["data"].removeprefix("0x")))
+    for param, value in zip(data_inputs, values):
+        args[param["name"]] = to_json_value(value)
+
+    return event["name"], args
+
+
+#########
+# Store #
+#########
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS blocks (number INTEGER PRIMARY KEY, hash TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS wallets (
+    address TEXT PRIMARY KEY,
+    config TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    block_number INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    address TEXT NOT NULL,
+    event TEXT NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_address ON events (address);
+CREATE INDEX IF NOT EXISTS events_event ON events (event);
+"""
+
+
+class IndexerStore:
+    """
+    Embedded (sqlite) store for indexed events. Each synced range is written in one transaction,
+    along with the block hashes needed to detect reorgs.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def get_cursor(self):
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'cursor'").fetchone()
+        return None if row is None else int(row[0])
+
+    def get_recent_blocks(self, limit):
+        return self.db.execute("SELECT number, hash FROM blocks ORDER BY number DESC LIMIT ?", (limit,)).fetchall()
+
+    def get_wallets(self):
+        return self.db.execute("SELECT address, config, owner, agent, block_number FROM wallets ORDER BY block_number, rowid").fetchall()
+
+    def get_events(self, event=None, address=None):
+        query = "SELECT block_number, log_index, tx_hash, address, event, args FROM events"
+        clauses, params = [], []
+        if event is not None:
+            clauses.append("event = ?")
+            params.append(event)
+        if address is not None:
+            clauses.append("address = ?")
+            params.append(to_address(address))
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY block_number, log_index"
+
+        return [
+            {"blockNumber": b, "logIndex": i, "txHash": t, "address": a, "event": e, "args": json.loads(args)}
+            for b, i, t, a, e, args in self.db.execute(query, params)
+        ]
+
+    def commit_range(self, to_block, block_hashes, wallets, events):
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO blocks (number, hash) VALUES (?, ?)", block_hashes.items())
+            self.db.executemany("INSERT OR IGNORE INTO wallets (address, config, owner, agent, block_number) VALUES (?, ?, ?, ?, ?)", wallets)
+            self.db.executemany(
+                "INSERT OR REPLACE INTO events (block_number, log_index, tx_hash, address, event, args) VALUES (?, ?, ?, ?, ?, ?)",
+                [(e["blockNumber"], e["logIndex"], e["txHash"], e["address"], e["event"], json.dumps(e["args"])) for e in events],
+            )
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('cursor', ?)", (str(to_block),))
+
+    def rollback(self, from_block):
+        # forget everything from `from_block` on, the next sync re-indexes it
+        with self.db:
+            for table, column in [("blocks", "number"), ("wallets", "block_number"), ("events", "block_number")]:
+                self.db.execute(f"DELETE FROM {table} WHERE {column} >= ?", (from_block,))
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('cursor', ?)", (str(from_block - 1),))
+
+
+###########
+# Indexer #
+###########
+
+
+class EventIndexer:
+    """
+    Indexes the events of every user wallet (main + config contract) created by `factories`,
+    along with the factory events themselves.
+
+    Wallets are discovered from `UserWalletCreated` in the same pass, so a wallet created
+    mid-range has its own events in that range indexed too. Block ranges grow after each
+    successful fetch and are halved whenever the source refuses one.
+    """
+
+    def __init__(
+        self,
+        source,
+        store,
+        decoder,
+        factories,
+        start_block=0,
+        max_range=10_000,
+        address_batch_size=250,
+        reorg_depth=128,
+    ):
+        self.source = source
+        self.store = store
+        self.decoder = decoder
+        self.factories = [to_address(f) for f in factories]
+        self.start_block = start_block
+        self.max_range = max_range
+        self.range_size = max_range
+        self.address_batch_size = address_batch_size
+        self.reorg_depth = reorg_depth
+
+    def sync(self, to_block=None, confirmations=0):
+        """
+        Index up to `to_block` (default: head - `confirmations`). Returns the number of new events.
+        """
+        head = self.source.get_latest_block() - confirmations
+        to_block = head if to_block is None else min(to_block, head)
+
+        self.check_reorg()
+
+        cursor = self.store.get_cursor()
+        from_block = self.start_block if cursor is None else cursor + 1
+        num_events = 0
+        while from_block <= to_block:
+            end_block = min(from_block + self.range_size - 1, to_block)
+            try:
+                block_hashes, wallets, events = self._fetch_range(from_block, end_block)
+            except RangeTooLarge:
+                if end_block == from_block:
+                    raise
+                self.range_size = max(1, (end_block - from_block + 1) // 2)
+                continue
+
+            self.store.commit_range(end_block, block_hashes, wallets, events)
+            num_events += len(events)
+            from_block = end_block + 1
+            self.range_size = min(self.max_range, self.range_size * 2)
+
+        return num_events
+
+    def check_reorg(self):
+        """
+        Roll back to the last stored block whose hash still matches the source.
+        Returns the first rolled back block, or None.
+        """
+        recent = self.store.get_recent_blocks(self.reorg_depth)
+        if len(recent) == 0:
+            return None
+
+        for i, (block_number, block_hash) in enumerate(recent):
+            if self.source.get_block_hash(block_number) == block_hash:
+                if i == 0:
+                    return None
+                self.store.rollback(block_number + 1)
+                return block_number + 1
+
+        # deeper than we keep hashes for, start over
+        self.store.rollback(self.start_block)
+        return self.start_block
+
+    def _fetch_range(self, from_block, to_block):
+        block_hashes = {to_block: self.source.get_block_hash(to_block)}
+        wallets = []
+        events = []
+
+        # factory first, wallets created in this range get indexed right away
+        for log in self.source.get_logs(self.factories, from_block, to_block):
+            event = self._decode(log)
+            if event is None:
+                continue
+            events.append(event)
+            if event["event"] == WALLET_CREATED_EVENT:
+                args = event["args"]
+                wallets.append((args["mainAddr"], args["configAddr"], args["owner"], args["agent"], log["blockNumber"]))
+
+        known = self.store.get_wallets() + wallets
+        addresses = [w[0] for w in known] + [w[1] for w in known]
+        for i in range(0, len(addresses), self.address_batch_size):
+            for log in self.source.get_logs(addresses[i : i + self.address_batch_size], from_block, to_block):
+                event = self._decode(log)
+                if event is not None:
+                    events.append(event)
+
+        for event in events:
+            block_hashes[event["blockNumber"]] = event["blockHash"]
+        events.sort(key=lambda e: (e["blockNumber"], e["logIndex"]))
+        return block_hashes, wallets, events
+
+    def _decode(self, log):
+        decoded = self.decoder.decode(log)
+        if decoded is None:
+            return None
+        name, args = decoded
+        return {**log, "event": name, "args": args}
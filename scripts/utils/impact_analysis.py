@@ -0,0 +1,285 @@
+import ast
+import math
+import os
+import re
+import subprocess
+
+
+VYPER_EXTS = (".vy", ".vyi")
+
+# `import contracts.modules.LocalGov as gov`, `from interfaces import LegoYield`, `from x import A, B as C`
+VYPER_IMPORT_RE = re.compile(r"^import\s+([\w.]+)(?:\s+as\s+\w+)?\s*$")
+VYPER_FROM_IMPORT_RE = re.compile(r"^from\s+([\w.]+)\s+import\s+(.+)$")
+
+# contract paths in python source, e.g. `boa.load("contracts/legos/yield/LegoSky.vy", ...)`
+CONTRACT_PATH_RE = re.compile(r"""["']((?:contracts|interfaces)/[\w/]+\.vyi?)["']""")
+IDENTIFIER_RE = re.compile(r"\b[A-Za-z_]\w*\b")
+HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+###############
+# Git Changes #
+###############
+
+
+def _git(root, *args):
+    return subprocess.run(["git", *args], cwd=root, check=True, capture_output=True, text=True).stdout
+
+
+def parse_diff(diff):
+    """
+    `git diff -U0` output -> {path: set of changed (new side) line numbers}, None for deleted files.
+    Pure deletions count as a change to the line they were removed at.
+    """
+    changes = {}
+    path = None
+    for line in diff.splitlines():
+        if line.startswith("+++ "):
+            path = None if line == "+++ /dev/null" else line[len("+++ b/"):]
+            if path is not None:
+                changes.setdefault(path, set())
+        elif line.startswith("--- ") and line != "--- /dev/null":
+            old_path = line[len("--- a/"):]
+            changes.setdefault(old_path, set())
+        elif path is not None:
+            m = HUNK_RE.match(line)
+            if m is not None:
+                start, count = int(m.group(1)), int(m.group(2) or 1)
+                changes[path].update(range(start, start + max(count, 1)))
+
+    # files only on the old side were deleted
+    for p, lines in changes.items():
+        if len(lines) == 0:
+            changes[p] = None
+    return changes
+
+
+def get_git_changes(root, ref="HEAD"):
+    """
+    Everything that differs from `ref`: committed since, staged, unstaged and untracked.
+    """
+    changes = parse_diff(_git(root, "diff", "-U0", "--no-color", "--no-ext-diff", ref))
+    for path in _git(root, "ls-files", "--others", "--exclude-standard").splitlines():
+        changes[path] = None
+    return changes
+
+
+############
+# Analysis #
+############
+
+
+class SourceFile:
+    """
+    Top level defs, imports and line ranges of one python file.
+    """
+
+    def __init__(self, analyzer, path):
+        self.path = path
+        with open(os.path.join(analyzer.root, path)) as f:
+            source = f.read()
+        self.lines = source.splitlines()
+
+        self.defs = {}  # name -> (start, end, is_test_or_fixture)
+        self.imports = {}  # local name -> repo path
+        self.imported_paths = set()
+        self.context_spans = []  # everything that isn't a test or fixture
+        self.import_spans = []
+
+        for node in ast.parse(source).body:
+            start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+            span = (start, node.end_lineno)
+
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                for name, target in analyzer.resolve_python_import(node, path):
+                    if target is not None:
+                        self.imports[name] = target
+                        self.imported_paths.add(target)
+                self.import_spans.append(span)
+                continue
+
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                is_fixture = any("fixture" in ast.unparse(d) for d in node.decorator_list)
+                is_test = node.name.startswith("test")
+                self.defs[node.name] = (span[0], span[1], is_fixture or is_test)
+                if is_fixture or is_test:
+                    continue
+            self.context_spans.append(span)
+
+    def get_text(self, start, end):
+        return "\n".join(self.lines[start - 1:end])
+
+
+class ImpactAnalyzer:
+    """
+    Works out which tests can be affected by a set of changed lines.
+
+    Contracts depend on what they `import` (modules, interfaces). Fixtures and tests depend on
+    the contract paths they `boa.load` and the names they use from imported contracts / python modules.
+    """
+
+    def __init__(self, root, changes):
+        self.root = os.path.abspath(root)
+        self.changes = {os.path.normpath(p): lines for p, lines in changes.items()}
+        self._files = {}
+        self._vyper_deps = {}
+        self._affected = {}
+        self._whole_file = {}
+
+    @classmethod
+    def from_git(cls, root, ref="HEAD"):
+        root = _git(root, "rev-parse", "--show-toplevel").strip()
+        return cls(root, get_git_changes(root, ref))
+
+    def _rel(self, path):
+        path = os.path.relpath(os.path.abspath(path), self.root) if os.path.isabs(path) else path
+        return os.path.normpath(path)
+
+    def _exists(self, path):
+        return os.path.isfile(os.path.join(self.root, path))
+
+    # vyper
+
+    def _resolve_vyper_module(self, dotted):
+        base = dotted.replace(".", "/")
+        for ext in VYPER_EXTS:
+            if self._exists(base + ext):
+                return base + ext
+        return None
+
+    def get_vyper_deps(self, path):
+        path = self._rel(path)
+        if path in self._vyper_deps:
+            return self._vyper_deps[path]
+
+        deps = set()
+        if self._exists(path):
+            with open(os.path.join(self.root, path)) as f:
+                for line in f:
+                    line = line.split("#")[0].strip()
+                    m = VYPER_IMPORT_RE.match(line)
+                    if m is not None:
+                        deps.add(self._resolve_vyper_module(m.group(1)))
+                        continue
+                    m = VYPER_FROM_IMPORT_RE.match(line)
+                    if m is not None:
+                        for name in m.group(2).split(","):
+                            name = name.strip().split(" ")[0]
+                            deps.add(self._resolve_vyper_module(f"{m.group(1)}.{name}") or self._resolve_vyper_module(m.group(1)))
+
+        # builtins like `ethereum.ercs` don't resolve
+        self._vyper_deps[path] = {d for d in deps if d is not None}
+        return self._vyper_deps[path]
+
+    # python
+
+    def resolve_python_import(self, node, from_path):
+        # -> [(local name, repo path or None)]; `tests/` is on sys.path too (`from constants import ...`)
+        def resolve(dotted):
+            base = dotted.replace(".", "/")
+            for root in ["", "tests/", os.path.dirname(from_path) + "/"]:
+                for candidate in [base + ".py", base + "/__init__.py"] + [base + ext for ext in VYPER_EXTS]:
+                    if self._exists(os.path.normpath(root + candidate)):
+                        return os.path.normpath(root + candidate)
+            return None
+
+        if isinstance(node, ast.Import):
+            return [((a.asname or a.name).split(".")[0], resolve(a.name)) for a in node.names]
+        if node.module is None or node.level != 0:
+            return []
+        return [(a.asname or a.name, resolve(f"{node.module}.{a.name}") or resolve(node.module)) for a in node.names]
+
+    def get_file(self, path):
+        path = self._rel(path)
+        if path not in self._files:
+            self._files[path] = SourceFile(self, path) if self._exists(path) and path.endswith(".py") else None
+        return self._files[path]
+
+    # impact
+
+    def is_affected(self, path):
+        """
+        Whether a contract / python module changed, or (transitively) imports one that did.
+        """
+        path = self._rel(path)
+        if path not in self._affected:
+            self._resolve_affected(path, {}, [])
+        return self._affected[path]
+
+    def _get_deps(self, path):
+        if path.endswith(VYPER_EXTS):
+            return self.get_vyper_deps(path)
+        f = self.get_file(path)
+        return set() if f is None else f.imported_paths
+
+    def _resolve_affected(self, path, indices, pending):
+        # -> (affected, lowest index of an unresolved file it reaches), tarjan style: every file of an
+        # import cycle gets the same result, cached only once the first file of the cycle is resolved
+        if path in self._affected:
+            return self._affected[path], math.inf
+        if path in indices:
+            return False, indices[path]
+
+        index = indices[path] = len(indices)
+        pending.append(path)
+        result, low = path in self.changes, index
+        if not result:
+            for dep in self._get_deps(path):
+                result, dep_low = self._resolve_affected(self._rel(dep), indices, pending)
+                low = min(low, dep_low)
+                if result:
+                    break
+
+        # still pending above this file = same cycle, an affected file affects the whole cycle
+        if result or low == index:
+            while True:
+                resolved = pending.pop()
+                self._affected[resolved] = result
+                if resolved == path:
+                    break
+        return result, low
+
+    def _references_affected(self, f, text):
+        if any(self.is_affected(p) for p in CONTRACT_PATH_RE.findall(text)):
+            return True
+        names = set(IDENTIFIER_RE.findall(text))
+        return any(self.is_affected(f.imports[n]) for n in names & f.imports.keys())
+
+    def is_whole_file_affected(self, path):
+        """
+        Changes (or affected references) outside of tests and fixtures, e.g. helpers, can reach anything in the file.
+        """
+        path = self._rel(path)
+        if path in self._whole_file:
+            return self._whole_file[path]
+
+        f = self.get_file(path)
+        changed = self.changes.get(path, set())
+        if f is None:
+            result = path in self.changes
+        elif changed is None:
+            result = True
+        else:
+            result = any(start <= line <= end for start, end in f.context_spans + f.import_spans for line in changed)
+            result = result or any(self._references_affected(f, f.get_text(start, end)) for start, end in f.context_spans)
+
+        self._whole_file[path] = result
+        return result
+
+    def is_def_affected(self, path, name):
+        """
+        Whether a top level test / fixture (by name) in `path` is affected.
+        """
+        path = self._rel(path)
+        if self.is_whole_file_affected(path):
+            return True
+
+        f = self.get_file(path)
+        if f is None or name not in f.defs:
+            return False
+
+        start, end, _ = f.defs[name]
+        changed = self.changes.get(path, set())
+        if any(start <= line <= end for line in changed):
+            return True
+        return self._references_affected(f, f.get_text(start, end))
@@ -15,6 +15,10 @@ def h3(msg):
     print(f"\t{Fore.GREEN}{msg}{Style.RESET_ALL}")
 
 
+def warning(msg):
+    print(f"{Fore.YELLOW}{msg}{Style.RESET_ALL}")
+
+
 def error(msg):
     print(f"{Fore.RED}{msg}{Style.RESET_ALL}")
 
@@ -5,17 +5,29 @@ import boa.contracts.abi
 from mergedeep import merge
 import boa
 from boa.deployments import get_deployments_db
+from boa.util.eip5202 import DEFAULT_BLUEPRINT_PREAMBLE
 from scripts.utils import log
 from scripts.utils import json_file
+from scripts.utils import tracing
 from scripts.utils.deploy_args import DeployArgs
+from scripts.utils.deployer_registry import DeployerRegistry
 from scripts.utils.migration_helpers import (deployed_contracts_manifest,
+                                             encode_constructor_args,
                                              execute_transaction)
 
 
+class ReusedContractError(Exception):
+    """
+    A call on a reused contract needs a redeployed one, skipping it would leave the environment miswired.
+    """
+
+
 class Migration:
-    def __init__(self, deploy_args: DeployArgs, files, timestamp, previous_timestamp, history_path):
+    def __init__(self, deploy_args: DeployArgs, files, timestamp, previous_timestamp, history_path, deployers=None, max_attempts=20):
         self._hq = None
+        self._max_attempts = max_attempts
         self._files = files
+        self._deployers = deployers if deployers is not None else DeployerRegistry(files)
         self._timestamp = timestamp
         self._previous_timestamp = previous_timestamp
         self._history_path = history_path
@@ -26,6 +38,10 @@ class Migration:
         self._args = {}
         self.gas = 0
 
+        # contracts of another environment that can be reused, see `_get_reusable`
+        self._reuse_manifest = (deploy_args.reuse_manifest or {}).get("contracts", {})
+        self._reuse_addresses = {c["address"].lower() for c in self._reuse_manifest.values()}
+
         self._previous_manifest = {}
         if previous_timestamp:
             filename = self._manifest_filename('current')
@@ -41,8 +57,15 @@ class Migration:
     def execute(self, transaction, *args, **kwargs):
         """
         Executes a transaction or skips if already executed.
+        Calls on reused contracts are skipped, their state came along with them.
+        Raises `ReusedContractError` if such a call passes a redeployed contract.
         Returns the transaction receipt.
         """
+        target = getattr(transaction, 'contract', None)
+        if target is not None and self._is_reused(target):
+            self._skip_reused(transaction, args)
+            return None
+
         tx = self._run('', transaction, *args, **kwargs)
         self._save_log_file()
 
@@ -57,10 +80,25 @@ class Migration:
         kwargs = {}
 
         def deploy_bp_wrapper(*args, **kwargs):
-            c = boa.load_partial(self._files[name]).deploy_as_blueprint()
+            deployer = self._compile(name)
+            env_deploy = boa.env.deploy
+            computations = []
+
+            # `VyperBlueprint` doesn't keep its computation, grab it for the gas used
+            def traced_deploy(*args, **kwargs):
+                address, computation = env_deploy(*args, **kwargs)
+                computations.append(computation)
+                return address, computation
+
+            boa.env.deploy = traced_deploy
+            try:
+                c = deployer.deploy_as_blueprint()
+            finally:
+                boa.env.deploy = env_deploy
+            c._computation = computations[-1] if computations else None
             return c
 
-        contract = self._run(name, deploy_bp_wrapper, *args, **kwargs)
+        contract = self._get_reusable(name, args, is_blueprint=True) or self._run(name, deploy_bp_wrapper, *args, **kwargs)
         self._contracts[name] = contract
         self._args[name] = args
         self._save_log_file()
@@ -71,7 +109,7 @@ class Migration:
         Deploys contract with given name and args or skips if already deployed
         Returns the deployed contract.
         """
-        contract = self._run(name, boa.load, self._files[name], *args, name=name, **kwargs)
+        contract = self._get_reusable(name, args) or self._run(name, self._deploy_wrapper(name), *args, **kwargs)
 
         self._contracts[name] = contract
         self._args[name] = args
@@ -83,7 +121,7 @@ class Migration:
         Deploys contract with given name and args or skips if already deployed
         Returns the deployed contract.
         """
-        contract = self._run(name, boa.load, self._files[name], *args, name=name, **kwargs)
+        contract = self._get_reusable(name, args) or self._run(name, self._deploy_wrapper(name), *args, **kwargs)
         self._save_log_file()
         return contract
 
@@ -91,7 +129,7 @@ class Migration:
         return self._previous_manifest["contracts"][name]["address"]
 
     def get_contract(self, name):
-        return boa.load_partial(self._files[name]).at(self.get_address(name))
+        return self._deployers.get(name).at(self.get_address(name))
 
     def end(self):
         """
@@ -126,6 +164,68 @@ class Migration:
             if not contract in keys:
                 self._contracts[contract] = ''
 
+    def _compile(self, name):
+        return self._deployers.get(name)
+
+    def _deploy_wrapper(self, name):
+        # same as `boa.load`, with compiling traced apart from deploying
+        def deploy_wrapper(*args, **kwargs):
+            return self._compile(name).deploy(*args, contract_name=name, **kwargs)
+        return deploy_wrapper
+
+    def _get_reusable(self, name, args, is_blueprint=False):
+        """
+        The contract of the reuse manifest, if its constructor args and on-chain code are what
+        deploying `name` now would produce. None otherwise (or when not reusing).
+        """
+        previous = self._reuse_manifest.get(name)
+        if previous is None:
+            return None
+
+        deployer = self._compile(name)
+        if not is_blueprint and encode_constructor_args(self._deployers.get_abi(name), list(args)) != previous["args"]:
+            log.h3(f"{name} constructor args changed, deploying")
+            return None
+
+        # blueprints hold the initcode, other contracts the runtime code + immutables (covered by the args)
+        code = boa.env.get_code(previous["address"])
+        if is_blueprint:
+            is_same = code == DEFAULT_BLUEPRINT_PREAMBLE + deployer.compiler_data.bytecode
+        else:
+            is_same = code.startswith(deployer.compiler_data.bytecode_runtime)
+        if not is_same:
+            log.h3(f"{name} bytecode changed, deploying")
+            return None
+
+        log.h3(f"{name} unchanged, reusing {previous['address']}")
+        return deployer.at(previous["address"])
+
+    def _is_reused(self, contract):
+        address = getattr(contract, 'address', contract)
+        return str(address).lower() in self._reuse_addresses
+
+    def _skip_reused(self, transaction, args):
+        message = self._clean_message(transaction, '')
+        log.h3(f"Skipping {message}, contract is reused")
+
+        # e.g. registering a redeployed contract in a reused registry, needs its own migration
+        current = {str(getattr(c, 'address', c)).lower() for c in self._contracts.values()}
+        current |= {c["address"].lower() for c in self._previous_manifest.get("contracts", {}).values()}
+        fresh = [str(getattr(a, 'address', a)) for a in args if str(getattr(a, 'address', a)).lower() in current and not self._is_reused(a)]
+        if len(fresh) != 0:
+            raise ReusedContractError(
+                f"{message} wires redeployed {', '.join(fresh)} into a reused contract, "
+                "drop it from the reuse manifest so it gets redeployed too, or wire it in its own migration"
+            )
+
+    def _get_gas_used(self, transaction, tx, contract_name):
+        # deploys keep their computation on the new contract, calls on the contract they were made on
+        source = tx if contract_name != '' else getattr(transaction, 'contract', None)
+        computation = getattr(source, '_computation', None)
+        if computation is None:
+            return 0
+        return computation.get_gas_used()
+
     def _curr_transaction(self):
         """
         Returns the current transaction if it's been already executed.
@@ -134,10 +234,17 @@ class Migration:
             return None
         return self._transactions[self._count]
 
-    def _clean_message(self, message, contract_name):
+    def _clean_message(self, transaction, contract_name):
         if contract_name != '':
             return f"Deploying {contract_name}"
 
+        # vyper contract functions, `Name.method`
+        fn_ast = getattr(transaction, 'fn_ast', None)
+        contract = getattr(transaction, 'contract', None)
+        if fn_ast is not None and hasattr(contract, 'contract_name'):
+            return f"{contract.contract_name}.{fn_ast.name}"
+
+        message = str(transaction)
         if 'ABI ' in message:
             try:
                 abi_part = message.split('ABI ')[1]
@@ -155,41 +262,35 @@ class Migration:
         Returns the transaction receipt as string.
         """
         next_transaction = self._count + 1
-        message = self._clean_message(str(transaction), contract_name)
+        message = self._clean_message(transaction, contract_name)
         log.h2(
             f"Transaction {next_transaction} for migration with timestamp {self._timestamp} - {message}"
         )
 
         tx = self._curr_transaction()
 
-        if not tx:
-            # Only include sender in kwargs if contract_name is empty
-            if contract_name == '':
-                kwargs['sender'] = self._deploy_args.sender.address
-
-            tx = execute_transaction(transaction, *args, **kwargs)
-            self._transactions.append(str(tx))
-            gas = 0
-            if contract_name != '':
-                if hasattr(tx, '_computation') and tx._computation is not None:
-                    gas = tx._computation.get_gas_used()
-                log.h3(
-                    f"Contract {contract_name} deployed at {tx.address}"
-                )
-            else:
-                log.h3(
-                    f"Transaction confirmed"
-                )
-                try:
-                    contract_name = message.split('.')[0]
-                    contract = self._contracts[contract_name]
-                    gas = contract._computation.get_gas_used()
-                except:
-                    pass
-            self.gas += gas
+        with tracing.span(message, "transaction", index=next_transaction, skipped=bool(tx)):
+            if not tx:
+                # Only include sender in kwargs if contract_name is empty
+                if contract_name == '':
+                    kwargs['sender'] = self._deploy_args.sender.address
+
+                tx = execute_transaction(transaction, *args, max_attempts=self._max_attempts, **kwargs)
+                self._transactions.append(str(tx))
+                if contract_name != '':
+                    log.h3(
+                        f"Contract {contract_name} deployed at {tx.address}"
+                    )
+                else:
+                    log.h3(
+                        f"Transaction confirmed"
+                    )
+                gas = self._get_gas_used(transaction, tx, contract_name)
+                tracing.add_gas(gas)
+                self.gas += gas
 
-        else:
-            log.h3(f"Skipping transaction {next_transaction}")
+            else:
+                log.h3(f"Skipping transaction {next_transaction}")
 
         self._count += 1
 
@@ -204,11 +305,12 @@ class Migration:
     def _save_manifest(self):
         log.info(f"\n--- Generating manifest ---\n")
 
-        manifest = deployed_contracts_manifest(self._contracts, self._args, self._files)
-        merged_manifest = merge({}, self._previous_manifest, manifest)
-        json_file.save(self._manifest_filename(
-            self._timestamp), merged_manifest)
-        json_file.save(self._manifest_filename("current"), merged_manifest)
+        with tracing.span(self._manifest_filename(self._timestamp), "manifest"):
+            manifest = deployed_contracts_manifest(self._contracts, self._args, self._files, self._deployers)
+            merged_manifest = merge({}, self._previous_manifest, manifest)
+            json_file.save(self._manifest_filename(
+                self._timestamp), merged_manifest)
+            json_file.save(self._manifest_filename("current"), merged_manifest)
         return merged_manifest
 
     def _load_log_file(self):
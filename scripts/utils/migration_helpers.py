@@ -2,6 +2,8 @@ import json
 import os
 import time
 from scripts.utils import log
+from scripts.utils import tracing
+from scripts.utils.precompile import load_artifact
 from eth_account import Account
 import subprocess
 from eth_abi.abi import encode
@@ -51,18 +53,15 @@ def get_account(accountName):
     return account
 
 
-def execute_transaction(transaction, *args, **kwargs):
+def execute_transaction(transaction, *args, max_attempts=20, **kwargs):
     attempts = 0
-    max_attempts = 20
-    if "max_attempts" in kwargs:
-        max_attempts = kwargs["max_attempts"]
-
     while attempts < max_attempts:
         attempts += 1
         try:
             return transaction(*args, **kwargs)
 
         except Exception as exception:
+            tracing.add_retries(1)
             log.info(
                 "\tTransaction Failed "
                 + str(attempts)
@@ -74,7 +73,7 @@ def execute_transaction(transaction, *args, **kwargs):
             log.error(f"\tException: {str(exception)}\n")
             if attempts == max_attempts:
                 log.error(f"\tMax attempts reached. Exiting.\n")
-                break
+                raise
 
             time.sleep(3)
 
@@ -100,7 +99,12 @@ def execute_vyper_json_command(file_path, command):
 
 
 def get_vyper_abi(file_path):
-    return execute_vyper_json_command(file_path, "abi")
+    # precompiled artifact if the sources haven't changed, the vyper cli otherwise
+    artifact = load_artifact(file_path)
+    if artifact is not None:
+        return artifact["abi"]
+    with tracing.span(file_path, "abi"):
+        return execute_vyper_json_command(file_path, "abi")
 
 
 def get_contract_abi(contract_name, contract, files):
@@ -151,18 +155,20 @@ def encode_constructor_args(abi: list, args: list) -> str:
     return encoded.hex()
 
 
-def deployed_contracts_manifest(contracts: dict, args: dict, files: dict):
+def deployed_contracts_manifest(contracts: dict, args: dict, files: dict, deployers=None):
     """
     Generate manifest file that maps each deployed contract to its address.
+    ABIs come from the already compiled `deployers` when given, the vyper cli otherwise.
     """
     manifest = {}
 
     for contract_name in contracts.keys():
+        abi = deployers.get_abi(contract_name) if deployers is not None else get_vyper_abi(files[contract_name])
         manifest[contract_name] = {
             "address": contracts[contract_name].address,
-            "abi": get_vyper_abi(files[contract_name]),
+            "abi": abi,
             "solc_json": contracts[contract_name].deployer.solc_json,
-            "args": encode_constructor_args(get_vyper_abi(files[contract_name]), args[contract_name])
+            "args": encode_constructor_args(abi, args[contract_name])
         }
 
     return {"contracts": manifest}
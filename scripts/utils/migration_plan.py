@@ -0,0 +1,66 @@
+from scripts.utils import log
+
+
+def get_manifest_diff(before, after):
+    """
+    Contracts a migration run added or redeployed, by name -> {"before": address | None, "after": address}.
+    """
+    before = (before or {}).get("contracts", {})
+    after = (after or {}).get("contracts", {})
+    diff = {}
+    for name, contract in after.items():
+        previous = before.get(name, {}).get("address")
+        if previous != contract["address"]:
+            diff[name] = {"before": previous, "after": contract["address"]}
+    return diff
+
+
+def build_plan(tracer, before, after, base_fee=0, error=None):
+    """
+    Every deploy / execute of the traced migrations with its gas and cost at `base_fee` (wei),
+    plus the manifest diff the run produced. `error` is why the run stopped early, if it did.
+    """
+    steps = []
+    for migration in (s for s in tracer.roots if s.kind == "migration"):
+        for span in migration.walk():
+            if span.kind != "transaction":
+                continue
+            steps.append({
+                "migration": migration.name,
+                "index": span.attrs.get("index"),
+                "name": span.name,
+                "gas": span.gas,
+                "cost": span.gas * base_fee,
+                "skipped": span.attrs.get("skipped", False),
+                "error": span.error,
+            })
+
+    total_gas = sum(s["gas"] for s in steps)
+    return {
+        "base_fee": base_fee,
+        "total_gas": total_gas,
+        "total_cost": total_gas * base_fee,
+        "steps": steps,
+        "manifest_diff": get_manifest_diff(before, after),
+        "error": error,
+    }
+
+
+def log_plan(plan):
+    log.h2("Dry run plan")
+    log.info(f"{'migration':<12}{'#':>4}  {'step':<56}{'gas':>12}{'cost (eth)':>14}")
+    for s in plan["steps"]:
+        note = " (already done)" if s["skipped"] else (" (failed)" if s["error"] else "")
+        log.info(f"{s['migration']:<12}{s['index']:>4}  {(s['name'] + note)[:55]:<56}{s['gas']:>12}{s['cost'] / 10**18:>14.8f}")
+
+    if plan["error"] is not None:
+        log.error(f"Dry run stopped at the failed step: {plan['error']}")
+
+    log.info("")
+    log.info(f"Total gas: {plan['total_gas']}, at base fee {plan['base_fee'] / 10**9:.4f} gwei: {plan['total_cost'] / 10**18:.8f} ETH")
+
+    diff = plan["manifest_diff"]
+    log.info("")
+    log.info(f"Manifest changes ({len(diff)}):")
+    for name, d in diff.items():
+        log.info(f"\t{name}: {d['before'] or 'new'} -> {d['after']}")
@@ -1,11 +1,19 @@
 import importlib.util
 import os
 import re
+import shutil
+import tempfile
 from operator import itemgetter
 
+import boa
+
+from scripts.utils import json_file
 from scripts.utils import log
+from scripts.utils import tracing
+from scripts.utils import migration_plan
 from scripts.utils.migration import Migration
 from scripts.utils.deploy_args import DeployArgs
+from scripts.utils.deployer_registry import DeployerRegistry
 
 
 class MigrationError(Exception):
@@ -29,12 +37,16 @@ class MigrationError(Exception):
 class MigrationRunner:
     """
     Facilitates the execution of migration scripts.
+    Contracts are compiled once per run, in `deployers`, shared by all migrations.
+    Failing transactions are retried up to `max_attempts` times before the migration fails.
     """
 
-    def __init__(self, migrations_dir, history_dir, files):
+    def __init__(self, migrations_dir, history_dir, files, max_attempts=20):
         self.migrations_dir = migrations_dir
         self.history_dir = history_dir
         self.files = files
+        self.max_attempts = max_attempts
+        self.deployers = DeployerRegistry(files)
         self.gas = 0
 
     def run(self, deploy_args: DeployArgs, start_timestamp=None, end_timestamp=None, continue_running=True):
@@ -51,22 +63,70 @@ class MigrationRunner:
         To make it easy for other utilities to obtain the current manifest, a manifest
         named `current-manifest.json` will be also be saved in the history directory,
         duplicating the manifest of the latest migration.
+
+        Timings, gas, rpc calls and retries of each migration are written to
+        `<timestamp>-trace.json` next to its manifest (also for failed migrations).
         """
         for migrate, timestamp, prev_timestamp in self._migrations(start_timestamp, end_timestamp):
             log.h1(f"Running migration with timestamp {timestamp}...")
+            span = None
             try:
-                migration = Migration(
-                    deploy_args, self.files, timestamp, prev_timestamp, self.history_dir
-                )
-                migrate(migration)
-                self.gas += migration.end()
+                with tracing.span(timestamp, "migration") as span:
+                    migration = Migration(
+                        deploy_args, self.files, timestamp, prev_timestamp, self.history_dir, self.deployers, self.max_attempts
+                    )
+                    migrate(migration)
+                    self.gas += migration.end()
 
                 if not continue_running:
                     break
             except Exception as exception:
                 raise MigrationError(timestamp) from exception
+            finally:
+                if span is not None:
+                    tracing.get_tracer().save(self._trace_filename(timestamp), [span])
         return self.gas
 
+    def dry_run(self, deploy_args: DeployArgs, start_timestamp=None, end_timestamp=None, continue_running=True, base_fee=0):
+        """
+        Runs the same migrations as `run` against the current env (a fork or the plain boa env)
+        without touching the history directory, then rolls the env back.
+
+        Returns the plan (see `migration_plan.build_plan`): every deploy / execute with its gas,
+        its cost at `base_fee` (wei) and the manifest diff the run would produce.
+        A failing step is not retried, the plan stops there with the step marked and `error` set.
+        """
+        previous_tracer = tracing.get_tracer()
+        tracer = tracing.set_tracer(tracing.Tracer())
+        error = None
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                history_dir = os.path.join(tmp, "history")
+                if os.path.isdir(self.history_dir):
+                    shutil.copytree(self.history_dir, history_dir)
+
+                runner = MigrationRunner(self.migrations_dir, history_dir, self.files, max_attempts=1)
+                runner.deployers = self.deployers
+                with boa.env.anchor():
+                    try:
+                        runner.run(deploy_args, start_timestamp, end_timestamp, continue_running)
+                    except MigrationError as exception:
+                        error = f"{exception} ({exception.__cause__!r})"
+
+                before = self._load_current_manifest(self.history_dir)
+                after = self._load_current_manifest(history_dir)
+        finally:
+            tracing.set_tracer(previous_tracer)
+
+        return migration_plan.build_plan(tracer, before, after, base_fee, error)
+
+    def _load_current_manifest(self, history_dir):
+        filename = os.path.join(history_dir, "current-manifest.json")
+        return json_file.load(filename) if os.path.exists(filename) else {}
+
+    def _trace_filename(self, timestamp):
+        return os.path.join(self.history_dir, f"{timestamp}-trace.json")
+
     def _migrations(self, start_timestamp=None, end_timestamp=None):
         # Generator that returns a `(migration, timestamp, prev_timestamp)` tuple for
         # each migration script, starting ON OR AFTER `start_timestamp`.
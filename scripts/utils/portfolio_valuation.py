@@ -0,0 +1,357 @@
+import csv
+from array import array
+
+from eth_abi import decode, encode
+from eth_utils import keccak, to_checksum_address
+
+from boa.rpc import EthereumRPC, to_bytes, to_hex, to_int
+
+from scripts.utils.abi_utils import to_address
+
+
+# deployed at the same address on every chain we support
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# lego id used for assets sitting idle in the wallet
+IDLE_LEGO_ID = 0
+
+
+###############
+# Eth Callers #
+###############
+
+
+class RpcEthCaller:
+    """
+    `eth_call`s against a node, pinned to one block, sent as json-rpc batches.
+    """
+
+    def __init__(self, rpc, block_number=None, batch_size=20):
+        self.rpc = EthereumRPC(rpc) if isinstance(rpc, str) else rpc
+        if block_number is None:
+            block_number = to_int(self.rpc.fetch("eth_blockNumber", []))
+        self.block_number = block_number
+        self.batch_size = batch_size
+
+    def eth_call_many(self, requests):
+        block = to_hex(self.block_number)
+        results = []
+        for i in range(0, len(requests), self.batch_size):
+            payloads = [("eth_call", [{"to": to, "data": to_hex(data)}, block]) for to, data in requests[i:i + self.batch_size]]
+            results.extend(to_bytes(r) for r in self.rpc.fetch_multi(payloads))
+        return results
+
+    def get_code_many(self, addresses):
+        block = to_hex(self.block_number)
+        results = []
+        for i in range(0, len(addresses), self.batch_size):
+            payloads = [("eth_getCode", [to_address(a), block]) for a in addresses[i:i + self.batch_size]]
+            results.extend(to_bytes(r) for r in self.rpc.fetch_multi(payloads))
+        return results
+
+
+class BoaEthCaller:
+    """
+    Same thing, in-process against a boa env (local tests, forks).
+    """
+
+    def __init__(self, env):
+        self.env = env
+        self.block_number = env.evm.patch.block_number
+
+    def eth_call_many(self, requests):
+        results = []
+        for to, data in requests:
+            computation = self.env.execute_code(to_address=to, data=data, is_modifying=False)
+            if computation.is_error:
+                raise computation.error
+            results.append(computation.output)
+        return results
+
+    def get_code_many(self, addresses):
+        return [self.env.get_code(to_address(a)) for a in addresses]
+
+
+#############
+# Multicall #
+#############
+
+
+class Multicaller:
+    """
+    Runs many view calls as chunked Multicall3 `aggregate3` calls.
+    A call is `(target, signature, args, output_types)`, e.g. `(token, "balanceOf(address)", [user], ["uint256"])`.
+    Failed calls (reverts, bad return data) come back as None.
+    """
+
+    AGGREGATE3 = "aggregate3((address,bool,bytes)[])"
+
+    def __init__(self, caller, multicall=MULTICALL3, chunk_size=100):
+        self.caller = caller
+        self.multicall = to_address(multicall)
+        self.chunk_size = chunk_size
+        self.num_calls = 0
+        self.num_eth_calls = 0
+
+    @staticmethod
+    def _selector(signature):
+        return keccak(text=signature)[:4]
+
+    @staticmethod
+    def _get_arg_types(signature):
+        # top level commas only, tuple args keep theirs
+        arg_types, depth, current = [], 0, ""
+        for c in signature[signature.index("(") + 1:-1]:
+            if c == "," and depth == 0:
+                arg_types.append(current)
+                current = ""
+                continue
+            depth += {"(": 1, ")": -1}.get(c, 0)
+            current += c
+        if current != "":
+            arg_types.append(current)
+        return arg_types
+
+    @classmethod
+    def _encode(cls, signature, args):
+        return cls._selector(signature) + encode(cls._get_arg_types(signature), list(args))
+
+    def call_many(self, calls):
+        chunks = [calls[i:i + self.chunk_size] for i in range(0, len(calls), self.chunk_size)]
+        requests = []
+        for chunk in chunks:
+            call3s = [(to_address(target), True, self._encode(signature, args)) for target, signature, args, _ in chunk]
+            requests.append((self.multicall, self._encode(self.AGGREGATE3, [call3s])))
+
+        raw_results = self.caller.eth_call_many(requests) if len(requests) != 0 else []
+        self.num_calls += len(calls)
+        self.num_eth_calls += len(requests)
+
+        results = []
+        for chunk, raw in zip(chunks, raw_results):
+            (call_results,) = decode(["(bool,bytes)[]"], raw)
+            for (_, _, _, output_types), (success, return_data) in zip(chunk, call_results):
+                results.append(self._decode_result(success, return_data, output_types))
+        return results
+
+    @staticmethod
+    def _decode_result(success, return_data, output_types):
+        if not success:
+            return None
+        try:
+            values = decode(output_types, return_data)
+        except Exception:
+            return None
+        return values[0] if len(values) == 1 else values
+
+
+############
+# Universe #
+############
+
+
+class YieldUniverse:
+    """
+    Every (lego, asset, vault token) that a wallet could hold, read once from the yield legos.
+    A vault token listed by more than one (lego, asset) keeps its first row only, so it's valued once.
+    """
+
+    def __init__(self, rows, decimals):
+        first_rows = {}
+        for row in rows:
+            first_rows.setdefault(row[3], row)
+        self.rows = list(first_rows.values())  # [(lego_id, lego_addr, asset, vault_token)]
+        self.decimals = decimals  # asset -> decimals, None if `decimals()` couldn't be read
+
+    @property
+    def assets(self):
+        return list(self.decimals.keys())
+
+    @classmethod
+    def load(cls, multicaller, lego_registry):
+        lego_registry = to_address(lego_registry)
+        (last_lego_id,) = multicaller.call_many([(lego_registry, "getLastLegoId()", [], ["uint256"])])
+        lego_ids = list(range(1, (last_lego_id or 0) + 1))
+
+        # yield legos
+        results = multicaller.call_many(
+            [(lego_registry, "getLegoAddr(uint256)", [i], ["address"]) for i in lego_ids]
+            + [(lego_registry, "isYieldLego(uint256)", [i], ["bool"]) for i in lego_ids]
+        )
+        addrs, is_yield = results[:len(lego_ids)], results[len(lego_ids):]
+        legos = [
+            (lego_id, to_checksum_address(addr))
+            for lego_id, addr, y in zip(lego_ids, addrs, is_yield)
+            if y and addr not in [None, ZERO_ADDRESS]
+        ]
+
+        # assets per lego
+        lego_assets = multicaller.call_many([(addr, "getAssets()", [], ["address[]"]) for _, addr in legos])
+        pairs = [
+            (lego_id, lego_addr, to_checksum_address(asset))
+            for (lego_id, lego_addr), assets in zip(legos, lego_assets)
+            for asset in (assets or [])
+            if asset != ZERO_ADDRESS
+        ]
+
+        # vault tokens per (lego, asset) + asset decimals
+        assets = list(dict.fromkeys(asset for _, _, asset in pairs))
+        results = multicaller.call_many(
+            [(lego_addr, "getAssetOpportunities(address)", [asset], ["address[]"]) for _, lego_addr, asset in pairs]
+            + [(asset, "decimals()", [], ["uint8"]) for asset in assets]
+        )
+        opportunities, decimals = results[:len(pairs)], results[len(pairs):]
+
+        rows = [
+            (lego_id, lego_addr, asset, to_checksum_address(vault_token))
+            for (lego_id, lego_addr, asset), vault_tokens in zip(pairs, opportunities)
+            for vault_token in (vault_tokens or [])
+            if vault_token != ZERO_ADDRESS
+        ]
+        return cls(rows, dict(zip(assets, decimals)))
+
+
+#############
+# Positions #
+#############
+
+
+class PositionTable:
+    """
+    Columnar positions, one row per non-zero (wallet, lego, vault token) holding.
+    Idle assets in the wallet are rows with `lego_id` 0 and no vault token.
+    Amounts are uint256, so they stay python int lists; small ints are `array`s.
+    """
+
+    COLUMNS = ["wallet", "lego_id", "asset", "vault_token", "balance", "underlying", "price", "usd_value"]
+
+    def __init__(self, wallets, assets):
+        self.wallets = wallets
+        self.assets = assets
+        self.wallet_idx = array("I")
+        self.lego_id = array("I")
+        self.asset_idx = array("I")
+        self.vault_token = []
+        self.balance = []
+        self.underlying = []
+        self.price = []
+        self.usd_value = []
+
+    def __len__(self):
+        return len(self.wallet_idx)
+
+    def append(self, wallet_idx, lego_id, asset_idx, vault_token, balance, underlying, price, usd_value):
+        self.wallet_idx.append(wallet_idx)
+        self.lego_id.append(lego_id)
+        self.asset_idx.append(asset_idx)
+        self.vault_token.append(vault_token)
+        self.balance.append(balance)
+        self.underlying.append(underlying)
+        self.price.append(price)
+        self.usd_value.append(usd_value)
+
+    def column(self, name):
+        if name == "wallet":
+            return [self.wallets[i] for i in self.wallet_idx]
+        if name == "asset":
+            return [self.assets[i] for i in self.asset_idx]
+        return list(getattr(self, name))
+
+    def rows(self):
+        columns = [self.column(name) for name in self.COLUMNS]
+        return [dict(zip(self.COLUMNS, values)) for values in zip(*columns)]
+
+    def get_wallet_totals(self):
+        totals = {wallet: 0 for wallet in self.wallets}
+        for i, usd_value in zip(self.wallet_idx, self.usd_value):
+            totals[self.wallets[i]] += usd_value or 0
+        return totals
+
+    def get_unpriced(self):
+        # positions without a usd value (price or decimals unreadable), left out of the totals
+        return [row for row in self.rows() if row["usd_value"] is None]
+
+    def get_underlying_totals(self, wallet):
+        # wallet -> asset -> deployed underlying, same as `LegoRegistry.getUnderlyingForUser`
+        wallet_idx = self.wallets.index(to_address(wallet))
+        totals = {}
+        for i, lego_id, asset_idx, underlying in zip(self.wallet_idx, self.lego_id, self.asset_idx, self.underlying):
+            if i == wallet_idx and lego_id != IDLE_LEGO_ID:
+                asset = self.assets[asset_idx]
+                totals[asset] = totals.get(asset, 0) + underlying
+        return totals
+
+    def to_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(self.COLUMNS)
+            for row in self.rows():
+                writer.writerow([row[name] if row[name] is not None else "" for name in self.COLUMNS])
+
+
+#############
+# Valuation #
+#############
+
+
+class PortfolioValuer:
+    """
+    Values many wallets at once. Calls per run are batched by kind (balances, underlying, prices),
+    so round trips grow with `calls / chunk_size`, not with wallets x assets.
+    """
+
+    def __init__(self, multicaller, universe, oracle_registry, include_idle=True):
+        self.multicaller = multicaller
+        self.universe = universe
+        self.oracle_registry = to_address(oracle_registry)
+        self.include_idle = include_idle
+
+    def value(self, wallets):
+        wallets = list(dict.fromkeys(to_address(w) for w in wallets))
+        assets = self.universe.assets
+        asset_idx = {asset: i for i, asset in enumerate(assets)}
+
+        # balances, each vault token once per wallet
+        vault_tokens = list(dict.fromkeys(row[3] for row in self.universe.rows))
+        held = vault_tokens + (assets if self.include_idle else [])
+        balance_keys = [(w, token) for w in range(len(wallets)) for token in held]
+        balances = self.multicaller.call_many(
+            [(token, "balanceOf(address)", [wallets[w]], ["uint256"]) for w, token in balance_keys]
+        )
+        balances = {key: bal for key, bal in zip(balance_keys, balances) if bal}
+
+        # underlying for non-zero vault positions only, priced once per asset
+        positions = [
+            (w, lego_id, lego_addr, asset, vault_token, balances[(w, vault_token)])
+            for lego_id, lego_addr, asset, vault_token in self.universe.rows
+            for w in range(len(wallets))
+            if (w, vault_token) in balances
+        ]
+        results = self.multicaller.call_many(
+            [(lego_addr, "getUnderlyingAmount(address,uint256)", [vault_token, bal], ["uint256"]) for _, _, lego_addr, _, vault_token, bal in positions]
+            + [(self.oracle_registry, "getPrice(address,bool)", [asset, False], ["uint256"]) for asset in assets]
+        )
+        underlying, prices = results[:len(positions)], dict(zip(assets, results[len(positions):]))
+
+        table = PositionTable(wallets, assets)
+        for (w, lego_id, _, asset, vault_token, bal), amount in zip(positions, underlying):
+            table.append(w, lego_id, asset_idx[asset], vault_token, bal, amount, prices[asset], self._get_usd_value(asset, amount, prices[asset]))
+
+        if self.include_idle:
+            for w in range(len(wallets)):
+                for asset in assets:
+                    bal = balances.get((w, asset))
+                    if bal:
+                        table.append(w, IDLE_LEGO_ID, asset_idx[asset], None, bal, bal, prices[asset], self._get_usd_value(asset, bal, prices[asset]))
+
+        return table
+
+    def _get_usd_value(self, asset, amount, price):
+        # same math as `OracleRegistry.getUsdValue`, None if the amount, price or decimals could not be read
+        decimals = self.universe.decimals[asset]
+        if amount is None or price is None or decimals is None:
+            return None
+        if amount == 0 or price == 0:
+            return 0
+        return price * amount // (10 ** decimals)
@@ -0,0 +1,113 @@
+import functools
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import boa
+from vyper.compiler.output import build_abi_output, build_layout_output
+
+from scripts.utils import json_file
+from scripts.utils import log
+from scripts.utils import tracing
+
+
+ARTIFACTS_DIR = "./build/artifacts"
+SOURCE_DIRS = ["./contracts", "./interfaces"]
+INDEX_FILE = "index.json"
+
+
+def get_tree_hash(source_dirs=SOURCE_DIRS):
+    """
+    One hash over every vyper source, so artifacts are stale as soon as any contract or import changes.
+    """
+    digest = hashlib.sha256()
+    for directory in source_dirs:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for file in sorted(files):
+                if file.endswith((".vy", ".vyi")):
+                    path = os.path.join(root, file)
+                    digest.update(os.path.relpath(path).encode())
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _compile(path):
+    # runs in a worker process, `load_partial` also leaves the compiled data in boa's disk cache
+    # so `boa.load` / `load_partial` of the same file in later processes skip code generation
+    try:
+        deployer = boa.load_partial(path)
+        compiler_data = deployer.compiler_data
+        return {
+            "path": path,
+            "abi": build_abi_output(compiler_data),
+            "bytecode": "0x" + compiler_data.bytecode.hex(),
+            "bytecode_runtime": "0x" + compiler_data.bytecode_runtime.hex(),
+            "layout": build_layout_output(compiler_data),
+            "solc_json": deployer.solc_json,
+        }, None
+    except Exception as exception:
+        return None, repr(exception)
+
+
+def precompile(files, artifacts_dir=ARTIFACTS_DIR, max_workers=None, source_dirs=SOURCE_DIRS, cache_dir=None):
+    """
+    Compiles every file in `files` (name -> path) in a process pool and writes one artifact per
+    contract (abi, bytecode, runtime bytecode, storage layout, standard json) to `artifacts_dir`.
+    Contracts that don't compile are listed under `errors` in the index.
+    Workers use boa's default compile cache unless `cache_dir` is given.
+    """
+    tree_hash = get_tree_hash(source_dirs)
+    names = sorted(files.keys())
+
+    with tracing.span("precompile", "precompile", num_files=len(names)):
+        # fresh interpreters, the parent may hold boa envs and compile threads
+        pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=None if cache_dir is None else boa.interpret.set_cache_dir,
+            initargs=() if cache_dir is None else (cache_dir,),
+        )
+        with pool:
+            results = list(pool.map(_compile, [files[name] for name in names]))
+
+    os.makedirs(artifacts_dir, exist_ok=True)
+    index = {"tree_hash": tree_hash, "contracts": {}, "errors": {}}
+    for name, (artifact, error) in zip(names, results):
+        if artifact is None:
+            index["errors"][name] = error
+            continue
+        json_file.save(os.path.join(artifacts_dir, f"{name}.json"), artifact)
+        index["contracts"][name] = os.path.normpath(artifact["path"])
+
+    # written last, a partial run never looks current
+    json_file.save(os.path.join(artifacts_dir, INDEX_FILE), index)
+    log.h3(f"Precompiled {len(index['contracts'])} contracts into {artifacts_dir}, {len(index['errors'])} skipped")
+    return index
+
+
+def load_artifact(path, artifacts_dir=ARTIFACTS_DIR, source_dirs=SOURCE_DIRS):
+    """
+    The precompiled artifact of the contract at `path`, or None if there is none or the sources changed since.
+    Sources are hashed once per process for each version of the index, not on every call.
+    """
+    index_path = os.path.join(artifacts_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return None
+
+    names = _load_current_index(index_path, os.stat(index_path).st_mtime_ns, tuple(source_dirs))
+    name = None if names is None else names.get(os.path.normpath(path))
+    if name is None:
+        return None
+    return json_file.load(os.path.join(artifacts_dir, f"{name}.json"))
+
+
+@functools.lru_cache(maxsize=None)
+def _load_current_index(index_path, index_mtime, source_dirs):
+    # path -> name of a current index, None if stale, keyed by mtime so a new `precompile` is picked up
+    index = json_file.load(index_path)
+    if index["tree_hash"] != get_tree_hash(list(source_dirs)):
+        return None
+    return {p: n for n, p in index["contracts"].items()}
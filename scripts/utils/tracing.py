@@ -0,0 +1,185 @@
+import time
+from contextlib import contextmanager
+
+from scripts.utils import json_file
+from scripts.utils import log
+
+
+class Span:
+    """
+    One timed unit of work (migration, transaction, compile, abi, manifest).
+    Counters are inclusive: a span also counts everything its children did.
+    """
+
+    def __init__(self, name, kind, attrs=None):
+        self.name = name
+        self.kind = kind
+        self.attrs = attrs or {}
+        self.children = []
+        self.start = time.time()
+        self.wall_time = 0.0
+        self.gas = 0
+        self.rpc_calls = 0
+        self.retries = 0
+        self.error = None
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "start": self.start,
+            "wall_time": round(self.wall_time, 6),
+            "gas": self.gas,
+            "rpc_calls": self.rpc_calls,
+            "retries": self.retries,
+            "error": self.error,
+            "attrs": self.attrs,
+            "children": [c.to_dict() for c in self.children],
+        }
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class Tracer:
+    """
+    Collects nested spans. `add_*` counters go to every open span.
+    """
+
+    def __init__(self):
+        self.roots = []
+        self._stack = []
+
+    @contextmanager
+    def span(self, name, kind, **attrs):
+        span = Span(name, kind, attrs)
+        (self._stack[-1].children if self._stack else self.roots).append(span)
+        self._stack.append(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as exception:
+            span.error = repr(exception)
+            raise
+        finally:
+            span.wall_time = time.perf_counter() - started
+            self._stack.pop()
+
+    def add_gas(self, gas):
+        for span in self._stack:
+            span.gas += gas
+
+    def add_rpc_calls(self, count):
+        for span in self._stack:
+            span.rpc_calls += count
+
+    def add_retries(self, count):
+        for span in self._stack:
+            span.retries += count
+
+    def spans(self):
+        for root in self.roots:
+            yield from root.walk()
+
+    def save(self, filename, roots=None):
+        json_file.save(filename, {"spans": [r.to_dict() for r in (self.roots if roots is None else roots)]})
+
+    def get_totals(self):
+        """
+        kind -> {count, wall_time, gas, rpc_calls, retries}. Gas, rpc calls and retries are only
+        summed over the outermost span of each kind, so nesting doesn't count them twice.
+        """
+        totals = {}
+
+        def visit(span, open_kinds):
+            t = totals.setdefault(span.kind, {"count": 0, "wall_time": 0.0, "gas": 0, "rpc_calls": 0, "retries": 0})
+            t["count"] += 1
+            if span.kind not in open_kinds:
+                t["wall_time"] += span.wall_time
+                t["gas"] += span.gas
+                t["rpc_calls"] += span.rpc_calls
+                t["retries"] += span.retries
+            for child in span.children:
+                visit(child, open_kinds | {span.kind})
+
+        for root in self.roots:
+            visit(root, frozenset())
+        return totals
+
+    def log_summary(self, num_slowest=5):
+        totals = self.get_totals()
+        if len(totals) == 0:
+            return
+
+        log.h2("Timing summary")
+        log.info(f"{'kind':<12}{'count':>8}{'wall (s)':>12}{'gas':>16}{'rpc calls':>12}{'retries':>10}")
+        for kind, t in totals.items():
+            log.info(f"{kind:<12}{t['count']:>8}{t['wall_time']:>12.2f}{t['gas']:>16}{t['rpc_calls']:>12}{t['retries']:>10}")
+
+        slowest = sorted((s for s in self.spans() if s.kind != "migration"), key=lambda s: s.wall_time, reverse=True)
+        if len(slowest) != 0:
+            log.info("")
+            log.info("Slowest steps:")
+            for span in slowest[:num_slowest]:
+                log.info(f"\t{span.wall_time:>8.2f}s  {span.kind:<12}{span.name}")
+
+
+def count_rpc_calls(env, tracer=None):
+    """
+    Counts the requests a network env makes (a batch counts each call in it), receipt polling included.
+    Local and fork envs are left alone.
+    """
+    rpc = getattr(env, "_rpc", None)
+    if rpc is None or getattr(rpc, "_is_counted", False):
+        return
+
+    fetch, fetch_multi = rpc.fetch, rpc.fetch_multi
+
+    def counted_fetch(method, params):
+        (tracer or _tracer).add_rpc_calls(1)
+        return fetch(method, params)
+
+    def counted_fetch_multi(payloads):
+        (tracer or _tracer).add_rpc_calls(len(payloads))
+        return fetch_multi(payloads)
+
+    # on the instance, so `fetch_uncached` / `wait_for_tx_receipt` go through it too
+    rpc.fetch = counted_fetch
+    rpc.fetch_multi = counted_fetch_multi
+    rpc._is_counted = True
+
+
+#################
+# Active Tracer #
+#################
+
+
+_tracer = Tracer()
+
+
+def get_tracer():
+    return _tracer
+
+
+def set_tracer(tracer):
+    global _tracer
+    _tracer = tracer
+    return tracer
+
+
+def span(name, kind, **attrs):
+    return _tracer.span(name, kind, **attrs)
+
+
+def add_gas(gas):
+    _tracer.add_gas(gas)
+
+
+def add_rpc_calls(count):
+    _tracer.add_rpc_calls(count)
+
+
+def add_retries(count):
+    _tracer.add_retries(count)
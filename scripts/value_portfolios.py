@@ -0,0 +1,62 @@
+import click
+import os
+
+from scripts.utils import log, json_file
+from scripts.utils.event_indexer import IndexerStore
+from scripts.utils.portfolio_valuation import MULTICALL3, Multicaller, PortfolioValuer, RpcEthCaller, YieldUniverse
+
+MIGRATION_HISTORY_DIR = "./migration_history"
+
+
+@click.command()
+@click.option("--rpc", required=True, help="RPC url of the chain to value wallets on.")
+@click.option("--environment", default="prod-v3", help="Environment whose current manifest provides the registries. Defaults to `prod-v3`.")
+@click.option("--db", "db_path", default=None, help="Indexer sqlite db to read wallets from (see `index_events.py`). Defaults to `./indexer/<environment>.db`.")
+@click.option("--wallet", "wallets", multiple=True, help="Wallet address(es) to value, instead of every indexed wallet.")
+@click.option("--block", default=None, type=int, help="Block to value at. Defaults to the chain head.")
+@click.option("--chunk-size", default=100, type=int, help="Calls per multicall `eth_call`. Defaults to 100.")
+@click.option("--multicall", default=MULTICALL3, help="Multicall3 address. Defaults to the canonical deployment.")
+@click.option("--no-idle", is_flag=True, help="Skip assets sitting idle in the wallets, only value yield positions.")
+@click.option("--out", default=None, help="Csv file to write positions to. Defaults to `./indexer/<environment>-positions-<block>.csv`.")
+def cli(rpc, environment, db_path, wallets, block, chunk_size, multicall, no_idle, out):
+    """Value many wallets at once via batched multicalls, write one row per position"""
+    manifest_path = f"{MIGRATION_HISTORY_DIR}/{environment}/current-manifest.json"
+    if not os.path.exists(manifest_path):
+        log.error(f"No manifest found at {manifest_path}")
+        return
+    contracts = json_file.load(manifest_path)["contracts"]
+
+    if len(wallets) == 0:
+        if db_path is None:
+            db_path = f"./indexer/{environment}.db"
+        if not os.path.exists(db_path):
+            log.error(f"No indexer db found at {db_path}, run `index_events.py` first or pass `--wallet`")
+            return
+        store = IndexerStore(db_path)
+        wallets = [w[0] for w in store.get_wallets()]
+        store.close()
+
+    caller = RpcEthCaller(rpc, block)
+    multicaller = Multicaller(caller, multicall, chunk_size)
+    log.h1(f"Valuing {len(wallets)} {environment} wallets at block {caller.block_number}")
+
+    universe = YieldUniverse.load(multicaller, contracts["LegoRegistry"]["address"])
+    log.h2(f"{len(universe.rows)} vault tokens over {len(universe.assets)} assets")
+
+    table = PortfolioValuer(multicaller, universe, contracts["OracleRegistry"]["address"], not no_idle).value(wallets)
+    total = sum(table.get_wallet_totals().values())
+    log.h3(f"{len(table)} positions, total ${total / 10 ** 18:,.2f}, {multicaller.num_calls} calls in {multicaller.num_eth_calls} eth_calls")
+    unpriced = table.get_unpriced()
+    if len(unpriced) != 0:
+        assets = sorted({row["asset"] for row in unpriced})
+        log.warning(f"{len(unpriced)} positions unpriced (price or decimals unreadable), not in the total: {', '.join(assets)}")
+
+    if out is None:
+        out = f"./indexer/{environment}-positions-{caller.block_number}.csv"
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    table.to_csv(out)
+    log.h3(f"Positions written to {out}")
+
+
+if __name__ == "__main__":
+    cli()
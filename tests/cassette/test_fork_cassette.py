@@ -0,0 +1,117 @@
+import gzip
+import json
+import pytest
+
+from boa.explorer import Etherscan
+from boa.rpc import RPC, RPCError
+
+from conf_cassette import ForkCassette
+
+
+class FakeRPC(RPC):
+    # canned answers, counts what reaches the "network"
+    def __init__(self, _results):
+        self.results = _results
+        self.numFetches = 0
+
+    @property
+    def identifier(self):
+        return "fake"
+
+    @property
+    def name(self):
+        return "fake"
+
+    def fetch(self, method, params):
+        self.numFetches += 1
+        return self.results[method]
+
+    def fetch_multi(self, payloads):
+        return [self.fetch(method, params) for method, params in payloads]
+
+
+RESULTS = {
+    "eth_chainId": "0x2105",
+    "eth_getBalance": "0x64",
+    "eth_getCode": "0x6080",
+}
+ABI = [{"type": "function", "name": "foo", "inputs": [], "outputs": [], "stateMutability": "view"}]
+
+
+@pytest.fixture(scope="function")
+def recorded(tmp_path, monkeypatch):
+    # record through the fake rpc, abis through a fake explorer
+    monkeypatch.setattr(Etherscan, "fetch_abi", lambda self, address: ABI)
+    cassette = ForkCassette(ForkCassette.getPath(str(tmp_path), "base", 123), "base", 123, True)
+    rpc = FakeRPC(RESULTS)
+    wrapped = cassette.wrapRpc(rpc)
+
+    assert wrapped.fetch("eth_chainId", []) == "0x2105"
+    assert wrapped.fetch_multi([("eth_getBalance", ["0xabc", "0x7b"]), ("eth_getCode", ["0xabc", "0x7b"])]) == ["0x64", "0x6080"]
+    etherscan = cassette.wrapEtherscan(Etherscan(uri="https://example.invalid/api", api_key="x", chain_id=8453))
+    assert etherscan.fetch_abi("0xABC") == ABI
+
+    cassette.save()
+    return cassette, rpc
+
+
+#########
+# Tests #
+#########
+
+
+def test_cassette_record_save_replay(tmp_path, recorded):
+    recording, rpc = recorded
+    assert rpc.numFetches == 3
+
+    # same state, same bytes
+    with open(recording.path, "rb") as f:
+        saved = f.read()
+    recording.save()
+    with open(recording.path, "rb") as f:
+        assert f.read() == saved
+    with gzip.open(recording.path, "rt") as f:
+        assert len(json.load(f)["rpc"]) == 3
+
+    # replay offline, nothing reaches an rpc
+    cassette = ForkCassette.load(str(tmp_path), "base", 123)
+    assert not cassette.isRecording
+    wrapped = cassette.wrapRpc()
+    assert wrapped.identifier == "cassette://base/123"
+    assert wrapped.fetch("eth_chainId", []) == "0x2105"
+    assert wrapped.fetch_multi([("eth_getBalance", ["0xabc", "0x7b"]), ("eth_getCode", ["0xabc", "0x7b"])]) == ["0x64", "0x6080"]
+    assert rpc.numFetches == 3
+    assert cassette.numMisses == 0
+
+    # abis keyed by chain and lowercase address
+    etherscan = cassette.wrapEtherscan(Etherscan(uri="https://example.invalid/api", api_key="x", chain_id=8453))
+    assert etherscan.fetch_abi("0xabc") == ABI
+
+
+def test_cassette_replay_misses(tmp_path, recorded):
+    cassette = ForkCassette.load(str(tmp_path), "base", 123)
+    wrapped = cassette.wrapRpc()
+
+    # different params are a different request
+    with pytest.raises(RPCError):
+        wrapped.fetch("eth_getBalance", ["0xabc", "0x7c"])
+    with pytest.raises(RPCError):
+        wrapped.fetch_multi([("eth_chainId", []), ("eth_blockNumber", [])])
+    assert cassette.numMisses == 2
+
+    # abi recorded for another chain
+    etherscan = cassette.wrapEtherscan(Etherscan(uri="https://example.invalid/api", api_key="x", chain_id=1))
+    with pytest.raises(ValueError, match="abi not in cassette"):
+        etherscan.fetch_abi("0xabc")
+
+
+def test_cassette_load_errors(tmp_path, recorded):
+    with pytest.raises(FileNotFoundError, match="record one first"):
+        ForkCassette.load(str(tmp_path), "base", 124)
+
+    # file for another block
+    recording, _ = recorded
+    recording.path = ForkCassette.getPath(str(tmp_path), "base", 124)
+    recording.save()
+    with pytest.raises(AssertionError, match="cassette mismatch"):
+        ForkCassette.load(str(tmp_path), "base", 124)
@@ -0,0 +1,173 @@
+import gzip
+import json
+import os
+import pytest
+
+from boa.explorer import Etherscan
+from boa.rpc import RPC, RPCError
+
+from conf_env import FORKS
+
+
+CASSETTE_DIR = os.path.join(os.path.dirname(__file__), "cassettes")
+CASSETTE_KEY = pytest.StashKey[str]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--cassette",
+        action="store",
+        default="off",
+        choices=["off", "record", "replay"],
+        help="Record fork state (rpc + explorer abis) to a cassette, or replay a run from it offline"
+    )
+    parser.addoption(
+        "--cassette-dir",
+        action="store",
+        default=CASSETTE_DIR,
+        help="Directory holding the fork state cassettes"
+    )
+
+
+class ForkCassette:
+    """
+    Every rpc response and explorer abi read during a fork run, keyed by (chain, block).
+    Fork blocks are pinned in `conf_env.FORKS`, so the same request always gets the same answer.
+    """
+
+    def __init__(self, _path, _chain, _block, _isRecording):
+        self.path = _path
+        self.chain = _chain
+        self.block = _block
+        self.isRecording = _isRecording
+        self.rpcResults = {}
+        self.abis = {}
+        self.numMisses = 0
+
+    @classmethod
+    def getPath(cls, _dir, _chain, _block):
+        return os.path.join(_dir, f"{_chain}_{_block}.json.gz")
+
+    @classmethod
+    def load(cls, _dir, _chain, _block):
+        path = cls.getPath(_dir, _chain, _block)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"no cassette for {_chain} @ {_block}, record one first with `--fork {_chain} --cassette record` ({path})")
+
+        with gzip.open(path, "rt") as f:
+            data = json.load(f)
+        assert data["chain"] == _chain and data["block"] == _block, f"cassette mismatch: {path}"
+
+        cassette = cls(path, _chain, _block, False)
+        cassette.rpcResults = data["rpc"]
+        cassette.abis = data["abis"]
+        return cassette
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            "chain": self.chain,
+            "block": self.block,
+            "rpc": dict(sorted(self.rpcResults.items())),
+            "abis": dict(sorted(self.abis.items())),
+        }
+        # fixed mtime, so re-recording the same state gives the same bytes
+        with open(self.path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+            f.write(json.dumps(data, separators=(",", ":")).encode())
+
+    @staticmethod
+    def getKey(_method, _params):
+        return json.dumps([_method, _params], separators=(",", ":"))
+
+    def wrapRpc(self, _rpc=None):
+        return CassetteRPC(self, _rpc)
+
+    def wrapEtherscan(self, _etherscan):
+        return CassetteEtherscan(self, uri=_etherscan.uri, api_key=_etherscan.api_key, chain_id=_etherscan.chain_id)
+
+
+class CassetteRPC(RPC):
+    """
+    Records every request passed through to `_rpc`, or serves them all from the cassette (`_rpc` is None).
+    """
+
+    def __init__(self, _cassette, _rpc=None):
+        self._cassette = _cassette
+        self._rpc = _rpc
+
+    @property
+    def identifier(self):
+        return f"cassette://{self._cassette.chain}/{self._cassette.block}"
+
+    @property
+    def name(self):
+        return self.identifier
+
+    def fetch(self, method, params):
+        key = ForkCassette.getKey(method, params)
+        if self._rpc is None:
+            if key not in self._cassette.rpcResults:
+                # callers like the prestate prefetch expect rpc errors, and fall back to plain reads
+                self._cassette.numMisses += 1
+                raise RPCError(f"not in cassette: {method} {params}", -32000)
+            return self._cassette.rpcResults[key]
+
+        result = self._rpc.fetch(method, params)
+        self._cassette.rpcResults[key] = result
+        return result
+
+    def fetch_multi(self, payloads):
+        if self._rpc is None:
+            return [self.fetch(method, params) for method, params in payloads]
+
+        results = self._rpc.fetch_multi(payloads)
+        for (method, params), result in zip(payloads, results):
+            self._cassette.rpcResults[ForkCassette.getKey(method, params)] = result
+        return results
+
+
+class CassetteEtherscan(Etherscan):
+    def __init__(self, _cassette, **kwargs):
+        super().__init__(**kwargs)
+        self._cassette = _cassette
+
+    def fetch_abi(self, address):
+        key = f"{self.chain_id}:{str(address).lower()}"
+        if not self._cassette.isRecording:
+            if key not in self._cassette.abis:
+                raise ValueError(f"abi not in cassette: {address} (chain {self.chain_id})")
+            return self._cassette.abis[key]
+
+        abi = super().fetch_abi(address)
+        self._cassette.abis[key] = abi
+        return abi
+
+
+@pytest.fixture(scope="session")
+def cassette(fork, pytestconfig):
+    mode = pytestconfig.getoption("cassette")
+    if mode == "off" or fork == "local":
+        yield None
+        return
+
+    cassetteDir = pytestconfig.getoption("cassette_dir")
+    block = FORKS[fork]["block"]
+    if mode == "replay":
+        c = ForkCassette.load(cassetteDir, fork, block)
+        yield c
+        if c.numMisses != 0:
+            pytestconfig.stash[CASSETTE_KEY] = f"{c.numMisses} requests not in {c.path}, re-record it"
+        return
+
+    c = ForkCassette(ForkCassette.getPath(cassetteDir, fork, block), fork, block, True)
+    yield c
+    c.save()
+    pytestconfig.stash[CASSETTE_KEY] = f"saved {len(c.rpcResults)} rpc results, {len(c.abis)} abis to {c.path}"
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if CASSETTE_KEY not in config.stash:
+        return
+
+    terminalreporter.section("fork cassette")
+    terminalreporter.write_line(config.stash[CASSETTE_KEY])
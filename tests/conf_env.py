@@ -8,8 +8,13 @@ import sys
 import socket
 
 from boa.environment import Env
+from boa.explorer import Etherscan, _set_etherscan
+from boa.rpc import EthereumRPC
 import os
 
+from scripts.utils.migration_helpers import load_vyper_files
+from scripts.utils.precompile import precompile
+
 
 FORKS = {
     "mainnet": {
@@ -94,6 +99,18 @@ def pytest_addoption(parser):
         default=False,
         help="Force using Anvil"
     )
+    parser.addoption(
+        "--precompile",
+        action="store_true",
+        default=False,
+        help="Compile every contract in a process pool before the session"
+    )
+
+
+def pytest_sessionstart(session):
+    # fills boa's compile cache in parallel, tests then load contracts from it
+    if session.config.getoption("--precompile"):
+        precompile(load_vyper_files())
 
 
 @pytest.fixture(scope="session")
@@ -102,14 +119,36 @@ def fork(pytestconfig):
 
 
 @pytest.fixture(scope="session")
-def set_etherscan(fork):
+def set_etherscan(fork, cassette):
     config = FORKS[fork] if fork in FORKS else FORKS["mainnet"]
     api_key = config["etherscan_api_key"]
     uri = config["etherscan_url"]
 
+    if cassette is not None:
+        # abis come from (or get recorded to) the cassette
+        _set_etherscan(cassette.wrapEtherscan(Etherscan(api_key=api_key, uri=uri)))
+        return
+
     boa.set_etherscan(api_key=api_key, uri=uri)
 
 
+@contextlib.contextmanager
+def fork_env(url, block_number, cassette=None):
+    if cassette is None:
+        fork_kwargs = {"block_identifier": block_number} if block_number else {}
+        with boa.fork(url, **fork_kwargs) as env:
+            yield env
+        return
+
+    # no prestate prefetch, so every account / slot read is its own (replayable) request.
+    # boa's disk cache would hide reads from the cassette, keep it in memory
+    rpc = cassette.wrapRpc(EthereumRPC(url) if cassette.isRecording else None)
+    env = Env(fork_try_prefetch_state=False)
+    env.fork_rpc(rpc, block_identifier=block_number, cache_dir=None)
+    with boa.set_env(env):
+        yield env
+
+
 @pytest.fixture(scope="session")
 def free_port():
     """Find a free port to use for anvil"""
@@ -123,7 +162,7 @@ def free_port():
 @pytest.fixture(scope="session")
 def anvil(free_port):
     @contextlib.contextmanager
-    def anvil(fork_url=None, block_number=None):
+    def anvil(fork_url=None, block_number=None, cassette=None):
         anvil_args = [
             "anvil",
             "--port", str(free_port),
@@ -154,8 +193,7 @@ def anvil(free_port):
                 except requests.exceptions.ConnectionError:
                     time.sleep(1)
 
-            fork_kwargs = {"block_identifier": block_number} if block_number else {}
-            with boa.fork(anvil_uri, **fork_kwargs) as env:
+            with fork_env(anvil_uri, block_number, cassette) as env:
                 yield env
         finally:
             # Clean up anvil process
@@ -169,7 +207,7 @@ def anvil(free_port):
 
 
 @pytest.fixture(scope="session")
-def env(fork, pytestconfig, anvil, set_etherscan):
+def env(fork, pytestconfig, anvil, set_etherscan, cassette):
     # Get optional settings
     rpc_override = pytestconfig.getoption("rpc")
     force_anvil = pytestconfig.getoption("anvil")
@@ -178,11 +216,17 @@ def env(fork, pytestconfig, anvil, set_etherscan):
     # Enable prefetch state for all forked environments
     boa.env.evm._fork_try_prefetch_state = is_forked
 
+    # Replay everything from the cassette, no network
+    if cassette is not None and not cassette.isRecording:
+        with fork_env(None, cassette.block, cassette) as env:
+            yield env
+        return
+
     # Handle RPC override first
     if rpc_override:
         if fork in FORKS:
             block_number = FORKS[fork].get("block")
-        with boa.fork(rpc_override, block_identifier=block_number) as env:
+        with fork_env(rpc_override, block_number, cassette) as env:
             yield env
         return
 
@@ -203,9 +247,25 @@ def env(fork, pytestconfig, anvil, set_etherscan):
     use_anvil = force_anvil or fork_config.get("anvil", False)
 
     if use_anvil:
-        with anvil(fork_config["rpc_url"], block_number) as env:
+        with anvil(fork_config["rpc_url"], block_number, cassette) as env:
             yield env
     else:
-        fork_kwargs = {"block_identifier": block_number} if block_number else {}
-        with boa.fork(fork_config["rpc_url"], **fork_kwargs) as env:
+        with fork_env(fork_config["rpc_url"], block_number, cassette) as env:
             yield env
+
+
+@pytest.fixture(scope="session", autouse=True)
+def clear_transient_storage(env):
+    # boa applies each call as a message (no tx executor), so transient storage
+    # would otherwise leak across "transactions" -- clear it before every top-level call
+    evm = env.evm
+
+    def _wrap(fn):
+        def wrapped(*args, **kwargs):
+            evm.vm.state.clear_transient_storage()
+            return fn(*args, **kwargs)
+        return wrapped
+
+    evm.execute_code = _wrap(evm.execute_code)
+    evm.deploy_code = _wrap(evm.deploy_code)
+    return env
@@ -0,0 +1,137 @@
+import json
+import os
+import pytest
+import boa
+
+
+GAS_BASELINE_PATH = os.path.join(os.path.dirname(__file__), "gas_baseline.json")
+GAS_RESULTS_KEY = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--gas",
+        action="store_true",
+        default=False,
+        help="Run gas benchmarks (only) and compare against the baseline"
+    )
+    parser.addoption(
+        "--gas-threshold",
+        action="store",
+        type=float,
+        default=5.0,
+        help="Allowed gas regression over baseline, in percent"
+    )
+    parser.addoption(
+        "--gas-baseline",
+        action="store",
+        default=GAS_BASELINE_PATH,
+        help="Path to the gas baseline file"
+    )
+    parser.addoption(
+        "--update-gas-baseline",
+        action="store_true",
+        default=False,
+        help="Run gas benchmarks and write results to the baseline file"
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "gas: gas benchmark, only runs with --gas or --update-gas-baseline"
+    )
+    pytest.gas = pytest.mark.gas
+    config.stash[GAS_RESULTS_KEY] = {}
+
+
+def _isGasRun(config):
+    return config.getoption("--gas") or config.getoption("--update-gas-baseline")
+
+
+def pytest_collection_modifyitems(config, items):
+    # benchmarks run in isolation so state (and gas) is the same every run
+    isGasRun = _isGasRun(config)
+
+    selected = []
+    deselected = []
+    for item in items:
+        if (item.get_closest_marker("gas") is not None) == isGasRun:
+            selected.append(item)
+        else:
+            deselected.append(item)
+
+    items[:] = selected
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+
+
+def _loadBaseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+class GasBench:
+    def __init__(self, baseline, threshold, results, shouldUpdate):
+        self.baseline = baseline
+        self.threshold = threshold
+        self.results = results
+        self.shouldUpdate = shouldUpdate
+
+    def measure(self, name, fn, *args, **kwargs):
+        """Run `fn`, record its gas under `name` and fail if it regressed past the threshold"""
+        assert name not in self.results, f"duplicate gas scenario: {name}"
+
+        # NOTE: not using `reset_gas_used()`, it also resets the journal and breaks test anchors
+        preGas = boa.env.get_gas_used()
+        ret = fn(*args, **kwargs)
+        gasUsed = boa.env.get_gas_used() - preGas
+        self.results[name] = gasUsed
+
+        prevGas = self.baseline.get(name)
+        if not self.shouldUpdate and prevGas is not None:
+            maxGas = prevGas * (100 + self.threshold) / 100
+            assert gasUsed <= maxGas, f"{name}: {gasUsed} gas, baseline {prevGas} (+{_pctDiff(prevGas, gasUsed):.2f}%)"
+        return ret
+
+
+@pytest.fixture(scope="session")
+def gas_bench(pytestconfig):
+    return GasBench(
+        _loadBaseline(pytestconfig.getoption("--gas-baseline")),
+        pytestconfig.getoption("--gas-threshold"),
+        pytestconfig.stash[GAS_RESULTS_KEY],
+        pytestconfig.getoption("--update-gas-baseline"),
+    )
+
+
+def _pctDiff(_prev, _new):
+    return (_new - _prev) * 100 / _prev if _prev != 0 else 0.0
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    results = config.stash[GAS_RESULTS_KEY]
+    if not _isGasRun(config) or not results:
+        return
+
+    path = config.getoption("--gas-baseline")
+    baseline = _loadBaseline(path)
+
+    terminalreporter.section("gas benchmarks")
+    terminalreporter.write_line(f"{'scenario':<40} {'baseline':>10} {'current':>10} {'diff':>9}")
+    for name in sorted(results):
+        gasUsed = results[name]
+        prevGas = baseline.get(name)
+        if prevGas is None:
+            terminalreporter.write_line(f"{name:<40} {'-':>10} {gasUsed:>10} {'new':>9}")
+            continue
+        terminalreporter.write_line(f"{name:<40} {prevGas:>10} {gasUsed:>10} {_pctDiff(prevGas, gasUsed):>+8.2f}%")
+
+    if config.getoption("--update-gas-baseline"):
+        baseline.update(results)
+        with open(path, "w") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
+        terminalreporter.write_line(f"gas baseline written to {path}")
@@ -0,0 +1,92 @@
+import inspect
+import os
+import pytest
+
+from scripts.utils.impact_analysis import ImpactAnalyzer
+
+
+IMPACT_KEY = pytest.StashKey[tuple]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--impacted-by",
+        action="store",
+        default=None,
+        metavar="REF",
+        help="Only run tests affected by changes since a git ref (committed, staged, unstaged + untracked), e.g. `--impacted-by main`"
+    )
+
+
+def _getFixtureFiles(item):
+    # (file, fixture name) of every fixture the test ends up using, after overrides
+    fixtureinfo = getattr(item, "_fixtureinfo", None)
+    if fixtureinfo is None:
+        return []
+
+    fixtures = []
+    for name in item.fixturenames:
+        defs = fixtureinfo.name2fixturedefs.get(name)
+        if not defs:
+            continue
+        func = defs[-1].func
+        try:
+            path = inspect.getsourcefile(func)
+        except TypeError:
+            continue
+        if path is not None:
+            fixtures.append((path, func.__name__))
+    return fixtures
+
+
+def _isPluginFile(analyzer, path):
+    # fixture + hook files, changes outside of fixtures there can touch any test
+    rel = os.path.relpath(path, analyzer.root)
+    name = os.path.basename(rel)
+    return rel.startswith("tests" + os.sep) and (name == "conftest.py" or (name.startswith("conf_") and name.endswith(".py")))
+
+
+def isItemAffected(analyzer, item):
+    if analyzer.is_def_affected(str(item.path), getattr(item, "originalname", item.name)):
+        return True
+    return any(
+        path.startswith(analyzer.root) and analyzer.is_def_affected(path, name)
+        for path, name in _getFixtureFiles(item)
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    ref = config.getoption("impacted_by")
+    if ref is None or len(items) == 0:
+        return
+
+    analyzer = ImpactAnalyzer.from_git(str(config.rootpath), ref)
+    changedPlugins = [
+        os.path.join(analyzer.root, p)
+        for p in analyzer.changes
+        if _isPluginFile(analyzer, os.path.join(analyzer.root, p)) and analyzer.is_whole_file_affected(p)
+    ]
+
+    selected, deselected = [], []
+    for item in items:
+        if len(changedPlugins) != 0 or isItemAffected(analyzer, item):
+            selected.append(item)
+        else:
+            deselected.append(item)
+
+    config.stash[IMPACT_KEY] = (len(selected), len(items), sorted(analyzer.changes), sorted(os.path.relpath(p, analyzer.root) for p in changedPlugins))
+    items[:] = selected
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if IMPACT_KEY not in config.stash:
+        return
+
+    numSelected, numTotal, changed, changedPlugins = config.stash[IMPACT_KEY]
+    terminalreporter.section("test impact")
+    terminalreporter.write_line(f"{numSelected} of {numTotal} tests affected by {len(changed)} changed files (vs {config.getoption('impacted_by')})")
+    if len(changedPlugins) != 0:
+        terminalreporter.write_line(f"running everything, shared test setup changed: {', '.join(changedPlugins)}")
@@ -89,10 +89,11 @@ def lego_sky(mock_registry, fork, lego_registry, addy_registry_deploy, governor)
 
 
 @pytest.fixture(scope="session")
-def lego_uniswap_v2(fork, lego_registry, addy_registry_deploy, governor):
-    if fork == "local":
-        pytest.skip("asset not relevant on this fork")
-    addr = boa.load("contracts/legos/dexes/LegoUniswapV2.vy", ADDYS[fork]["UNISWAP_V2_FACTORY"], ADDYS[fork]["UNISWAP_V2_ROUTER"], addy_registry_deploy, ADDYS[fork]["UNI_V2_WETH_USDC_POOL"], name="lego_uniswap_v2")
+def lego_uniswap_v2(fork, lego_registry, addy_registry_deploy, governor, mock_uni_v2_factory, mock_uni_v2_router, alpha_token, mock_weth):
+    UNISWAP_V2_FACTORY = mock_uni_v2_factory if fork == "local" else ADDYS[fork]["UNISWAP_V2_FACTORY"]
+    UNISWAP_V2_ROUTER = mock_uni_v2_router if fork == "local" else ADDYS[fork]["UNISWAP_V2_ROUTER"]
+    UNI_V2_WETH_USDC_POOL = mock_uni_v2_factory.getPair(alpha_token, mock_weth) if fork == "local" else ADDYS[fork]["UNI_V2_WETH_USDC_POOL"]
+    addr = boa.load("contracts/legos/dexes/LegoUniswapV2.vy", UNISWAP_V2_FACTORY, UNISWAP_V2_ROUTER, addy_registry_deploy, UNI_V2_WETH_USDC_POOL, name="lego_uniswap_v2")
     lego_registry.registerNewLego(addr, "Uniswap V2", DEX_UINT256, sender=governor)
     boa.env.time_travel(blocks=lego_registry.legoChangeDelay() + 1)
     assert lego_registry.confirmNewLegoRegistration(addr, sender=governor) != 0
@@ -100,10 +101,12 @@ def lego_uniswap_v2(fork, lego_registry, addy_registry_deploy, governor):
 
 
 @pytest.fixture(scope="session")
-def lego_uniswap_v3(fork, lego_registry, addy_registry_deploy, governor):
-    if fork == "local":
-        pytest.skip("asset not relevant on this fork")
-    addr = boa.load("contracts/legos/dexes/LegoUniswapV3.vy", ADDYS[fork]["UNIV3_FACTORY"], ADDYS[fork]["UNIV3_NFT_MANAGER"], ADDYS[fork]["UNIV3_QUOTER"], addy_registry_deploy, ADDYS[fork]["UNI_V3_WETH_USDC_POOL"], name="lego_uniswap_v3")
+def lego_uniswap_v3(fork, lego_registry, addy_registry_deploy, governor, mock_uni_v3_factory, mock_uni_v3_nft_manager, alpha_token, mock_weth):
+    UNIV3_FACTORY = mock_uni_v3_factory if fork == "local" else ADDYS[fork]["UNIV3_FACTORY"]
+    UNIV3_NFT_MANAGER = mock_uni_v3_nft_manager if fork == "local" else ADDYS[fork]["UNIV3_NFT_MANAGER"]
+    UNIV3_QUOTER = mock_uni_v3_factory if fork == "local" else ADDYS[fork]["UNIV3_QUOTER"]
+    UNI_V3_WETH_USDC_POOL = mock_uni_v3_factory.getPool(alpha_token, mock_weth, 500) if fork == "local" else ADDYS[fork]["UNI_V3_WETH_USDC_POOL"]
+    addr = boa.load("contracts/legos/dexes/LegoUniswapV3.vy", UNIV3_FACTORY, UNIV3_NFT_MANAGER, UNIV3_QUOTER, addy_registry_deploy, UNI_V3_WETH_USDC_POOL, name="lego_uniswap_v3")
     lego_registry.registerNewLego(addr, "Uniswap V3", DEX_UINT256, sender=governor)
     boa.env.time_travel(blocks=lego_registry.legoChangeDelay() + 1)
     assert lego_registry.confirmNewLegoRegistration(addr, sender=governor) != 0
@@ -111,10 +114,11 @@ def lego_uniswap_v3(fork, lego_registry, addy_registry_deploy, governor):
 
 
 @pytest.fixture(scope="session")
-def lego_aero_classic(fork, lego_registry, addy_registry_deploy, governor):
-    if fork == "local":
-        pytest.skip("asset not relevant on this fork")
-    addr = boa.load("contracts/legos/dexes/LegoAeroClassic.vy", ADDYS[fork]["AERODROME_FACTORY"], ADDYS[fork]["AERODROME_ROUTER"], addy_registry_deploy, ADDYS[fork]["AERODROME_WETH_USDC_POOL"], name="lego_aero_classic")
+def lego_aero_classic(fork, lego_registry, addy_registry_deploy, governor, mock_aero_factory, mock_aero_router, alpha_token, mock_weth):
+    AERODROME_FACTORY = mock_aero_factory if fork == "local" else ADDYS[fork]["AERODROME_FACTORY"]
+    AERODROME_ROUTER = mock_aero_router if fork == "local" else ADDYS[fork]["AERODROME_ROUTER"]
+    AERODROME_WETH_USDC_POOL = mock_aero_factory.getPool(alpha_token, mock_weth, False) if fork == "local" else ADDYS[fork]["AERODROME_WETH_USDC_POOL"]
+    addr = boa.load("contracts/legos/dexes/LegoAeroClassic.vy", AERODROME_FACTORY, AERODROME_ROUTER, addy_registry_deploy, AERODROME_WETH_USDC_POOL, name="lego_aero_classic")
     lego_registry.registerNewLego(addr, "aero_classic", DEX_UINT256, sender=governor)
     boa.env.time_travel(blocks=lego_registry.legoChangeDelay() + 1)
     assert lego_registry.confirmNewLegoRegistration(addr, sender=governor) != 0
@@ -122,10 +126,12 @@ def lego_aero_classic(fork, lego_registry, addy_registry_deploy, governor):
 
 
 @pytest.fixture(scope="session")
-def lego_aero_slipstream(fork, lego_registry, addy_registry_deploy, governor):
-    if fork == "local":
-        pytest.skip("asset not relevant on this fork")
-    addr = boa.load("contracts/legos/dexes/LegoAeroSlipstream.vy", ADDYS[fork]["AERO_SLIPSTREAM_FACTORY"], ADDYS[fork]["AERO_SLIPSTREAM_NFT_MANAGER"], ADDYS[fork]["AERO_SLIPSTREAM_QUOTER"], addy_registry_deploy, ADDYS[fork]["AERO_SLIPSTREAM_WETH_USDC_POOL"], name="lego_aero_slipstream")
+def lego_aero_slipstream(fork, lego_registry, addy_registry_deploy, governor, mock_slipstream_factory, mock_slipstream_nft_manager, alpha_token, mock_weth):
+    AERO_SLIPSTREAM_FACTORY = mock_slipstream_factory if fork == "local" else ADDYS[fork]["AERO_SLIPSTREAM_FACTORY"]
+    AERO_SLIPSTREAM_NFT_MANAGER = mock_slipstream_nft_manager if fork == "local" else ADDYS[fork]["AERO_SLIPSTREAM_NFT_MANAGER"]
+    AERO_SLIPSTREAM_QUOTER = mock_slipstream_factory if fork == "local" else ADDYS[fork]["AERO_SLIPSTREAM_QUOTER"]
+    AERO_SLIPSTREAM_WETH_USDC_POOL = mock_slipstream_factory.getPool(alpha_token, mock_weth, 100) if fork == "local" else ADDYS[fork]["AERO_SLIPSTREAM_WETH_USDC_POOL"]
+    addr = boa.load("contracts/legos/dexes/LegoAeroSlipstream.vy", AERO_SLIPSTREAM_FACTORY, AERO_SLIPSTREAM_NFT_MANAGER, AERO_SLIPSTREAM_QUOTER, addy_registry_deploy, AERO_SLIPSTREAM_WETH_USDC_POOL, name="lego_aero_slipstream")
     lego_registry.registerNewLego(addr, "aero_slipstream", DEX_UINT256, sender=governor)
     boa.env.time_travel(blocks=lego_registry.legoChangeDelay() + 1)
     assert lego_registry.confirmNewLegoRegistration(addr, sender=governor) != 0
@@ -133,10 +139,9 @@ def lego_aero_slipstream(fork, lego_registry, addy_registry_deploy, governor):
 
 
 @pytest.fixture(scope="session")
-def lego_curve(fork, lego_registry, addy_registry_deploy, governor):
-    if fork == "local":
-        pytest.skip("asset not relevant on this fork")
-    addr = boa.load("contracts/legos/dexes/LegoCurve.vy", ADDYS[fork]["CURVE_ADDRESS_PROVIDER"], addy_registry_deploy, name="lego_curve")
+def lego_curve(fork, lego_registry, addy_registry_deploy, governor, mock_curve_registry):
+    CURVE_ADDRESS_PROVIDER = mock_curve_registry if fork == "local" else ADDYS[fork]["CURVE_ADDRESS_PROVIDER"]
+    addr = boa.load("contracts/legos/dexes/LegoCurve.vy", CURVE_ADDRESS_PROVIDER, addy_registry_deploy, name="lego_curve")
     lego_registry.registerNewLego(addr, "Curve", DEX_UINT256, sender=governor)
     boa.env.time_travel(blocks=lego_registry.legoChangeDelay() + 1)
     assert lego_registry.confirmNewLegoRegistration(addr, sender=governor) != 0
@@ -1,7 +1,8 @@
+import math
 import pytest
 import boa
 
-from constants import ZERO_ADDRESS, YIELD_OPP_UINT256
+from constants import ZERO_ADDRESS, YIELD_OPP_UINT256, EIGHTEEN_DECIMALS
 from contracts.core.templates import UserWalletTemplate, UserWalletConfigTemplate
 
 
@@ -227,6 +228,141 @@ def mock_aave_v3_pool():
     return boa.load("contracts/mock/MockAaveV3Pool.vy", name="mock_aave_v3_pool")
 
 
+# mock dexes (alpha ~ $1, bravo ~ $1, charlie ~ $1, weth ~ 2,500 alpha)
+
+
+def _seedAmmPool(_pool, _tokenA, _amountA, _tokenB, _amountB, _lp):
+    _tokenA.transfer(_pool, _amountA, sender=_lp)
+    _tokenB.transfer(_pool, _amountB, sender=_lp)
+    assert _pool.mint(_lp, sender=_lp) != 0
+
+
+def _getSqrtPriceX96(_tokenA, _amountA, _tokenB, _amountB):
+    # token1 per token0, tokens sorted by address
+    if int(_tokenA.address, 16) > int(_tokenB.address, 16):
+        _amountA, _amountB = _amountB, _amountA
+    return math.isqrt(_amountB * 2 ** 192 // _amountA)
+
+
+def _seedClPool(_nftManager, _pool, _poolParam, _tokenA, _amountA, _tokenB, _amountB, _lp, _isSlipstream=False):
+    _tokenA.approve(_nftManager, _amountA, sender=_lp)
+    _tokenB.approve(_nftManager, _amountB, sender=_lp)
+    token0, token1, amount0, amount1 = _tokenA, _tokenB, _amountA, _amountB
+    if _pool.token0() != _tokenA.address:
+        token0, token1, amount0, amount1 = _tokenB, _tokenA, _amountB, _amountA
+
+    # full range, same ticks the lego would pick
+    tickSpacing = _pool.tickSpacing()
+    tickLower = -(887272 // tickSpacing) * tickSpacing
+    tickUpper = (887272 // tickSpacing) * tickSpacing
+    params = (token0, token1, _poolParam, tickLower, tickUpper, amount0, amount1, 0, 0, _lp, boa.env.evm.patch.timestamp)
+    if _isSlipstream:
+        params += (0,)
+    tokenId, liquidity, _, _ = _nftManager.mint(params, sender=_lp)
+    assert tokenId != 0 and liquidity != 0
+
+
+def _dexAmounts(_alpha, _bravo, _charlie, _weth):
+    return {
+        "alpha_weth": (_alpha, 5_000_000 * EIGHTEEN_DECIMALS, _weth, 2_000 * EIGHTEEN_DECIMALS),
+        "alpha_bravo": (_alpha, 1_000_000 * EIGHTEEN_DECIMALS, _bravo, 1_000_000 * EIGHTEEN_DECIMALS),
+        "bravo_weth": (_bravo, 1_000_000 * EIGHTEEN_DECIMALS, _weth, 400 * EIGHTEEN_DECIMALS),
+        "alpha_charlie": (_alpha, 1_000_000 * EIGHTEEN_DECIMALS, _charlie, 1_000_000 * (10 ** 6)),
+    }
+
+
+@pytest.fixture(scope="session")
+def mock_dex_lp(env, alpha_token, bravo_token, charlie_token, mock_weth, governor):
+    lp = env.generate_address("mock_dex_lp")
+    for token in [alpha_token, bravo_token, charlie_token]:
+        token.mint(lp, 100_000_000 * (10 ** token.decimals()), sender=governor)
+    boa.env.set_balance(lp, 20_000 * EIGHTEEN_DECIMALS)
+    mock_weth.deposit(value=20_000 * EIGHTEEN_DECIMALS, sender=lp)
+    return lp
+
+
+@pytest.fixture(scope="session")
+def mock_uni_v2_factory(mock_dex_lp, alpha_token, bravo_token, charlie_token, mock_weth):
+    factory = boa.load("contracts/mock/MockAmmFactory.vy", name="mock_uni_v2_factory")
+    for tokenA, amountA, tokenB, amountB in _dexAmounts(alpha_token, bravo_token, charlie_token, mock_weth).values():
+        pool = boa.load("contracts/mock/MockAmmPool.vy", tokenA, tokenB, False, 30, name="mock_uni_v2_pool")
+        assert factory.registerPool(pool)
+        _seedAmmPool(pool, tokenA, amountA, tokenB, amountB, mock_dex_lp)
+    return factory
+
+
+@pytest.fixture(scope="session")
+def mock_uni_v2_router(mock_uni_v2_factory):
+    return boa.load("contracts/mock/MockUniV2Router.vy", mock_uni_v2_factory, name="mock_uni_v2_router")
+
+
+@pytest.fixture(scope="session")
+def mock_aero_factory(mock_dex_lp, alpha_token, bravo_token, charlie_token, mock_weth):
+    factory = boa.load("contracts/mock/MockAmmFactory.vy", name="mock_aero_factory")
+    amounts = _dexAmounts(alpha_token, bravo_token, charlie_token, mock_weth)
+    for key, isStable, fee in [("alpha_weth", False, 30), ("alpha_bravo", False, 30), ("alpha_charlie", True, 5)]:
+        tokenA, amountA, tokenB, amountB = amounts[key]
+        pool = boa.load("contracts/mock/MockAmmPool.vy", tokenA, tokenB, isStable, fee, name="mock_aero_pool")
+        assert factory.registerPool(pool)
+        _seedAmmPool(pool, tokenA, amountA, tokenB, amountB, mock_dex_lp)
+    return factory
+
+
+@pytest.fixture(scope="session")
+def mock_aero_router(mock_aero_factory):
+    return boa.load("contracts/mock/MockAeroRouter.vy", mock_aero_factory, name="mock_aero_router")
+
+
+@pytest.fixture(scope="session")
+def mock_uni_v3_factory():
+    return boa.load("contracts/mock/MockUniV3Factory.vy", name="mock_uni_v3_factory")
+
+
+@pytest.fixture(scope="session")
+def mock_uni_v3_nft_manager(mock_uni_v3_factory, mock_dex_lp, alpha_token, bravo_token, charlie_token, mock_weth):
+    nftManager = boa.load("contracts/mock/MockUniV3NftManager.vy", mock_uni_v3_factory, name="mock_uni_v3_nft_manager")
+    amounts = _dexAmounts(alpha_token, bravo_token, charlie_token, mock_weth)
+
+    # deeper 5 bps alpha/weth pool, shallower 30 bps one
+    for key, fee, tickSpacing, depth in [("alpha_weth", 500, 10, 1), ("alpha_weth", 3000, 60, 10), ("alpha_bravo", 3000, 60, 1), ("alpha_charlie", 100, 1, 1)]:
+        tokenA, amountA, tokenB, amountB = amounts[key]
+        pool = boa.load("contracts/mock/MockClPool.vy", tokenA, tokenB, fee, tickSpacing, _getSqrtPriceX96(tokenA, amountA, tokenB, amountB), name="mock_uni_v3_pool")
+        assert mock_uni_v3_factory.registerPool(pool)
+        _seedClPool(nftManager, pool, fee, tokenA, amountA // depth, tokenB, amountB // depth, mock_dex_lp)
+    return nftManager
+
+
+@pytest.fixture(scope="session")
+def mock_slipstream_factory():
+    return boa.load("contracts/mock/MockSlipstreamFactory.vy", name="mock_slipstream_factory")
+
+
+@pytest.fixture(scope="session")
+def mock_slipstream_nft_manager(mock_slipstream_factory, mock_dex_lp, alpha_token, bravo_token, charlie_token, mock_weth):
+    nftManager = boa.load("contracts/mock/MockSlipstreamNftManager.vy", mock_slipstream_factory, name="mock_slipstream_nft_manager")
+    amounts = _dexAmounts(alpha_token, bravo_token, charlie_token, mock_weth)
+    for key, fee, tickSpacing in [("alpha_weth", 500, 100), ("alpha_bravo", 3000, 200), ("alpha_charlie", 100, 1)]:
+        tokenA, amountA, tokenB, amountB = amounts[key]
+        pool = boa.load("contracts/mock/MockClPool.vy", tokenA, tokenB, fee, tickSpacing, _getSqrtPriceX96(tokenA, amountA, tokenB, amountB), name="mock_slipstream_pool")
+        assert mock_slipstream_factory.registerPool(pool)
+        _seedClPool(nftManager, pool, tickSpacing, tokenA, amountA, tokenB, amountB, mock_dex_lp, True)
+    return nftManager
+
+
+@pytest.fixture(scope="session")
+def mock_curve_registry(mock_dex_lp, alpha_token, bravo_token, charlie_token, mock_weth):
+    registry = boa.load("contracts/mock/MockCurveRegistry.vy", name="mock_curve_registry")
+    amounts = _dexAmounts(alpha_token, bravo_token, charlie_token, mock_weth)
+    for key, A in [("alpha_charlie", 200), ("alpha_bravo", 100)]:
+        tokenA, amountA, tokenB, amountB = amounts[key]
+        pool = boa.load("contracts/mock/MockCurvePool.vy", tokenA, tokenB, A, 4_000_000, name="mock_curve_pool") # 4 bps
+        assert registry.registerPool(pool)
+        tokenA.approve(pool, amountA, sender=mock_dex_lp)
+        tokenB.approve(pool, amountB, sender=mock_dex_lp)
+        assert pool.add_liquidity([amountA, amountB], 0, sender=mock_dex_lp) != 0
+    return registry
+
+
 # mock pyth / stork
 
 
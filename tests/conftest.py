@@ -7,5 +7,8 @@ pytest_plugins = [
     "conf_mock",
     "conf_utils",
     "conf_env",
+    "conf_cassette",
     "conf_oracles",
+    "conf_gas",
+    "conf_impact",
 ]
@@ -820,6 +820,61 @@ def test_create_wallet_with_insufficient_trial_funds(agent_factory, owner, gover
     assert alpha_token.balanceOf(wallet_addr) == 0
 
 
+def test_create_user_wallets_batch(agent_factory, owner, governor, bob, sally, bob_ai_wallet, alpha_token, alpha_token_whale):
+    """Test creating many wallets in one transaction"""
+    # enough trial funds for two wallets
+    alpha_token.transfer(agent_factory.address, 110 * EIGHTEEN_DECIMALS, sender=alpha_token_whale)
+    agent_factory.setTrialFundsData(alpha_token.address, 50 * EIGHTEEN_DECIMALS, sender=governor)
+    pre_num_wallets = agent_factory.numUserWallets()
+
+    new_wallets = [
+        (owner, ZERO_ADDRESS, True),
+        (bob, bob_ai_wallet.address, False),
+        (sally, ZERO_ADDRESS, True),
+        (sally, ZERO_ADDRESS, True),
+    ]
+    wallet_addrs = agent_factory.createUserWallets(new_wallets, sender=owner)
+    logs = filter_logs(agent_factory, "UserWalletCreated")
+    assert len(wallet_addrs) == 4
+    assert len(logs) == 4
+    assert agent_factory.numUserWallets() == pre_num_wallets + 4
+
+    for i, log in enumerate(logs):
+        assert log.mainAddr == wallet_addrs[i]
+        assert log.owner == new_wallets[i][0]
+        assert log.creator == owner
+        assert agent_factory.isUserWallet(wallet_addrs[i])
+        assert UserWalletConfigTemplate.at(log.configAddr).owner() == new_wallets[i][0]
+    assert logs[1].ambassador == bob_ai_wallet.address
+
+    # trial funds handed out in order while available
+    assert alpha_token.balanceOf(wallet_addrs[0]) == 50 * EIGHTEEN_DECIMALS
+    assert alpha_token.balanceOf(wallet_addrs[1]) == 0
+    assert alpha_token.balanceOf(wallet_addrs[2]) == 50 * EIGHTEEN_DECIMALS
+    assert alpha_token.balanceOf(wallet_addrs[3]) == 0
+    assert UserWalletTemplate.at(wallet_addrs[3]).trialFundsAsset() == ZERO_ADDRESS
+
+
+def test_create_user_wallets_batch_limits(agent_factory, owner, governor, bob):
+    """Test batch creation honors whitelist and wallet limits"""
+    pre_num_wallets = agent_factory.numUserWallets()
+
+    # whole batch must fit within limit
+    assert agent_factory.setNumUserWalletsAllowed(pre_num_wallets + 1, sender=governor)
+    assert agent_factory.createUserWallets([(owner, ZERO_ADDRESS, False), (bob, ZERO_ADDRESS, False)], sender=owner) == []
+    assert agent_factory.numUserWallets() == pre_num_wallets
+    assert len(agent_factory.createUserWallets([(bob, ZERO_ADDRESS, False)], sender=owner)) == 1
+
+    # invalid owner
+    assert agent_factory.setNumUserWalletsAllowed(sender=governor)
+    with boa.reverts("invalid owner"):
+        agent_factory.createUserWallets([(ZERO_ADDRESS, ZERO_ADDRESS, False)], sender=governor)
+
+    # whitelist
+    assert agent_factory.setShouldEnforceWhitelist(True, sender=governor)
+    assert agent_factory.createUserWallets([(owner, ZERO_ADDRESS, False)], sender=bob) == []
+
+
 def test_recover_funds_from_agent_factory(agent_factory, governor, alpha_token, alpha_token_whale, bob):
     """Test recovering funds from the agent factory"""
     # Transfer tokens to the factory
@@ -973,3 +1028,109 @@ def test_clawback_permissions(agent_factory, governor, bob, sally):
     # Check that governor can always call clawback function
     assert agent_factory.canCancelCriticalAction(governor)
 
+
+
+#################
+# Clone Deploys #
+#################
+
+
+@pytest.fixture(scope="module")
+def clone_implementations(agent_factory, addy_registry, weth, governor):
+    min_delay = agent_factory.MIN_OWNER_CHANGE_DELAY()
+    max_delay = agent_factory.MAX_OWNER_CHANGE_DELAY()
+
+    # implementations are regular deployments (not blueprints), constructor locks them against `initialize`
+    config_impl = boa.load("contracts/core/templates/UserWalletConfigTemplate.vy", governor, ZERO_ADDRESS, ZERO_ADDRESS, addy_registry, min_delay, max_delay, name="config_impl")
+    wallet_impl = boa.load("contracts/core/templates/UserWalletTemplate.vy", config_impl, addy_registry, weth, ZERO_ADDRESS, 0, name="wallet_impl")
+    agent_impl = boa.load("contracts/core/templates/AgentTemplate.vy", governor, addy_registry, min_delay, max_delay, name="agent_impl")
+    return wallet_impl, config_impl, agent_impl
+
+
+def _use_clone_implementations(agent_factory, governor, clone_implementations):
+    wallet_impl, config_impl, agent_impl = clone_implementations
+    assert agent_factory.initiateUserWalletTemplateUpdate(wallet_impl, sender=governor)
+    assert agent_factory.initiateUserWalletConfigTemplateUpdate(config_impl, sender=governor)
+    assert agent_factory.initiateAgentTemplateUpdate(agent_impl, sender=governor)
+    boa.env.time_travel(blocks=agent_factory.addressChangeDelay() + 1)
+    assert agent_factory.confirmUserWalletTemplateUpdate(sender=governor)
+    assert agent_factory.confirmUserWalletConfigTemplateUpdate(sender=governor)
+    assert agent_factory.confirmAgentTemplateUpdate(sender=governor)
+
+
+def test_create_user_wallet_as_clone(agent_factory, governor, owner, agent, weth, clone_implementations):
+    wallet_impl, config_impl, _ = clone_implementations
+    original_version = agent_factory.getUserWalletTemplateInfo().version
+    _use_clone_implementations(agent_factory, governor, clone_implementations)
+
+    # template versioning still tracked
+    assert agent_factory.getUserWalletTemplateAddr() == wallet_impl.address
+    assert agent_factory.getUserWalletTemplateInfo().version == original_version + 1
+    assert agent_factory.getUserWalletConfigTemplateAddr() == config_impl.address
+
+    w = agent_factory.createUserWallet(owner, sender=owner)
+    log = filter_logs(agent_factory, "UserWalletCreated")[0]
+    assert log.mainAddr == w
+    assert log.owner == owner
+    assert agent_factory.isUserWallet(w)
+
+    # minimal proxy, initialized like a blueprint deployment
+    assert len(boa.env.get_code(w)) == 45
+    wallet = UserWalletTemplate.at(w)
+    wallet_config = UserWalletConfigTemplate.at(wallet.walletConfig())
+    assert wallet.wethAddr() == weth.address
+    assert wallet.apiVersion() == "0.0.3"
+    assert wallet_config.wallet() == w
+    assert wallet_config.owner() == owner
+    assert wallet_config.ownershipChangeDelay() == agent_factory.MIN_OWNER_CHANGE_DELAY()
+    assert wallet_config.agentSettings(agent).isActive
+
+    # clones cannot be initialized again
+    with boa.reverts("already initialized"):
+        wallet.initialize(wallet_config, weth, ZERO_ADDRESS, 0, sender=agent_factory.address)
+    with boa.reverts("already initialized"):
+        wallet_config.initialize(owner, ZERO_ADDRESS, ZERO_ADDRESS, sender=agent_factory.address)
+
+
+def test_clone_implementations_locked(agent_factory, owner, weth, clone_implementations):
+    wallet_impl, config_impl, agent_impl = clone_implementations
+
+    with boa.reverts("already initialized"):
+        wallet_impl.initialize(config_impl, weth, ZERO_ADDRESS, 0, sender=agent_factory.address)
+    with boa.reverts("already initialized"):
+        config_impl.initialize(owner, ZERO_ADDRESS, ZERO_ADDRESS, sender=agent_factory.address)
+    with boa.reverts("already initialized"):
+        agent_impl.initialize(owner, sender=agent_factory.address)
+
+
+def test_create_agent_as_clone(agent_factory, governor, owner, clone_implementations):
+    _use_clone_implementations(agent_factory, governor, clone_implementations)
+
+    a = agent_factory.createAgent(owner, sender=owner)
+    assert a != ZERO_ADDRESS
+    assert agent_factory.isAgent(a)
+    assert len(boa.env.get_code(a)) == 45
+
+    agent = boa.load_partial("contracts/core/templates/AgentTemplate.vy").at(a)
+    assert agent.owner() == owner
+    assert agent.apiVersion() == "0.0.2"
+
+    with boa.reverts("already initialized"):
+        agent.initialize(governor, sender=agent_factory.address)
+
+
+def test_migrate_blueprint_wallet_to_clone(agent_factory, governor, owner, alpha_token, alpha_token_whale, clone_implementations):
+    old_wallet = UserWalletTemplate.at(agent_factory.createUserWallet(owner, sender=owner))
+    old_wallet_config = UserWalletConfigTemplate.at(old_wallet.walletConfig())
+
+    _use_clone_implementations(agent_factory, governor, clone_implementations)
+    new_wallet = UserWalletTemplate.at(agent_factory.createUserWallet(owner, sender=owner))
+    new_wallet_config = UserWalletConfigTemplate.at(new_wallet.walletConfig())
+
+    amount = 1000 * EIGHTEEN_DECIMALS
+    alpha_token.transfer(old_wallet, amount, sender=alpha_token_whale)
+    assert old_wallet_config.startMigrationOut(new_wallet, [alpha_token], [], sender=owner)
+
+    assert old_wallet_config.didMigrateOut()
+    assert new_wallet_config.didMigrateIn()
+    assert alpha_token.balanceOf(new_wallet) == amount
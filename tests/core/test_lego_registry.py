@@ -474,3 +474,73 @@ def test_multiple_lego_types(lego_registry, new_lego, new_lego_b, governor):
     # Verify types are stored correctly
     assert lego_registry.legoIdToType(yield_lego_id) == YIELD_OPP_UINT256
     assert lego_registry.legoIdToType(dex_lego_id) == DEX_UINT256
+
+
+def test_ripe_snapshots_coalesced(lego_registry, mock_lego_alpha, alpha_token, bravo_token, governor, bob):
+    ripe = boa.load("contracts/mock/MockRipe.vy", name="mock_ripe")
+    ripe.setAddr(7, ripe)
+
+    # no ripe hq, nothing happens (any caller)
+    lego_registry.addRipeSnapshot(alpha_token, sender=bob)
+
+    with boa.reverts("no perms"):
+        lego_registry.setRipeHq(ripe, sender=bob)
+    assert lego_registry.setRipeHq(ripe, sender=governor)
+    log = filter_logs(lego_registry, "RipeHqSet")[0]
+    assert log.ripeHq == ripe.address
+    assert log.priceDesk == ripe.address
+    assert lego_registry.ripePriceDesk() == ripe.address
+
+    with boa.reverts("no perms"):
+        lego_registry.addRipeSnapshot(alpha_token, sender=bob)
+
+    # once per block by default
+    lego_registry.addRipeSnapshot(alpha_token, sender=mock_lego_alpha.address)
+    lego_registry.addRipeSnapshot(alpha_token, sender=mock_lego_alpha.address)
+    lego_registry.addRipeSnapshot(bravo_token, sender=mock_lego_alpha.address)
+    assert ripe.numSnapshots(alpha_token) == 1
+    assert ripe.numSnapshots(bravo_token) == 1
+
+    boa.env.time_travel(blocks=1)
+    lego_registry.addRipeSnapshot(alpha_token, sender=mock_lego_alpha.address)
+    assert ripe.numSnapshots(alpha_token) == 2
+
+    # longer interval
+    with boa.reverts("no perms"):
+        lego_registry.setRipeSnapshotInterval(10, sender=bob)
+    assert lego_registry.setRipeSnapshotInterval(10, sender=governor)
+    assert filter_logs(lego_registry, "RipeSnapshotIntervalSet")[0].numBlocks == 10
+
+    boa.env.time_travel(blocks=9)
+    lego_registry.addRipeSnapshot(alpha_token, sender=mock_lego_alpha.address)
+    assert ripe.numSnapshots(alpha_token) == 2
+    boa.env.time_travel(blocks=1)
+    lego_registry.addRipeSnapshot(alpha_token, sender=mock_lego_alpha.address)
+    assert ripe.numSnapshots(alpha_token) == 3
+    assert lego_registry.lastRipeSnapshotBlock(alpha_token) == boa.env.evm.patch.block_number
+
+
+def test_ripe_price_desk_cached(lego_registry, mock_lego_alpha, alpha_token, governor, bob):
+    ripe = boa.load("contracts/mock/MockRipe.vy", name="mock_ripe")
+    new_desk = boa.load("contracts/mock/MockRipe.vy", name="new_desk")
+
+    # no price desk yet
+    assert not lego_registry.updateRipePriceDesk(sender=governor)
+    assert lego_registry.setRipeHq(ripe, sender=governor)
+    assert lego_registry.ripePriceDesk() == ZERO_ADDRESS
+    lego_registry.addRipeSnapshot(alpha_token, sender=mock_lego_alpha.address)
+
+    # ripe moving its price desk isn't picked up until updated
+    ripe.setAddr(7, new_desk)
+    lego_registry.addRipeSnapshot(alpha_token, sender=mock_lego_alpha.address)
+    assert new_desk.numSnapshots(alpha_token) == 0
+
+    with boa.reverts("no perms"):
+        lego_registry.updateRipePriceDesk(sender=bob)
+    assert lego_registry.updateRipePriceDesk(sender=governor)
+    assert filter_logs(lego_registry, "RipePriceDeskUpdated")[0].priceDesk == new_desk.address
+    assert not lego_registry.updateRipePriceDesk(sender=governor)
+
+    lego_registry.addRipeSnapshot(alpha_token, sender=mock_lego_alpha.address)
+    assert new_desk.numSnapshots(alpha_token) == 1
+    assert ripe.numSnapshots(alpha_token) == 0
@@ -1,7 +1,7 @@
 import pytest
 import boa
 
-from constants import ZERO_ADDRESS, EIGHTEEN_DECIMALS
+from constants import ZERO_ADDRESS, EIGHTEEN_DECIMALS, YIELD_OPP_UINT256
 from conf_utils import filter_logs
 from utils.BluePrint import PARAMS
 
@@ -16,6 +16,69 @@ def new_oracle_b(addy_registry):
     return boa.load("contracts/oracles/CustomOracle.vy", addy_registry, name="new_oracle_partner_b")
 
 
+# oracle partner anyone can move, optionally without clearing the memo
+OPEN_ORACLE = """
+interface OracleRegistry:
+    def clearPriceMemo() -> bool: nonpayable
+
+price: public(HashMap[address, uint256])
+
+@view
+@external
+def getPriceAndHasFeed(_asset: address, _staleTime: uint256 = 0, _oracleRegistry: address = empty(address)) -> (uint256, bool):
+    return self.price[_asset], self.price[_asset] != 0
+
+@view
+@external
+def hasPriceFeed(_asset: address) -> bool:
+    return self.price[_asset] != 0
+
+@external
+def setOraclePartnerId(_oracleId: uint256) -> bool:
+    return True
+
+@external
+def setPrice(_oracleRegistry: address, _asset: address, _price: uint256, _shouldClear: bool):
+    self.price[_asset] = _price
+    if _shouldClear:
+        extcall OracleRegistry(_oracleRegistry).clearPriceMemo()
+"""
+
+# memoizes, moves the price, then reads it back in the same tx
+MEMO_PROBE = """
+interface OracleRegistry:
+    def getUsdValueAndMemoize(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: nonpayable
+    def getUsdValue(_asset: address, _amount: uint256, _shouldRaise: bool = False) -> uint256: view
+
+interface OpenOracle:
+    def setPrice(_oracleRegistry: address, _asset: address, _price: uint256, _shouldClear: bool): nonpayable
+
+@external
+def setLegoId(_legoId: uint256) -> bool:
+    return True
+
+@external
+def memoizeThenMove(_oracleRegistry: address, _oracle: address, _asset: address, _amount: uint256, _newPrice: uint256, _shouldClear: bool) -> uint256:
+    extcall OracleRegistry(_oracleRegistry).getUsdValueAndMemoize(_asset, _amount)
+    extcall OpenOracle(_oracle).setPrice(_oracleRegistry, _asset, _newPrice, _shouldClear)
+    return staticcall OracleRegistry(_oracleRegistry).getUsdValue(_asset, _amount)
+"""
+
+
+@pytest.fixture(scope="module")
+def open_oracle(oracle_registry, governor):
+    oracle = boa.loads(OPEN_ORACLE, name="open_oracle_partner")
+    assert oracle_registry.registerNewOraclePartner(oracle, "Open Oracle Partner", sender=governor)
+    boa.env.time_travel(blocks=oracle_registry.oracleChangeDelay() + 1)
+    assert oracle_registry.confirmNewOraclePartnerRegistration(oracle, sender=governor) != 0
+    return oracle
+
+
+@pytest.fixture(scope="module")
+def memo_probe():
+    return boa.loads(MEMO_PROBE, name="memo_probe")
+
+
 #########
 # Tests #
 #########
@@ -518,6 +581,62 @@ def test_usd_value_and_asset_amount(oracle_registry, new_oracle, governor, alpha
     assert oracle_registry.getAssetAmount(alpha_token, usd_value) == 0
 
 
+def test_usd_value_and_memoize(oracle_registry, new_oracle, governor, alpha_token, bob):
+    assert oracle_registry.registerNewOraclePartner(new_oracle, "Test Oracle Partner", sender=governor)
+    boa.env.time_travel(blocks=oracle_registry.oracleChangeDelay() + 1)
+    assert oracle_registry.confirmNewOraclePartnerRegistration(new_oracle, sender=governor) != 0
+
+    new_oracle.setPrice(alpha_token, 2_000 * EIGHTEEN_DECIMALS, sender=governor)
+
+    # same result as view version
+    amount = 5 * EIGHTEEN_DECIMALS
+    assert oracle_registry.getUsdValueAndMemoize(alpha_token, amount, sender=bob) == 10_000 * EIGHTEEN_DECIMALS
+    assert oracle_registry.getUsdValueAndMemoize(alpha_token, 0, sender=bob) == 0
+    assert oracle_registry.getUsdValueAndMemoize(ZERO_ADDRESS, amount, sender=bob) == 0
+
+    # memo only lives for the tx, new price is picked up right after
+    new_oracle.setPrice(alpha_token, 1_000 * EIGHTEEN_DECIMALS, sender=governor)
+    assert oracle_registry.getPrice(alpha_token) == 1_000 * EIGHTEEN_DECIMALS
+    assert oracle_registry.getUsdValueAndMemoize(alpha_token, amount, sender=bob) == 5_000 * EIGHTEEN_DECIMALS
+
+    # no price, nothing memoized
+    new_oracle.setPrice(alpha_token, 0, sender=governor)
+    assert oracle_registry.getUsdValueAndMemoize(alpha_token, amount, sender=bob) == 0
+    assert oracle_registry.getUsdValue(alpha_token, amount) == 0
+
+
+def test_memoize_only_for_legos_and_wallets(oracle_registry, open_oracle, memo_probe, lego_registry, governor, alpha_token):
+    amount = 5 * EIGHTEEN_DECIMALS
+    open_oracle.setPrice(oracle_registry, alpha_token, 2_000 * EIGHTEEN_DECIMALS, False)
+
+    # unknown caller gets the value, but does not pin the price for the rest of the tx
+    assert memo_probe.memoizeThenMove(oracle_registry, open_oracle, alpha_token, amount, 1_000 * EIGHTEEN_DECIMALS, False) == 5_000 * EIGHTEEN_DECIMALS
+
+    # registered lego pins it
+    assert lego_registry.registerNewLego(memo_probe, "Memo Probe", YIELD_OPP_UINT256, sender=governor)
+    boa.env.time_travel(blocks=lego_registry.legoChangeDelay() + 1)
+    assert lego_registry.confirmNewLegoRegistration(memo_probe, sender=governor) != 0
+    assert memo_probe.memoizeThenMove(oracle_registry, open_oracle, alpha_token, amount, 3_000 * EIGHTEEN_DECIMALS, False) == 5_000 * EIGHTEEN_DECIMALS
+
+    # memo is gone after the tx
+    assert oracle_registry.getUsdValue(alpha_token, amount) == 15_000 * EIGHTEEN_DECIMALS
+
+
+def test_price_memo_cleared_by_partner_update(oracle_registry, open_oracle, memo_probe, lego_registry, governor, alpha_token, bob):
+    assert lego_registry.registerNewLego(memo_probe, "Memo Probe", YIELD_OPP_UINT256, sender=governor)
+    boa.env.time_travel(blocks=lego_registry.legoChangeDelay() + 1)
+    assert lego_registry.confirmNewLegoRegistration(memo_probe, sender=governor) != 0
+
+    amount = 5 * EIGHTEEN_DECIMALS
+    open_oracle.setPrice(oracle_registry, alpha_token, 2_000 * EIGHTEEN_DECIMALS, False)
+
+    # partner pushing a new price drops the memo, rest of the tx sees the new price
+    assert memo_probe.memoizeThenMove(oracle_registry, open_oracle, alpha_token, amount, 1_000 * EIGHTEEN_DECIMALS, True) == 5_000 * EIGHTEEN_DECIMALS
+
+    # only oracle partners can clear it
+    assert not oracle_registry.clearPriceMemo(sender=bob)
+
+
 def test_usd_value_and_asset_amount_diff_decimals(oracle_registry, new_oracle, governor, charlie_token):
     description = "Test Oracle Partner"
     assert oracle_registry.registerNewOraclePartner(new_oracle, description, sender=governor)
@@ -539,6 +658,39 @@ def test_usd_value_and_asset_amount_diff_decimals(oracle_registry, new_oracle, g
     assert oracle_registry.getAssetAmount(charlie_token, usd_value) == expected_amount
 
 
+def test_asset_decimals_cache(oracle_registry, new_oracle, governor, alpha_token, charlie_token, bob):
+    assert oracle_registry.registerNewOraclePartner(new_oracle, "Test Oracle Partner", sender=governor)
+    boa.env.time_travel(blocks=oracle_registry.oracleChangeDelay() + 1)
+    assert oracle_registry.confirmNewOraclePartnerRegistration(new_oracle, sender=governor) != 0
+    new_oracle.setPrice(charlie_token, 2_000 * EIGHTEEN_DECIMALS, sender=governor)
+
+    # not cached yet, still read from token
+    assert oracle_registry.assetDecimals(charlie_token) == 0
+    assert oracle_registry.getDecimals(charlie_token) == charlie_token.decimals()
+    assert oracle_registry.getDecimalsForAssets([alpha_token, charlie_token]) == [alpha_token.decimals(), charlie_token.decimals()]
+
+    # memoized usd value fills cache
+    amount = 5 * (10 ** charlie_token.decimals())
+    assert oracle_registry.getUsdValueAndMemoize(charlie_token, amount, sender=bob) == 10_000 * EIGHTEEN_DECIMALS
+    log = filter_logs(oracle_registry, "AssetDecimalsCached")[0]
+    assert log.asset == charlie_token.address
+    assert log.decimals == charlie_token.decimals()
+    assert oracle_registry.assetDecimals(charlie_token) == charlie_token.decimals()
+
+    # only stored once
+    assert oracle_registry.getUsdValueAndMemoize(charlie_token, amount, sender=bob) == 10_000 * EIGHTEEN_DECIMALS
+    assert len(filter_logs(oracle_registry, "AssetDecimalsCached")) == 0
+
+    # anyone can fill it
+    assert oracle_registry.cacheAssetDecimals([alpha_token, charlie_token, ZERO_ADDRESS], sender=bob)
+    assert len(filter_logs(oracle_registry, "AssetDecimalsCached")) == 1
+    assert oracle_registry.assetDecimals(alpha_token) == alpha_token.decimals()
+
+    # same results from cache
+    assert oracle_registry.getUsdValue(charlie_token, amount) == 10_000 * EIGHTEEN_DECIMALS
+    assert oracle_registry.getAssetAmount(charlie_token, 4_000 * EIGHTEEN_DECIMALS) == 2 * (10 ** charlie_token.decimals())
+
+
 def test_eth_specific_functions(oracle_registry, new_oracle, governor):
     ETH = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
     description = "Test Oracle Partner"
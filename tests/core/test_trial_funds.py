@@ -520,3 +520,91 @@ def test_trial_funds_recovery_with_extra_yield(_test, mock_lego_alpha, agent_fac
     new_vault_balance = alpha_token_erc4626_vault.balanceOf(new_ai_wallet)
     underlying_amount = mock_lego_alpha.getUnderlyingAmount(alpha_token_erc4626_vault, new_vault_balance)
     assert underlying_amount == orig_underlying_amount - take_back_amount
+
+
+def test_trial_funds_tracked_vault_tokens(new_ai_wallet, new_ai_wallet_config, lego_registry, alpha_token, agent, owner, mock_lego_alpha, mock_lego_alpha_another, alpha_token_erc4626_vault, alpha_token_erc4626_vault_another):
+    """Test wallet config tracks the vault tokens trial funds were deposited into"""
+    half_amount = TRIAL_AMOUNT // 2
+    assert new_ai_wallet_config.getTrialFundsDeployed(lego_registry) == 0
+
+    new_ai_wallet.depositTokens(mock_lego_alpha.legoId(), alpha_token, alpha_token_erc4626_vault, half_amount, sender=agent.address)
+    new_ai_wallet.depositTokens(mock_lego_alpha_another.legoId(), alpha_token, alpha_token_erc4626_vault_another, half_amount // 2, sender=agent.address)
+
+    # same vault again is not added twice
+    new_ai_wallet.depositTokens(mock_lego_alpha.legoId(), alpha_token, alpha_token_erc4626_vault, half_amount // 2, sender=agent.address)
+
+    assert new_ai_wallet_config.trialFundsVaultTokens(0) == alpha_token_erc4626_vault.address
+    assert new_ai_wallet_config.trialFundsVaultTokens(1) == alpha_token_erc4626_vault_another.address
+    with boa.reverts():
+        new_ai_wallet_config.trialFundsVaultTokens(2)
+    assert new_ai_wallet_config.trialFundsLegoId(alpha_token_erc4626_vault) == mock_lego_alpha.legoId()
+    assert new_ai_wallet_config.trialFundsLegoId(alpha_token_erc4626_vault_another) == mock_lego_alpha_another.legoId()
+    assert new_ai_wallet_config.isTrialFundsVaultToken(alpha_token_erc4626_vault)
+    assert not new_ai_wallet_config.isTrialFundsVaultToken(alpha_token)
+
+    # matches the registry-wide scan
+    assert new_ai_wallet_config.getTrialFundsDeployed(lego_registry) == TRIAL_AMOUNT
+    assert new_ai_wallet_config.getTrialFundsDeployed(lego_registry) == lego_registry.getUnderlyingForUser(new_ai_wallet, alpha_token)
+
+    # withdrawing trial funds back to the wallet is fine, the fully exited vault leaves the list
+    new_ai_wallet.withdrawTokens(mock_lego_alpha_another.legoId(), alpha_token, alpha_token_erc4626_vault_another, MAX_UINT256, sender=agent.address)
+    assert new_ai_wallet_config.getTrialFundsDeployed(lego_registry) == TRIAL_AMOUNT - half_amount // 2
+    assert not new_ai_wallet_config.isTrialFundsVaultToken(alpha_token_erc4626_vault_another)
+    with boa.reverts():
+        new_ai_wallet_config.trialFundsVaultTokens(1)
+
+    # vault tokens still holding trial funds can't move
+    with boa.reverts("cannot transfer trial funds vault token"):
+        new_ai_wallet.transferFunds(owner, 1, alpha_token_erc4626_vault, sender=owner)
+
+
+def test_trial_funds_vault_slots_reused(new_ai_wallet, new_ai_wallet_config, alpha_token, agent, mock_lego_alpha, governor):
+    """Test exited trial funds vaults free their slot, only vaults still holding funds count against the cap"""
+    legoId = mock_lego_alpha.legoId()
+    amount = TRIAL_AMOUNT // 100
+    vaults = []
+    for i in range(21):
+        vault = boa.load("contracts/mock/MockErc4626Vault.vy", alpha_token, name=f"trial_vault_{i}")
+        assert mock_lego_alpha.addAssetOpportunity(alpha_token, vault, sender=governor)
+        vaults.append(vault)
+
+    # in and out of more vaults than the cap
+    for vault in vaults:
+        new_ai_wallet.depositTokens(legoId, alpha_token, vault, amount, sender=agent.address)
+        assert new_ai_wallet_config.isTrialFundsVaultToken(vault)
+        new_ai_wallet.withdrawTokens(legoId, alpha_token, vault, MAX_UINT256, sender=agent.address)
+        assert not new_ai_wallet_config.isTrialFundsVaultToken(vault)
+    with boa.reverts():
+        new_ai_wallet_config.trialFundsVaultTokens(0)
+
+    # cap still holds for vaults that have funds
+    for vault in vaults[:20]:
+        new_ai_wallet.depositTokens(legoId, alpha_token, vault, amount, sender=agent.address)
+    with boa.reverts("too many trial funds vaults"):
+        new_ai_wallet.depositTokens(legoId, alpha_token, vaults[20], amount, sender=agent.address)
+
+    # one exits, its slot goes to the next vault
+    new_ai_wallet.withdrawTokens(legoId, alpha_token, vaults[3], MAX_UINT256, sender=agent.address)
+    new_ai_wallet.depositTokens(legoId, alpha_token, vaults[20], amount, sender=agent.address)
+    assert new_ai_wallet_config.trialFundsVaultTokens(3) == vaults[19].address
+    assert new_ai_wallet_config.trialFundsVaultTokens(19) == vaults[20].address
+    assert new_ai_wallet_config.trialFundsLegoId(vaults[20]) == legoId
+
+
+def test_trial_funds_guard_skipped_after_clawback(new_ai_wallet, new_ai_wallet_config, lego_registry, agent_factory, alpha_token, alpha_token_whale, agent, owner, mock_lego_alpha, alpha_token_erc4626_vault):
+    """Test vault tokens can move freely once trial funds are clawed back"""
+    new_ai_wallet.depositTokens(mock_lego_alpha.legoId(), alpha_token, alpha_token_erc4626_vault, TRIAL_AMOUNT, sender=agent.address)
+    with boa.reverts("cannot transfer trial funds vault token"):
+        new_ai_wallet.transferFunds(owner, 1, alpha_token_erc4626_vault, sender=owner)
+
+    # yield on top, so vault tokens remain after clawback
+    alpha_token.transfer(alpha_token_erc4626_vault, TRIAL_AMOUNT, sender=alpha_token_whale)
+    assert new_ai_wallet.clawBackTrialFunds(sender=agent_factory.address)
+    assert new_ai_wallet.trialFundsAsset() == ZERO_ADDRESS
+
+    # still tracked, but no longer checked
+    assert new_ai_wallet_config.isTrialFundsVaultToken(alpha_token_erc4626_vault)
+    remaining = alpha_token_erc4626_vault.balanceOf(new_ai_wallet)
+    assert remaining != 0
+    new_ai_wallet.transferFunds(owner, remaining, alpha_token_erc4626_vault, sender=owner)
+    assert alpha_token_erc4626_vault.balanceOf(owner) == remaining
@@ -0,0 +1,155 @@
+import os
+import subprocess
+
+from scripts.utils.impact_analysis import ImpactAnalyzer, parse_diff
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def getDefLine(_path, _name):
+    # last line of a top level def
+    f = ImpactAnalyzer(ROOT, {}).get_file(_path)
+    start, end, _ = f.defs[_name]
+    return end
+
+
+#########
+# Tests #
+#########
+
+
+def test_impact_parse_diff():
+    diff = "\n".join([
+        "diff --git a/contracts/A.vy b/contracts/A.vy",
+        "--- a/contracts/A.vy",
+        "+++ b/contracts/A.vy",
+        "@@ -10,2 +10,3 @@ def foo():",
+        "@@ -40 +41 @@",
+        "@@ -50,3 +51,0 @@",
+        "diff --git a/contracts/B.vy b/contracts/B.vy",
+        "--- a/contracts/B.vy",
+        "+++ /dev/null",
+        "@@ -1,5 +0,0 @@",
+        "diff --git a/tests/c.py b/tests/c.py",
+        "--- /dev/null",
+        "+++ b/tests/c.py",
+        "@@ -0,0 +1,4 @@",
+    ])
+    changes = parse_diff(diff)
+    assert changes["contracts/A.vy"] == {10, 11, 12, 41, 51}
+    assert changes["contracts/B.vy"] is None  # deleted
+    assert changes["tests/c.py"] == {1, 2, 3, 4}
+
+
+def test_impact_vyper_graph():
+    analyzer = ImpactAnalyzer(ROOT, {"contracts/modules/YieldLegoData.vy": {50}})
+    deps = analyzer.get_vyper_deps("contracts/legos/yield/LegoAaveV3.vy")
+    assert "contracts/modules/YieldLegoData.vy" in deps
+    assert "contracts/modules/LocalGov.vy" in deps
+    assert "interfaces/LegoYield.vyi" in deps
+
+    # module change reaches the legos that use it, not the others
+    assert analyzer.is_affected("contracts/legos/yield/LegoAaveV3.vy")
+    assert analyzer.is_affected("contracts/legos/yield/LegoMorpho.vy")
+    assert not analyzer.is_affected("contracts/legos/yield/LegoSky.vy")
+    assert not analyzer.is_affected("contracts/legos/dexes/LegoUniswapV2.vy")
+
+    # interface change reaches its implementers
+    analyzer = ImpactAnalyzer(ROOT, {"interfaces/LegoDex.vyi": {10}})
+    assert analyzer.is_affected("contracts/legos/dexes/LegoUniswapV2.vy")
+    assert not analyzer.is_affected("contracts/legos/yield/LegoSky.vy")
+
+
+def test_impact_fixtures_by_contract_path():
+    analyzer = ImpactAnalyzer(ROOT, {"contracts/legos/yield/LegoSky.vy": {100}})
+    assert analyzer.is_def_affected("tests/conf_legos.py", "lego_sky")
+    assert not analyzer.is_def_affected("tests/conf_legos.py", "lego_aave_v3")
+    assert not analyzer.is_whole_file_affected("tests/conf_legos.py")
+
+    # test bodies that load contracts directly
+    analyzer = ImpactAnalyzer(ROOT, {"contracts/mock/MockMulticall3.vy": {20}})
+    assert analyzer.is_def_affected("tests/valuation/test_portfolio_valuation.py", "mock_multicall")
+    assert not analyzer.is_def_affected("tests/valuation/test_portfolio_valuation.py", "test_multicall_failed_calls")
+
+
+def test_impact_fixtures_by_imported_name():
+    # `UserWalletTemplate.at(...)` via `from contracts.core.templates import UserWalletTemplate`
+    analyzer = ImpactAnalyzer(ROOT, {"contracts/core/templates/UserWalletTemplate.vy": {100}})
+    assert analyzer.is_def_affected("tests/conf_mock.py", "bob_ai_wallet")
+    assert not analyzer.is_def_affected("tests/conf_mock.py", "alpha_token")
+
+    # python modules, transitively
+    analyzer = ImpactAnalyzer(ROOT, {"scripts/utils/event_indexer.py": {10}})
+    assert analyzer.is_def_affected("tests/indexer/test_event_indexer.py", "test_indexer_resumes_from_cursor")
+    assert not analyzer.is_def_affected("tests/valuation/test_portfolio_valuation.py", "test_valuation_chunking")
+    assert analyzer.is_affected("scripts/index_events.py")
+
+
+def test_impact_changed_lines():
+    path = "tests/conf_mock.py"
+
+    # inside a fixture, only that fixture
+    analyzer = ImpactAnalyzer(ROOT, {path: {getDefLine(path, "alpha_token")}})
+    assert analyzer.is_def_affected(path, "alpha_token")
+    assert not analyzer.is_def_affected(path, "bravo_token")
+
+    # in a helper, anything in the file could use it
+    analyzer = ImpactAnalyzer(ROOT, {path: {getDefLine(path, "_seedAmmPool")}})
+    assert analyzer.is_whole_file_affected(path)
+    assert analyzer.is_def_affected(path, "bravo_token")
+
+
+def test_impact_from_git(tmp_path):
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    files = {
+        "contracts/modules/Base.vy": "# @version 0.4.1\nx: uint256\n",
+        "contracts/Child.vy": "import contracts.modules.Base as base\ninitializes: base\n",
+        "contracts/Other.vy": "y: uint256\n",
+        "tests/test_things.py": "import boa\n\n\ndef test_child():\n    boa.load(\"contracts/Child.vy\")\n\n\ndef test_other():\n    boa.load(\"contracts/Other.vy\")\n",
+    }
+    for path, source in files.items():
+        os.makedirs(tmp_path / os.path.dirname(path), exist_ok=True)
+        (tmp_path / path).write_text(source)
+
+    git("init", "-q")
+    git("add", ".")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "init")
+
+    (tmp_path / "contracts/modules/Base.vy").write_text("# @version 0.4.1\nx: uint256\nz: uint256\n")
+    (tmp_path / "contracts/New.vy").write_text("w: uint256\n")
+
+    analyzer = ImpactAnalyzer.from_git(str(tmp_path), "HEAD")
+    assert analyzer.changes == {"contracts/modules/Base.vy": {3}, "contracts/New.vy": None}
+    assert analyzer.is_def_affected("tests/test_things.py", "test_child")
+    assert not analyzer.is_def_affected("tests/test_things.py", "test_other")
+
+
+def test_impact_import_cycles(tmp_path):
+    files = {
+        "a.py": "import b\nimport c\n",
+        "b.py": "import a\n",
+        "c.py": "x = 1\n",
+        "d.py": "import e\n",
+        "e.py": "import d\nimport a\n",
+        "f.py": "import g\n",
+        "g.py": "import f\n",
+    }
+    for path, source in files.items():
+        (tmp_path / path).write_text(source)
+
+    # b is reached through a while a is still resolving, it still ends up affected
+    analyzer = ImpactAnalyzer(str(tmp_path), {"c.py": {1}})
+    assert analyzer.is_affected("a.py")
+    assert analyzer.is_affected("b.py")
+    assert analyzer.is_affected("d.py")
+    assert analyzer.is_affected("e.py")
+    assert not analyzer.is_affected("f.py")
+    assert not analyzer.is_affected("g.py")
+
+    # same answers whichever file of the cycle is asked first
+    analyzer = ImpactAnalyzer(str(tmp_path), {"c.py": {1}})
+    assert analyzer.is_affected("b.py")
+    assert analyzer.is_affected("a.py")
@@ -0,0 +1,92 @@
+import pytest
+import boa
+import os
+
+from scripts.utils import json_file
+from scripts.utils.abi_index import build_abi_index, get_manifest_paths, load_abi_index
+from scripts.utils.event_indexer import BoaLogSource, EventDecoder
+
+
+@pytest.fixture(scope="function")
+def log_source(env):
+    source = BoaLogSource(env)
+    yield source
+    source.close()
+
+
+@pytest.fixture(scope="function")
+def token(governor):
+    return boa.load("contracts/mock/MockErc20.vy", governor, "Token", "TKN", 18, 1_000, name="index_token")
+
+
+@pytest.fixture(scope="function")
+def manifests(tmp_path, token, agent_factory, lego_registry):
+    paths = [str(tmp_path / "0001-manifest.json"), str(tmp_path / "deployments.json")]
+    json_file.save(paths[0], {"contracts": {
+        "AgentFactory": {"address": agent_factory.address, "abi": agent_factory.abi},
+        "MockErc20": {"address": token.address, "abi": token.abi},
+    }})
+    # deployments manifest layout, contracts at the top level
+    json_file.save(paths[1], {"LegoRegistry": {"address": lego_registry.address, "abi": lego_registry.abi}})
+    return paths
+
+
+#########
+# Tests #
+#########
+
+
+def test_abi_index_decodes_calls_and_logs(tmp_path, manifests, token, log_source, governor, bob):
+    index = build_abi_index(manifests, str(tmp_path / "abi-index.bin"))
+
+    # calldata
+    calldata = token.transfer.prepare_calldata(bob, 5)
+    name, args, contracts = index.decode_call(calldata)
+    assert name == "transfer"
+    assert args == {"_to": bob, "_value": 5}
+    assert contracts == ["MockErc20"]
+    assert index.get_functions(calldata[:4])[0]["inputs"] == ["address", "uint256"]
+    assert index.decode_call("0xdeadbeef") is None
+
+    # logs
+    token.transfer(bob, 5, sender=governor)
+    log = log_source.logs[-1]
+    assert index.decode_log(log) == ("Transfer", {"sender": governor, "receiver": bob, "value": 5})
+    assert index.decode_log({"topics": ["0x" + "00" * 32], "data": "0x"}) is None
+
+    # drop in for the event decoder
+    decoder = EventDecoder.from_abi_index(index)
+    assert decoder.decode(log) == index.decode_log(log)
+    assert decoder.get_topic("UserWalletCreated") is not None
+    assert decoder.get_topic("LegoHelperSet") is not None
+    index.close()
+
+
+def test_abi_index_rebuilds_on_manifest_change(tmp_path, manifests):
+    indexPath = str(tmp_path / "abi-index.bin")
+    index = load_abi_index(manifests, indexPath)
+    builtAt = os.stat(indexPath).st_mtime_ns
+    numEvents = len(index.events)
+    index.close()
+
+    # unchanged manifests, same file
+    index = load_abi_index(manifests, indexPath)
+    assert os.stat(indexPath).st_mtime_ns == builtAt
+    index.close()
+
+    # a manifest changed, rebuilt
+    manifest = json_file.load(manifests[1])
+    manifest["LegoRegistry"]["abi"] = manifest["LegoRegistry"]["abi"] + [{"type": "event", "name": "Extra", "anonymous": False, "inputs": []}]
+    json_file.save(manifests[1], manifest)
+    index = load_abi_index(manifests, indexPath)
+    assert len(index.events) == numEvents + 1
+    assert EventDecoder.from_abi_index(index).get_topic("Extra") is not None
+    index.close()
+
+
+def test_abi_index_covers_every_manifest(tmp_path):
+    index = load_abi_index(get_manifest_paths(), str(tmp_path / "abi-index.bin"))
+    for env in ["prod-v1", "prod-v2", "prod-v3"]:
+        decoder = EventDecoder.from_manifest(f"migration_history/{env}/current-manifest.json")
+        assert all(index.get_events(topic) != [] for topic in decoder.events)
+    index.close()
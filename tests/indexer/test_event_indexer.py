@@ -0,0 +1,207 @@
+import pytest
+import boa
+
+from boa.rpc import to_hex
+from eth_abi import encode
+
+from constants import EIGHTEEN_DECIMALS, MAX_UINT256
+from contracts.core.templates import UserWalletTemplate, UserWalletConfigTemplate
+from scripts.utils.event_indexer import BoaLogSource, EventDecoder, EventIndexer, IndexerStore, RangeTooLarge
+
+
+@pytest.fixture(scope="function")
+def log_source(env):
+    source = BoaLogSource(env)
+    yield source
+    source.close()
+
+
+@pytest.fixture(scope="function")
+def createWallet(agent_factory, alpha_token, alpha_token_whale):
+    def createWallet(_owner, _amount=1_000 * EIGHTEEN_DECIMALS):
+        wallet = UserWalletTemplate.at(agent_factory.createUserWallet(_owner, sender=_owner))
+        alpha_token.transfer(wallet, _amount, sender=alpha_token_whale)
+        return wallet, UserWalletConfigTemplate.at(wallet.walletConfig())
+
+    yield createWallet
+
+
+@pytest.fixture(scope="function")
+def makeIndexer(log_source, agent_factory):
+    def makeIndexer(_startBlock, _wallet, _walletConfig, _source=None, _maxRange=10_000):
+        decoder = EventDecoder([agent_factory.abi, _wallet.abi, _walletConfig.abi])
+        return EventIndexer(
+            _source or log_source,
+            IndexerStore(),
+            decoder,
+            [agent_factory],
+            start_block=_startBlock,
+            max_range=_maxRange,
+        )
+
+    yield makeIndexer
+
+
+class FlakySource:
+    # refuses any range wider than `maxBlocks`, like a provider with a results cap
+    def __init__(self, _source, _maxBlocks):
+        self.source = _source
+        self.maxBlocks = _maxBlocks
+        self.numRefused = 0
+
+    def get_latest_block(self):
+        return self.source.get_latest_block()
+
+    def get_block_hash(self, _blockNumber):
+        return self.source.get_block_hash(_blockNumber)
+
+    def get_logs(self, _addresses, _fromBlock, _toBlock):
+        if _toBlock - _fromBlock + 1 > self.maxBlocks:
+            self.numRefused += 1
+            raise RangeTooLarge("too many results")
+        return self.source.get_logs(_addresses, _fromBlock, _toBlock)
+
+
+#########
+# Tests #
+#########
+
+
+def test_indexer_discovers_wallets_and_events(log_source, createWallet, makeIndexer, agent_factory, alpha_token, owner, bob):
+    startBlock = boa.env.evm.patch.block_number
+    wallet, walletConfig = createWallet(owner)
+    other_wallet, _ = createWallet(bob)
+
+    boa.env.time_travel(blocks=10)
+    wallet.transferFunds(owner, 400 * EIGHTEEN_DECIMALS, alpha_token, sender=owner)
+    other_wallet.transferFunds(bob, MAX_UINT256, alpha_token, sender=bob)
+
+    indexer = makeIndexer(startBlock, wallet, walletConfig)
+    assert indexer.sync() != 0
+    assert indexer.store.get_cursor() == boa.env.evm.patch.block_number
+
+    # wallets, found via factory events
+    wallets = indexer.store.get_wallets()
+    assert [w[0] for w in wallets] == [wallet.address, other_wallet.address]
+    assert wallets[0][1] == walletConfig.address
+    assert wallets[0][2] == owner
+    assert wallets[0][4] == startBlock
+
+    # factory events
+    created = indexer.store.get_events("UserWalletCreated")
+    assert len(created) == 2
+    assert created[0]["address"] == agent_factory.address
+    assert created[0]["args"]["mainAddr"] == wallet.address
+    assert created[1]["args"]["owner"] == bob
+
+    # wallet events, decoded
+    transfers = indexer.store.get_events("UserWalletFundsTransferred", wallet)
+    assert len(transfers) == 1
+    assert transfers[0]["blockNumber"] == startBlock + 10
+    assert transfers[0]["args"]["recipient"] == owner
+    assert transfers[0]["args"]["asset"] == alpha_token.address
+    assert transfers[0]["args"]["amount"] == 400 * EIGHTEEN_DECIMALS
+    assert transfers[0]["args"]["isSignerAgent"] == False
+    assert indexer.store.get_events("UserWalletFundsTransferred", other_wallet)[0]["args"]["amount"] == 1_000 * EIGHTEEN_DECIMALS
+
+    # only the wallets + factory, not the token itself
+    assert all(e["address"] != alpha_token.address for e in indexer.store.get_events())
+
+
+def test_indexer_resumes_from_cursor(log_source, createWallet, makeIndexer, alpha_token, owner):
+    startBlock = boa.env.evm.patch.block_number
+    wallet, walletConfig = createWallet(owner)
+    indexer = makeIndexer(startBlock, wallet, walletConfig)
+    numEvents = indexer.sync()
+    assert numEvents != 0
+
+    # nothing new
+    assert indexer.sync() == 0
+
+    boa.env.time_travel(blocks=1)
+    wallet.transferFunds(owner, 1 * EIGHTEEN_DECIMALS, alpha_token, sender=owner)
+    assert indexer.sync() == 1
+    assert len(indexer.store.get_events()) == numEvents + 1
+
+
+def test_indexer_splits_refused_ranges(log_source, createWallet, makeIndexer, alpha_token, owner):
+    startBlock = boa.env.evm.patch.block_number
+    wallet, walletConfig = createWallet(owner)
+    for _ in range(5):
+        boa.env.time_travel(blocks=3)
+        wallet.transferFunds(owner, 1 * EIGHTEEN_DECIMALS, alpha_token, sender=owner)
+
+    source = FlakySource(log_source, 4)
+    indexer = makeIndexer(startBlock, wallet, walletConfig, source, 64)
+    indexer.sync()
+
+    assert source.numRefused != 0
+    assert len(indexer.store.get_events("UserWalletFundsTransferred")) == 5
+    assert indexer.store.get_cursor() == boa.env.evm.patch.block_number
+
+    # same result as an unrestricted run
+    full = makeIndexer(startBlock, wallet, walletConfig)
+    full.sync()
+    assert full.store.get_events() == indexer.store.get_events()
+
+
+def test_indexer_reorg_rollback(log_source, createWallet, makeIndexer, alpha_token, owner, bob):
+    startBlock = boa.env.evm.patch.block_number
+    wallet, walletConfig = createWallet(owner)
+    boa.env.time_travel(blocks=5)
+    reorgBlock = boa.env.evm.patch.block_number
+    wallet.transferFunds(owner, 1 * EIGHTEEN_DECIMALS, alpha_token, sender=owner)
+
+    indexer = makeIndexer(startBlock, wallet, walletConfig)
+    indexer.sync()
+    assert len(indexer.store.get_events("UserWalletFundsTransferred")) == 1
+
+    # that block gets replaced, with a different transfer + a new wallet
+    log_source.reorg(reorgBlock)
+    wallet.transferFunds(owner, 2 * EIGHTEEN_DECIMALS, alpha_token, sender=owner)
+    other_wallet, _ = createWallet(bob)
+
+    # only block hashes at range ends + blocks with events are kept, rolls back past the last one that still matches
+    rolledBack = indexer.check_reorg()
+    assert startBlock < rolledBack <= reorgBlock
+    assert indexer.store.get_cursor() == rolledBack - 1
+    assert len(indexer.store.get_events("UserWalletFundsTransferred")) == 0
+    assert len(indexer.store.get_wallets()) == 1
+
+    indexer.sync()
+    transfers = indexer.store.get_events("UserWalletFundsTransferred")
+    assert len(transfers) == 1
+    assert transfers[0]["args"]["amount"] == 2 * EIGHTEEN_DECIMALS
+    assert [w[0] for w in indexer.store.get_wallets()] == [wallet.address, other_wallet.address]
+
+    # no reorg, nothing to do
+    assert indexer.check_reorg() is None
+
+
+def test_indexer_decoder_from_manifest():
+    decoder = EventDecoder.from_manifest("migration_history/prod-v3/current-manifest.json")
+    for event in ["UserWalletCreated", "UserWalletDeposit", "UserWalletTransactionFeePaid", "UserWalletSubscriptionPaid"]:
+        assert decoder.get_topic(event) is not None
+
+
+
+def test_indexer_decoder_indexing_variants(bob, sally):
+    def transferEvent(_numIndexed):
+        names = ["sender", "receiver", "value"]
+        types = ["address", "address", "uint256"]
+        inputs = [{"name": n, "type": t, "indexed": i < _numIndexed} for i, (n, t) in enumerate(zip(names, types))]
+        return {"type": "event", "name": "Transfer", "anonymous": False, "inputs": inputs}
+
+    # erc20 and erc721 `Transfer` share topic0, only the indexing differs
+    decoder = EventDecoder([[transferEvent(2)], [transferEvent(3)]])
+    topic = decoder.get_topic("Transfer")
+    assert len(decoder.events[topic]) == 2
+
+    topics = [topic, to_hex(encode(["address"], [bob])), to_hex(encode(["address"], [sally]))]
+    erc20Log = {"topics": topics, "data": to_hex(encode(["uint256"], [5]))}
+    erc721Log = {"topics": topics + [to_hex(encode(["uint256"], [7]))], "data": "0x"}
+    assert decoder.decode(erc20Log) == ("Transfer", {"sender": bob, "receiver": sally, "value": 5})
+    assert decoder.decode(erc721Log) == ("Transfer", {"sender": bob, "receiver": sally, "value": 7})
+
+    # no variant with this indexing
+    assert decoder.decode({"topics": topics[:2], "data": to_hex(encode(["address", "uint256"], [sally, 5]))}) is None
@@ -186,7 +186,7 @@ def testLegoSwap(bob_ai_wallet, bob_agent, lego_registry, _test):
 
 
 @pytest.fixture(scope="package")
-def testLegoLiquidityAdded(bob_ai_wallet, bob_agent, _test):
+def testLegoLiquidityAdded(bob_ai_wallet, bob_agent, fork, _test):
     def testLegoLiquidityAdded(
         _lego,
         _nftAddr,
@@ -204,7 +204,7 @@ def testLegoLiquidityAdded(bob_ai_wallet, bob_agent, _test):
         lp_token_addr = _lego.getLpToken(_pool.address)
         lp_token = lp_token_addr
         if lp_token_addr != ZERO_ADDRESS:
-            lp_token = boa.from_etherscan(lp_token_addr)
+            lp_token = boa.env.lookup_contract(lp_token_addr) if fork == "local" else boa.from_etherscan(lp_token_addr)
 
         # pre balances
         pre_user_bal_a = _tokenA.balanceOf(bob_ai_wallet)
@@ -287,7 +287,7 @@ def testLegoLiquidityAdded(bob_ai_wallet, bob_agent, _test):
 
 
 @pytest.fixture(scope="package")
-def testLegoLiquidityRemoved(bob_ai_wallet, bob_agent, _test):
+def testLegoLiquidityRemoved(bob_ai_wallet, bob_agent, fork, _test):
     def testLegoLiquidityRemoved(
         _lego,
         _nftAddr,
@@ -302,7 +302,7 @@ def testLegoLiquidityRemoved(bob_ai_wallet, bob_agent, _test):
         lp_token_addr = _lego.getLpToken(_pool.address)
         lp_token = lp_token_addr
         if lp_token_addr != ZERO_ADDRESS:
-            lp_token = boa.from_etherscan(lp_token_addr)
+            lp_token = boa.env.lookup_contract(lp_token_addr) if fork == "local" else boa.from_etherscan(lp_token_addr)
 
         tokenAddrB = ZERO_ADDRESS
         if _tokenB != ZERO_ADDRESS:
@@ -0,0 +1,35 @@
+import pytest
+import boa
+
+from utils.BluePrint import CORE_TOKENS
+
+
+# local stand-ins for the fork tokens, seeded into the dex simulators (see `conf_mock.py`)
+LOCAL_TOKENS = {
+    "usdc": "alpha_token",
+    "weth": "mock_weth",
+    "aero": "bravo_token",
+    "well": "bravo_token",
+    "usdm": "charlie_token",
+    "dola": "charlie_token",
+}
+
+
+@pytest.fixture(scope="package")
+def getTokenAndWhale(getTokenAndWhale, fork, mock_dex_lp, request):
+    def getLocalTokenAndWhale(_token_str):
+        if fork == "local" and _token_str in LOCAL_TOKENS:
+            return request.getfixturevalue(LOCAL_TOKENS[_token_str]), mock_dex_lp
+        return getTokenAndWhale(_token_str)
+
+    yield getLocalTokenAndWhale
+
+
+@pytest.fixture(scope="package")
+def getCoreToken(fork, request):
+    def getCoreToken(_symbol):
+        if fork == "local":
+            return request.getfixturevalue(LOCAL_TOKENS[_symbol.lower()])
+        return boa.from_etherscan(CORE_TOKENS[fork][_symbol])
+
+    yield getCoreToken
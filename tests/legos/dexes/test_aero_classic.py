@@ -17,19 +17,15 @@ TEST_ASSETS = [
 TO_TOKEN = {
     "usdc": {
         "base": "0x526728DBc96689597F85ae4cd716d4f7fCcBAE9d", # msUSD (sAMM)
-        "local": ZERO_ADDRESS,
     },
     "weth": {
         "base": "0x7Ba6F01772924a82D9626c126347A28299E98c98", # msETH (sAMM)
-        "local": ZERO_ADDRESS,
     },
     "aero": {
         "base": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913", # USDC (vAMM)
-        "local": ZERO_ADDRESS,
     },
     "cbbtc": {
         "base": "0x0b3e328455c4059EEb9e3f84b5543F74E24e7E1b", # VIRTUAL (vAMM)
-        "local": ZERO_ADDRESS,
     },
 }
 
@@ -37,26 +33,40 @@ TO_TOKEN = {
 POOLS = {
     "usdc": {
         "base": "0xcEFC8B799a8EE5D9b312aeca73262645D664AaF7", # msUSD/usdc (sAMM)
-        "local": ZERO_ADDRESS,
     },
     "weth": {
         "base": "0xDE4FB30cCC2f1210FcE2c8aD66410C586C8D1f9A", # msETH/weth (sAMM)
-        "local": ZERO_ADDRESS,
     },
     "aero": {
         "base": "0x6cDcb1C4A4D1C3C6d054b27AC5B77e89eAFb971d", # USDC/aero (vAMM)
-        "local": ZERO_ADDRESS,
     },
     "cbbtc": {
         "base": "0xb909F567c5c2Bb1A4271349708CC4637D7318b4A", # VIRTUAL/cbbtc (vAMM)
-        "local": ZERO_ADDRESS,
     },
 }
 
 
+# local simulator swaps (see `conf_mock.py`), to token and pool type per from token
+LOCAL_TO_TOKEN = {
+    "usdc": "dola",
+    "weth": "usdc",
+    "aero": "usdc",
+}
+LOCAL_IS_STABLE = {
+    "usdc": True,
+    "weth": False,
+    "aero": False,
+}
+
+
 @pytest.fixture(scope="module")
-def getToToken(fork):
+def getToToken(fork, getTokenAndWhale):
     def getToToken(_token_str):
+        if fork == "local":
+            if _token_str not in LOCAL_TO_TOKEN:
+                pytest.skip("asset not relevant on this fork")
+            return getTokenAndWhale(LOCAL_TO_TOKEN[_token_str])[0]
+
         toToken = TO_TOKEN[_token_str][fork]
         if toToken == ZERO_ADDRESS:
             pytest.skip("asset not relevant on this fork")
@@ -66,8 +76,13 @@ def getToToken(fork):
 
 
 @pytest.fixture(scope="module")
-def getPool(fork):
+def getPool(fork, getTokenAndWhale, getToToken, mock_aero_factory):
     def getPool(_token_str):
+        if fork == "local":
+            fromToken, _ = getTokenAndWhale(_token_str)
+            toToken = getToToken(_token_str)
+            return mock_aero_factory.getPool(fromToken, toToken, LOCAL_IS_STABLE[_token_str])
+
         pool = POOLS[_token_str][fork]
         if pool == ZERO_ADDRESS:
             pytest.skip("asset not relevant on this fork")
@@ -76,7 +91,6 @@ def getPool(fork):
     yield getPool
 
 
-
 #########
 # Tests #
 #########
@@ -123,7 +137,7 @@ def test_aerodrome_classic_swap_partial_with_pool(
     testLegoSwap(lego_aero_classic.legoId(), fromAsset, toToken, pool, testAmount // 2)
 
 
-@pytest.always
+@pytest.base
 def test_aerodrom_classic_swap_with_routes(
     oracle_chainlink,
     getTokenAndWhale,
@@ -171,7 +185,7 @@ def test_aerodrom_classic_swap_with_routes(
 # add liquidity
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_add_liquidity_more_token_A_volatile(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -191,7 +205,7 @@ def test_aerodrome_classic_add_liquidity_more_token_A_volatile(
     testLegoLiquidityAdded(lego_aero_classic, ZERO_ADDRESS, 0, pool, tokenA, tokenB, amountA, amountB)
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_add_liquidity_more_token_B_volatile(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -211,7 +225,7 @@ def test_aerodrome_classic_add_liquidity_more_token_B_volatile(
     testLegoLiquidityAdded(lego_aero_classic, ZERO_ADDRESS, 0, pool, tokenA, tokenB, amountA, amountB)
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_add_liquidity_more_token_A_stable(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -231,7 +245,7 @@ def test_aerodrome_classic_add_liquidity_more_token_A_stable(
     testLegoLiquidityAdded(lego_aero_classic, ZERO_ADDRESS, 0, pool, tokenA, tokenB, amountA, amountB)
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_add_liquidity_more_token_B_stable(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -254,7 +268,7 @@ def test_aerodrome_classic_add_liquidity_more_token_B_stable(
 # remove liquidity
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_remove_liq_max_volatile(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -281,7 +295,7 @@ def test_aerodrome_classic_remove_liq_max_volatile(
     testLegoLiquidityRemoved(lego_aero_classic, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_remove_liq_partial_volatile(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -308,7 +322,7 @@ def test_aerodrome_classic_remove_liq_partial_volatile(
     testLegoLiquidityRemoved(lego_aero_classic, ZERO_ADDRESS, 0, pool, tokenA, tokenB, lpAmountReceived // 2)
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_remove_liq_max_stable(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -335,7 +349,7 @@ def test_aerodrome_classic_remove_liq_max_stable(
     testLegoLiquidityRemoved(lego_aero_classic, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_remove_liq_partial_stable(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -365,7 +379,7 @@ def test_aerodrome_classic_remove_liq_partial_stable(
 # helper / utils
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_get_best_pool(
     getTokenAndWhale,
     lego_aero_classic,
@@ -388,7 +402,7 @@ def test_aerodrome_classic_get_best_pool(
     assert best_pool.numCoins == 2
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_get_swap_amount_out(
     getTokenAndWhale,
     lego_aero_classic,
@@ -403,7 +417,7 @@ def test_aerodrome_classic_get_swap_amount_out(
     _test(2_500 * (10 ** tokenA.decimals()), amount_out, 100)
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_get_swap_amount_in(
     getTokenAndWhale,
     lego_aero_classic,
@@ -418,7 +432,7 @@ def test_aerodrome_classic_get_swap_amount_in(
     _test(2_500 * (10 ** tokenA.decimals()), amount_in, 100)
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_get_add_liq_amounts_in(
     getTokenAndWhale,
     lego_aero_classic,
@@ -444,7 +458,7 @@ def test_aerodrome_classic_get_add_liq_amounts_in(
     _test(liq_amount_b, 4 * (10 ** tokenB.decimals()), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_get_remove_liq_amounts_out(
     getTokenAndWhale,
     bob_ai_wallet,
@@ -479,7 +493,7 @@ def test_aerodrome_classic_get_remove_liq_amounts_out(
     _test(second_amount, 7_500 * (10 ** tokenA.decimals()), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_aerodrome_classic_get_price(
     getTokenAndWhale,
     lego_aero_classic,
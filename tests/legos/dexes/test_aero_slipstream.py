@@ -18,23 +18,18 @@ TEST_ASSETS = [
 TO_TOKEN = {
     "usdc": {
         "base": "0x526728DBc96689597F85ae4cd716d4f7fCcBAE9d", # msUSD (CL50)
-        "local": ZERO_ADDRESS,
     },
     "weth": {
         "base": "0x60a3e35cc302bfa44cb288bc5a4f316fdb1adb42", # EURC (CL100)
-        "local": ZERO_ADDRESS,
     },
     "aero": {
         "base": "0x4200000000000000000000000000000000000006", # weth (CL200)
-        "local": ZERO_ADDRESS,
     },
     "cbbtc": {
         "base": "0x236aa50979D5f3De3Bd1Eeb40E81137F22ab794b", # tbtc (CL1)
-        "local": ZERO_ADDRESS,
     },
     "eurc": {
         "base": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913", # usdc (CL50)
-        "local": ZERO_ADDRESS,
     },
 }
 
@@ -42,30 +37,43 @@ TO_TOKEN = {
 POOLS = {
     "usdc": {
         "base": "0x7501bc8Bb51616F79bfA524E464fb7B41f0B10fB", # msUSD (CL50)
-        "local": ZERO_ADDRESS,
     },
     "weth": {
         "base": "0x5d4e504EB4c526995E0cC7A6E327FDa75D8B52b5", # EURC (CL100)
-        "local": ZERO_ADDRESS,
     },
     "aero": {
         "base": "0x82321f3BEB69f503380D6B233857d5C43562e2D0", # weth (CL200)
-        "local": ZERO_ADDRESS,
     },
     "cbbtc": {
         "base": "0x138aceE5573fA09e7F215965ff60898cc33c6330", # tbtc (CL1)
-        "local": ZERO_ADDRESS,
     },
     "eurc": {
         "base": "0xE846373C1a92B167b4E9cd5d8E4d6B1Db9E90EC7", # usdc (CL50)
-        "local": ZERO_ADDRESS,
     },
 }
 
 
+# local simulator swaps (see `conf_mock.py`), to token and tick spacing per from token
+LOCAL_TO_TOKEN = {
+    "usdc": "usdm",
+    "weth": "usdc",
+    "aero": "usdc",
+}
+LOCAL_TICK_SPACINGS = {
+    "usdc": 1,
+    "weth": 100,
+    "aero": 200,
+}
+
+
 @pytest.fixture(scope="module")
-def getToToken(fork):
+def getToToken(fork, getTokenAndWhale):
     def getToToken(_token_str):
+        if fork == "local":
+            if _token_str not in LOCAL_TO_TOKEN:
+                pytest.skip("asset not relevant on this fork")
+            return getTokenAndWhale(LOCAL_TO_TOKEN[_token_str])[0]
+
         toToken = TO_TOKEN[_token_str][fork]
         if toToken == ZERO_ADDRESS:
             pytest.skip("asset not relevant on this fork")
@@ -75,8 +83,13 @@ def getToToken(fork):
 
 
 @pytest.fixture(scope="module")
-def getPool(fork):
+def getPool(fork, getTokenAndWhale, getToToken, mock_slipstream_factory):
     def getPool(_token_str):
+        if fork == "local":
+            fromToken, _ = getTokenAndWhale(_token_str)
+            toToken = getToToken(_token_str)
+            return mock_slipstream_factory.getPool(fromToken, toToken, LOCAL_TICK_SPACINGS[_token_str])
+
         pool = POOLS[_token_str][fork]
         if pool == ZERO_ADDRESS:
             pytest.skip("asset not relevant on this fork")
@@ -85,7 +98,6 @@ def getPool(fork):
     yield getPool
 
 
-
 #########
 # Tests #
 #########
@@ -132,7 +144,7 @@ def test_aero_slipstream_swap_partial_with_pool(
     testLegoSwap(lego_aero_slipstream.legoId(), fromAsset, toToken, pool, testAmount // 2)
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_swap_with_routes(
     oracle_chainlink,
     getTokenAndWhale,
@@ -180,7 +192,7 @@ def test_aero_slipstream_swap_with_routes(
 # add liquidity
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_add_liquidity_new_position_more_token_A(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -202,7 +214,7 @@ def test_aero_slipstream_add_liquidity_new_position_more_token_A(
     assert nftTokenId != 0
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_add_liquidity_new_position_more_token_B(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -224,7 +236,7 @@ def test_aero_slipstream_add_liquidity_new_position_more_token_B(
     assert nftTokenId != 0
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_add_liquidity_increase_position(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -262,7 +274,7 @@ def test_aero_slipstream_add_liquidity_increase_position(
 # remove liquidity
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_remove_liq_max(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -291,7 +303,7 @@ def test_aero_slipstream_remove_liq_max(
     testLegoLiquidityRemoved(lego_aero_slipstream, nft_token_manager, nftTokenId, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_remove_liq_partial(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -320,7 +332,7 @@ def test_aero_slipstream_remove_liq_partial(
     testLegoLiquidityRemoved(lego_aero_slipstream, nft_token_manager, nftTokenId, pool, tokenA, tokenB, liquidityAdded // 2)
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_remove_liq_max_stable(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -353,7 +365,7 @@ def test_aero_slipstream_remove_liq_max_stable(
 # helper / utils
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_get_best_pool(
     getTokenAndWhale,
     lego_aero_slipstream,
@@ -375,7 +387,7 @@ def test_aero_slipstream_get_best_pool(
     assert best_pool.numCoins == 2
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_get_swap_amount_out(
     getTokenAndWhale,
     lego_aero_slipstream,
@@ -390,7 +402,7 @@ def test_aero_slipstream_get_swap_amount_out(
     _test(2_500 * (10 ** tokenA.decimals()), amount_out, 100)
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_get_best_swap_amount_out(
     lego_aero_slipstream,
     fork,
@@ -408,7 +420,7 @@ def test_aero_slipstream_get_best_swap_amount_out(
     assert best_pool != ZERO_ADDRESS
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_get_swap_amount_in(
     getTokenAndWhale,
     lego_aero_slipstream,
@@ -423,7 +435,7 @@ def test_aero_slipstream_get_swap_amount_in(
     _test(2_500 * (10 ** tokenA.decimals()), amount_in, 100)
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_get_add_liq_amounts_in(
     getTokenAndWhale,
     lego_aero_slipstream,
@@ -449,7 +461,7 @@ def test_aero_slipstream_get_add_liq_amounts_in(
     _test(liq_amount_b, 4 * (10 ** tokenB.decimals()), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_get_remove_liq_amounts_out(
     getTokenAndWhale,
     bob_ai_wallet,
@@ -484,7 +496,7 @@ def test_aero_slipstream_get_remove_liq_amounts_out(
     _test(second_amount, 7_500 * (10 ** tokenA.decimals()), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_aero_slipstream_get_price(
     getTokenAndWhale,
     lego_aero_slipstream,
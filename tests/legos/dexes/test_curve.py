@@ -19,23 +19,18 @@ TEST_ASSETS = [
 TO_TOKEN = {
     "usdc": {
         "base": "0x59d9356e565ab3a36dd77763fc0d87feaf85508c", # usdm (stable ng)
-        "local": ZERO_ADDRESS,
     },
     "weth": {
         "base": "0x2ae3f1ec7f1f5012cfeab0185bfc7aa3cf0dec22", # cbeth (two crypto)
-        "local": ZERO_ADDRESS,
     },
     "tbtc": {
         "base": "0x417ac0e078398c154edfadd9ef675d30be60af93", # crvusd (tricrypto)
-        "local": ZERO_ADDRESS,
     },
     "frok": {
         "base": "0x4200000000000000000000000000000000000006", # weth (two crypto ng)
-        "local": ZERO_ADDRESS,
     },
     "crvusd": {
         "base": "0xd9aaec86b65d86f6a7b5b1b0c42ffa531710b6ca", # usdbc (4pool)
-        "local": ZERO_ADDRESS,
     },
 }
 
@@ -43,30 +38,36 @@ TO_TOKEN = {
 POOLS = {
     "usdc": {
         "base": "0x63Eb7846642630456707C3efBb50A03c79B89D81", # usdc/usdm (stable ng)
-        "local": ZERO_ADDRESS,
     },
     "weth": {
         "base": "0x11C1fBd4b3De66bC0565779b35171a6CF3E71f59", # weth/cbeth (two crypto)
-        "local": ZERO_ADDRESS,
     },
     "tbtc": {
         "base": "0x6e53131F68a034873b6bFA15502aF094Ef0c5854", # tbtc/crvusd (tricrypto)
-        "local": ZERO_ADDRESS,
     },
     "frok": {
         "base": "0xa0D3911349e701A1F49C1Ba2dDA34b4ce9636569", # frok/weth (two crypto ng)
-        "local": ZERO_ADDRESS,
     },
     "crvusd": {
         "base": "0xf6C5F01C7F3148891ad0e19DF78743D31E390D1f", # crvusd/usdbc (4pool)
-        "local": ZERO_ADDRESS,
     },
 }
 
 
+# local simulator swaps (see `conf_mock.py`), to token per from token
+LOCAL_TO_TOKEN = {
+    "usdc": "usdm",
+}
+
+
 @pytest.fixture(scope="module")
-def getToToken(fork):
+def getToToken(fork, getTokenAndWhale):
     def getToToken(_token_str):
+        if fork == "local":
+            if _token_str not in LOCAL_TO_TOKEN:
+                pytest.skip("asset not relevant on this fork")
+            return getTokenAndWhale(LOCAL_TO_TOKEN[_token_str])[0]
+
         toToken = TO_TOKEN[_token_str][fork]
         if toToken == ZERO_ADDRESS:
             pytest.skip("asset not relevant on this fork")
@@ -76,8 +77,13 @@ def getToToken(fork):
 
 
 @pytest.fixture(scope="module")
-def getPool(fork):
+def getPool(fork, getTokenAndWhale, getToToken, mock_curve_registry):
     def getPool(_token_str):
+        if fork == "local":
+            fromToken, _ = getTokenAndWhale(_token_str)
+            toToken = getToToken(_token_str)
+            return mock_curve_registry.find_pools_for_coins(fromToken, toToken)[0]
+
         pool = POOLS[_token_str][fork]
         if pool == ZERO_ADDRESS:
             pytest.skip("asset not relevant on this fork")
@@ -86,7 +92,6 @@ def getPool(fork):
     yield getPool
 
 
-
 #########
 # Tests #
 #########
@@ -133,7 +138,7 @@ def test_curve_swap_partial_with_pool(
     testLegoSwap(lego_curve.legoId(), fromAsset, toToken, pool, testAmount // 2)
 
 
-@pytest.always
+@pytest.base
 def test_curve_swap_with_routes(
     oracle_chainlink,
     getTokenAndWhale,
@@ -181,7 +186,7 @@ def test_curve_swap_with_routes(
 # add liquidity
 
 
-@pytest.always
+@pytest.base
 def test_curve_add_liquidity_stable_ng(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -201,7 +206,7 @@ def test_curve_add_liquidity_stable_ng(
     testLegoLiquidityAdded(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_curve_add_liquidity_stable_ng_one_coin(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -218,7 +223,7 @@ def test_curve_add_liquidity_stable_ng_one_coin(
     testLegoLiquidityAdded(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB, amountA, 0)
 
 
-@pytest.always
+@pytest.base
 def test_curve_add_liquidity_two_crypto(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -238,7 +243,7 @@ def test_curve_add_liquidity_two_crypto(
     testLegoLiquidityAdded(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_curve_add_liquidity_two_crypto_one_coin(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -255,7 +260,7 @@ def test_curve_add_liquidity_two_crypto_one_coin(
     testLegoLiquidityAdded(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB, amountA, 0)
 
 
-@pytest.always
+@pytest.base
 def test_curve_add_liquidity_tricrypto(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -275,7 +280,7 @@ def test_curve_add_liquidity_tricrypto(
     testLegoLiquidityAdded(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_curve_add_liquidity_tricrypto_one_coin(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -292,7 +297,7 @@ def test_curve_add_liquidity_tricrypto_one_coin(
     testLegoLiquidityAdded(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB, amountA, 0)
 
 
-@pytest.always
+@pytest.base
 def test_curve_add_liquidity_two_crypto_ng(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -312,7 +317,7 @@ def test_curve_add_liquidity_two_crypto_ng(
     testLegoLiquidityAdded(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_curve_add_liquidity_two_crypto_ng_one_coin(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -329,7 +334,7 @@ def test_curve_add_liquidity_two_crypto_ng_one_coin(
     testLegoLiquidityAdded(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB, amountA, 0)
 
 
-@pytest.always
+@pytest.base
 def test_curve_add_liquidity_4pool(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -349,7 +354,7 @@ def test_curve_add_liquidity_4pool(
     testLegoLiquidityAdded(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_curve_add_liquidity_4pool_one_coin(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -369,7 +374,7 @@ def test_curve_add_liquidity_4pool_one_coin(
 # remove liquidity
 
 
-@pytest.always
+@pytest.base
 def test_curve_remove_liquidity_stable_ng(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -396,7 +401,7 @@ def test_curve_remove_liquidity_stable_ng(
     testLegoLiquidityRemoved(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_curve_remove_liquidity_stable_ng_one_coin(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -423,7 +428,7 @@ def test_curve_remove_liquidity_stable_ng_one_coin(
     testLegoLiquidityRemoved(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, ZERO_ADDRESS)
 
 
-@pytest.always
+@pytest.base
 def test_curve_remove_liquidity_two_crypto(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -450,7 +455,7 @@ def test_curve_remove_liquidity_two_crypto(
     testLegoLiquidityRemoved(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_curve_remove_liquidity_two_crypto_one_coin(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -477,7 +482,7 @@ def test_curve_remove_liquidity_two_crypto_one_coin(
     testLegoLiquidityRemoved(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, ZERO_ADDRESS)
 
 
-@pytest.always
+@pytest.base
 def test_curve_remove_liquidity_tricrypto(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -504,7 +509,7 @@ def test_curve_remove_liquidity_tricrypto(
     testLegoLiquidityRemoved(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_curve_remove_liquidity_tricrypto_one_coin(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -531,7 +536,7 @@ def test_curve_remove_liquidity_tricrypto_one_coin(
     testLegoLiquidityRemoved(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, ZERO_ADDRESS)
 
 
-@pytest.always
+@pytest.base
 def test_curve_remove_liquidity_two_crypto_ng(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -558,7 +563,7 @@ def test_curve_remove_liquidity_two_crypto_ng(
     testLegoLiquidityRemoved(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_curve_remove_liquidity_two_crypto_ng_one_coin(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -585,7 +590,7 @@ def test_curve_remove_liquidity_two_crypto_ng_one_coin(
     testLegoLiquidityRemoved(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, ZERO_ADDRESS)
 
 
-@pytest.always
+@pytest.base
 def test_curve_remove_liquidity_4pool(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -612,7 +617,7 @@ def test_curve_remove_liquidity_4pool(
     testLegoLiquidityRemoved(lego_curve, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_curve_remove_liquidity_4pool_one_coin(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -643,7 +648,7 @@ def test_curve_remove_liquidity_4pool_one_coin(
 # helper / utils
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_best_pool(
     getTokenAndWhale,
     lego_curve,
@@ -666,7 +671,7 @@ def test_curve_get_best_pool(
     assert best_pool.numCoins == 3
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_swap_amount_out(
     getTokenAndWhale,
     lego_curve,
@@ -681,7 +686,7 @@ def test_curve_get_swap_amount_out(
     _test(2_450 * (10 ** tokenA.decimals()), amount_out, 100)
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_swap_amount_out_diff_decimals(
     getTokenAndWhale,
     lego_curve,
@@ -696,7 +701,7 @@ def test_curve_get_swap_amount_out_diff_decimals(
     _test(1_000 * (10 ** tokenA.decimals()), amount_out, 100)
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_swap_amount_in(
     getTokenAndWhale,
     lego_curve,
@@ -711,7 +716,7 @@ def test_curve_get_swap_amount_in(
     _test(2_555 * (10 ** tokenA.decimals()), amount_in, 100)
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_swap_amount_in_diff_decimals(
     getTokenAndWhale,
     lego_curve,
@@ -729,7 +734,7 @@ def test_curve_get_swap_amount_in_diff_decimals(
     _test(1_000 * (10 ** tokenB.decimals()), amount_in, 100)
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_add_liq_amounts_in_stable_ng(
     getTokenAndWhale,
     lego_curve,
@@ -757,7 +762,7 @@ def test_curve_get_add_liq_amounts_in_stable_ng(
     assert lp_amount != 0
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_add_liq_amounts_in_crypto_ng(
     getTokenAndWhale,
     lego_curve,
@@ -776,7 +781,7 @@ def test_curve_get_add_liq_amounts_in_crypto_ng(
     assert lp_amount != 0
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_add_liq_amounts_in_two_crypto(
     getTokenAndWhale,
     lego_curve,
@@ -795,7 +800,7 @@ def test_curve_get_add_liq_amounts_in_two_crypto(
     assert lp_amount != 0
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_add_liq_amounts_in_tricrypto(
     getTokenAndWhale,
     lego_curve,
@@ -814,7 +819,7 @@ def test_curve_get_add_liq_amounts_in_tricrypto(
     assert lp_amount != 0
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_add_liq_amounts_in_meta_pool(
     getTokenAndWhale,
     lego_curve,
@@ -833,7 +838,7 @@ def test_curve_get_add_liq_amounts_in_meta_pool(
     assert lp_amount != 0
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_remove_liq_amounts_out_stable_ng(
     getTokenAndWhale,
     bob_ai_wallet,
@@ -871,7 +876,7 @@ def test_curve_get_remove_liq_amounts_out_stable_ng(
     _test(liq_amount_b, 19_999 * (10 ** tokenB.decimals()), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_remove_liq_amounts_out_two_crypto(
     getTokenAndWhale,
     bob_ai_wallet,
@@ -909,7 +914,7 @@ def test_curve_get_remove_liq_amounts_out_two_crypto(
     _test(liq_amount_b, int(3.83 * (10 ** tokenB.decimals())), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_remove_liq_amounts_out_tricrypto(
     getTokenAndWhale,
     bob_ai_wallet,
@@ -947,7 +952,7 @@ def test_curve_get_remove_liq_amounts_out_tricrypto(
     _test(liq_amount_b, 18_796 * (10 ** tokenB.decimals()), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_remove_liq_amounts_out_crypto_ng(
     getTokenAndWhale,
     bob_ai_wallet,
@@ -985,7 +990,7 @@ def test_curve_get_remove_liq_amounts_out_crypto_ng(
     _test(liq_amount_b, 103_001 * (10 ** tokenB.decimals()), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_curve_get_remove_liq_amounts_out_4pool(
     getTokenAndWhale,
     bob_ai_wallet,
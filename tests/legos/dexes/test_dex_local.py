@@ -0,0 +1,256 @@
+import pytest
+import boa
+
+from constants import ZERO_ADDRESS, EIGHTEEN_DECIMALS
+
+
+# runs against the local dex simulators in `contracts/mock/` (see `conf_mock.py`),
+# fork tests for the same legos live in the per-dex test files
+
+
+@pytest.fixture(scope="module")
+def fundBob(bob_ai_wallet, mock_dex_lp):
+    def fundBob(_token, _amount):
+        amount = _amount * (10 ** _token.decimals())
+        _token.transfer(bob_ai_wallet.address, amount, sender=mock_dex_lp)
+        return amount
+
+    yield fundBob
+
+
+@pytest.fixture(scope="module")
+def dexPools(
+    mock_uni_v2_factory,
+    mock_aero_factory,
+    mock_uni_v3_factory,
+    mock_slipstream_factory,
+    mock_curve_registry,
+    alpha_token,
+    bravo_token,
+    charlie_token,
+    mock_weth,
+):
+    return {
+        "uni_v2": boa.env.lookup_contract(mock_uni_v2_factory.getPair(alpha_token, mock_weth)),
+        "aero_classic": boa.env.lookup_contract(mock_aero_factory.getPool(alpha_token, mock_weth, False)),
+        "aero_classic_stable": boa.env.lookup_contract(mock_aero_factory.getPool(alpha_token, charlie_token, True)),
+        "uni_v3": boa.env.lookup_contract(mock_uni_v3_factory.getPool(alpha_token, mock_weth, 500)),
+        "uni_v3_shallow": boa.env.lookup_contract(mock_uni_v3_factory.getPool(alpha_token, mock_weth, 3000)),
+        "slipstream": boa.env.lookup_contract(mock_slipstream_factory.getPool(alpha_token, mock_weth, 100)),
+        "curve": boa.env.lookup_contract(mock_curve_registry.find_pools_for_coins(alpha_token, charlie_token)[0]),
+        "curve_bravo": boa.env.lookup_contract(mock_curve_registry.find_pools_for_coins(alpha_token, bravo_token)[0]),
+    }
+
+
+########
+# Swap #
+########
+
+
+@pytest.mark.parametrize("lego_str", ["uni_v2", "aero_classic", "uni_v3", "slipstream"])
+def test_local_dex_swap_max(
+    lego_str,
+    testLegoSwap,
+    fundBob,
+    dexPools,
+    alpha_token,
+    mock_weth,
+    lego_uniswap_v2,
+    lego_aero_classic,
+    lego_uniswap_v3,
+    lego_aero_slipstream,
+):
+    lego = {"uni_v2": lego_uniswap_v2, "aero_classic": lego_aero_classic, "uni_v3": lego_uniswap_v3, "slipstream": lego_aero_slipstream}[lego_str]
+    fundBob(alpha_token, 10_000)
+    testLegoSwap(lego.legoId(), alpha_token, mock_weth, dexPools[lego_str].address)
+
+
+@pytest.mark.parametrize("lego_str", ["uni_v2", "aero_classic", "uni_v3", "slipstream"])
+def test_local_dex_swap_partial_reverse(
+    lego_str,
+    testLegoSwap,
+    fundBob,
+    dexPools,
+    alpha_token,
+    mock_weth,
+    lego_uniswap_v2,
+    lego_aero_classic,
+    lego_uniswap_v3,
+    lego_aero_slipstream,
+):
+    lego = {"uni_v2": lego_uniswap_v2, "aero_classic": lego_aero_classic, "uni_v3": lego_uniswap_v3, "slipstream": lego_aero_slipstream}[lego_str]
+    amount = fundBob(mock_weth, 4)
+    testLegoSwap(lego.legoId(), mock_weth, alpha_token, dexPools[lego_str].address, amount // 2)
+
+
+def test_local_dex_swap_stable_pools(
+    testLegoSwap,
+    fundBob,
+    dexPools,
+    alpha_token,
+    charlie_token,
+    lego_aero_classic,
+    lego_curve,
+):
+    fundBob(alpha_token, 10_000)
+    testLegoSwap(lego_aero_classic.legoId(), alpha_token, charlie_token, dexPools["aero_classic_stable"].address)
+
+    # curve, different decimals (alpha 18, charlie 6)
+    fundBob(charlie_token, 10_000)
+    testLegoSwap(lego_curve.legoId(), charlie_token, alpha_token, dexPools["curve"].address)
+
+
+def test_local_dex_swap_matches_quote(
+    fundBob,
+    dexPools,
+    alpha_token,
+    mock_weth,
+    bob_ai_wallet,
+    bob_agent,
+    lego_uniswap_v2,
+    lego_uniswap_v3,
+):
+    for lego, pool in [(lego_uniswap_v2, dexPools["uni_v2"]), (lego_uniswap_v3, dexPools["uni_v3"])]:
+        amount = fundBob(alpha_token, 25_000)
+        expected = lego.getSwapAmountOut(pool, alpha_token, mock_weth, amount)
+        assert expected != 0
+
+        # should be roughly 10 weth (2,500 alpha per weth), minus fees + price impact
+        assert 9 * EIGHTEEN_DECIMALS < expected < 10 * EIGHTEEN_DECIMALS
+
+        fromSwapAmount, toAmount, _ = bob_ai_wallet.swapTokens([(lego.legoId(), amount, 0, [alpha_token, mock_weth], [pool])], sender=bob_agent)
+        assert fromSwapAmount == amount
+        assert toAmount == expected
+
+
+def test_local_dex_swap_min_amount_out(
+    fundBob,
+    dexPools,
+    alpha_token,
+    mock_weth,
+    bob_ai_wallet,
+    bob_agent,
+    lego_uniswap_v3,
+):
+    amount = fundBob(alpha_token, 10_000)
+    expected = lego_uniswap_v3.getSwapAmountOut(dexPools["uni_v3"], alpha_token, mock_weth, amount)
+    with boa.reverts():
+        bob_ai_wallet.swapTokens([(lego_uniswap_v3.legoId(), amount, expected + 1, [alpha_token, mock_weth], [dexPools["uni_v3"]])], sender=bob_agent)
+
+
+##########
+# Quotes #
+##########
+
+
+def test_local_dex_best_pool(
+    alpha_token,
+    mock_weth,
+    dexPools,
+    lego_uniswap_v3,
+    lego_aero_slipstream,
+):
+    # deeper 5 bps pool should win over the shallow 30 bps one
+    best = lego_uniswap_v3.getDeepestLiqPool(alpha_token, mock_weth)
+    assert best.pool == dexPools["uni_v3"].address
+    assert best.fee == 5
+
+    pool, amountOut = lego_uniswap_v3.getBestSwapAmountOut(alpha_token, mock_weth, 10_000 * EIGHTEEN_DECIMALS)
+    assert pool == dexPools["uni_v3"].address
+    assert amountOut > lego_uniswap_v3.getSwapAmountOut(dexPools["uni_v3_shallow"], alpha_token, mock_weth, 10_000 * EIGHTEEN_DECIMALS)
+
+    best = lego_aero_slipstream.getDeepestLiqPool(alpha_token, mock_weth)
+    assert best.pool == dexPools["slipstream"].address
+
+
+def test_local_dex_amount_in_round_trip(
+    alpha_token,
+    mock_weth,
+    charlie_token,
+    dexPools,
+    lego_uniswap_v2,
+    lego_aero_classic,
+    lego_uniswap_v3,
+    lego_curve,
+):
+    wethOut = 2 * EIGHTEEN_DECIMALS
+    for lego, pool in [(lego_uniswap_v2, dexPools["uni_v2"]), (lego_aero_classic, dexPools["aero_classic"]), (lego_uniswap_v3, dexPools["uni_v3"])]:
+        amountIn = lego.getSwapAmountIn(pool, alpha_token, mock_weth, wethOut)
+        assert amountIn > 5_000 * EIGHTEEN_DECIMALS
+        assert lego.getSwapAmountOut(pool, alpha_token, mock_weth, amountIn) >= wethOut * 999 // 1000
+
+    # curve stable pair, close to 1:1 after decimals
+    charlieIn = lego_curve.getSwapAmountIn(dexPools["curve"], charlie_token, alpha_token, 1_000 * EIGHTEEN_DECIMALS)
+    assert 999 * (10 ** 6) < charlieIn < 1_010 * (10 ** 6)
+
+
+#############
+# Liquidity #
+#############
+
+
+@pytest.mark.parametrize("lego_str", ["uni_v2", "aero_classic", "curve_bravo"])
+def test_local_dex_add_remove_liquidity(
+    lego_str,
+    testLegoLiquidityAdded,
+    testLegoLiquidityRemoved,
+    fundBob,
+    dexPools,
+    alpha_token,
+    bravo_token,
+    mock_weth,
+    bob_ai_wallet,
+    lego_uniswap_v2,
+    lego_aero_classic,
+    lego_curve,
+):
+    lego = {"uni_v2": lego_uniswap_v2, "aero_classic": lego_aero_classic, "curve_bravo": lego_curve}[lego_str]
+    pool = dexPools[lego_str]
+    tokenB = bravo_token if lego_str == "curve_bravo" else mock_weth
+
+    amountA = fundBob(alpha_token, 10_000)
+    amountB = fundBob(tokenB, 10_000 if lego_str == "curve_bravo" else 4)
+    testLegoLiquidityAdded(lego, ZERO_ADDRESS, 0, pool, alpha_token, tokenB, amountA, amountB)
+
+    # partial, then the rest
+    lpBal = pool.balanceOf(bob_ai_wallet)
+    testLegoLiquidityRemoved(lego, ZERO_ADDRESS, 0, pool, alpha_token, tokenB, lpBal // 2)
+    testLegoLiquidityRemoved(lego, ZERO_ADDRESS, 0, pool, alpha_token, tokenB)
+
+
+@pytest.mark.parametrize("lego_str", ["uni_v3", "slipstream"])
+def test_local_dex_nft_liquidity(
+    lego_str,
+    testLegoLiquidityAdded,
+    testLegoLiquidityRemoved,
+    fundBob,
+    dexPools,
+    alpha_token,
+    mock_weth,
+    bob_ai_wallet,
+    lego_uniswap_v3,
+    lego_aero_slipstream,
+    mock_uni_v3_nft_manager,
+    mock_slipstream_nft_manager,
+):
+    lego, nftManager = {"uni_v3": (lego_uniswap_v3, mock_uni_v3_nft_manager), "slipstream": (lego_aero_slipstream, mock_slipstream_nft_manager)}[lego_str]
+    pool = dexPools[lego_str]
+
+    amountA = fundBob(alpha_token, 10_000)
+    amountB = fundBob(mock_weth, 4)
+    nftTokenId = testLegoLiquidityAdded(lego, nftManager, 0, pool, alpha_token, mock_weth, amountA, amountB)
+    assert nftManager.ownerOf(nftTokenId) == bob_ai_wallet.address
+
+    # add to existing position
+    amountA = fundBob(alpha_token, 5_000)
+    amountB = fundBob(mock_weth, 2)
+    assert testLegoLiquidityAdded(lego, nftManager, nftTokenId, pool, alpha_token, mock_weth, amountA, amountB) == nftTokenId
+
+    # partial, nft goes back to wallet
+    liquidity = nftManager.positions(nftTokenId).liquidity
+    testLegoLiquidityRemoved(lego, nftManager, nftTokenId, pool, alpha_token, mock_weth, liquidity // 2)
+    assert nftManager.ownerOf(nftTokenId) == bob_ai_wallet.address
+
+    # rest, nft gets burned
+    testLegoLiquidityRemoved(lego, nftManager, nftTokenId, pool, alpha_token, mock_weth)
+    assert nftManager.balanceOf(bob_ai_wallet) == 0
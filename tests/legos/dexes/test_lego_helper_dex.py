@@ -1,7 +1,5 @@
 import pytest
-import boa
 
-from utils.BluePrint import CORE_TOKENS
 from constants import ZERO_ADDRESS, HUNDRED_PERCENT, MAX_UINT256
 
 
@@ -11,12 +9,12 @@ from constants import ZERO_ADDRESS, HUNDRED_PERCENT, MAX_UINT256
 
 
 @pytest.always
-def test_get_routes_and_swap_instructions_amount_out(lego_helper, fork):
+def test_get_routes_and_swap_instructions_amount_out(lego_helper, getCoreToken):
     """Test the high-level getRoutesAndSwapInstructionsAmountOut function"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     
     # Test with 1% slippage
     slippage = 1_00  # 1%
@@ -46,11 +44,11 @@ def test_get_routes_and_swap_instructions_amount_out(lego_helper, fork):
 
 
 @pytest.always
-def test_get_routes_and_swap_instructions_amount_in(lego_helper, fork):
+def test_get_routes_and_swap_instructions_amount_in(lego_helper, getCoreToken):
     """Test the high-level getRoutesAndSwapInstructionsAmountIn function"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     weth_amount = int(0.1 * (10 ** weth.decimals()))  # 0.1 WETH
     
     # Test with 1% slippage and 1000 USDC available
@@ -78,12 +76,12 @@ def test_get_routes_and_swap_instructions_amount_in(lego_helper, fork):
 
 
 @pytest.always
-def test_prepare_swap_instructions_amount_out(lego_helper, fork):
+def test_prepare_swap_instructions_amount_out(lego_helper, getCoreToken):
     """Test the prepareSwapInstructionsAmountOut function"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     
     # Get routes
     routes = lego_helper.getBestSwapRoutesAmountOut(usdc.address, weth.address, usdc_amount)
@@ -109,12 +107,12 @@ def test_prepare_swap_instructions_amount_out(lego_helper, fork):
 
 
 @pytest.always
-def test_get_best_swap_routes_amount_out(lego_helper, fork):
+def test_get_best_swap_routes_amount_out(lego_helper, getCoreToken):
     """Test the getBestSwapRoutesAmountOut function"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     
     # Get routes without specifying lego IDs
     routes = lego_helper.getBestSwapRoutesAmountOut(usdc.address, weth.address, usdc_amount)
@@ -152,13 +150,13 @@ def test_get_best_swap_routes_amount_out(lego_helper, fork):
 
 
 @pytest.always
-def test_get_best_swap_amount_out_with_router_pool(lego_helper, fork):
+def test_get_best_swap_amount_out_with_router_pool(lego_helper, getCoreToken):
     """Test the getBestSwapAmountOutWithRouterPool function"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
     # Use a token that's likely to require routing through core tokens
-    well = boa.from_etherscan(CORE_TOKENS[fork]["WELL"])
+    well = getCoreToken("WELL")
     
     # Get amount out and routes
     amount_out, routes = lego_helper.getBestSwapAmountOutWithRouterPool(
@@ -183,12 +181,12 @@ def test_get_best_swap_amount_out_with_router_pool(lego_helper, fork):
 
 
 @pytest.always
-def test_get_best_swap_amount_out_single_pool(lego_helper, fork):
+def test_get_best_swap_amount_out_single_pool(lego_helper, getCoreToken):
     """Test the getBestSwapAmountOutSinglePool function"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     
     # Get best swap route for a single pool
     route = lego_helper.getBestSwapAmountOutSinglePool(
@@ -215,11 +213,11 @@ def test_get_best_swap_amount_out_single_pool(lego_helper, fork):
 
 
 @pytest.always
-def test_get_swap_amount_out_via_router_pool(lego_helper, fork):
+def test_get_swap_amount_out_via_router_pool(lego_helper, getCoreToken):
     """Test the getSwapAmountOutViaRouterPool function"""
     # Get router tokens (typically USDC and WETH)
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    usdc = getCoreToken("USDC")
+    weth = getCoreToken("WETH")
     
     usdc_amount = 100 * (10 ** usdc.decimals())
     
@@ -238,11 +236,11 @@ def test_get_swap_amount_out_via_router_pool(lego_helper, fork):
 
 
 @pytest.always
-def test_get_best_swap_routes_amount_in(lego_helper, fork):
+def test_get_best_swap_routes_amount_in(lego_helper, getCoreToken):
     """Test the getBestSwapRoutesAmountIn function"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     weth_amount = int(0.1 * (10 ** weth.decimals()))  # 0.1 WETH
     
     # Get routes without specifying lego IDs
@@ -270,12 +268,12 @@ def test_get_best_swap_routes_amount_in(lego_helper, fork):
 
 
 @pytest.always
-def test_get_best_swap_amount_in_with_router_pool(lego_helper, fork):
+def test_get_best_swap_amount_in_with_router_pool(lego_helper, getCoreToken):
     """Test the getBestSwapAmountInWithRouterPool function"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     
     # Use a token that's likely to require routing through core tokens
-    well = boa.from_etherscan(CORE_TOKENS[fork]["WELL"])
+    well = getCoreToken("WELL")
     well_amount = 10 * (10 ** well.decimals())  # 10 WELL
     
     # Get amount in and routes
@@ -301,11 +299,11 @@ def test_get_best_swap_amount_in_with_router_pool(lego_helper, fork):
 
 
 @pytest.always
-def test_get_best_swap_amount_in_single_pool(lego_helper, fork):
+def test_get_best_swap_amount_in_single_pool(lego_helper, getCoreToken):
     """Test the getBestSwapAmountInSinglePool function"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     weth_amount = int(0.1 * (10 ** weth.decimals()))  # 0.1 WETH
     
     # Get best swap route for a single pool
@@ -333,11 +331,11 @@ def test_get_best_swap_amount_in_single_pool(lego_helper, fork):
 
 
 @pytest.always
-def test_get_swap_amount_in_via_router_pool(lego_helper, fork):
+def test_get_swap_amount_in_via_router_pool(lego_helper, getCoreToken):
     """Test the getSwapAmountInViaRouterPool function"""
     # Get router tokens (typically USDC and WETH)
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    usdc = getCoreToken("USDC")
+    weth = getCoreToken("WETH")
     
     weth_amount = int(0.1 * (10 ** weth.decimals()))  # 0.1 WETH
     
@@ -356,13 +354,13 @@ def test_get_swap_amount_in_via_router_pool(lego_helper, fork):
 
 
 @pytest.always
-def test_multi_token_path_swap(lego_helper, fork):
+def test_multi_token_path_swap(lego_helper, getCoreToken):
     """Test swaps with multiple tokens in the path"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
     # Try to find a token that might require multiple hops
-    well = boa.from_etherscan(CORE_TOKENS[fork]["WELL"])
+    well = getCoreToken("WELL")
     
     # Get routes
     routes = lego_helper.getBestSwapRoutesAmountOut(usdc.address, well.address, usdc_amount)
@@ -393,9 +391,9 @@ def test_multi_token_path_swap(lego_helper, fork):
 # Edge Cases and Special Scenarios
 
 @pytest.always
-def test_edge_case_same_token(lego_helper, fork):
+def test_edge_case_same_token(lego_helper, getCoreToken):
     """Test swapping between the same token (should return empty routes)"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
     # Test getBestSwapRoutesAmountOut with same token
@@ -420,10 +418,10 @@ def test_edge_case_same_token(lego_helper, fork):
 
 
 @pytest.always
-def test_edge_case_zero_amount(lego_helper, fork):
+def test_edge_case_zero_amount(lego_helper, getCoreToken):
     """Test swapping with zero amount (should return empty routes)"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    usdc = getCoreToken("USDC")
+    weth = getCoreToken("WETH")
     
     # Test getBestSwapRoutesAmountOut with zero amount
     routes = lego_helper.getBestSwapRoutesAmountOut(usdc.address, weth.address, 0)
@@ -447,10 +445,10 @@ def test_edge_case_zero_amount(lego_helper, fork):
 
 
 @pytest.always
-def test_edge_case_empty_address(lego_helper, fork):
+def test_edge_case_empty_address(lego_helper, getCoreToken):
     """Test swapping with empty address (should return empty routes)"""
     # Now that the contract handles empty addresses gracefully, we can test this functionality
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
 
     # Test getBestSwapRoutesAmountOut with empty address
@@ -461,7 +459,7 @@ def test_edge_case_empty_address(lego_helper, fork):
     assert len(routes) == 0
 
     # Test getBestSwapRoutesAmountIn with empty address
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     weth_amount = int(0.1 * (10 ** weth.decimals()))
     routes = lego_helper.getBestSwapRoutesAmountIn(usdc.address, ZERO_ADDRESS, weth_amount)
     assert len(routes) == 0
@@ -471,7 +469,7 @@ def test_edge_case_empty_address(lego_helper, fork):
 
 
 @pytest.always
-def test_prepare_swap_instructions_empty_routes(lego_helper, fork):
+def test_prepare_swap_instructions_empty_routes(lego_helper, getCoreToken):
     """Test preparing swap instructions with empty routes"""
     # Test prepareSwapInstructionsAmountOut with empty routes
     instructions = lego_helper.prepareSwapInstructionsAmountOut(1_00, [])
@@ -479,12 +477,12 @@ def test_prepare_swap_instructions_empty_routes(lego_helper, fork):
 
 
 @pytest.always
-def test_specific_lego_ids(lego_helper, fork):
+def test_specific_lego_ids(lego_helper, getCoreToken):
     """Test swapping with specific lego IDs"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     
     # Get all available lego IDs
     uniswap_v2_id = lego_helper.uniswapV2Id()
@@ -517,12 +515,12 @@ def test_specific_lego_ids(lego_helper, fork):
 
 
 @pytest.always
-def test_different_slippage_values(lego_helper, fork):
+def test_different_slippage_values(lego_helper, getCoreToken):
     """Test swapping with different slippage values"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     
     # Get routes
     routes = lego_helper.getBestSwapRoutesAmountOut(usdc.address, weth.address, usdc_amount)
@@ -548,11 +546,11 @@ def test_different_slippage_values(lego_helper, fork):
 
 
 @pytest.always
-def test_router_token_swaps(lego_helper, fork):
+def test_router_token_swaps(lego_helper, getCoreToken):
     """Test swaps involving router tokens"""
     # Get router tokens (typically USDC and WETH)
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    usdc = getCoreToken("USDC")
+    weth = getCoreToken("WETH")
     
     # Test direct swap between router tokens
     usdc_amount = 100 * (10 ** usdc.decimals())
@@ -562,7 +560,7 @@ def test_router_token_swaps(lego_helper, fork):
     assert len(routes) > 0
     
     # Test swap from router token to another token
-    well = boa.from_etherscan(CORE_TOKENS[fork]["WELL"])
+    well = getCoreToken("WELL")
     
     # Get routes from router token to another token
     routes_from_router = lego_helper.getBestSwapRoutesAmountOut(usdc.address, well.address, usdc_amount)
@@ -578,13 +576,13 @@ def test_router_token_swaps(lego_helper, fork):
 
 
 @pytest.always
-def test_multi_hop_consolidation(lego_helper, fork):
+def test_multi_hop_consolidation(lego_helper, getCoreToken):
     """Test consolidation of multi-hop routes with the same lego ID"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
     # Try to find a token that might require multiple hops
-    well = boa.from_etherscan(CORE_TOKENS[fork]["WELL"])
+    well = getCoreToken("WELL")
     
     # Get routes
     routes = lego_helper.getBestSwapRoutesAmountOut(usdc.address, well.address, usdc_amount)
@@ -615,13 +613,13 @@ def test_multi_hop_consolidation(lego_helper, fork):
 
 
 @pytest.always
-def test_multi_hop_different_legos(lego_helper, fork):
+def test_multi_hop_different_legos(lego_helper, getCoreToken):
     """Test multi-hop routes with different lego IDs"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
     # Try to find a token that might require multiple hops
-    well = boa.from_etherscan(CORE_TOKENS[fork]["WELL"])
+    well = getCoreToken("WELL")
     
     # Get routes
     routes = lego_helper.getBestSwapRoutesAmountOut(usdc.address, well.address, usdc_amount)
@@ -645,14 +643,14 @@ def test_multi_hop_different_legos(lego_helper, fork):
 
 
 @pytest.always
-def test_large_amount_swaps(lego_helper, fork):
+def test_large_amount_swaps(lego_helper, getCoreToken):
     """Test swaps with large amounts"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     
     # Test with a large amount (1 million USDC)
     large_usdc_amount = 1_000_000 * (10 ** usdc.decimals())
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     
     # Get routes for large amount
     routes = lego_helper.getBestSwapRoutesAmountOut(usdc.address, weth.address, large_usdc_amount)
@@ -672,14 +670,14 @@ def test_large_amount_swaps(lego_helper, fork):
 
 
 @pytest.always
-def test_small_amount_swaps(lego_helper, fork):
+def test_small_amount_swaps(lego_helper, getCoreToken):
     """Test swaps with small amounts"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     
     # Test with a small amount (0.01 USDC)
     small_usdc_amount = int(0.01 * (10 ** usdc.decimals()))
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     
     # Get routes for small amount
     routes = lego_helper.getBestSwapRoutesAmountOut(usdc.address, weth.address, small_usdc_amount)
@@ -699,13 +697,13 @@ def test_small_amount_swaps(lego_helper, fork):
 
 
 @pytest.always
-def test_compare_direct_vs_router_pool_routes(lego_helper, fork):
+def test_compare_direct_vs_router_pool_routes(lego_helper, getCoreToken):
     """Test comparison between direct routes and router pool routes"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
     # Try to find a token that might have both direct and router pool routes
-    well = boa.from_etherscan(CORE_TOKENS[fork]["WELL"])
+    well = getCoreToken("WELL")
     
     # Get direct route
     direct_route = lego_helper.getBestSwapAmountOutSinglePool(
@@ -737,11 +735,11 @@ def test_compare_direct_vs_router_pool_routes(lego_helper, fork):
 
 
 @pytest.always
-def test_compare_direct_vs_router_pool_routes_amount_in(lego_helper, fork):
+def test_compare_direct_vs_router_pool_routes_amount_in(lego_helper, getCoreToken):
     """Test comparison between direct routes and router pool routes for amount in"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     
-    well = boa.from_etherscan(CORE_TOKENS[fork]["WELL"])
+    well = getCoreToken("WELL")
     well_amount = 10 * (10 ** well.decimals())
     
     # Get direct route
@@ -774,11 +772,11 @@ def test_compare_direct_vs_router_pool_routes_amount_in(lego_helper, fork):
 
 
 @pytest.always
-def test_get_routes_and_swap_instructions_amount_in_with_limited_amount(lego_helper, fork):
+def test_get_routes_and_swap_instructions_amount_in_with_limited_amount(lego_helper, getCoreToken):
     """Test getRoutesAndSwapInstructionsAmountIn with limited available amount"""
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     weth_amount = int(0.1 * (10 ** weth.decimals()))  # 0.1 WETH
     
     # First get the amount needed without limiting
@@ -807,7 +805,7 @@ def test_get_routes_and_swap_instructions_amount_in_with_limited_amount(lego_hel
 
 
 @pytest.always
-def test_all_dex_lego_ids(lego_helper, fork):
+def test_all_dex_lego_ids(lego_helper, getCoreToken):
     """Test all available DEX lego IDs"""
     # Get all available DEX lego IDs
     uniswap_v2_id = lego_helper.uniswapV2Id()
@@ -821,10 +819,10 @@ def test_all_dex_lego_ids(lego_helper, fork):
     assert len(set(lego_ids)) == len(lego_ids)
     
     # Test with each lego ID individually
-    usdc = boa.from_etherscan(CORE_TOKENS[fork]["USDC"])
+    usdc = getCoreToken("USDC")
     usdc_amount = 100 * (10 ** usdc.decimals())
     
-    weth = boa.from_etherscan(CORE_TOKENS[fork]["WETH"])
+    weth = getCoreToken("WETH")
     
     for lego_id in lego_ids:
         # Test getBestSwapRoutesAmountOut with specific lego ID
@@ -15,11 +15,9 @@ TEST_ASSETS = [
 TO_TOKEN = {
     "usdc": {
         "base": "0x4200000000000000000000000000000000000006", # WETH
-        "local": ZERO_ADDRESS,
     },
     "weth": {
         "base": "0x0b3e328455c4059EEb9e3f84b5543F74E24e7E1b", # VIRTUAL
-        "local": ZERO_ADDRESS,
     },
 }
 
@@ -27,18 +25,28 @@ TO_TOKEN = {
 POOLS = {
     "usdc": {
         "base": "0x88A43bbDF9D098eEC7bCEda4e2494615dfD9bB9C", # usdc/weth
-        "local": ZERO_ADDRESS,
     },
     "weth": {
         "base": "0xE31c372a7Af875b3B5E0F3713B17ef51556da667", # weth/virtual
-        "local": ZERO_ADDRESS,
     },
 }
 
 
+# local simulator swaps (see `conf_mock.py`), to token per from token
+LOCAL_TO_TOKEN = {
+    "usdc": "weth",
+    "weth": "aero",
+}
+
+
 @pytest.fixture(scope="module")
-def getToToken(fork):
+def getToToken(fork, getTokenAndWhale):
     def getToToken(_token_str):
+        if fork == "local":
+            if _token_str not in LOCAL_TO_TOKEN:
+                pytest.skip("asset not relevant on this fork")
+            return getTokenAndWhale(LOCAL_TO_TOKEN[_token_str])[0]
+
         toToken = TO_TOKEN[_token_str][fork]
         if toToken == ZERO_ADDRESS:
             pytest.skip("asset not relevant on this fork")
@@ -48,8 +56,13 @@ def getToToken(fork):
 
 
 @pytest.fixture(scope="module")
-def getPool(fork):
+def getPool(fork, getTokenAndWhale, getToToken, mock_uni_v2_factory):
     def getPool(_token_str):
+        if fork == "local":
+            fromToken, _ = getTokenAndWhale(_token_str)
+            toToken = getToToken(_token_str)
+            return mock_uni_v2_factory.getPair(fromToken, toToken)
+
         pool = POOLS[_token_str][fork]
         if pool == ZERO_ADDRESS:
             pytest.skip("asset not relevant on this fork")
@@ -104,7 +117,7 @@ def test_uniswapV2_swap_partial_with_pool(
     testLegoSwap(lego_uniswap_v2.legoId(), fromAsset, toToken, pool, testAmount // 2)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV2_swap_with_multiple_routes(
     oracle_chainlink,
     getTokenAndWhale,
@@ -152,7 +165,7 @@ def test_uniswapV2_swap_with_multiple_routes(
 # add liquidity
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV2_add_liquidity_more_token_A(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -172,7 +185,7 @@ def test_uniswapV2_add_liquidity_more_token_A(
     testLegoLiquidityAdded(lego_uniswap_v2, ZERO_ADDRESS, 0, pool, tokenA, tokenB, amountA, amountB)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV2_add_liquidity_more_token_B(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -195,7 +208,7 @@ def test_uniswapV2_add_liquidity_more_token_B(
 # remove liquidity
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV2_remove_liq_max(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -222,7 +235,7 @@ def test_uniswapV2_remove_liq_max(
     testLegoLiquidityRemoved(lego_uniswap_v2, ZERO_ADDRESS, 0, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV2_remove_liq_partial(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -252,7 +265,7 @@ def test_uniswapV2_remove_liq_partial(
 # helper / utils
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV2_get_best_pool(
     getTokenAndWhale,
     lego_uniswap_v2,
@@ -274,7 +287,7 @@ def test_uniswapV2_get_best_pool(
     assert best_pool.numCoins == 2
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV2_get_swap_amount_out(
     getTokenAndWhale,
     lego_uniswap_v2,
@@ -303,7 +316,7 @@ def test_uniswapV2_get_swap_amount_out(
     assert amount_out == amount_out_b
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV2_get_swap_amount_in(
     getTokenAndWhale,
     lego_uniswap_v2,
@@ -318,7 +331,7 @@ def test_uniswapV2_get_swap_amount_in(
     _test(2_500 * (10 ** tokenA.decimals()), amount_in, 100)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV2_get_add_liq_amounts_in(
     getTokenAndWhale,
     lego_uniswap_v2,
@@ -344,7 +357,7 @@ def test_uniswapV2_get_add_liq_amounts_in(
     _test(liq_amount_b, 4 * (10 ** tokenB.decimals()), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV2_get_remove_liq_amounts_out(
     getTokenAndWhale,
     bob_ai_wallet,
@@ -379,7 +392,7 @@ def test_uniswapV2_get_remove_liq_amounts_out(
     _test(second_amount, 7_500 * (10 ** tokenA.decimals()), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV2_get_price(
     getTokenAndWhale,
     lego_uniswap_v2,
@@ -15,11 +15,9 @@ TEST_ASSETS = [
 TO_TOKEN = {
     "usdc": {
         "base": "0x4200000000000000000000000000000000000006", # WETH
-        "local": ZERO_ADDRESS,
     },
     "weth": {
         "base": "0xb33Ff54b9F7242EF1593d2C9Bcd8f9df46c77935", # FAI
-        "local": ZERO_ADDRESS,
     },
 }
 
@@ -27,18 +25,32 @@ TO_TOKEN = {
 POOLS = {
     "usdc": {
         "base": "0xd0b53D9277642d899DF5C87A3966A349A798F224", # usdc/weth
-        "local": ZERO_ADDRESS,
     },
     "weth": {
         "base": "0x68B27E9066d3aAdC6078E17C8611b37868F96A1D", # weth/fai
-        "local": ZERO_ADDRESS,
     },
 }
 
 
+# local simulator swaps (see `conf_mock.py`), to token and fee tier per from token
+LOCAL_TO_TOKEN = {
+    "usdc": "weth",
+    "weth": "usdc",
+}
+LOCAL_FEES = {
+    "usdc": 500,
+    "weth": 3000,
+}
+
+
 @pytest.fixture(scope="module")
-def getToToken(fork):
+def getToToken(fork, getTokenAndWhale):
     def getToToken(_token_str):
+        if fork == "local":
+            if _token_str not in LOCAL_TO_TOKEN:
+                pytest.skip("asset not relevant on this fork")
+            return getTokenAndWhale(LOCAL_TO_TOKEN[_token_str])[0]
+
         toToken = TO_TOKEN[_token_str][fork]
         if toToken == ZERO_ADDRESS:
             pytest.skip("asset not relevant on this fork")
@@ -48,8 +60,13 @@ def getToToken(fork):
 
 
 @pytest.fixture(scope="module")
-def getPool(fork):
+def getPool(fork, getTokenAndWhale, getToToken, mock_uni_v3_factory):
     def getPool(_token_str):
+        if fork == "local":
+            fromToken, _ = getTokenAndWhale(_token_str)
+            toToken = getToToken(_token_str)
+            return mock_uni_v3_factory.getPool(fromToken, toToken, LOCAL_FEES[_token_str])
+
         pool = POOLS[_token_str][fork]
         if pool == ZERO_ADDRESS:
             pytest.skip("asset not relevant on this fork")
@@ -104,7 +121,7 @@ def test_uniswapV3_swap_partial_with_pool(
     testLegoSwap(lego_uniswap_v3.legoId(), fromAsset, toToken, pool, testAmount // 2)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_swap_with_routes(
     oracle_chainlink,
     getTokenAndWhale,
@@ -152,7 +169,7 @@ def test_uniswapV3_swap_with_routes(
 # add liquidity
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_add_liquidity_new_position_more_token_A(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -174,7 +191,7 @@ def test_uniswapV3_add_liquidity_new_position_more_token_A(
     assert nftTokenId != 0
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_add_liquidity_new_position_more_token_B(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -196,7 +213,7 @@ def test_uniswapV3_add_liquidity_new_position_more_token_B(
     assert nftTokenId != 0
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_add_liquidity_increase_position(
     testLegoLiquidityAdded,
     getTokenAndWhale,
@@ -234,7 +251,7 @@ def test_uniswapV3_add_liquidity_increase_position(
 # remove liquidity
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_remove_liq_max(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -263,7 +280,7 @@ def test_uniswapV3_remove_liq_max(
     testLegoLiquidityRemoved(lego_uniswap_v3, uniswap_nft_token_manager, nftTokenId, pool, tokenA, tokenB)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_remove_liq_partial(
     testLegoLiquidityRemoved,
     getTokenAndWhale,
@@ -295,7 +312,7 @@ def test_uniswapV3_remove_liq_partial(
 # helper / utils
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_get_best_pool(
     getTokenAndWhale,
     lego_uniswap_v3,
@@ -317,7 +334,7 @@ def test_uniswapV3_get_best_pool(
     assert best_pool.numCoins == 2
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_get_swap_amount_out(
     getTokenAndWhale,
     lego_uniswap_v3,
@@ -347,7 +364,7 @@ def test_uniswapV3_get_swap_amount_out(
     _test(amount_out, amount_out_b, 100)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_get_best_swap_amount_out(
     lego_uniswap_v3,
     fork,
@@ -365,7 +382,7 @@ def test_uniswapV3_get_best_swap_amount_out(
     assert best_pool != ZERO_ADDRESS
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_get_swap_amount_in(
     getTokenAndWhale,
     lego_uniswap_v3,
@@ -380,7 +397,7 @@ def test_uniswapV3_get_swap_amount_in(
     _test(2_500 * (10 ** tokenA.decimals()), amount_in, 100)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_get_add_liq_amounts_in(
     getTokenAndWhale,
     lego_uniswap_v3,
@@ -406,7 +423,7 @@ def test_uniswapV3_get_add_liq_amounts_in(
     _test(liq_amount_b, 4 * (10 ** tokenB.decimals()), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_get_remove_liq_amounts_out(
     getTokenAndWhale,
     bob_ai_wallet,
@@ -441,7 +458,7 @@ def test_uniswapV3_get_remove_liq_amounts_out(
     _test(second_amount, 7_500 * (10 ** tokenA.decimals()), 1_00)
 
 
-@pytest.always
+@pytest.base
 def test_uniswapV3_get_price(
     getTokenAndWhale,
     lego_uniswap_v3,
@@ -0,0 +1,30 @@
+import pytest
+import boa
+
+from constants import EIGHTEEN_DECIMALS, MAX_UINT256
+
+
+pytestmark = pytest.mark.gas
+
+
+@pytest.fixture(scope="module")
+def lego_user(env, alpha_token, alpha_token_whale, bravo_token, bravo_token_whale, mock_lego_alpha, alpha_token_erc4626_vault):
+    user = boa.env.generate_address("lego_gas_user")
+    alpha_token.transfer(user, 1_000 * EIGHTEEN_DECIMALS, sender=alpha_token_whale)
+    bravo_token.transfer(mock_lego_alpha, 1_000 * EIGHTEEN_DECIMALS, sender=bravo_token_whale)
+
+    alpha_token.approve(mock_lego_alpha, MAX_UINT256, sender=user)
+    alpha_token_erc4626_vault.approve(mock_lego_alpha, MAX_UINT256, sender=user)
+    return user
+
+
+# each lego is called directly (no wallet), so numbers are lego-only overhead
+
+
+def test_gas_mock_lego_deposit_withdraw(gas_bench, lego_user, mock_lego_alpha, alpha_token, alpha_token_erc4626_vault, oracle_registry):
+    gas_bench.measure("mock_lego.depositTokens", mock_lego_alpha.depositTokens, alpha_token, 100 * EIGHTEEN_DECIMALS, alpha_token_erc4626_vault, lego_user, oracle_registry, sender=lego_user)
+    gas_bench.measure("mock_lego.withdrawTokens", mock_lego_alpha.withdrawTokens, alpha_token, 50 * EIGHTEEN_DECIMALS, alpha_token_erc4626_vault, lego_user, oracle_registry, sender=lego_user)
+
+
+def test_gas_mock_lego_swap(gas_bench, lego_user, mock_lego_alpha, alpha_token, bravo_token, oracle_registry):
+    gas_bench.measure("mock_lego.swapTokens", mock_lego_alpha.swapTokens, 100 * EIGHTEEN_DECIMALS, 0, [alpha_token, bravo_token], [alpha_token], lego_user, oracle_registry, sender=lego_user)
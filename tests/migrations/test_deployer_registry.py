@@ -0,0 +1,93 @@
+import pytest
+import os
+
+from eth_account import Account
+
+from scripts.utils import tracing
+from scripts.utils.deploy_args import DeployArgs
+from scripts.utils.deployer_registry import DeployerRegistry
+from scripts.utils.migration_helpers import TEST_PRIVATE_KEY, get_vyper_abi
+from scripts.utils.migration_runner import MigrationRunner
+
+
+FILES = {
+    "MockErc20": "contracts/mock/MockErc20.vy",
+    "MockMulticall3": "contracts/mock/MockMulticall3.vy",
+}
+
+DEPLOY_MIGRATION = """
+def migrate(migration):
+    deployer = migration.account()
+    migration.deploy("MockErc20", deployer.address, "Token", "TKN", 18, 1_000)
+"""
+
+USE_MIGRATION = """
+def migrate(migration):
+    token = migration.get_contract("MockErc20")
+    migration.execute(token.mint, migration.account().address, 5 * 10**18)
+    migration.get_contract("MockErc20")
+"""
+
+
+@pytest.fixture
+def tracer():
+    tracer = tracing.set_tracer(tracing.Tracer())
+    yield tracer
+    tracing.set_tracer(tracing.Tracer())
+
+
+def getKinds(_tracer, _kind):
+    return [s for s in _tracer.spans() if s.kind == _kind]
+
+
+#########
+# Tests #
+#########
+
+
+def test_deployer_registry_compiles_once(tracer):
+    deployers = DeployerRegistry(FILES)
+    assert "MockErc20" not in deployers
+
+    deployer = deployers.get("MockErc20")
+    assert deployers.get("MockErc20") is deployer
+    assert "MockErc20" in deployers
+    assert len(getKinds(tracer, "compile")) == 1
+
+    # same abi as the vyper cli, no extra compile
+    assert deployers.get_abi("MockErc20") == get_vyper_abi(FILES["MockErc20"])
+    assert len(getKinds(tracer, "compile")) == 1
+
+
+def test_deployer_registry_warm(tracer):
+    deployers = DeployerRegistry({**FILES, "Broken": "contracts/does/not/Exist.vy"})
+    results = [f.result() for f in deployers.warm()]
+    deployers.close()
+    assert results == [True, True, False]
+
+    # already compiled in the background
+    assert "MockMulticall3" in deployers
+    deployers.get("MockErc20")
+    deployers.get("MockMulticall3")
+    assert len(getKinds(tracer, "compile")) == 0
+
+    # failures show up when the contract is needed
+    with pytest.raises(Exception):
+        deployers.get("Broken")
+
+
+def test_migrations_share_deployers(tmp_path, tracer):
+    migrationsDir = tmp_path / "migrations"
+    os.makedirs(migrationsDir)
+    (migrationsDir / "0001_deploy.py").write_text(DEPLOY_MIGRATION)
+    (migrationsDir / "0002_use.py").write_text(USE_MIGRATION)
+
+    runner = MigrationRunner(str(migrationsDir), str(tmp_path / "history"), FILES)
+    deployArgs = DeployArgs(Account.from_key(TEST_PRIVATE_KEY), "local", ignore_logs=True, blueprint="base")
+    assert runner.run(deployArgs) != 0
+
+    # compiled once across both migrations, manifests didn't shell out for abis
+    compiles = getKinds(tracer, "compile")
+    assert [s.name for s in compiles] == ["MockErc20"]
+    assert len(getKinds(tracer, "abi")) == 0
+    assert len(getKinds(tracer, "manifest")) == 2
@@ -0,0 +1,141 @@
+import copy
+
+import pytest
+import boa
+
+from constants import EIGHTEEN_DECIMALS
+from scripts.utils.deployer_registry import DeployerRegistry
+from scripts.utils.deployment_audit import DeploymentAuditor
+from scripts.utils.portfolio_valuation import BoaEthCaller, Multicaller
+
+
+FILES = {
+    "AddyRegistry": "contracts/core/registries/AddyRegistry.vy",
+    "AgentFactory": "contracts/core/AgentFactory.vy",
+    "LegoRegistry": "contracts/core/registries/LegoRegistry.vy",
+    "OracleRegistry": "contracts/core/registries/OracleRegistry.vy",
+    "PriceSheets": "contracts/core/PriceSheets.vy",
+    "UserWalletTemplate": "contracts/core/templates/UserWalletTemplate.vy",
+    "UserWalletConfigTemplate": "contracts/core/templates/UserWalletConfigTemplate.vy",
+    "AgentTemplate": "contracts/core/templates/AgentTemplate.vy",
+    "ChainlinkFeeds": "contracts/oracles/ChainlinkFeeds.vy",
+    "MockErc20": "contracts/mock/MockErc20.vy",
+}
+
+
+@pytest.fixture(scope="module")
+def mock_multicall():
+    return boa.load("contracts/mock/MockMulticall3.vy", name="mock_multicall")
+
+
+@pytest.fixture(scope="module")
+def deployers():
+    deployers = DeployerRegistry(FILES)
+    yield deployers
+    deployers.close()
+
+
+@pytest.fixture(scope="function")
+def makeAuditor(env, mock_multicall, deployers):
+    def makeAuditor(_manifest, _legoTypes, _feeds):
+        multicaller = Multicaller(BoaEthCaller(env), mock_multicall)
+        return DeploymentAuditor(multicaller, _manifest, _legoTypes, _feeds), multicaller
+
+    yield makeAuditor
+
+
+@pytest.fixture(scope="function")
+def deployment(deployers, addy_registry, agent_factory, lego_registry, oracle_registry, price_sheets, oracle_chainlink, wallet_funds_template, wallet_config_template, agent_template, mock_lego_alpha, mock_lego_bravo, alpha_token, governor):
+    feed = boa.load("contracts/mock/MockChainlinkFeed.vy", 2 * EIGHTEEN_DECIMALS, name="alpha_feed")
+    assert oracle_chainlink.setChainlinkFeed(alpha_token, feed, sender=governor)
+    token = boa.load(FILES["MockErc20"], governor, "Token", "TKN", 18, 1_000, name="audit_token")
+
+    contracts = {
+        "AddyRegistry": addy_registry,
+        "AgentFactory": agent_factory,
+        "LegoRegistry": lego_registry,
+        "OracleRegistry": oracle_registry,
+        "PriceSheets": price_sheets,
+        "ChainlinkFeeds": oracle_chainlink,
+        "UserWalletTemplate": wallet_funds_template,
+        "UserWalletConfigTemplate": wallet_config_template,
+        "AgentTemplate": agent_template,
+        "MockErc20": token,
+    }
+
+    # every lego registered so far, with its registered type
+    legoTypes = {}
+    for legoId in range(1, lego_registry.getLastLegoId() + 1):
+        contracts[f"Lego{legoId}"] = lego_registry.getLegoAddr(legoId)
+        legoTypes[f"Lego{legoId}"] = lego_registry.legoIdToType(legoId)
+
+    # sources as deployed, legos without them only get a "has code" check
+    manifest = {"contracts": {name: {"address": str(getattr(c, "address", c))} for name, c in contracts.items()}}
+    for name in FILES:
+        manifest["contracts"][name]["solc_json"] = copy.deepcopy(deployers.get(name).solc_json)
+    return manifest, legoTypes, {alpha_token.address: feed.address}
+
+
+#########
+# Tests #
+#########
+
+
+def test_audit_matching_deployment(makeAuditor, deployment):
+    manifest, legoTypes, feeds = deployment
+    auditor, multicaller = makeAuditor(manifest, legoTypes, feeds)
+    checks = auditor.audit()
+
+    assert auditor.drift == []
+    names = [c["check"] for c in checks]
+    assert "AddyRegistry.getAddy(4)" in names
+    assert "AgentFactory.getAgentTemplateAddr()" in names
+    assert "OracleRegistry.getPriorityOraclePartnerIds()" in names
+    assert len([n for n in names if n.startswith("ChainlinkFeeds.feedConfig")]) == 1
+    assert len([n for n in names if n.startswith("LegoRegistry.legoIdToType")]) == len(legoTypes)
+    assert len([n for n in names if n.startswith("code ")]) == len(manifest["contracts"])
+
+    # one multicall for the registries, one for the legos
+    assert multicaller.num_eth_calls == 2
+
+
+def test_audit_reports_drift(makeAuditor, deployment, alpha_token, bravo_token):
+    manifest, legoTypes, feeds = deployment
+    contracts = manifest["contracts"]
+
+    # wrong wiring: price sheets not the registered one, wrong lego type, wrong feed
+    contracts["PriceSheets"]["address"] = contracts["MockErc20"]["address"]
+    legoTypes["Lego1"] = 3 - legoTypes["Lego1"]
+    feeds[bravo_token.address] = alpha_token.address
+
+    # lego registered on-chain that the manifest doesn't know about
+    del contracts["Lego2"]
+    del legoTypes["Lego2"]
+
+    # code that isn't the compiled contract
+    boa.env.set_code(contracts["MockErc20"]["address"], b"\x00")
+
+    auditor, _ = makeAuditor(manifest, legoTypes, feeds)
+    auditor.audit()
+    drift = [c["check"] for c in auditor.drift]
+
+    assert "AddyRegistry.getAddy(3)" in drift
+    assert "LegoRegistry.legoIdToType(1) Lego1" in drift
+    assert f"ChainlinkFeeds.feedConfig({bravo_token.address})" in drift
+    assert "LegoRegistry.getLegoAddr(2)" in drift
+    assert "code MockErc20" in drift
+    assert "code PriceSheets" in drift
+    assert len(drift) == 6
+
+
+def test_audit_code_from_manifest_sources(makeAuditor, deployment):
+    manifest, legoTypes, feeds = deployment
+
+    # deployed code matches the working tree, but not the sources the manifest says were deployed
+    solc_json = manifest["contracts"]["MockErc20"]["solc_json"]
+    source = solc_json["sources"][FILES["MockErc20"]]
+    source["content"] += "\n\n@view\n@external\ndef auditMarker() -> uint256:\n    return 1\n"
+
+    auditor, _ = makeAuditor(manifest, legoTypes, feeds)
+    auditor.audit()
+    assert [c["check"] for c in auditor.drift] == ["code MockErc20"]
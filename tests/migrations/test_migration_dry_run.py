@@ -0,0 +1,108 @@
+import boa
+import os
+import time
+
+from eth_account import Account
+
+from scripts.utils import json_file
+from scripts.utils.deploy_args import DeployArgs
+from scripts.utils.migration_helpers import TEST_PRIVATE_KEY
+from scripts.utils.migration_runner import MigrationRunner
+
+
+FILES = {"MockErc20": "contracts/mock/MockErc20.vy", "MockErc20Blueprint": "contracts/mock/MockErc20.vy", "MockMulticall3": "contracts/mock/MockMulticall3.vy"}
+
+FIRST_MIGRATION = """
+def migrate(migration):
+    migration.deploy("MockErc20", migration.account().address, "Token", "TKN", 18, 1_000)
+"""
+
+SECOND_MIGRATION = """
+def migrate(migration):
+    token = migration.get_contract("MockErc20")
+    migration.execute(token.mint, migration.account().address, 5 * 10**18)
+    migration.deploy("MockMulticall3")
+    migration.deploy_bp("MockErc20Blueprint")
+"""
+
+FAILING_MIGRATION = """
+def migrate(migration):
+    token = migration.get_contract("MockErc20")
+    migration.execute(token.mint, migration.account().address, 5 * 10**18)
+    migration.execute(token.transfer, migration.account().address, 10**30)
+    migration.deploy("MockMulticall3")
+"""
+
+
+#########
+# Tests #
+#########
+
+
+def test_migration_dry_run(tmp_path):
+    migrationsDir = tmp_path / "migrations"
+    historyDir = tmp_path / "history"
+    os.makedirs(migrationsDir)
+    (migrationsDir / "0001_token.py").write_text(FIRST_MIGRATION)
+
+    runner = MigrationRunner(str(migrationsDir), str(historyDir), FILES)
+    deployArgs = DeployArgs(Account.from_key(TEST_PRIVATE_KEY), "local", ignore_logs=True, blueprint="base")
+    runner.run(deployArgs)
+    manifest = json_file.load(str(historyDir / "current-manifest.json"))
+    historyFiles = sorted(os.listdir(historyDir))
+
+    # only the new migration is planned
+    (migrationsDir / "0002_more.py").write_text(SECOND_MIGRATION)
+    plan = runner.dry_run(deployArgs, "0002", base_fee=10**9)
+
+    assert [(s["migration"], s["index"], s["name"]) for s in plan["steps"]] == [
+        ("0002", 1, "MockErc20.mint"),
+        ("0002", 2, "Deploying MockMulticall3"),
+        ("0002", 3, "Deploying MockErc20Blueprint"),
+    ]
+    assert all(s["gas"] != 0 and s["cost"] == s["gas"] * 10**9 for s in plan["steps"])
+    assert plan["total_gas"] == sum(s["gas"] for s in plan["steps"])
+    assert plan["total_cost"] == plan["total_gas"] * 10**9
+
+    diff = plan["manifest_diff"]
+    assert list(diff.keys()) == ["MockMulticall3", "MockErc20Blueprint"]
+    assert diff["MockMulticall3"]["before"] is None
+
+    # nothing written, chain rolled back
+    assert sorted(os.listdir(historyDir)) == historyFiles
+    assert json_file.load(str(historyDir / "current-manifest.json")) == manifest
+    assert boa.env.get_code(diff["MockMulticall3"]["after"]) == b""
+    token = boa.load_partial(FILES["MockErc20"]).at(manifest["contracts"]["MockErc20"]["address"])
+    assert token.totalSupply() == 1_000 * 10**18
+
+    # real run afterwards is unaffected
+    assert runner.run(deployArgs, "0002") != 0
+    assert token.totalSupply() == 1_005 * 10**18
+
+
+def test_migration_dry_run_failing_step(tmp_path):
+    migrationsDir = tmp_path / "migrations"
+    historyDir = tmp_path / "history"
+    os.makedirs(migrationsDir)
+    (migrationsDir / "0001_token.py").write_text(FIRST_MIGRATION)
+
+    runner = MigrationRunner(str(migrationsDir), str(historyDir), FILES)
+    deployArgs = DeployArgs(Account.from_key(TEST_PRIVATE_KEY), "local", ignore_logs=True, blueprint="base")
+    runner.run(deployArgs)
+
+    # plan up to the failing step, no retries
+    (migrationsDir / "0002_fails.py").write_text(FAILING_MIGRATION)
+    started = time.perf_counter()
+    plan = runner.dry_run(deployArgs, "0002")
+    assert time.perf_counter() - started < 3
+
+    steps = plan["steps"]
+    assert [(s["index"], s["name"]) for s in steps] == [(1, "MockErc20.mint"), (2, "MockErc20.transfer")]
+    assert steps[0]["error"] is None and steps[0]["gas"] != 0
+    assert steps[1]["error"] is not None and steps[1]["gas"] == 0
+    assert "0002" in plan["error"]
+    assert plan["manifest_diff"] == {}
+
+    # rolled back
+    token = boa.load_partial(FILES["MockErc20"]).at(json_file.load(str(historyDir / "current-manifest.json"))["contracts"]["MockErc20"]["address"])
+    assert token.totalSupply() == 1_000 * 10**18
@@ -0,0 +1,89 @@
+import boa
+import os
+import pytest
+
+from eth_account import Account
+
+from scripts.utils import json_file
+from scripts.utils.deploy_args import DeployArgs
+from scripts.utils.migration import ReusedContractError
+from scripts.utils.migration_helpers import TEST_PRIVATE_KEY
+from scripts.utils.migration_runner import MigrationError, MigrationRunner
+
+
+FILES = {
+    "MockErc20": "contracts/mock/MockErc20.vy",
+    "MockErc20Other": "contracts/mock/MockErc20.vy",
+    "MockMulticall3": "contracts/mock/MockMulticall3.vy",
+}
+
+MIGRATION = """
+def migrate(migration):
+    deployer = migration.account()
+    token = migration.deploy("MockErc20", deployer.address, "Token", "TKN", 18, 1_000)
+    other = migration.deploy("MockErc20Other", deployer.address, "Other", "OTH", 18, {supply})
+    migration.deploy_bp("MockMulticall3")
+    migration.execute(token.mint, deployer.address, 5 * 10**18)
+    migration.execute(other.mint, deployer.address, 5 * 10**18)
+"""
+
+
+# the reused token keeps pointing at whatever it was given before
+WIRING_MIGRATION = MIGRATION + """    migration.execute(token.approve, other, 1)
+"""
+
+
+def runEnv(_tmp_path, _env, _supply, _reuseManifest=None, _migration=MIGRATION):
+    migrationsDir = _tmp_path / _env / "migrations"
+    historyDir = _tmp_path / _env / "history"
+    os.makedirs(migrationsDir)
+    (migrationsDir / "0001_tokens.py").write_text(_migration.format(supply=_supply))
+
+    runner = MigrationRunner(str(migrationsDir), str(historyDir), FILES)
+    deployArgs = DeployArgs(Account.from_key(TEST_PRIVATE_KEY), "local", ignore_logs=True, blueprint="base", reuse_manifest=_reuseManifest)
+    gas = runner.run(deployArgs)
+    return json_file.load(str(historyDir / "current-manifest.json")), gas
+
+
+#########
+# Tests #
+#########
+
+
+def test_migration_reuses_unchanged_contracts(tmp_path):
+    deployer = Account.from_key(TEST_PRIVATE_KEY).address
+    previous, previousGas = runEnv(tmp_path, "prev", 1_000)
+
+    # only the constructor args of `MockErc20Other` differ
+    current, gas = runEnv(tmp_path, "next", 2_000, previous)
+    assert current["contracts"]["MockErc20"]["address"] == previous["contracts"]["MockErc20"]["address"]
+    assert current["contracts"]["MockMulticall3"]["address"] == previous["contracts"]["MockMulticall3"]["address"]
+    assert current["contracts"]["MockErc20Other"]["address"] != previous["contracts"]["MockErc20Other"]["address"]
+    assert current["contracts"]["MockErc20"]["abi"] == previous["contracts"]["MockErc20"]["abi"]
+    assert 0 < gas < previousGas
+
+    # calls on the reused token were skipped, the new one was set up
+    token = boa.load_partial(FILES["MockErc20"]).at(current["contracts"]["MockErc20"]["address"])
+    other = boa.load_partial(FILES["MockErc20"]).at(current["contracts"]["MockErc20Other"]["address"])
+    assert token.balanceOf(deployer) == 1_000 * 10**18 + 5 * 10**18
+    assert other.balanceOf(deployer) == 2_000 * 10**18 + 5 * 10**18
+
+    # code that doesn't match isn't reused
+    boa.env.set_code(previous["contracts"]["MockErc20"]["address"], b"\x00")
+    current, _ = runEnv(tmp_path, "third", 1_000, previous)
+    assert current["contracts"]["MockErc20"]["address"] != previous["contracts"]["MockErc20"]["address"]
+    assert current["contracts"]["MockErc20Other"]["address"] == previous["contracts"]["MockErc20Other"]["address"]
+
+
+def test_migration_reuse_refuses_stale_wiring(tmp_path):
+    previous, _ = runEnv(tmp_path, "prev", 1_000, _migration=WIRING_MIGRATION)
+
+    # everything reused, nothing to rewire
+    current, _ = runEnv(tmp_path, "same", 1_000, previous, WIRING_MIGRATION)
+    assert current["contracts"]["MockErc20"]["address"] == previous["contracts"]["MockErc20"]["address"]
+
+    # `MockErc20Other` redeployed, the reused token would still point at the old one
+    with pytest.raises(MigrationError) as e:
+        runEnv(tmp_path, "next", 2_000, previous, WIRING_MIGRATION)
+    assert isinstance(e.value.__cause__, ReusedContractError)
+    assert "MockErc20.approve" in str(e.value.__cause__)
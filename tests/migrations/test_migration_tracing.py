@@ -0,0 +1,95 @@
+import boa
+import json
+import os
+
+from eth_account import Account
+
+from constants import EIGHTEEN_DECIMALS
+from scripts.utils import tracing
+from scripts.utils.deploy_args import DeployArgs
+from scripts.utils.migration_helpers import TEST_PRIVATE_KEY
+from scripts.utils.migration_runner import MigrationRunner
+
+
+MIGRATION = """
+def migrate(migration):
+    deployer = migration.account()
+    token = migration.deploy("MockErc20", deployer.address, "Token", "TKN", 18, 1_000)
+    migration.execute(token.mint, deployer.address, 5 * 10**18)
+"""
+
+
+def getSpans(_span, _kind):
+    spans = [_span] if _span["kind"] == _kind else []
+    for child in _span["children"]:
+        spans += getSpans(child, _kind)
+    return spans
+
+
+#########
+# Tests #
+#########
+
+
+def test_migration_trace(tmp_path):
+    migrationsDir = tmp_path / "migrations"
+    historyDir = tmp_path / "history"
+    os.makedirs(migrationsDir)
+    (migrationsDir / "0001_token.py").write_text(MIGRATION)
+
+    tracer = tracing.set_tracer(tracing.Tracer())
+    try:
+        runner = MigrationRunner(str(migrationsDir), str(historyDir), {"MockErc20": "contracts/mock/MockErc20.vy"})
+        deployArgs = DeployArgs(Account.from_key(TEST_PRIVATE_KEY), "local", ignore_logs=True, blueprint="base")
+        totalGas = runner.run(deployArgs)
+    finally:
+        tracing.set_tracer(tracing.Tracer())
+
+    assert os.path.exists(historyDir / "0001-manifest.json")
+    with open(historyDir / "0001-trace.json") as f:
+        migrationSpan = json.load(f)["spans"][0]
+
+    assert migrationSpan["kind"] == "migration"
+    assert migrationSpan["name"] == "0001"
+
+    deploy, mint = getSpans(migrationSpan, "transaction")
+    assert deploy["name"] == "Deploying MockErc20"
+    assert mint["name"] == "MockErc20.mint"
+    assert len(getSpans(deploy, "compile")) == 1
+    assert len(getSpans(migrationSpan, "manifest")) == 1
+    assert len(getSpans(migrationSpan, "abi")) == 0  # served by the compiled deployer
+
+    # calls made through `execute` are counted too
+    assert deploy["gas"] != 0 and mint["gas"] != 0
+    assert migrationSpan["gas"] == deploy["gas"] + mint["gas"] == totalGas
+    assert migrationSpan["retries"] == 0
+    assert migrationSpan["wall_time"] >= deploy["wall_time"] + mint["wall_time"]
+
+    totals = tracer.get_totals()
+    assert totals["transaction"]["count"] == 2
+    assert totals["transaction"]["gas"] == totalGas
+    assert totals["migration"]["gas"] == totalGas
+
+
+def test_tracer_counters_and_errors():
+    tracer = tracing.Tracer()
+    try:
+        with tracer.span("outer", "migration"):
+            with tracer.span("tx", "transaction"):
+                tracer.add_gas(100)
+                tracer.add_retries(2)
+            with tracer.span("broken", "transaction"):
+                tracer.add_rpc_calls(3)
+                raise ValueError("boom")
+    except ValueError:
+        pass
+
+    outer = tracer.roots[0]
+    tx, broken = outer.children
+    assert (outer.gas, outer.retries, outer.rpc_calls) == (100, 2, 3)
+    assert (tx.gas, tx.retries, tx.error) == (100, 2, None)
+    assert "boom" in broken.error
+
+    # counters aren't summed twice for nested spans of the same kind
+    assert tracer.get_totals()["transaction"]["rpc_calls"] == 3
+    assert tracer.get_totals()["migration"]["count"] == 1
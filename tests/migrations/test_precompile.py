@@ -0,0 +1,100 @@
+import boa
+import os
+import shutil
+
+from vyper.compiler.output import build_abi_output
+
+from scripts.utils.deployer_registry import DeployerRegistry
+from scripts.utils import precompile as precompile_module
+from scripts.utils.precompile import load_artifact, precompile
+
+
+FILES = {
+    "MockErc20": "contracts/mock/MockErc20.vy",
+    "MockMulticall3": "contracts/mock/MockMulticall3.vy",
+}
+
+
+def copySources(_tmpPath):
+    # the tree hash is taken over these copies, compiling uses the repo files
+    sourcesDir = _tmpPath / "sources"
+    os.makedirs(sourcesDir)
+    for path in FILES.values():
+        shutil.copy(path, sourcesDir / os.path.basename(path))
+    return str(sourcesDir)
+
+
+def changeSource(_sourcesDir):
+    with open(os.path.join(_sourcesDir, "MockMulticall3.vy"), "a") as f:
+        f.write("\n# changed\n")
+
+
+#########
+# Tests #
+#########
+
+
+def test_precompile_artifacts(tmp_path):
+    artifactsDir = str(tmp_path / "artifacts")
+    sourcesDir = copySources(tmp_path)
+    files = {**FILES, "Broken": "contracts/does/not/Exist.vy"}
+
+    index = precompile(files, artifactsDir, max_workers=2, source_dirs=[sourcesDir])
+    assert sorted(index["contracts"].keys()) == ["MockErc20", "MockMulticall3"]
+    assert list(index["errors"].keys()) == ["Broken"]
+
+    # same output as compiling here
+    artifact = load_artifact(files["MockErc20"], artifactsDir, [sourcesDir])
+    compilerData = boa.load_partial(files["MockErc20"]).compiler_data
+    assert artifact["abi"] == build_abi_output(compilerData)
+    assert artifact["bytecode"] == "0x" + compilerData.bytecode.hex()
+    assert artifact["bytecode_runtime"] == "0x" + compilerData.bytecode_runtime.hex()
+    assert "totalSupply" in artifact["layout"]["storage_layout"]
+    assert files["MockErc20"] in artifact["solc_json"]["sources"]
+
+    assert load_artifact("contracts/mock/MockWeth.vy", artifactsDir, [sourcesDir]) is None
+
+    # sources are only hashed once per index, not on every load
+    changeSource(sourcesDir)
+    assert load_artifact(files["MockErc20"], artifactsDir, [sourcesDir]) is not None
+
+    # a new index is checked against the sources again, stale once any source changes
+    precompile(FILES, artifactsDir, max_workers=2, source_dirs=[sourcesDir])
+    changeSource(sourcesDir)
+    assert load_artifact(files["MockErc20"], artifactsDir, [sourcesDir]) is None
+
+
+def test_load_artifact_hashes_sources_once(tmp_path, monkeypatch):
+    artifactsDir = str(tmp_path / "artifacts")
+    sourcesDir = copySources(tmp_path)
+    precompile(FILES, artifactsDir, max_workers=2, source_dirs=[sourcesDir])
+
+    hashedDirs = []
+    getTreeHash = precompile_module.get_tree_hash
+    monkeypatch.setattr(precompile_module, "get_tree_hash", lambda _dirs: hashedDirs.append(_dirs) or getTreeHash(_dirs))
+    for path in FILES.values():
+        assert load_artifact(path, artifactsDir, [sourcesDir]) is not None
+        assert load_artifact(path, artifactsDir, [sourcesDir]) is not None
+    assert len(hashedDirs) == 1
+
+
+def test_precompile_fills_compile_cache(tmp_path, monkeypatch):
+    cacheDir = str(tmp_path / "cache")
+    boa.interpret.set_cache_dir(cacheDir)
+    try:
+        precompile(FILES, str(tmp_path / "artifacts"), max_workers=2, source_dirs=[copySources(tmp_path)], cache_dir=cacheDir)
+
+        # loading in this process is a cache hit, no code generation
+        cache = boa.interpret._disk_cache
+        lookup = cache.caching_lookup
+        misses = []
+        monkeypatch.setattr(cache, "caching_lookup", lambda _key, _func: lookup(_key, lambda: misses.append(_key) or _func()))
+        DeployerRegistry(FILES).get("MockErc20")
+        boa.load_partial(FILES["MockMulticall3"])
+        assert misses == []
+
+        # without the precompile it would have been a miss
+        boa.loads_partial("x: public(uint256)", name="NotPrecompiled")
+        assert len(misses) == 1
+    finally:
+        boa.interpret.set_cache_dir()
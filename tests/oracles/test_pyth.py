@@ -307,6 +307,72 @@ def test_update_pyth_prices_insufficient_balance(
         new_oracle_pyth.updatePythPrices([payload], sender=governor)
 
 
+def test_update_pyth_prices_with_value_refund(
+    new_oracle_pyth,
+    mock_pyth,
+    alpha_token,
+    governor,
+    sally,
+):
+    data_feed_id = bytes.fromhex("eaa020c61cc479712813461ce153894a96a6c00b21ed0cfc2798d1f9a9e9c94a")
+    new_oracle_pyth.setPythFeed(alpha_token, data_feed_id, sender=governor)
+
+    # get payload
+    publish_time = boa.env.evm.patch.timestamp + 1
+    payload = mock_pyth.createPriceFeedUpdateData(
+        data_feed_id,
+        98000000,
+        50000,
+        -8,
+        publish_time,
+    )
+    exp_fee = len(payload)
+
+    # caller pays fee, contract has no balance of its own
+    boa.env.set_balance(new_oracle_pyth.address, 0)
+    boa.env.set_balance(governor, 10 ** 18)
+    pre_sally_bal = boa.env.get_balance(sally)
+    pre_pyth_bal = boa.env.get_balance(mock_pyth.address)
+
+    assert new_oracle_pyth.updatePythPrices([payload], sally, value=10 ** 18, sender=governor) == exp_fee
+
+    log = filter_logs(new_oracle_pyth, 'PythPriceUpdated')[0]
+    assert log.feeAmount == exp_fee
+
+    # excess refunded to recipient
+    assert boa.env.get_balance(new_oracle_pyth.address) == 0
+    assert boa.env.get_balance(mock_pyth.address) == pre_pyth_bal + exp_fee
+    assert boa.env.get_balance(sally) == pre_sally_bal + 10 ** 18 - exp_fee
+    assert boa.env.get_balance(governor) == 0
+
+
+def test_update_pyth_prices_refund_to_smart_account(
+    new_oracle_pyth,
+    mock_pyth,
+    alpha_token,
+    governor,
+):
+    data_feed_id = bytes.fromhex("eaa020c61cc479712813461ce153894a96a6c00b21ed0cfc2798d1f9a9e9c94a")
+    new_oracle_pyth.setPythFeed(alpha_token, data_feed_id, sender=governor)
+    payload = mock_pyth.createPriceFeedUpdateData(data_feed_id, 98000000, 50000, -8, boa.env.evm.patch.timestamp + 1)
+
+    # receiving eth costs more than a 2300 gas stipend
+    smart_account = boa.loads("""
+numReceived: public(uint256)
+
+@payable
+@external
+def __default__():
+    self.numReceived += 1
+""", name="smart_account")
+
+    boa.env.set_balance(new_oracle_pyth.address, 0)
+    boa.env.set_balance(governor, 10 ** 18)
+    assert new_oracle_pyth.updatePythPrices([payload], smart_account, value=10 ** 18, sender=governor) == len(payload)
+    assert smart_account.numReceived() == 1
+    assert boa.env.get_balance(smart_account.address) == 10 ** 18 - len(payload)
+
+
 def test_is_valid_pyth_feed(
     new_oracle_pyth,
     alpha_token,
@@ -0,0 +1,150 @@
+import pytest
+import boa
+
+from constants import EIGHTEEN_DECIMALS
+from contracts.core.templates import UserWalletTemplate
+from scripts.utils.portfolio_valuation import IDLE_LEGO_ID, BoaEthCaller, Multicaller, PortfolioValuer, YieldUniverse
+
+ALPHA_PRICE = 2 * EIGHTEEN_DECIMALS
+BRAVO_PRICE = 3 * EIGHTEEN_DECIMALS // 10
+
+
+@pytest.fixture(scope="module")
+def mock_multicall():
+    return boa.load("contracts/mock/MockMulticall3.vy", name="mock_multicall")
+
+
+@pytest.fixture(scope="module", autouse=True)
+def setup_prices(oracle_custom, alpha_token, bravo_token, governor):
+    oracle_custom.setPrice(alpha_token, ALPHA_PRICE, sender=governor)
+    oracle_custom.setPrice(bravo_token, BRAVO_PRICE, sender=governor)
+
+
+@pytest.fixture(scope="function")
+def makeMulticaller(env, mock_multicall):
+    def makeMulticaller(_chunkSize=100):
+        return Multicaller(BoaEthCaller(env), mock_multicall, _chunkSize)
+
+    yield makeMulticaller
+
+
+@pytest.fixture(scope="function")
+def createWallet(agent_factory, alpha_token, alpha_token_whale, bravo_token, bravo_token_whale):
+    def createWallet(_owner, _alpha, _bravo):
+        wallet = UserWalletTemplate.at(agent_factory.createUserWallet(_owner, sender=_owner))
+        alpha_token.transfer(wallet, _alpha, sender=alpha_token_whale)
+        bravo_token.transfer(wallet, _bravo, sender=bravo_token_whale)
+        return wallet
+
+    yield createWallet
+
+
+@pytest.fixture(scope="function")
+def wallets(createWallet, mock_lego_alpha, mock_lego_alpha_another, mock_lego_bravo, alpha_token, bravo_token, alpha_token_erc4626_vault, alpha_token_erc4626_vault_another, bravo_token_erc4626_vault, owner, bob, sally):
+    # owner: alpha split over 2 legos + idle, bravo deployed
+    a = createWallet(owner, 1_000 * EIGHTEEN_DECIMALS, 500 * EIGHTEEN_DECIMALS)
+    a.depositTokens(mock_lego_alpha.legoId(), alpha_token, alpha_token_erc4626_vault, 300 * EIGHTEEN_DECIMALS, sender=owner)
+    a.depositTokens(mock_lego_alpha_another.legoId(), alpha_token, alpha_token_erc4626_vault_another, 200 * EIGHTEEN_DECIMALS, sender=owner)
+    a.depositTokens(mock_lego_bravo.legoId(), bravo_token, bravo_token_erc4626_vault, 500 * EIGHTEEN_DECIMALS, sender=owner)
+
+    # bob: idle only
+    b = createWallet(bob, 50 * EIGHTEEN_DECIMALS, 0)
+
+    # sally: nothing
+    c = createWallet(sally, 0, 0)
+    return [a, b, c]
+
+
+#########
+# Tests #
+#########
+
+
+def test_universe_from_legos(makeMulticaller, lego_registry, mock_lego_alpha, mock_lego_alpha_another, mock_lego_bravo, alpha_token, bravo_token, alpha_token_erc4626_vault, alpha_token_erc4626_vault_another, bravo_token_erc4626_vault):
+    universe = YieldUniverse.load(makeMulticaller(), lego_registry)
+
+    assert (mock_lego_alpha.legoId(), mock_lego_alpha.address, alpha_token.address, alpha_token_erc4626_vault.address) in universe.rows
+    assert (mock_lego_alpha_another.legoId(), mock_lego_alpha_another.address, alpha_token.address, alpha_token_erc4626_vault_another.address) in universe.rows
+    assert (mock_lego_bravo.legoId(), mock_lego_bravo.address, bravo_token.address, bravo_token_erc4626_vault.address) in universe.rows
+    assert universe.decimals[alpha_token.address] == 18
+
+    # only yield legos
+    for lego_id, _, _, _ in universe.rows:
+        assert lego_registry.isYieldLego(lego_id)
+
+
+def test_valuation_matches_registries(makeMulticaller, wallets, lego_registry, oracle_registry, alpha_token, bravo_token):
+    multicaller = makeMulticaller()
+    universe = YieldUniverse.load(multicaller, lego_registry)
+    table = PortfolioValuer(multicaller, universe, oracle_registry).value(wallets)
+
+    for wallet in wallets:
+        expected_nav = 0
+        totals = table.get_underlying_totals(wallet)
+        for asset in [alpha_token, bravo_token]:
+            deployed = lego_registry.getUnderlyingForUser(wallet, asset)
+            assert totals.get(asset.address, 0) == deployed
+            expected_nav += oracle_registry.getUsdValue(asset, deployed) + oracle_registry.getUsdValue(asset, asset.balanceOf(wallet))
+        assert table.get_wallet_totals()[wallet.address] == expected_nav
+
+    # 3 vault positions + 1 idle for owner, 1 idle for bob, nothing for sally
+    rows = table.rows()
+    assert len(table) == len(rows) == 5
+    assert sorted(r["wallet"] for r in rows) == sorted([wallets[0].address] * 4 + [wallets[1].address])
+
+    idle = [r for r in rows if r["lego_id"] == IDLE_LEGO_ID]
+    assert {(r["wallet"], r["asset"], r["balance"]) for r in idle} == {
+        (wallets[0].address, alpha_token.address, 500 * EIGHTEEN_DECIMALS),
+        (wallets[1].address, alpha_token.address, 50 * EIGHTEEN_DECIMALS),
+    }
+    assert all(r["vault_token"] is None for r in idle)
+    assert table.get_wallet_totals()[wallets[0].address] == 1_000 * ALPHA_PRICE + 500 * BRAVO_PRICE
+    assert table.get_wallet_totals()[wallets[2].address] == 0
+
+
+def test_valuation_chunking(makeMulticaller, wallets, lego_registry, oracle_registry):
+    big = makeMulticaller()
+    universe = YieldUniverse.load(big, lego_registry)
+    expected = PortfolioValuer(big, universe, oracle_registry).value(wallets).rows()
+
+    small = makeMulticaller(3)
+    table = PortfolioValuer(small, universe, oracle_registry).value(wallets)
+    assert table.rows() == expected
+
+    # one eth_call per chunk, not per (wallet, asset)
+    assert small.num_eth_calls > big.num_eth_calls
+    assert small.num_eth_calls == sum((n + 2) // 3 for n in [3 * (len(universe.rows) + len(universe.assets)), 4 + len(universe.assets)])
+
+
+def test_valuation_duplicate_vaults_and_unknown_decimals(makeMulticaller, wallets, lego_registry, oracle_registry, mock_lego_bravo, alpha_token, alpha_token_erc4626_vault):
+    multicaller = makeMulticaller()
+    loaded = YieldUniverse.load(multicaller, lego_registry)
+    expected = PortfolioValuer(multicaller, loaded, oracle_registry).value(wallets).get_wallet_totals()
+
+    # same vault token listed again under another lego, valued once
+    duplicate = (mock_lego_bravo.legoId(), mock_lego_bravo.address, alpha_token.address, alpha_token_erc4626_vault.address)
+    universe = YieldUniverse(loaded.rows + [duplicate], loaded.decimals)
+    assert universe.rows == loaded.rows
+    table = PortfolioValuer(multicaller, universe, oracle_registry).value(wallets)
+    assert table.get_wallet_totals() == expected
+    assert table.get_unpriced() == []
+
+    # unreadable decimals, alpha positions unpriced instead of assuming 18
+    universe = YieldUniverse(loaded.rows, {**loaded.decimals, alpha_token.address: None})
+    table = PortfolioValuer(multicaller, universe, oracle_registry).value(wallets)
+    unpriced = table.get_unpriced()
+    assert len(unpriced) == 4
+    assert all(r["asset"] == alpha_token.address and r["price"] == ALPHA_PRICE for r in unpriced)
+    assert table.get_wallet_totals()[wallets[0].address] == 500 * BRAVO_PRICE
+    assert table.get_wallet_totals()[wallets[1].address] == 0
+
+
+def test_multicall_failed_calls(makeMulticaller, alpha_token, lego_registry, bob):
+    results = makeMulticaller().call_many([
+        (alpha_token, "balanceOf(address)", [bob], ["uint256"]),
+        (alpha_token, "notAFunction()", [], ["uint256"]),
+        (lego_registry, "getLegoAddr(uint256)", [0], ["address"]),
+    ])
+    assert results[0] == alpha_token.balanceOf(bob)
+    assert results[1] is None
+    assert results[2] == "0x0000000000000000000000000000000000000000"
@@ -0,0 +1,181 @@
+import pytest
+import boa
+import random
+
+from eth_account import Account
+from eth_utils import keccak
+
+from conf_utils import filter_logs
+from constants import ZERO_ADDRESS, EIGHTEEN_DECIMALS, MAX_UINT256, DEPOSIT_UINT256, WITHDRAWAL_UINT256
+from scripts.utils.agent_signer import ACTION_TYPES, AgentSigner, get_domain_separator
+
+NUM_RANDOM_CASES = 25
+INT24_MAX = 2**23 - 1
+
+
+@pytest.fixture(scope="module")
+def agent_signer(special_agent, special_agent_signer):
+    return AgentSigner(special_agent_signer.key, special_agent, boa.env.evm.patch.chain_id)
+
+
+@pytest.fixture(scope="module")
+def randomInputs():
+    rng = random.Random(712)
+
+    def randomAddress():
+        return "0x" + rng.randbytes(20).hex()
+
+    def randomAmount():
+        return rng.choice([0, 1, MAX_UINT256, rng.randrange(MAX_UINT256), rng.randrange(10**30)])
+
+    def randomSwapInstruction():
+        pathLen = rng.randint(2, 5)
+        return (rng.randrange(100), randomAmount(), randomAmount(), [randomAddress() for _ in range(pathLen)], [randomAddress() for _ in range(pathLen - 1)])
+
+    def randomActionInstruction():
+        return (
+            rng.random() < 0.5,
+            2 ** rng.randrange(11),
+            rng.randrange(100),
+            randomAddress(),
+            randomAddress(),
+            randomAmount(),
+            rng.randrange(100),
+            randomAddress(),
+            randomAddress(),
+            randomAmount(),
+            randomAmount(),
+            randomAddress(),
+            rng.randbytes(32),
+            randomAddress(),
+            randomAmount(),
+            rng.randint(-INT24_MAX - 1, INT24_MAX),
+            rng.randint(-INT24_MAX - 1, INT24_MAX),
+            randomAmount(),
+            randomAmount(),
+            randomAmount(),
+            randomAmount(),
+            randomAddress(),
+            rng.random() < 0.5,
+            [randomSwapInstruction() for _ in range(rng.randint(0, 3))],
+            rng.random() < 0.5,
+        )
+
+    return rng, randomAddress, randomAmount, randomSwapInstruction, randomActionInstruction
+
+
+def getTypedMessage(_agent, _action, _fields):
+    # same shape as the `sign*` fixtures in `conftest.py`
+    fields = [f.split(" ") for f in ACTION_TYPES[_action][len(_action) + 1:-1].split(",")]
+    return {
+        "domain": {
+            "name": "UnderscoreAgent",
+            "version": _agent.apiVersion(),
+            "chainId": boa.env.evm.patch.chain_id,
+            "verifyingContract": _agent.address,
+        },
+        "types": {_action: [{"name": name, "type": t} for t, name in fields]},
+        "message": _fields,
+    }
+
+
+#########
+# Tests #
+#########
+
+
+def test_signer_domain_separator(special_agent, agent_signer):
+    assert agent_signer.domain_separator == special_agent.DOMAIN_SEPARATOR()
+    assert get_domain_separator(special_agent, boa.env.evm.patch.chain_id, special_agent.apiVersion()) == special_agent.DOMAIN_SEPARATOR()
+
+    # differs per agent + chain
+    assert get_domain_separator(ZERO_ADDRESS, boa.env.evm.patch.chain_id) != agent_signer.domain_separator
+    assert get_domain_separator(special_agent, boa.env.evm.patch.chain_id + 1) != agent_signer.domain_separator
+
+
+def test_signer_swap_hash_matches_contract(special_agent, special_ai_wallet, agent_signer, randomInputs):
+    rng, _, _, randomSwapInstruction, _ = randomInputs
+    for _ in range(NUM_RANDOM_CASES):
+        instructions = [randomSwapInstruction() for _ in range(rng.randint(0, 5))]
+        expiration = rng.randrange(2**64)
+        assert agent_signer.get_swap_digest(special_ai_wallet, instructions, expiration) == special_agent.getSwapActionHash(special_ai_wallet, instructions, expiration)
+
+
+def test_signer_batch_hash_matches_contract(special_agent, special_ai_wallet, agent_signer, randomInputs):
+    rng, _, _, _, randomActionInstruction = randomInputs
+    for numInstructions in [0, 1] + [rng.randint(2, 8) for _ in range(NUM_RANDOM_CASES)]:
+        instructions = [randomActionInstruction() for _ in range(numInstructions)]
+        expiration = rng.randrange(2**64)
+        assert agent_signer.get_batch_digest(special_ai_wallet, instructions, expiration) == special_agent.getBatchActionHash(special_ai_wallet, instructions, expiration)
+
+    # contract buffer fits 17 instructions without swaps, less with them
+    noSwaps = [randomActionInstruction()[:23] + ([], False) for _ in range(18)]
+    assert agent_signer.get_batch_digest(special_ai_wallet, noSwaps[:17], 1) == special_agent.getBatchActionHash(special_ai_wallet, noSwaps[:17], 1)
+    with boa.reverts():
+        special_agent.getBatchActionHash(special_ai_wallet, noSwaps, 1)
+    with pytest.raises(ValueError):
+        agent_signer.get_batch_digest(special_ai_wallet, noSwaps, 1)
+
+
+def test_signer_single_actions_match_eip712(special_agent, special_agent_signer, agent_signer, randomInputs):
+    rng, randomAddress, randomAmount, _, _ = randomInputs
+    for action, typeStr in ACTION_TYPES.items():
+        fields = {}
+        for f in typeStr[len(action) + 1:-1].split(","):
+            t, name = f.split(" ")
+            fields[name] = {
+                "address": randomAddress,
+                "uint256": randomAmount,
+                "bool": lambda: rng.random() < 0.5,
+                "int24": lambda: rng.randint(-INT24_MAX - 1, INT24_MAX),
+                "bytes32": lambda: rng.randbytes(32),
+            }[t]()
+
+        expected = Account.sign_typed_data(special_agent_signer.key, full_message=getTypedMessage(special_agent, action, fields))
+        signature, signer, expiration = agent_signer.sign_action(action, **fields)
+        assert signature == expected.signature
+        assert signer == special_agent_signer.address
+        assert expiration == fields["expiration"]
+
+    with pytest.raises(ValueError):
+        agent_signer.get_action_digest("Deposit", userWallet=ZERO_ADDRESS)
+
+
+def test_signer_signatures_accepted_by_agent(special_ai_wallet, special_agent, agent_signer, createActionInstruction, mock_lego_alpha, alpha_token, alpha_token_erc4626_vault, alpha_token_whale, broadcaster):
+    lego_id = mock_lego_alpha.legoId()
+    amount = 1_000 * EIGHTEEN_DECIMALS
+    alpha_token.transfer(special_ai_wallet, amount, sender=alpha_token_whale)
+    expiration = boa.env.evm.patch.timestamp + 60
+
+    # single action
+    signature = agent_signer.sign_action(
+        "Deposit",
+        userWallet=special_ai_wallet,
+        legoId=lego_id,
+        asset=alpha_token,
+        vault=alpha_token_erc4626_vault,
+        amount=amount // 2,
+        expiration=expiration,
+    )
+    assert special_agent.depositTokens(special_ai_wallet, lego_id, alpha_token, alpha_token_erc4626_vault, amount // 2, signature, sender=broadcaster)[0] == amount // 2
+
+    # batch, signed in bulk with a swap that is never used
+    instructions = [
+        createActionInstruction(DEPOSIT_UINT256, lego_id, alpha_token.address, alpha_token_erc4626_vault.address, amount // 2),
+        createActionInstruction(WITHDRAWAL_UINT256, lego_id, alpha_token.address, alpha_token_erc4626_vault.address, MAX_UINT256, _proof=keccak(b"proof")),
+    ]
+    batchSig, swapSig = agent_signer.sign_many([
+        ("batch", (special_ai_wallet, instructions, expiration)),
+        ("swap", (special_ai_wallet, [(lego_id, amount, 0, [alpha_token, alpha_token_erc4626_vault], [])], expiration)),
+    ])
+    assert swapSig[0] != batchSig[0]
+    assert special_agent.performBatchActions(special_ai_wallet, instructions, batchSig, sender=broadcaster)
+
+    logs = filter_logs(special_agent, "UserWalletWithdrawal")
+    assert len(logs) == 1
+    assert logs[0].signer == special_agent.address
+    assert alpha_token.balanceOf(special_ai_wallet) == amount
+
+    # same signature can't be replayed
+    with boa.reverts("signature already used"):
+        special_agent.performBatchActions(special_ai_wallet, instructions, batchSig, sender=broadcaster)
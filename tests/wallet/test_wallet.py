@@ -464,3 +464,75 @@ def test_swap_tokens_with_multiple_instructions(ai_wallet, agent, oracle_chainli
     assert weth.balanceOf(ai_wallet) == pre_weth_balance
     assert virtual.balanceOf(ai_wallet) == pre_virtual_balance
     assert cbbtc.balanceOf(ai_wallet) == pre_cbbtc_balance + lastTokenOutAmount
+
+
+def test_direct_deposit_withdraw(ai_wallet, owner, lego_registry, governor, mock_lego_alpha, alpha_token, alpha_token_erc4626_vault, alpha_token_erc4626_vault_another, alpha_token_whale, bob):
+    lego_id = mock_lego_alpha.legoId()
+    deposit_amount = 1_000 * EIGHTEEN_DECIMALS
+    alpha_token.transfer(ai_wallet, deposit_amount, sender=alpha_token_whale)
+
+    with boa.reverts("no perms"):
+        lego_registry.setDirectLego(lego_id, True, sender=bob)
+    assert lego_registry.setDirectLego(lego_id, True, sender=governor)
+    log = filter_logs(lego_registry, "DirectLegoSet")[0]
+    assert log.legoId == lego_id and log.isDirect
+    assert lego_registry.isDirectLego(lego_id)
+
+    # deposit goes wallet -> vault, lego never holds tokens
+    assetAmountDeposited, vaultToken, vaultTokenAmountReceived, usdValue = ai_wallet.depositTokens(
+        lego_id, alpha_token, alpha_token_erc4626_vault, deposit_amount // 2, sender=owner)
+    transfers = filter_logs(ai_wallet, "Transfer")
+    assert mock_lego_alpha.address not in [t.sender for t in transfers] + [t.receiver for t in transfers]
+    assert (ai_wallet.address, alpha_token_erc4626_vault.address) in [(t.sender, t.receiver) for t in transfers]
+
+    log = filter_logs(ai_wallet, "UserWalletDeposit")[0]
+    assert log.assetAmountDeposited == deposit_amount // 2 == assetAmountDeposited
+    assert log.vaultToken == alpha_token_erc4626_vault.address == vaultToken
+    assert log.vaultTokenAmountReceived == vaultTokenAmountReceived == alpha_token_erc4626_vault.balanceOf(ai_wallet)
+    assert log.legoAddr == mock_lego_alpha.address
+    log = filter_logs(ai_wallet, "MockLegoDeposit")[0]
+    assert log.sender == ai_wallet.address
+    assert log.assetAmountDeposited == deposit_amount // 2
+    assert alpha_token.allowance(ai_wallet, alpha_token_erc4626_vault) == 0
+    assert alpha_token.balanceOf(mock_lego_alpha) == 0
+
+    # same results as going through the lego
+    assert lego_registry.setDirectLego(lego_id, False, sender=governor)
+    assert ai_wallet.depositTokens(lego_id, alpha_token, alpha_token_erc4626_vault, deposit_amount // 2, sender=owner)[2] == vaultTokenAmountReceived
+    assert lego_registry.setDirectLego(lego_id, True, sender=governor)
+
+    # redeem straight from the vault, no vault token approvals
+    assetAmountReceived, vaultTokenAmountBurned, usdValue = ai_wallet.withdrawTokens(
+        lego_id, alpha_token, alpha_token_erc4626_vault, MAX_UINT256, sender=owner)
+    assert assetAmountReceived == deposit_amount == alpha_token.balanceOf(ai_wallet)
+    assert vaultTokenAmountBurned == 2 * vaultTokenAmountReceived
+    assert alpha_token_erc4626_vault.balanceOf(ai_wallet) == 0
+    assert filter_logs(ai_wallet, "Approval") == []
+    log = filter_logs(ai_wallet, "UserWalletWithdrawal")[0]
+    assert log.assetAmountReceived == deposit_amount
+    assert log.vaultTokenAmountBurned == vaultTokenAmountBurned
+    assert filter_logs(ai_wallet, "MockLegoWithdrawal")[0].assetAmountReceived == deposit_amount
+
+    # wallet checks the vault with the lego before approving it
+    assert mock_lego_alpha.isDirectVault(alpha_token, alpha_token_erc4626_vault)
+    assert not mock_lego_alpha.isDirectVault(alpha_token, alpha_token_erc4626_vault_another)
+    with boa.reverts("invalid vault"):
+        ai_wallet.depositTokens(lego_id, alpha_token, alpha_token_erc4626_vault_another, deposit_amount, sender=owner)
+
+    # only user wallets can report direct deposits / withdrawals
+    with boa.reverts("no perms"):
+        mock_lego_alpha.onDirectDeposit(alpha_token, alpha_token_erc4626_vault, deposit_amount, deposit_amount, sender=bob)
+    with boa.reverts("no perms"):
+        mock_lego_alpha.onDirectWithdrawal(alpha_token, alpha_token_erc4626_vault, deposit_amount, deposit_amount, sender=bob)
+
+    # only valid legos, reset when lego is disabled
+    with boa.reverts("invalid lego"):
+        lego_registry.setDirectLego(0, True, sender=governor)
+    assert lego_registry.disableLegoAddr(lego_id, sender=governor)
+    boa.env.time_travel(blocks=lego_registry.legoChangeDelay() + 1)
+    assert lego_registry.confirmLegoDisable(lego_id, sender=governor)
+    assert not lego_registry.isDirectLego(lego_id)
+
+    # wallets can't report either once the lego is no longer direct
+    with boa.reverts("no perms"):
+        mock_lego_alpha.onDirectDeposit(alpha_token, alpha_token_erc4626_vault, deposit_amount, deposit_amount, sender=ai_wallet.address)
@@ -34,6 +34,47 @@ def test_batch_actions_simple(special_ai_wallet, special_agent, createActionInst
     assert log2.isSignerAgent
 
 
+def test_batch_actions_with_price_updates(special_ai_wallet, special_agent, createActionInstruction, mock_lego_alpha, alpha_token, alpha_token_whale, alpha_token_erc4626_vault, oracle_pyth, mock_pyth, governor, bob):
+    data_feed_id = bytes.fromhex("eaa020c61cc479712813461ce153894a96a6c00b21ed0cfc2798d1f9a9e9c94a")
+    oracle_pyth.setPythFeed(alpha_token, data_feed_id, sender=governor)
+
+    lego_id = mock_lego_alpha.legoId()
+    amount = 1_000 * EIGHTEEN_DECIMALS
+    alpha_token.transfer(special_ai_wallet, amount, sender=alpha_token_whale)
+
+    payload = mock_pyth.createPriceFeedUpdateData(data_feed_id, 98000000, 50000, -8, boa.env.evm.patch.timestamp + 1)
+    exp_fee = len(payload)
+
+    instructions = [
+        createActionInstruction(DEPOSIT_UINT256, lego_id, alpha_token.address, alpha_token_erc4626_vault.address, amount),
+    ]
+
+    agent_owner = special_agent.owner()
+    boa.env.set_balance(agent_owner, 10 ** 18)
+
+    # pyth feeds must be a registered oracle partner
+    with boa.reverts("invalid pyth feeds"):
+        special_agent.performBatchActionsWithPriceUpdates(special_ai_wallet, instructions, bob, [payload], value=10 ** 18, sender=agent_owner)
+
+    # eth sent without any price updates
+    with boa.reverts("no price updates"):
+        special_agent.performBatchActionsWithPriceUpdates(special_ai_wallet, instructions, oracle_pyth, [], value=1, sender=agent_owner)
+
+    pre_pyth_bal = boa.env.get_balance(mock_pyth.address)
+    assert special_agent.performBatchActionsWithPriceUpdates(special_ai_wallet, instructions, oracle_pyth, [payload], value=10 ** 18, sender=agent_owner)
+
+    log = filter_logs(special_agent, "UserWalletDeposit")[0]
+    assert log.signer == special_agent.address
+    assert log.isSignerAgent
+
+    # price was pushed before the deposit, excess eth refunded to caller
+    assert mock_pyth.priceFeeds(data_feed_id).price.price == 98000000
+    assert boa.env.get_balance(mock_pyth.address) == pre_pyth_bal + exp_fee
+    assert boa.env.get_balance(agent_owner) == 10 ** 18 - exp_fee
+    assert boa.env.get_balance(special_agent.address) == 0
+    assert alpha_token_erc4626_vault.balanceOf(special_ai_wallet) != 0
+
+
 @pytest.base
 def test_batch_action_withdraw_swap(special_ai_wallet, special_agent, owner, lego_aave_v3, createActionInstruction, oracle_chainlink, getTokenAndWhale, governor, lego_uniswap_v2, lego_uniswap_v3, fork, createSwapActionInstruction):
 
@@ -92,6 +92,47 @@ def test_agent_management(ai_wallet_config, owner, agent, mock_lego_alpha, mock_
     assert not agent_info.isActive
 
 
+def test_agent_permission_lookups(ai_wallet_config, owner, agent, mock_lego_alpha, mock_lego_bravo, bravo_token, alpha_token):
+    lego_id = mock_lego_alpha.legoId()
+    lego_id_another = mock_lego_bravo.legoId()
+
+    # no restrictions
+    assert ai_wallet_config.canAgentAccess(agent, 1, [alpha_token, bravo_token], [lego_id, lego_id_another])
+
+    # restrict to alpha / lego alpha, deposit only
+    assert ai_wallet_config.addOrModifyAgent(agent, [alpha_token], [lego_id], (True, True, False, False, False, False, False, False, False, False, False, False), sender=owner)
+    assert ai_wallet_config.isAgentAssetAllowed(agent, alpha_token)
+    assert ai_wallet_config.isAgentLegoIdAllowed(agent, lego_id)
+    assert ai_wallet_config.agentActionFlags(agent) == 1
+
+    assert ai_wallet_config.canAgentAccess(agent, 1, [alpha_token], [lego_id])
+    assert not ai_wallet_config.canAgentAccess(agent, 2, [alpha_token], [lego_id])
+    assert not ai_wallet_config.canAgentAccess(agent, 1, [bravo_token], [lego_id])
+    assert not ai_wallet_config.canAgentAccess(agent, 1, [alpha_token], [lego_id_another])
+
+    # replacing lists clears previous lookups
+    assert ai_wallet_config.addOrModifyAgent(agent, [bravo_token], [lego_id_another], sender=owner)
+    assert not ai_wallet_config.isAgentAssetAllowed(agent, alpha_token)
+    assert not ai_wallet_config.isAgentLegoIdAllowed(agent, lego_id)
+    assert ai_wallet_config.isAgentAssetAllowed(agent, bravo_token)
+    assert ai_wallet_config.isAgentLegoIdAllowed(agent, lego_id_another)
+    assert ai_wallet_config.agentActionFlags(agent) == 0
+
+    assert ai_wallet_config.canAgentAccess(agent, 2, [bravo_token], [lego_id_another])
+    assert not ai_wallet_config.canAgentAccess(agent, 1, [alpha_token], [lego_id_another])
+
+    # single adds update lookups
+    assert ai_wallet_config.addAssetForAgent(agent, alpha_token, sender=owner)
+    assert ai_wallet_config.addLegoIdForAgent(agent, lego_id, sender=owner)
+    assert ai_wallet_config.canAgentAccess(agent, 1, [alpha_token, bravo_token], [lego_id, lego_id_another])
+    assert ai_wallet_config.agentSettings(agent).allowedAssets == [bravo_token.address, alpha_token.address]
+    assert ai_wallet_config.agentSettings(agent).allowedLegoIds == [lego_id_another, lego_id]
+
+    # disabled agent
+    assert ai_wallet_config.disableAgent(agent, sender=owner)
+    assert not ai_wallet_config.canAgentAccess(agent, 1, [alpha_token], [lego_id])
+
+
 # agent management permissions
 
 
@@ -191,6 +191,53 @@ def test_protocol_subscription_payment(new_ai_wallet, new_ai_wallet_config, alph
     assert protocol_sub.paidThroughBlock == current_block + 302_400  # pay period
 
 
+def test_prepay_subscription(new_ai_wallet, new_ai_wallet_config, costly_agent, alpha_token, alpha_token_whale, mock_lego_alpha, alpha_token_erc4626_vault, owner, governor, price_sheets, sally):
+    """Test prepaying multiple subscription periods"""
+    trial_paid_through = new_ai_wallet_config.agentSettings(costly_agent).paidThroughBlock
+
+    # no perms, nothing to prepay
+    with boa.reverts("no perms"):
+        new_ai_wallet_config.prepaySubscription(costly_agent, 3, sender=sally)
+    with boa.reverts("nothing to prepay"):
+        new_ai_wallet_config.prepaySubscription(costly_agent, 0, sender=owner)
+    with boa.reverts("nothing to prepay"):
+        new_ai_wallet_config.prepaySubscription(costly_agent, 25, sender=owner)
+    with boa.reverts("insufficient balance for subscription payment"):
+        new_ai_wallet_config.prepaySubscription(costly_agent, 3, sender=owner)
+
+    # prepay 3 agent periods
+    alpha_token.transfer(new_ai_wallet, 1000 * EIGHTEEN_DECIMALS, sender=alpha_token_whale)
+    assert new_ai_wallet_config.prepaySubscription(costly_agent, 3, sender=owner)
+
+    log = filter_logs(new_ai_wallet_config, "SubscriptionPrepaid")[0]
+    assert log.agent == costly_agent
+    assert log.asset == alpha_token.address
+    assert log.amount == 15 * EIGHTEEN_DECIMALS
+    assert log.usdValue == 15 * EIGHTEEN_DECIMALS
+    assert log.numPeriods == 3
+    assert log.paidThroughBlock == trial_paid_through + 3 * 302_400
+
+    assert alpha_token.balanceOf(costly_agent) == 15 * EIGHTEEN_DECIMALS
+    assert new_ai_wallet_config.agentSettings(costly_agent).paidThroughBlock == log.paidThroughBlock
+
+    # prepay 2 protocol periods
+    protocol_paid_through = new_ai_wallet_config.protocolSub().paidThroughBlock
+    assert new_ai_wallet_config.prepaySubscription(ZERO_ADDRESS, 2, sender=owner)
+    log = filter_logs(new_ai_wallet_config, "SubscriptionPrepaid")[0]
+    assert log.agent == ZERO_ADDRESS
+    assert log.amount == 20 * EIGHTEEN_DECIMALS
+    assert log.paidThroughBlock == protocol_paid_through + 2 * 302_400
+    assert new_ai_wallet_config.protocolSub().paidThroughBlock == log.paidThroughBlock
+    assert alpha_token.balanceOf(price_sheets.protocolRecipient()) >= 20 * EIGHTEEN_DECIMALS
+
+    # past trial, still covered by credit -- no payments on normal actions
+    boa.env.time_travel(blocks=43_200 + 302_400)
+    a, b, c, d = new_ai_wallet.depositTokens(mock_lego_alpha.legoId(), alpha_token, alpha_token_erc4626_vault, 100 * EIGHTEEN_DECIMALS, sender=costly_agent)
+    assert a != 0 and d != 0
+    assert len(filter_logs(new_ai_wallet, "UserWalletSubscriptionPaid")) == 0
+    assert alpha_token.balanceOf(costly_agent) == 15 * EIGHTEEN_DECIMALS
+
+
 def test_subscription_payment_checks(new_ai_wallet, new_ai_wallet_config, costly_agent, alpha_token, alpha_token_whale):
     """Test canMakeSubscriptionPayments function"""
 
@@ -702,3 +749,137 @@ def test_ambassador_bonus(mock_lego_alpha, agent_factory, ambassador, governor,
     assert log.ratio == 10_00
 
     assert alpha_token.balanceOf(ambassador.address) == pre_ambassador_balance + log.amount
+
+
+def test_swap_fees_accrued_to_ledger(new_ai_wallet, costly_agent, governor, agent_factory, mock_lego_alpha, alpha_token, price_sheets, alpha_token_whale, bravo_token, bravo_token_whale, ambassador, bob):
+    lego_id = mock_lego_alpha.legoId()
+    deposit_amount = 1000 * EIGHTEEN_DECIMALS
+    alpha_token.transfer(new_ai_wallet, deposit_amount, sender=alpha_token_whale)
+
+    # set ambassador ratio, enable deferred settlement
+    assert price_sheets.setAmbassadorRatio(50_00, sender=governor)
+    assert price_sheets.setShouldAccrueTxFees(True, sender=governor)
+
+    # put amount for swap
+    bravo_token.transfer(mock_lego_alpha.address, deposit_amount, sender=bravo_token_whale)
+
+    instruction = (
+        lego_id,
+        deposit_amount,
+        0,
+        [alpha_token, bravo_token],
+        [alpha_token]
+    )
+
+    protocol_recipient = price_sheets.protocolRecipient()
+    pre_protocol_balance = bravo_token.balanceOf(protocol_recipient)
+    pre_ambassador_balance = bravo_token.balanceOf(ambassador.address)
+
+    # swap
+    new_ai_wallet.swapTokens([instruction], sender=costly_agent)
+
+    log = filter_logs(new_ai_wallet, "UserWalletTransactionFeePaid")[0]
+    assert log.asset == bravo_token.address
+    assert log.protocolRecipient == protocol_recipient
+    assert log.protocolAmount == 5 * EIGHTEEN_DECIMALS
+    assert log.ambassadorRecipient == ambassador.address
+    assert log.ambassadorAmount == 5 * EIGHTEEN_DECIMALS
+    assert log.fee == 1_00 # 1%
+
+    # nothing paid out yet, fees held in agent factory
+    assert bravo_token.balanceOf(protocol_recipient) == pre_protocol_balance
+    assert bravo_token.balanceOf(ambassador.address) == pre_ambassador_balance
+    assert bravo_token.balanceOf(agent_factory) == 10 * EIGHTEEN_DECIMALS
+    assert agent_factory.accruedFees(protocol_recipient, bravo_token) == 5 * EIGHTEEN_DECIMALS
+    assert agent_factory.accruedFees(ambassador.address, bravo_token) == 5 * EIGHTEEN_DECIMALS
+    assert agent_factory.totalAccruedFees(bravo_token) == 10 * EIGHTEEN_DECIMALS
+
+    # accrued fees cannot be recovered by governance
+    assert not agent_factory.recoverFundsFromAgentFactory(bravo_token, governor, sender=governor)
+
+    # protocol sweeps its own fees
+    assert agent_factory.sweepAccruedFees(protocol_recipient, [bravo_token, alpha_token], sender=protocol_recipient) == 1
+    log = filter_logs(agent_factory, "AccruedFeesSwept")[0]
+    assert log.recipient == protocol_recipient
+    assert log.asset == bravo_token.address
+    assert log.caller == protocol_recipient
+    assert log.amount == 5 * EIGHTEEN_DECIMALS
+    assert bravo_token.balanceOf(protocol_recipient) == pre_protocol_balance + 5 * EIGHTEEN_DECIMALS
+    assert agent_factory.accruedFees(protocol_recipient, bravo_token) == 0
+
+    # ambassador wallet can't call the factory, anyone sweeps on its behalf and it still gets paid
+    assert agent_factory.sweepAccruedFees(ambassador, [bravo_token], sender=bob) == 1
+    log = filter_logs(agent_factory, "AccruedFeesSwept")[0]
+    assert log.recipient == ambassador.address
+    assert log.caller == bob
+    assert bravo_token.balanceOf(ambassador.address) == pre_ambassador_balance + 5 * EIGHTEEN_DECIMALS
+    assert agent_factory.totalAccruedFees(bravo_token) == 0
+    assert bravo_token.balanceOf(agent_factory) == 0
+
+    # nothing left to sweep
+    assert agent_factory.sweepAccruedFees(ambassador, [bravo_token], sender=bob) == 0
+
+    with boa.reverts("invalid recipient"):
+        agent_factory.sweepAccruedFees(ZERO_ADDRESS, [bravo_token], sender=bob)
+
+
+def test_ambassador_bonus_accrued_to_ledger(mock_lego_alpha, agent_factory, ambassador, governor, alpha_token, alpha_token_whale, new_ai_wallet, costly_agent, alpha_token_erc4626_vault, price_sheets):
+    lego_id = mock_lego_alpha.legoId()
+    deposit_amount = 1_000 * EIGHTEEN_DECIMALS
+
+    # no protocol fees, no abmassador ratios
+    assert price_sheets.setProtocolTxPriceSheet(0, 0, 0, sender=governor)
+    assert price_sheets.setAmbassadorRatio(0, sender=governor)
+
+    # set ambassador bonus ratio, enable deferred settlement
+    assert agent_factory.setAmbassadorBonusRatio(10_00, sender=governor)
+    assert price_sheets.setShouldAccrueTxFees(True, sender=governor)
+
+    # deposit
+    alpha_token.transfer(new_ai_wallet, deposit_amount, sender=alpha_token_whale)
+    new_ai_wallet.depositTokens(lego_id, alpha_token, alpha_token_erc4626_vault, MAX_UINT256, sender=costly_agent)
+
+    # send more to vault
+    alpha_token.transfer(alpha_token_erc4626_vault, 100 * EIGHTEEN_DECIMALS, sender=alpha_token_whale)
+
+    # put money in agent factory
+    alpha_token.transfer(agent_factory, 100 * EIGHTEEN_DECIMALS, sender=alpha_token_whale)
+    pre_ambassador_balance = alpha_token.balanceOf(ambassador.address)
+
+    # withdraw
+    new_ai_wallet.withdrawTokens(lego_id, alpha_token, alpha_token_erc4626_vault, MAX_UINT256, sender=costly_agent)
+
+    log = filter_logs(new_ai_wallet, "AmbassadorYieldBonusPaid")[0]
+    assert log.ambassador == ambassador.address
+    assert log.amount == 10 * EIGHTEEN_DECIMALS
+
+    # bonus recorded, not transferred
+    assert alpha_token.balanceOf(ambassador.address) == pre_ambassador_balance
+    assert agent_factory.accruedFees(ambassador.address, alpha_token) == 10 * EIGHTEEN_DECIMALS
+
+    # governance can only recover the unreserved balance
+    assert agent_factory.recoverFundsFromAgentFactory(alpha_token, governor, sender=governor)
+    assert alpha_token.balanceOf(agent_factory) == 10 * EIGHTEEN_DECIMALS
+
+    # swept into the ambassador wallet, never to the caller
+    assert agent_factory.sweepAccruedFees(ambassador, [alpha_token], sender=governor) == 1
+    assert alpha_token.balanceOf(ambassador.address) == pre_ambassador_balance + 10 * EIGHTEEN_DECIMALS
+    assert alpha_token.balanceOf(agent_factory) == 0
+
+
+def test_accrue_tx_fees_permissions(agent_factory, price_sheets, governor, alpha_token, bob):
+    with boa.reverts("no perms"):
+        price_sheets.setShouldAccrueTxFees(True, sender=bob)
+
+    with boa.reverts("not a user wallet"):
+        agent_factory.accrueTransactionFees(alpha_token, bob, 1, ZERO_ADDRESS, 0, sender=bob)
+
+    assert price_sheets.setShouldAccrueTxFees(True, sender=governor)
+    log = filter_logs(price_sheets, "ShouldAccrueTxFeesSet")[0]
+    assert log.shouldAccrue
+    assert price_sheets.shouldAccrueTxFees()
+
+    # fee data and settlement mode in one call
+    fee, recipient, ambassadorRatio, shouldAccrue = price_sheets.getTransactionFeeSettlementData(bob, SWAP_UINT256)
+    assert (fee, recipient, ambassadorRatio) == price_sheets.getTransactionFeeDataWithAmbassadorRatio(bob, SWAP_UINT256)
+    assert shouldAccrue
@@ -0,0 +1,79 @@
+import pytest
+import boa
+
+from constants import EIGHTEEN_DECIMALS, DEPOSIT_UINT256, WITHDRAWAL_UINT256
+from contracts.core.templates import UserWalletTemplate, UserWalletConfigTemplate
+
+
+pytestmark = pytest.mark.gas
+
+
+@pytest.fixture(scope="module")
+def gas_wallet(agent_factory, owner, special_agent, alpha_token, alpha_token_whale, bravo_token, bravo_token_whale, mock_lego_alpha):
+    wallet = UserWalletTemplate.at(agent_factory.createUserWallet(owner, sender=owner))
+    UserWalletConfigTemplate.at(wallet.walletConfig()).addOrModifyAgent(special_agent, sender=owner)
+
+    alpha_token.transfer(wallet, 10_000 * EIGHTEEN_DECIMALS, sender=alpha_token_whale)
+    bravo_token.transfer(mock_lego_alpha, 10_000 * EIGHTEEN_DECIMALS, sender=bravo_token_whale)
+    return wallet
+
+
+##########
+# Wallet #
+##########
+
+
+def test_gas_create_user_wallet(gas_bench, agent_factory, sally):
+    gas_bench.measure("agent_factory.createUserWallet", agent_factory.createUserWallet, sally, sender=sally)
+
+
+def test_gas_deposit_tokens(gas_bench, gas_wallet, owner, special_agent, mock_lego_alpha, alpha_token, alpha_token_erc4626_vault):
+    lego_id = mock_lego_alpha.legoId()
+    amount = 100 * EIGHTEEN_DECIMALS
+
+    gas_bench.measure("wallet.depositTokens.owner", gas_wallet.depositTokens, lego_id, alpha_token, alpha_token_erc4626_vault, amount, sender=owner)
+    gas_bench.measure("wallet.depositTokens.agent", gas_wallet.depositTokens, lego_id, alpha_token, alpha_token_erc4626_vault, amount, sender=special_agent.address)
+
+
+def test_gas_withdraw_tokens(gas_bench, gas_wallet, owner, mock_lego_alpha, alpha_token, alpha_token_erc4626_vault):
+    lego_id = mock_lego_alpha.legoId()
+    gas_wallet.depositTokens(lego_id, alpha_token, alpha_token_erc4626_vault, 100 * EIGHTEEN_DECIMALS, sender=owner)
+
+    gas_bench.measure("wallet.withdrawTokens", gas_wallet.withdrawTokens, lego_id, alpha_token, alpha_token_erc4626_vault, 50 * EIGHTEEN_DECIMALS, sender=owner)
+
+
+def test_gas_direct_deposit_withdraw(gas_bench, gas_wallet, owner, lego_registry, governor, mock_lego_alpha, alpha_token, alpha_token_erc4626_vault):
+    lego_id = mock_lego_alpha.legoId()
+    assert lego_registry.setDirectLego(lego_id, True, sender=governor)
+
+    gas_bench.measure("wallet.depositTokens.direct", gas_wallet.depositTokens, lego_id, alpha_token, alpha_token_erc4626_vault, 100 * EIGHTEEN_DECIMALS, sender=owner)
+    gas_bench.measure("wallet.withdrawTokens.direct", gas_wallet.withdrawTokens, lego_id, alpha_token, alpha_token_erc4626_vault, 50 * EIGHTEEN_DECIMALS, sender=owner)
+
+
+def test_gas_rebalance(gas_bench, gas_wallet, owner, mock_lego_alpha, mock_lego_alpha_another, alpha_token, alpha_token_erc4626_vault, alpha_token_erc4626_vault_another):
+    lego_id = mock_lego_alpha.legoId()
+    gas_wallet.depositTokens(lego_id, alpha_token, alpha_token_erc4626_vault, 100 * EIGHTEEN_DECIMALS, sender=owner)
+
+    gas_bench.measure("wallet.rebalance", gas_wallet.rebalance, lego_id, alpha_token, alpha_token_erc4626_vault, mock_lego_alpha_another.legoId(), alpha_token_erc4626_vault_another, 50 * EIGHTEEN_DECIMALS, sender=owner)
+
+
+def test_gas_swap_tokens(gas_bench, gas_wallet, owner, mock_lego_alpha, alpha_token, bravo_token):
+    instruction = (mock_lego_alpha.legoId(), 100 * EIGHTEEN_DECIMALS, 0, [alpha_token, bravo_token], [alpha_token])
+
+    gas_bench.measure("wallet.swapTokens", gas_wallet.swapTokens, [instruction], sender=owner)
+
+
+#########
+# Agent #
+#########
+
+
+def test_gas_perform_batch_actions(gas_bench, gas_wallet, special_agent, createActionInstruction, mock_lego_alpha, alpha_token, alpha_token_erc4626_vault):
+    lego_id = mock_lego_alpha.legoId()
+    amount = 100 * EIGHTEEN_DECIMALS
+    instructions = [
+        createActionInstruction(DEPOSIT_UINT256, lego_id, alpha_token.address, alpha_token_erc4626_vault.address, amount),
+        createActionInstruction(WITHDRAWAL_UINT256, lego_id, alpha_token.address, alpha_token_erc4626_vault.address, amount),
+    ]
+
+    gas_bench.measure("agent.performBatchActions", special_agent.performBatchActions, gas_wallet, instructions, sender=special_agent.owner())